@@ -0,0 +1,270 @@
+# hypervisor/aio_servicer.py
+"""
+Servicer gRPC asyncio (grpc.aio) per grpc_mode: aio.
+
+Le RPC sono coroutine: il lavoro sull'hardware (che quasi sempre attende il
+lock del resource manager, una riconfigurazione o un DMA) gira su executor
+dedicati e la coroutine lo attende, quindi migliaia di richieste in volo
+costano coroutine e non thread.
+
+La logica resta quella di PYNQServicer: ogni metodo esegue il corrispondente
+handler sincrono, così richieste, risposte e codici di errore sono identici.
+"""
+
+import asyncio
+import contextvars
+import threading
+import logging
+from concurrent import futures
+from typing import Dict, Optional
+
+import grpc
+
+from servicer import PYNQServicer
+import pynq_service_pb2 as pb2
+import pynq_service_pb2_grpc as pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+# Worker predefiniti per ogni executor
+DEFAULT_WORKERS = {
+    'reconfig': 2,   # LoadOverlay/Cleanup: riconfigurazioni PR, lente e serializzate
+    'dma': 4,        # Buffer e DMA
+    'mmio': 4,       # Accessi ai registri, sessioni e handle
+}
+
+
+class _Abort(Exception):
+    """Sollevata da context.abort() negli handler sincroni"""
+
+
+class _SyncContext:
+    """
+    Context grpc.aio visto da un handler sincrono.
+
+    abort() in grpc.aio è una coroutine: qui registra code e details e
+    interrompe l'handler come farebbe il server sincrono; l'abort vero
+    viene poi eseguito dalla coroutine.
+    """
+
+    def __init__(self, context):
+        self._context = context
+        self.code = None
+        self.details = None
+
+    def abort(self, code, details=''):
+        self.code = code
+        self.details = details
+        raise _Abort(details)
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+def _run_in_executor(executor: futures.Executor, fn, *args):
+    """run_in_executor nel contesto corrente (current_tenant impostato da AioAuthInterceptor)"""
+    context = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(executor, context.run, fn, *args)
+
+
+def _dispatch(method: str, pool: str):
+    """Metodo async che esegue l'handler sincrono sull'executor indicato"""
+
+    async def handler(self, request, context):
+        sync_context = _SyncContext(context)
+        try:
+            return await _run_in_executor(
+                self._executors[pool], getattr(self._servicer, method), request, sync_context)
+        except _Abort:
+            await context.abort(sync_context.code, sync_context.details)
+        except NotImplementedError as e:
+            # Metodi non implementati nella base generata: stessi code e details del server sincrono
+            await context.abort(grpc.StatusCode.UNIMPLEMENTED, str(e))
+
+    handler.__name__ = method
+    return handler
+
+
+class AsyncPYNQServicer(pb2_grpc.PYNQServiceServicer):
+    """PYNQService su grpc.aio: stessi handler di PYNQServicer, eseguiti fuori dall'event loop"""
+
+    def __init__(self, tenant_manager, resource_manager, executors: Dict[str, futures.Executor],
+                 tenant_id: Optional[str] = None):
+        self._servicer = PYNQServicer(tenant_manager, resource_manager, tenant_id=tenant_id)
+        self._executors = executors
+
+    Authenticate = _dispatch('Authenticate', 'mmio')
+
+    LoadOverlay = _dispatch('LoadOverlay', 'reconfig')
+    GetOverlayInfo = _dispatch('GetOverlayInfo', 'mmio')
+    UnloadOverlay = _dispatch('UnloadOverlay', 'reconfig')
+    CleanupResources = _dispatch('CleanupResources', 'reconfig')
+
+    CreateMMIO = _dispatch('CreateMMIO', 'mmio')
+    MMIORead = _dispatch('MMIORead', 'mmio')
+    MMIOWrite = _dispatch('MMIOWrite', 'mmio')
+    MMIOReadBlock = _dispatch('MMIOReadBlock', 'mmio')
+    MMIOWriteBlock = _dispatch('MMIOWriteBlock', 'mmio')
+    BatchMMIO = _dispatch('BatchMMIO', 'mmio')
+    ReleaseMMIO = _dispatch('ReleaseMMIO', 'mmio')
+
+    async def _tenant_id(self, context, pool: str) -> str:
+        """Tenant della RPC (stream: risolto una volta all'apertura)"""
+        sync_context = _SyncContext(context)
+        try:
+            return await _run_in_executor(
+                self._executors[pool], self._servicer._get_tenant_id, sync_context)
+        except _Abort:
+            await context.abort(sync_context.code, sync_context.details)
+
+    async def MMIOStream(self, request_iterator, context):
+        """Un frame alla volta sull'executor mmio: lo stream in attesa non occupa thread"""
+        loop = asyncio.get_running_loop()
+        executor = self._executors['mmio']
+        tenant_id = await self._tenant_id(context, 'mmio')
+
+        async for request in request_iterator:
+            response = await loop.run_in_executor(
+                executor, self._servicer._mmio_stream_op, tenant_id, request)
+            if response is not None:
+                yield response
+
+    AllocateBuffer = _dispatch('AllocateBuffer', 'dma')
+    ReadBuffer = _dispatch('ReadBuffer', 'dma')
+    WriteBuffer = _dispatch('WriteBuffer', 'dma')
+    FreeBuffer = _dispatch('FreeBuffer', 'dma')
+
+    async def ReadBufferStream(self, request, context):
+        """Un chunk alla volta sull'executor dma"""
+        loop = asyncio.get_running_loop()
+        executor = self._executors['dma']
+        tenant_id = await self._tenant_id(context, 'dma')
+        resource_manager = self._servicer.resource_manager
+
+        try:
+            version = await loop.run_in_executor(
+                executor, resource_manager.buffer_version, tenant_id, request.handle)
+            if request.known_version and request.known_version == version:
+                yield pb2.BufferChunk(version=version, not_modified=True)
+                return
+
+            for offset, length in self._servicer._buffer_chunks(request):
+                data = await loop.run_in_executor(
+                    executor, resource_manager.read_buffer, tenant_id, request.handle, offset, length)
+                yield pb2.BufferChunk(offset=offset, data=data, version=version)
+        except Exception as e:
+            logger.error(f"ReadBufferStream error: {e}")
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+
+    async def WriteBufferStream(self, request_iterator, context):
+        loop = asyncio.get_running_loop()
+        executor = self._executors['dma']
+        tenant_id = await self._tenant_id(context, 'dma')
+        handle = ''
+        response = None
+
+        try:
+            async for chunk in request_iterator:
+                handle, previous, version = await loop.run_in_executor(
+                    executor, self._servicer._write_buffer_chunk, tenant_id, handle, chunk)
+                response = self._servicer._chain_write_versions(response, previous, version)
+        except Exception as e:
+            logger.error(f"WriteBufferStream error: {e}")
+            await context.abort(grpc.StatusCode.INTERNAL, str(e))
+        return response or pb2.WriteBufferResponse()
+
+    CreateDMA = _dispatch('CreateDMA', 'dma')
+    DMATransfer = _dispatch('DMATransfer', 'dma')
+    GetDMAStatus = _dispatch('GetDMAStatus', 'dma')
+
+    async def WatchCompletions(self, request, context):
+        """Lo stream attende sul loop: il worker DMA lo sveglia a ogni completamento"""
+        loop = asyncio.get_running_loop()
+        tenant_id = await self._tenant_id(context, 'dma')
+        ready = asyncio.Event()
+
+        try:
+            watcher = self._servicer.resource_manager.dma_engine.subscribe(
+                tenant_id, on_ready=lambda: loop.call_soon_threadsafe(ready.set))
+        except Exception as e:
+            logger.error(f"WatchCompletions error: {e}")
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+
+        try:
+            yield pb2.CompletionBatch()
+            while not watcher.closed:
+                await ready.wait()
+                ready.clear()
+                while True:
+                    batch, overflow = watcher.drain()
+                    if not batch and not overflow:
+                        break
+                    yield self._servicer._completion_batch(batch, overflow)
+        finally:
+            watcher.close()
+
+    Disconnect = _dispatch('Disconnect', 'mmio')
+    Heartbeat = _dispatch('Heartbeat', 'mmio')
+
+
+class AioTenantServers:
+    """
+    Event loop asyncio in un thread dedicato che ospita i server grpc.aio dei
+    tenant (uno per socket, come in modalità sincrona) e gli executor condivisi.
+    """
+
+    def __init__(self, tenant_manager, resource_manager, workers: Optional[Dict[str, int]] = None):
+        self.tenant_manager = tenant_manager
+        self.resource_manager = resource_manager
+
+        workers = dict(DEFAULT_WORKERS, **(workers or {}))
+        self.executors = {
+            pool: futures.ThreadPoolExecutor(max_workers=count, thread_name_prefix=f"aio-{pool}")
+            for pool, count in workers.items()
+        }
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="GrpcAioLoop", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _call(self, coro):
+        """Esegue una coroutine sul loop dei server e ne attende il risultato"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def create_server(self, tenant_id: str, address: str, options=None,
+                      interceptors=None) -> '_AioServerHandle':
+        """Crea il server grpc.aio di un tenant e lo lega all'indirizzo (senza avviarlo)"""
+
+        async def create():
+            server = grpc.aio.server(options=options, interceptors=interceptors)
+            servicer = AsyncPYNQServicer(
+                self.tenant_manager, self.resource_manager, self.executors, tenant_id=tenant_id)
+            pb2_grpc.add_PYNQServiceServicer_to_server(servicer, server)
+            server.add_insecure_port(address)
+            return server
+
+        return _AioServerHandle(self, self._call(create()))
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        for executor in self.executors.values():
+            executor.shutdown(wait=False)
+
+
+class _AioServerHandle:
+    """Interfaccia sincrona (start/stop) di un server grpc.aio, come grpc.Server"""
+
+    def __init__(self, group: AioTenantServers, server):
+        self._group = group
+        self._server = server
+
+    def start(self):
+        self._group._call(self._server.start())
+
+    def stop(self, grace=None):
+        self._group._call(self._server.stop(grace))
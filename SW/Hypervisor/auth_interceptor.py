@@ -0,0 +1,156 @@
+# hypervisor/auth_interceptor.py
+"""
+Autenticazione delle RPC di PYNQService in un server interceptor.
+
+Il token viene cercato nello snapshot immutabile di TenantManager (nessun
+lock, nessun dict dei metadata) e il tenant risultante viene passato
+all'handler tramite current_tenant. La revoca di una sessione sostituisce
+lo snapshot: la RPC successiva con quel token viene rifiutata.
+
+Ogni socket ha il proprio server, quindi l'interceptor lega anche il token
+al tenant proprietario del socket (su UDS context.peer() è sempre "unix:",
+il socket è l'unica identità della connessione).
+
+AioAuthInterceptor fa lo stesso per i server grpc.aio (grpc_mode: aio); il
+servicer asyncio copia il contesto negli executor, così current_tenant arriva
+anche agli handler sincroni.
+"""
+
+import contextvars
+import logging
+from typing import Optional
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+# Tenant autenticato della RPC in corso (None fuori dall'interceptor)
+current_tenant: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'current_tenant', default=None)
+
+# RPC che non richiedono token
+PUBLIC_METHODS = frozenset({
+    '/pynq.PYNQService/Authenticate',
+})
+
+
+def _bind_tenant(behavior, tenant_id: str, streaming_response: bool):
+    """Esegue l'handler con current_tenant impostato"""
+    if streaming_response:
+        def wrapped(request, context):
+            reset = current_tenant.set(tenant_id)
+            try:
+                yield from behavior(request, context)
+            finally:
+                current_tenant.reset(reset)
+    else:
+        def wrapped(request, context):
+            reset = current_tenant.set(tenant_id)
+            try:
+                return behavior(request, context)
+            finally:
+                current_tenant.reset(reset)
+    return wrapped
+
+
+def _bind_tenant_async(behavior, tenant_id: str, streaming_response: bool):
+    """Come _bind_tenant per gli handler grpc.aio (coroutine e async generator)"""
+    if streaming_response:
+        async def wrapped(request, context):
+            reset = current_tenant.set(tenant_id)
+            try:
+                async for response in behavior(request, context):
+                    yield response
+            finally:
+                current_tenant.reset(reset)
+    else:
+        async def wrapped(request, context):
+            reset = current_tenant.set(tenant_id)
+            try:
+                return await behavior(request, context)
+            finally:
+                current_tenant.reset(reset)
+    return wrapped
+
+
+def _abort_with(code: grpc.StatusCode, details: str):
+    def behavior(request, context):
+        context.abort(code, details)
+    return behavior
+
+
+def _abort_with_async(code: grpc.StatusCode, details: str):
+    async def behavior(request, context):
+        await context.abort(code, details)
+    return behavior
+
+
+def _token(handler_call_details) -> Optional[str]:
+    for key, value in handler_call_details.invocation_metadata or ():
+        if key == 'auth-token':
+            return value
+    return None
+
+
+def _replace_behavior(handler, make):
+    """Handler dello stesso tipo con il behavior ritornato da make(behavior, streaming_response)"""
+    if handler.unary_unary:
+        return handler._replace(unary_unary=make(handler.unary_unary, False))
+    if handler.unary_stream:
+        return handler._replace(unary_stream=make(handler.unary_stream, True))
+    if handler.stream_unary:
+        return handler._replace(stream_unary=make(handler.stream_unary, False))
+    return handler._replace(stream_stream=make(handler.stream_stream, True))
+
+
+class _TokenCheck:
+    """Controllo del token comune agli interceptor sincrono e grpc.aio"""
+
+    _bind = staticmethod(_bind_tenant)
+    _abort = staticmethod(_abort_with)
+
+    def __init__(self, tenant_manager, socket_tenant: Optional[str] = None):
+        self.tenant_manager = tenant_manager
+        self.socket_tenant = socket_tenant
+
+    def _authorize(self, handler, handler_call_details):
+        if handler is None or handler_call_details.method in PUBLIC_METHODS:
+            return handler
+
+        token = _token(handler_call_details)
+        if not token:
+            return self._reject(handler, grpc.StatusCode.UNAUTHENTICATED, 'Missing auth token')
+
+        tenant_id = self.tenant_manager.lookup_token(token)
+        if not tenant_id:
+            return self._reject(handler, grpc.StatusCode.UNAUTHENTICATED, 'Invalid or expired token')
+
+        if self.socket_tenant and tenant_id != self.socket_tenant:
+            logger.warning(f"Token of {tenant_id} used on socket of {self.socket_tenant}")
+            return self._reject(handler, grpc.StatusCode.PERMISSION_DENIED, 'Token not valid on this socket')
+
+        return _replace_behavior(
+            handler, lambda behavior, streaming: self._bind(behavior, tenant_id, streaming))
+
+    def _reject(self, handler, code: grpc.StatusCode, details: str):
+        """Handler dello stesso tipo che termina la RPC con l'errore"""
+        abort = self._abort(code, details)
+        return _replace_behavior(handler, lambda behavior, streaming: abort)
+
+
+class AuthInterceptor(_TokenCheck, grpc.ServerInterceptor):
+    """Valida auth-token una volta per RPC, senza lock, prima di invocare l'handler"""
+
+    def intercept_service(self, continuation, handler_call_details):
+        return self._authorize(continuation(handler_call_details), handler_call_details)
+
+
+class AioAuthInterceptor(_TokenCheck, grpc.aio.ServerInterceptor):
+    """AuthInterceptor per i server grpc.aio"""
+
+    _bind = staticmethod(_bind_tenant_async)
+    _abort = staticmethod(_abort_with_async)
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        return self._authorize(handler, handler_call_details)
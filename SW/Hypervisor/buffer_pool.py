@@ -0,0 +1,278 @@
+# hypervisor/buffer_pool.py
+"""
+Pool di buffer contigui (CMA) per classi di dimensione.
+
+Un'allocazione contigua sulla board è lenta e, con il tempo, frammenta la
+CMA. Il pool arrotonda ogni richiesta alla sua classe, tiene una free list
+per classe dei buffer già allocati e li riusa: AllocateBuffer diventa un pop
+dalla lista, FreeBuffer un push (con azzeramento opzionale dei byte usati,
+perché il buffer può passare a un altro tenant).
+
+Le classi sono CLASSES_PER_OCTAVE per ogni potenza di due, quindi lo spazio
+sprecato per arrotondamento resta sotto il 25%. Le richieste oltre
+MAX_CLASS_SIZE vengono allocate e liberate direttamente.
+
+Il pool cede memoria quando serve: i buffer liberi oltre max_pooled_bytes
+vengono liberati subito, e con la CMA libera sotto cma_low_watermark (o se
+un'allocazione fallisce) le free list vengono svuotate.
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 4096
+
+# Classi: da MIN_CLASS_SIZE a MAX_CLASS_SIZE, CLASSES_PER_OCTAVE per ottava
+MIN_CLASS_SIZE = PAGE_SIZE
+MAX_CLASS_SIZE = 64 * 1024 * 1024
+CLASSES_PER_OCTAVE = 4
+
+DEFAULT_MAX_POOLED_BYTES = 128 * 1024 * 1024
+DEFAULT_CMA_LOW_WATERMARK = 32 * 1024 * 1024
+
+# Ogni quanto rileggere la CMA libera da /proc/meminfo
+CMA_CHECK_INTERVAL = 1.0
+
+
+def size_classes(min_size: int = MIN_CLASS_SIZE, max_size: int = MAX_CLASS_SIZE,
+                 per_octave: int = CLASSES_PER_OCTAVE) -> List[int]:
+    """Dimensioni delle classi (multipli di pagina), crescenti"""
+    classes = set()
+    octave = 1 << max(0, (min_size - 1).bit_length() - 1)
+    while octave <= max_size:
+        for step in range(per_octave):
+            size = octave + octave * step // per_octave
+            size = -(-size // PAGE_SIZE) * PAGE_SIZE
+            if min_size <= size <= max_size:
+                classes.add(size)
+        octave <<= 1
+    return sorted(classes)
+
+
+def cma_free_bytes() -> Optional[int]:
+    """CmaFree da /proc/meminfo (None se non disponibile)"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('CmaFree:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+@dataclass
+class PoolBlock:
+    """Buffer grezzo (uint8) del pool e quanti suoi byte sono in uso"""
+    raw: object
+    size_class: int        # 0 = fuori dalle classi, allocato su misura
+    used: int = 0
+
+
+@dataclass
+class SizeClassStats:
+    size: int
+    hits: int = 0          # Allocazioni servite dalla free list
+    misses: int = 0        # Allocazioni nuove
+    recycled: int = 0      # Buffer tornati nella free list
+    released: int = 0      # Buffer liberati (pool pieno o trim)
+    in_use: int = 0
+    free: int = 0
+    requested_bytes: int = 0   # Byte chiesti dalle allocazioni (per lo spreco di arrotondamento)
+
+
+class BufferPool:
+    """Free list per classe di dimensione di buffer già allocati"""
+
+    def __init__(self, allocator: Callable[[int], object], max_pooled_bytes: int = DEFAULT_MAX_POOLED_BYTES,
+                 zero_on_free: bool = True, cma_low_watermark: int = DEFAULT_CMA_LOW_WATERMARK,
+                 classes: Optional[List[int]] = None):
+        """
+        Args:
+            allocator: alloca un buffer contiguo uint8 di n byte (es. pynq.allocate)
+            max_pooled_bytes: byte massimi tenuti nelle free list
+            zero_on_free: azzera il buffer prima di rimetterlo nel pool
+            cma_low_watermark: sotto questa CMA libera le free list vengono svuotate (0 = mai)
+        """
+        self._allocator = allocator
+        self.max_pooled_bytes = max_pooled_bytes
+        self.zero_on_free = zero_on_free
+        self.cma_low_watermark = cma_low_watermark
+        self.classes = classes or size_classes()
+
+        self._lock = threading.Lock()
+        self._free: Dict[int, List[object]] = {size: [] for size in self.classes}
+        self._stats: Dict[int, SizeClassStats] = {size: SizeClassStats(size) for size in self.classes}
+        self._oversize = SizeClassStats(0)
+        self.pooled_bytes = 0
+        self.trims = 0
+        self._cma_checked_at = 0.0
+        self._cma_low = False
+
+    def class_for(self, nbytes: int) -> int:
+        """Classe che contiene nbytes (0 se oltre la più grande)"""
+        if nbytes > self.classes[-1]:
+            return 0
+        low, high = 0, len(self.classes) - 1
+        while low < high:
+            mid = (low + high) // 2
+            if self.classes[mid] >= nbytes:
+                high = mid
+            else:
+                low = mid + 1
+        return self.classes[low]
+
+    def allocate(self, nbytes: int) -> PoolBlock:
+        """Buffer con almeno nbytes byte: dalla free list della classe, se possibile"""
+        nbytes = max(1, int(nbytes))
+        size_class = self.class_for(nbytes)
+        stats = self._stats[size_class] if size_class else self._oversize
+
+        with self._lock:
+            stats.requested_bytes += nbytes
+            free = self._free.get(size_class)
+            if free:
+                raw = free.pop()
+                self.pooled_bytes -= size_class
+                stats.hits += 1
+                stats.in_use += 1
+                stats.free = len(free)
+                return PoolBlock(raw, size_class, nbytes)
+
+        # Miss: allocazione nuova fuori dal lock del pool
+        self._check_memory_pressure()
+        try:
+            raw = self._allocator(size_class or nbytes)
+        except Exception as e:
+            if not self.pooled_bytes:
+                raise
+            # CMA esaurita o frammentata: restituisce tutto il pool e riprova
+            logger.warning(f"Buffer allocation of {size_class or nbytes} bytes failed ({e}), trimming pool")
+            self.trim()
+            raw = self._allocator(size_class or nbytes)
+
+        with self._lock:
+            stats.misses += 1
+            stats.in_use += 1
+        return PoolBlock(raw, size_class, nbytes)
+
+    def release(self, block: PoolBlock):
+        """Rimette il buffer nella free list della sua classe (o lo libera)"""
+        stats = self._stats[block.size_class] if block.size_class else self._oversize
+        keep = (block.size_class
+                and self.pooled_bytes + block.size_class <= self.max_pooled_bytes
+                and not self._memory_pressure())
+
+        if keep and self.zero_on_free:
+            # Il buffer può passare a un altro tenant, che ne vede l'intera classe
+            block.raw[:] = 0
+            if hasattr(block.raw, 'flush'):
+                block.raw.flush()
+
+        with self._lock:
+            stats.in_use -= 1
+            if keep:
+                free = self._free[block.size_class]
+                free.append(block.raw)
+                self.pooled_bytes += block.size_class
+                stats.recycled += 1
+                stats.free = len(free)
+                return
+            stats.released += 1
+
+        self._free_raw(block.raw)
+
+    def discard(self, block: PoolBlock):
+        """Libera il buffer senza riciclarlo (es. ancora mappato in un char device)"""
+        stats = self._stats[block.size_class] if block.size_class else self._oversize
+        with self._lock:
+            stats.in_use -= 1
+            stats.released += 1
+        self._free_raw(block.raw)
+
+    def prewarm(self, counts: Dict[int, int]):
+        """Pre-alloca count buffer per ogni dimensione (arrotondata alla sua classe)"""
+        for nbytes, count in counts.items():
+            size_class = self.class_for(int(nbytes))
+            if not size_class:
+                logger.warning(f"Buffer pool: cannot prewarm {nbytes} bytes, above largest class")
+                continue
+            blocks = []
+            try:
+                for _ in range(int(count)):
+                    blocks.append(PoolBlock(self._allocator(size_class), size_class))
+            except Exception as e:
+                logger.warning(f"Buffer pool: prewarm of {size_class} bytes stopped after {len(blocks)}: {e}")
+            with self._lock:
+                free = self._free[size_class]
+                free.extend(block.raw for block in blocks)
+                self.pooled_bytes += size_class * len(blocks)
+                self._stats[size_class].free = len(free)
+            logger.info(f"Buffer pool: prewarmed {len(blocks)} x {size_class} bytes")
+
+    def trim(self, target_bytes: int = 0):
+        """Libera i buffer nelle free list, dai più grandi, fino a target_bytes in pool"""
+        released = []
+        with self._lock:
+            for size_class in reversed(self.classes):
+                free = self._free[size_class]
+                while free and self.pooled_bytes > target_bytes:
+                    released.append(free.pop())
+                    self.pooled_bytes -= size_class
+                    self._stats[size_class].released += 1
+                self._stats[size_class].free = len(free)
+            if released:
+                self.trims += 1
+
+        for raw in released:
+            self._free_raw(raw)
+        if released:
+            logger.info(f"Buffer pool: trimmed {len(released)} buffers, {self.pooled_bytes} bytes still pooled")
+
+    def close(self):
+        self.trim()
+
+    def _memory_pressure(self) -> bool:
+        if not self.cma_low_watermark:
+            return False
+        now = time.monotonic()
+        if now - self._cma_checked_at < CMA_CHECK_INTERVAL:
+            return self._cma_low
+        self._cma_checked_at = now
+        free = cma_free_bytes()
+        self._cma_low = free is not None and free < self.cma_low_watermark
+        return self._cma_low
+
+    def _check_memory_pressure(self):
+        if self.pooled_bytes and self._memory_pressure():
+            logger.info("Buffer pool: CMA below low watermark, trimming")
+            self.trim()
+
+    @staticmethod
+    def _free_raw(raw):
+        try:
+            if hasattr(raw, 'freebuffer'):
+                raw.freebuffer()
+        except Exception as e:
+            logger.warning(f"Buffer pool: error freeing buffer: {e}")
+
+    def stats(self) -> dict:
+        """Contatori per classe (solo le classi usate) e totali"""
+        with self._lock:
+            classes = [
+                dict(vars(stats))
+                for stats in list(self._stats.values()) + [self._oversize]
+                if stats.hits or stats.misses or stats.free
+            ]
+            return {
+                'classes': classes,
+                'pooled_bytes': self.pooled_bytes,
+                'max_pooled_bytes': self.max_pooled_bytes,
+                'trims': self.trims,
+                'cma_free_bytes': cma_free_bytes()
+            }
@@ -43,6 +43,15 @@ class DynamicConfigManager:
         self.socket_dir = '/var/run/pynq'
         self.bitstream_dir = '/home/xilinx/bitstreams'
         self.static_bitstream = '/home/xilinx/bitstreams/full.bit'
+        self.fast_mmio_mode = 'threaded'
+        self.fast_mmio_shards = 1
+        self.fast_mmio_ring = None
+        self.grpc_mode = 'per_tenant'
+        self.grpc_workers = 8
+        self.grpc_tenant_concurrency = 4
+        self.grpc_stream_threads = 32
+        self.grpc_tenant_streams = 8
+        self.buffer_pool = {}
         self.pr_zones = []
         self.tenants = {}
         
@@ -67,6 +76,15 @@ class DynamicConfigManager:
             self.socket_dir = global_config.get('socket_dir', '/var/run/pynq')
             self.bitstream_dir = global_config.get('bitstream_dir', '/home/xilinx/bitstreams')
             self.static_bitstream = global_config.get('static_bitstream', '/home/xilinx/bitstreams/full.bit')
+            self.fast_mmio_mode = global_config.get('fast_mmio_mode', 'threaded')
+            self.fast_mmio_shards = global_config.get('fast_mmio_shards', 1)
+            self.fast_mmio_ring = global_config.get('fast_mmio_ring')
+            self.grpc_mode = global_config.get('grpc_mode', 'per_tenant')
+            self.grpc_workers = global_config.get('grpc_workers', 8)
+            self.grpc_tenant_concurrency = global_config.get('grpc_tenant_concurrency', 4)
+            self.grpc_stream_threads = global_config.get('grpc_stream_threads', 32)
+            self.grpc_tenant_streams = global_config.get('grpc_tenant_streams', 8)
+            self.buffer_pool = global_config.get('buffer_pool') or {}
             
             # Override da environment se disponibili
             self.socket_dir = os.environ.get('PYNQ_SOCKET_DIR', self.socket_dir)
@@ -349,6 +367,15 @@ class DynamicConfigManager:
                 'bitstream_dir': self.bitstream_dir,
                 'socket_dir': self.socket_dir,
                 'static_bitstream': self.static_bitstream,
+                'fast_mmio_mode': self.fast_mmio_mode,
+                'fast_mmio_shards': self.fast_mmio_shards,
+                'fast_mmio_ring': self.fast_mmio_ring,
+                'grpc_mode': self.grpc_mode,
+                'grpc_workers': self.grpc_workers,
+                'grpc_tenant_concurrency': self.grpc_tenant_concurrency,
+                'grpc_stream_threads': self.grpc_stream_threads,
+                'grpc_tenant_streams': self.grpc_tenant_streams,
+                'buffer_pool': self.buffer_pool,
                 'pr_zones': []
             }
             
@@ -404,9 +431,14 @@ class DynamicConfigManager:
             if self.config_file and os.path.exists(self.config_file):
                 logger.info(f"Reloading configuration from {self.config_file}")
                 old_tenants = set(self.tenants.keys())
+                old_pr_zones = list(self.pr_zones)
                 
                 self._load_from_file()
                 
+                # PR zone cambiate (indirizzi, nomi): i resource manager rileggono la mappa
+                if self.pr_zones != old_pr_zones:
+                    self._notify_watchers('pr_zones_changed', [zone.zone_id for zone in self.pr_zones])
+                
                 # Notifica cambiamenti
                 new_tenants = set(self.tenants.keys())
                 
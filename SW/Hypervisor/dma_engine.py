@@ -0,0 +1,300 @@
+# hypervisor/dma_engine.py
+"""
+Trasferimenti DMA asincroni dietro DMATransfer/GetDMAStatus.
+
+Ogni canale di un DMA (MM2S e S2MM) ha un worker con la sua coda: i
+trasferimenti dello stesso canale vengono eseguiti in ordine, i due canali
+procedono in parallelo come sull'hardware (una S2MM in attesa non blocca la
+MM2S che le manda i dati). Ogni trasferimento ha un transfer_id e resta nella
+tabella dei completamenti finché non viene espulso dai più recenti, e viene
+notificato ai CompletionWatcher del tenant (WatchCompletions).
+
+I dati li muove un backend con transfer(direction, buffer, length, timeout),
+che ritorna i byte trasferiti, e cancel(), che interrompe il trasferimento in
+corso al rilascio del DMA: PYNQDMABackend (pynq.lib.dma.DMA) sulla board,
+MockDMA in loopback nei test.
+"""
+
+import time
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Direzioni (come DMADirection nel proto)
+DMA_MM2S = 0    # memoria -> stream (sendchannel)
+DMA_S2MM = 1    # stream -> memoria (recvchannel)
+
+# Stati (come DMAStatus nel proto)
+DMA_PENDING = 0
+DMA_RUNNING = 1
+DMA_DONE = 2
+DMA_ERROR = 3
+DMA_TIMEOUT = 4
+
+DMA_FINISHED = (DMA_DONE, DMA_ERROR, DMA_TIMEOUT)
+
+# Timeout di un trasferimento se la richiesta non lo specifica
+DEFAULT_TRANSFER_TIMEOUT = 10.0
+
+# Trasferimenti in coda per canale e trasferimenti terminati ricordati
+MAX_QUEUED_TRANSFERS = 64
+MAX_COMPLETED_TRANSFERS = 4096
+
+# WatchCompletions: stream per tenant, completamenti non ancora consegnati per
+# stream (oltre, i più vecchi vengono scartati e segnalati con overflow) e
+# completamenti per messaggio
+MAX_WATCHERS_PER_TENANT = 16
+MAX_PENDING_COMPLETIONS = 4096
+MAX_COMPLETION_BATCH = 256
+
+
+@dataclass
+class DMATransferState:
+    transfer_id: str
+    tenant_id: str
+    dma_handle: str
+    buffer_handle: str
+    direction: int
+    length: int
+    timeout: float
+    status: int = DMA_PENDING
+    bytes_transferred: int = 0
+    error: str = ''
+    submitted_at: float = field(default_factory=time.time)
+    completed_at: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+
+class _ChannelWorker:
+    """Thread che esegue in ordine i trasferimenti di un canale"""
+
+    def __init__(self, engine: 'DMAEngine', dma_handle: str, direction: int, backend):
+        self.engine = engine
+        self.backend = backend
+        self.direction = direction
+        self.queue = queue.Queue(maxsize=MAX_QUEUED_TRANSFERS)
+        name = f"DMA-{dma_handle}-{'MM2S' if direction == DMA_MM2S else 'S2MM'}"
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            transfer, buffer = item
+            self.engine._execute(self.backend, transfer, buffer)
+
+
+class CompletionWatcher:
+    """
+    Completamenti dei trasferimenti di un tenant per uno stream WatchCompletions.
+
+    I completamenti arrivati mentre lo stream invia il messaggio precedente
+    vengono consegnati insieme nel successivo. on_ready (se presente) viene
+    chiamata dal worker a ogni completamento, per svegliare uno stream asyncio.
+    """
+
+    def __init__(self, engine: 'DMAEngine', tenant_id: str, on_ready: Optional[Callable[[], None]] = None):
+        self._engine = engine
+        self.tenant_id = tenant_id
+        self._on_ready = on_ready
+        self._cond = threading.Condition()
+        self._pending = deque(maxlen=MAX_PENDING_COMPLETIONS)
+        self._overflow = False
+        self.closed = False
+
+    def _push(self, transfer: DMATransferState):
+        with self._cond:
+            if len(self._pending) == MAX_PENDING_COMPLETIONS:
+                self._overflow = True
+            self._pending.append(transfer)
+            self._cond.notify()
+        if self._on_ready is not None:
+            self._on_ready()
+
+    def next_batch(self, timeout: Optional[float] = None) -> Tuple[List[DMATransferState], bool]:
+        """Attende almeno un completamento (o la chiusura); ritorna (completamenti, overflow)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._overflow or self.closed, timeout)
+            return self.drain()
+
+    def drain(self) -> Tuple[List[DMATransferState], bool]:
+        """Completamenti pronti, senza attendere"""
+        with self._cond:
+            count = min(len(self._pending), MAX_COMPLETION_BATCH)
+            batch = [self._pending.popleft() for _ in range(count)]
+            overflow, self._overflow = self._overflow, False
+            return batch, overflow
+
+    def close(self):
+        self._engine._unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        if self._on_ready is not None:
+            self._on_ready()
+
+
+class DMAEngine:
+    """Code dei canali DMA e tabella dei trasferimenti"""
+
+    def __init__(self, on_complete: Optional[Callable[[DMATransferState], None]] = None):
+        """
+        Args:
+            on_complete: chiamata dal worker a fine trasferimento (es. nuova
+                         versione del buffer scritto da una S2MM)
+        """
+        self._on_complete = on_complete
+        self._lock = threading.Lock()
+        self._workers: Dict[str, Dict[int, _ChannelWorker]] = {}
+        self._transfers: Dict[str, DMATransferState] = {}
+        self._completed: 'OrderedDict[str, None]' = OrderedDict()
+        # buffer_handle -> trasferimenti non terminati
+        self._busy_buffers: Dict[str, int] = {}
+        self._watchers: Dict[str, List[CompletionWatcher]] = {}
+
+    def add_dma(self, dma_handle: str, backend, directions=(DMA_MM2S, DMA_S2MM)):
+        """Avvia i worker dei canali di un DMA"""
+        with self._lock:
+            if dma_handle in self._workers:
+                raise Exception(f"DMA {dma_handle} already registered")
+            self._workers[dma_handle] = {
+                direction: _ChannelWorker(self, dma_handle, direction, backend)
+                for direction in directions
+            }
+
+    def remove_dma(self, dma_handle: str, timeout: float = DEFAULT_TRANSFER_TIMEOUT):
+        """Ferma i worker di un DMA: i trasferimenti in coda falliscono, quello in corso viene interrotto"""
+        with self._lock:
+            workers = self._workers.pop(dma_handle, None)
+        if not workers:
+            return
+
+        for worker in workers.values():
+            while True:
+                try:
+                    transfer, _ = worker.queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._finish(transfer, DMA_ERROR, error="DMA released")
+            worker.queue.put(None)
+            worker.backend.cancel()
+
+        deadline = time.monotonic() + timeout
+        for worker in workers.values():
+            worker.thread.join(max(0.0, deadline - time.monotonic()))
+            if worker.thread.is_alive():
+                logger.warning(f"DMA {dma_handle}: transfer still running after release")
+
+    def submit(self, tenant_id: str, dma_handle: str, direction: int, buffer_handle: str,
+               buffer, length: int, timeout: float = 0) -> DMATransferState:
+        """Accoda un trasferimento sul canale; ritorna subito lo stato (PENDING)"""
+        transfer = DMATransferState(
+            transfer_id=f"xfer_{uuid.uuid4().hex[:12]}",
+            tenant_id=tenant_id,
+            dma_handle=dma_handle,
+            buffer_handle=buffer_handle,
+            direction=direction,
+            length=length,
+            timeout=timeout or DEFAULT_TRANSFER_TIMEOUT
+        )
+
+        with self._lock:
+            worker = self._workers.get(dma_handle, {}).get(direction)
+            if worker is None:
+                raise Exception(f"DMA {dma_handle} has no {'MM2S' if direction == DMA_MM2S else 'S2MM'} channel")
+            try:
+                worker.queue.put_nowait((transfer, buffer))
+            except queue.Full:
+                raise Exception(f"DMA {dma_handle}: too many queued transfers ({MAX_QUEUED_TRANSFERS})")
+            self._transfers[transfer.transfer_id] = transfer
+            self._busy_buffers[buffer_handle] = self._busy_buffers.get(buffer_handle, 0) + 1
+
+        logger.debug(f"DMA transfer {transfer.transfer_id} queued: dma={dma_handle}, "
+                     f"direction={direction}, buffer={buffer_handle}, length={length}")
+        return transfer
+
+    def get(self, tenant_id: str, transfer_id: str) -> DMATransferState:
+        transfer = self._transfers.get(transfer_id)
+        if transfer is None or transfer.tenant_id != tenant_id:
+            raise Exception(f"DMA transfer {transfer_id} not found")
+        return transfer
+
+    def wait(self, transfer: DMATransferState, timeout: Optional[float] = None) -> bool:
+        """Attende la fine del trasferimento; False se scade timeout"""
+        return transfer.done.wait(timeout)
+
+    def subscribe(self, tenant_id: str, on_ready: Optional[Callable[[], None]] = None) -> CompletionWatcher:
+        """Registra uno stream dei completamenti del tenant (da chiudere con watcher.close())"""
+        watcher = CompletionWatcher(self, tenant_id, on_ready)
+        with self._lock:
+            watchers = self._watchers.setdefault(tenant_id, [])
+            if len(watchers) >= MAX_WATCHERS_PER_TENANT:
+                raise Exception(f"Too many completion watchers for tenant {tenant_id} ({MAX_WATCHERS_PER_TENANT})")
+            watchers.append(watcher)
+        return watcher
+
+    def _unsubscribe(self, watcher: CompletionWatcher):
+        with self._lock:
+            watchers = self._watchers.get(watcher.tenant_id, [])
+            if watcher in watchers:
+                watchers.remove(watcher)
+            if not watchers:
+                self._watchers.pop(watcher.tenant_id, None)
+
+    def buffer_busy(self, buffer_handle: str) -> bool:
+        """True se il buffer è coinvolto in trasferimenti non terminati"""
+        return buffer_handle in self._busy_buffers
+
+    def _execute(self, backend, transfer: DMATransferState, buffer):
+        """Eseguito dal worker del canale"""
+        transfer.status = DMA_RUNNING
+        t0 = time.perf_counter()
+        try:
+            transferred = backend.transfer(transfer.direction, buffer, transfer.length, transfer.timeout)
+        except TimeoutError as e:
+            self._finish(transfer, DMA_TIMEOUT, error=str(e) or "DMA transfer timed out")
+        except Exception as e:
+            logger.error(f"DMA transfer {transfer.transfer_id} failed: {e}")
+            self._finish(transfer, DMA_ERROR, error=str(e))
+        else:
+            elapsed = time.perf_counter() - t0
+            logger.debug(f"DMA transfer {transfer.transfer_id}: {transferred} bytes in {elapsed * 1e3:.2f} ms")
+            self._finish(transfer, DMA_DONE, bytes_transferred=transferred)
+
+    def _finish(self, transfer: DMATransferState, status: int, bytes_transferred: int = 0, error: str = ''):
+        transfer.bytes_transferred = bytes_transferred
+        transfer.error = error
+        transfer.completed_at = time.time()
+
+        if self._on_complete is not None:
+            try:
+                self._on_complete(transfer)
+            except Exception as e:
+                logger.error(f"DMA completion callback error: {e}")
+
+        with self._lock:
+            count = self._busy_buffers.get(transfer.buffer_handle, 0) - 1
+            if count > 0:
+                self._busy_buffers[transfer.buffer_handle] = count
+            else:
+                self._busy_buffers.pop(transfer.buffer_handle, None)
+
+            self._completed[transfer.transfer_id] = None
+            while len(self._completed) > MAX_COMPLETED_TRANSFERS:
+                expired, _ = self._completed.popitem(last=False)
+                self._transfers.pop(expired, None)
+            watchers = list(self._watchers.get(transfer.tenant_id, ()))
+
+        # Lo stato finale per ultimo: chi lo vede trova buffer già aggiornato e contatori rilasciati
+        transfer.status = status
+        transfer.done.set()
+        for watcher in watchers:
+            watcher._push(transfer)
@@ -1,273 +1,1208 @@
 import socket
-import struct
 import os
+import sys
 import threading
 import time
-from typing import Dict, Tuple, Any
+import selectors
+import struct
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
 import logging
+import numpy as np
+
+# Codec condiviso con il client
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Proto'))
+from fast_mmio_protocol import (
+    PROTOCOL_VERSION, MAX_SLOTS, FrameReader, FrameWriter, ProtocolError, decode_handle,
+    OP_HELLO, OP_WRITE, OP_READ, OP_WRITE_SLOT, OP_READ_SLOT, OP_WRITE_ACK,
+    OP_READ_BLOCK, OP_WRITE_BLOCK, MAX_BLOCK_WORDS, READ_BLOCK_PAYLOAD, WRITE_BLOCK_HEADER,
+    OP_BATCH_WRITE, OP_BATCH_WRITE_SLOT, OP_BIND, OP_UNBIND, OP_RING_SETUP, OP_CREDIT, OP_EXEC,
+    FLAG_ACK, FLAG_CREDITS, CREDIT_BATCH,
+    STATUS_OK, STATUS_ERROR, STATUS_BAD_REQUEST, STATUS_TIMEOUT,
+    INSN, INSN_WRITE, INSN_READ, INSN_RMW, INSN_POLL, INSN_SLEEP,
+    MAX_PROGRAM_INSNS, MAX_SLEEP_US, MAX_POLL_US, MAX_PROGRAM_US,
+    HELLO_PAYLOAD, WRITE_PAYLOAD, READ_PAYLOAD, WRITE_SLOT_PAYLOAD, READ_SLOT_PAYLOAD,
+    BIND_PAYLOAD, U16, U16_REPLY,
+)
+from fast_mmio_ring import (
+    RING_SUPPORTED, STRONG_MEMORY_ORDER, MAX_RING_ENTRIES, SERVER_WAITING, CLIENT_WAITING,
+    MMIORing, AdaptiveSpinner, ring_doorbell,
+)
+from metrics import FastPathMetrics
 
 logger = logging.getLogger(__name__)
 
+_WRITE_SIZE = WRITE_PAYLOAD.size
+_READ_SIZE = READ_PAYLOAD.size
+_WRITE_SLOT_SIZE = WRITE_SLOT_PAYLOAD.size
+_READ_SLOT_SIZE = READ_SLOT_PAYLOAD.size
+_BIND_SIZE = BIND_PAYLOAD.size
+_INSN_SIZE = INSN.size
+_READ_BLOCK_SIZE = READ_BLOCK_PAYLOAD.size
+_WRITE_BLOCK_HEADER_SIZE = WRITE_BLOCK_HEADER.size
+
+# POLL nei micro-programmi: letture consecutive, poi sleep con backoff esponenziale
+_POLL_SPIN_READS = 32
+_POLL_BACKOFF_MIN = 0.00005
+_POLL_BACKOFF_MAX = 0.001
+
+# struct ucred di SO_PEERCRED: pid, uid, gid
+_PEERCRED = struct.Struct('3i')
+
+
+def _chown_socket(path: str, uid: int, gid: int):
+    """
+    Assegna il socket al tenant. Senza root (config-dev.yaml, backend mock)
+    chown fallisce con EPERM: il socket resta del server e il tenant non può
+    connettersi, ma il server parte comunque.
+    """
+    st = os.stat(path)
+    if (st.st_uid, st.st_gid) == (uid, gid):
+        return
+    try:
+        os.chown(path, uid, gid)
+    except PermissionError as e:
+        logger.warning(f"Cannot chown {path} to {uid}:{gid} ({e}); socket stays owned by uid {st.st_uid}")
+
+
+class _MMIOSlot:
+    """MMIO già validato dal resource manager, con limiti precalcolati"""
+
+    __slots__ = ('handle', 'mmio', 'limit', 'epoch')
+
+    def __init__(self, handle: str, mmio, length: int, epoch: int):
+        self.handle = handle
+        self.mmio = mmio
+        self.limit = length - 4   # Ultimo offset valido per un accesso a 32 bit
+        self.epoch = epoch
+
+
+class _Listener:
+    """Socket di ascolto di un tenant (<socket_dir>/<tenant>_mmio.sock)"""
+
+    __slots__ = ('tenant_id', 'path', 'sock', 'connections', 'shard', 'thread')
+
+    def __init__(self, tenant_id: str, path: str, sock):
+        self.tenant_id = tenant_id
+        self.path = path
+        self.sock = sock
+        # Connessioni aperte, chiuse da remove_tenant()
+        self.connections = set()
+        # Shard che serve il tenant (modalità event_loop) o thread di accept (threaded)
+        self.shard = None
+        self.thread = None
+
+
+class _ClientState:
+    """Stato di una connessione fast-path (buffer preallocati + tenant del socket)"""
+
+    __slots__ = ('sock', 'listener', 'reader', 'writer', 'tenant_id', 'events', 'slots',
+                 'ring', 'credit_flow', 'owed_credits', 'busy', 'shard', 'op_metrics',
+                 'tenant_metrics')
+
+    def __init__(self, sock, listener: _Listener):
+        self.sock = sock
+        self.listener = listener
+        self.reader = FrameReader()
+        self.writer = FrameWriter()
+        # Il tenant è quello del socket (verificato con SO_PEERCRED), attivo dopo l'HELLO
+        self.tenant_id = None
+        # Eventi registrati sul selector dello shard (0 = socket fuori dal selector)
+        self.events = 0
+        # Tabella slot per-connessione (indice = slot restituito da BIND)
+        self.slots = []
+        # _RingSession se il client ha richiesto il trasporto a ring
+        self.ring = None
+        # Crediti delle scritture fire-and-forget ancora da restituire (FLAG_CREDITS)
+        self.credit_flow = False
+        self.owed_credits = 0
+        # True mentre un micro-programma gira fuori dall'event loop: lo shard
+        # smette di leggere il socket e i frame successivi restano nel kernel
+        self.busy = False
+        # Shard proprietario (solo modalità event_loop)
+        self.shard = None
+        # Metriche del tenant, assegnate dopo l'HELLO (opcode -> OpMetrics)
+        self.op_metrics = None
+        self.tenant_metrics = None
+
+
+class _RingSession:
+    """Ring condivisi di una connessione + doorbell + thread consumatore"""
+
+    __slots__ = ('ring', 'sq_bell', 'cq_bell', 'thread')
+
+    def __init__(self, ring: MMIORing, sq_bell: int, cq_bell: int):
+        self.ring = ring
+        self.sq_bell = sq_bell    # client -> server
+        self.cq_bell = cq_bell    # server -> client
+        self.thread = None
+
+
+class _EventLoopShard:
+    """
+    Event loop single-thread basato su selectors (epoll su Linux).
+    Serve i socket dei tenant assegnati a questo shard e tutte le loro
+    connessioni: il traffico di un tenant non passa mai da altri shard.
+    """
+
+    def __init__(self, server, index: int):
+        self.server = server
+        self.index = index
+        self.selector = selectors.DefaultSelector()
+        self._pending = deque()
+        self._completions = deque()
+        # Connessioni fuori dal selector (micro-programma in corso, niente da inviare)
+        self._paused = set()
+        # socketpair per svegliare il loop (listener aggiunti/rimossi, micro-programmi)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self._run,
+            name=f"FastMMIOShard-{self.index}",
+            daemon=True
+        )
+        self.thread.start()
+
+    def add_listener(self, listener: _Listener):
+        """Assegna il socket di un tenant a questo shard (thread-safe)"""
+        listener.shard = self
+        self._pending.append((listener, True))
+        self._wake()
+
+    def remove_listener(self, listener: _Listener):
+        """Chiude il socket di un tenant e le sue connessioni (thread-safe)"""
+        self._pending.append((listener, False))
+        self._wake()
+
+    def post_program_result(self, state, tag: int, outcome):
+        """Consegna l'esito di un micro-programma eseguito fuori dal loop (thread-safe)"""
+        self._completions.append((state, tag, outcome))
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b'\x00')
+        except BlockingIOError:
+            pass  # Il loop è già stato svegliato
+        except OSError:
+            pass  # Loop terminato con stop(): _close_all ha già chiuso tutto
+
+    def _run(self):
+        while self.server.running:
+            try:
+                events = self.selector.select(timeout=1.0)
+            except OSError:
+                break
+
+            for key, mask in events:
+                if key.data is None:
+                    self._drain_wakeup()
+                elif key.data.__class__ is _Listener:
+                    self._accept(key.data)
+                else:
+                    state = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._on_readable(state)
+                    if mask & selectors.EVENT_WRITE and state.sock.fileno() != -1:
+                        self._flush(state)
+
+        self._close_all()
+
+    def _drain_wakeup(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        while self._pending:
+            listener, add = self._pending.popleft()
+            if add:
+                listener.sock.setblocking(False)
+                self.selector.register(listener.sock, selectors.EVENT_READ, listener)
+                continue
+
+            try:
+                self.selector.unregister(listener.sock)
+            except (KeyError, ValueError):
+                pass
+            listener.sock.close()
+            for state in self._connections():
+                if state.listener is listener:
+                    self._close(state)
+
+        while self._completions:
+            state, tag, (status, executed, results) = self._completions.popleft()
+            if state.sock.fileno() == -1:
+                continue  # Connessione chiusa durante l'esecuzione
+
+            state.writer.program_reply(OP_EXEC, status, tag, executed, results)
+            state.busy = False
+
+            # Riprende i frame arrivati nel frattempo; _flush riarma EVENT_READ
+            if not self.server._process_frames(state):
+                self._flush(state)
+                self._close(state)
+                continue
+            self._flush(state)
+
+    def _accept(self, listener: _Listener):
+        """Accept non bloccante: le connessioni restano su questo shard"""
+        while True:
+            try:
+                conn, _ = listener.sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                if self.server.running:
+                    logger.error(f"Accept error on {listener.path}: {e}")
+                return
+
+            if not self.server._peer_allowed(listener, conn):
+                conn.close()
+                continue
+
+            conn.setblocking(False)
+            state = _ClientState(conn, listener)
+            state.shard = self
+            listener.connections.add(conn)
+            self._set_events(state, selectors.EVENT_READ)
+
+    def _on_readable(self, state):
+        try:
+            received = state.reader.recv_from(state.sock)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            logger.debug(f"Shard {self.index} recv error: {e}")
+            self._close(state)
+            return
+        except ProtocolError as e:
+            logger.warning(f"Fast MMIO protocol error: {e}")
+            self._close(state)
+            return
+
+        if not received:
+            self._close(state)
+            return
+
+        if not self.server._process_frames(state):
+            self._flush(state)
+            self._close(state)
+            return
+
+        if state.writer.end:
+            self._flush(state)
+        elif state.busy:
+            # Micro-programma fuori dallo shard: il socket non viene più letto
+            self._set_events(state, 0)
+
+    def _flush(self, state):
+        try:
+            t0 = time.perf_counter_ns()
+            drained = state.writer.flush_nonblocking(state.sock)
+            if state.tenant_metrics is not None:
+                state.tenant_metrics.send.record(time.perf_counter_ns() - t0)
+        except OSError as e:
+            logger.debug(f"Shard {self.index} send error: {e}")
+            self._close(state)
+            return
+
+        # EVENT_WRITE solo se restano dati da inviare, EVENT_READ solo se la
+        # connessione non attende un micro-programma
+        self._set_events(state, (0 if state.busy else selectors.EVENT_READ)
+                         | (0 if drained else selectors.EVENT_WRITE))
+
+    def _set_events(self, state, events: int):
+        """Aggiorna gli eventi del socket sul selector (0 = lo toglie dal selector)"""
+        if events == state.events:
+            return
+        if not events:
+            self.selector.unregister(state.sock)
+            self._paused.add(state)
+        elif not state.events:
+            self.selector.register(state.sock, events, state)
+            self._paused.discard(state)
+        else:
+            self.selector.modify(state.sock, events, state)
+        state.events = events
+
+    def _connections(self):
+        """Connessioni dello shard, anche quelle fuori dal selector"""
+        states = [key.data for key in self.selector.get_map().values()
+                  if key.data.__class__ is _ClientState]
+        return states + list(self._paused)
+
+    def _close(self, state):
+        if state.sock.fileno() == -1:
+            return
+        if state.events:
+            try:
+                self.selector.unregister(state.sock)
+            except (KeyError, ValueError):
+                pass
+        state.events = 0
+        self._paused.discard(state)
+        self.server._close_ring(state)
+        state.listener.connections.discard(state.sock)
+        state.sock.close()
+
+    def _close_all(self):
+        for state in self._connections():
+            self._close(state)
+        for key in list(self.selector.get_map().values()):
+            if key.data.__class__ is _Listener:
+                key.data.sock.close()
+        self.selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+
 class UltraFastMMIOServer:
-    """Server MMIO veloce con cache per skip verifiche ripetute"""
-    
-    def __init__(self, resource_manager, tenant_manager):
+    """
+    Server MMIO veloce con cache per skip verifiche ripetute.
+
+    Ogni tenant ha il proprio socket in socket_dir, con permessi 0600 e
+    proprietario uid/gid del tenant come i socket gRPC: il tenant si ricava dal
+    socket e le credenziali del peer (SO_PEERCRED) devono coincidere con la sua
+    configurazione, quindi non serve alcun token.
+
+    Gli handle validati dal resource manager vengono memorizzati insieme al
+    suo mmio_epoch: quando il resource manager rimuove un MMIO o rilascia una
+    PR zone l'epoch cambia e ogni slot viene rivalidato al primo accesso.
+    """
+
+    def __init__(self, resource_manager, tenant_manager,
+                 socket_dir: str = "/var/run/pynq",
+                 mode: str = 'threaded', num_shards: int = 1,
+                 ring_enabled: Optional[bool] = None):
+        """
+        Args:
+            mode: 'threaded' (un thread per connessione) oppure
+                  'event_loop' (selectors/epoll, nessun thread per connessione)
+            num_shards: numero di event loop in modalità 'event_loop';
+                        i tenant sono assegnati agli shard a rotazione
+            ring_enabled: accetta OP_RING_SETUP (default: solo su CPU con
+                          ordinamento forte, vedi fast_mmio_ring)
+        """
+        if mode not in ('threaded', 'event_loop'):
+            raise ValueError(f"Unknown fast MMIO server mode: {mode}")
+
         self.resource_manager = resource_manager
         self.tenant_manager = tenant_manager
-        self.socket_path = "/var/run/pynq/mmio_fast.sock"
+        self.socket_dir = socket_dir
+        self.mode = mode
+        self.num_shards = max(1, num_shards)
+        self.ring_enabled = STRONG_MEMORY_ORDER if ring_enabled is None else ring_enabled
         self.running = False
-        
-        # Cache token -> tenant_id per auth veloce
-        self._auth_tokens: Dict[bytes, str] = {}
-        
-        # CACHE: (handle_str, tenant_id) -> mmio_object
-        # Per skip verifiche su handle già validati
-        self._mmio_cache: Dict[Tuple[str, str], Any] = {}
+        self._shards = []
+        self._shard_rr = itertools.cycle(range(self.num_shards))
+
+        # tenant_id -> _Listener
+        self._listeners: Dict[str, _Listener] = {}
+        self._listeners_lock = threading.Lock()
+
+        # CACHE: (handle_bytes, tenant_id) -> _MMIOSlot
+        # Per skip verifiche su handle già validati (chiave = handle grezzo, senza decode)
+        self._mmio_cache: Dict[Tuple[bytes, str], _MMIOSlot] = {}
         self._cache_lock = threading.RLock()
-        
+
+        # Micro-programmi con POLL/SLEEP in modalità event_loop: girano qui
+        # per non bloccare lo shard (in modalità threaded girano inline)
+        self._exec_pool: Optional[ThreadPoolExecutor] = None
+
+        # Latenze per fase e contatori per opcode/tenant (vedi metrics.py)
+        self.metrics = FastPathMetrics()
+
+    def socket_path_for(self, tenant_id: str) -> str:
+        return os.path.join(self.socket_dir, f"{tenant_id}_mmio.sock")
+
     def start(self):
-        """Avvia server ultra-veloce"""
-        if os.path.exists(self.socket_path):
-            os.unlink(self.socket_path)
-        
-        self.server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.server_sock.bind(self.socket_path)
-        self.server_sock.listen(10)
-        os.chmod(self.socket_path, 0o666)
-        
+        """Avvia server ultra-veloce con un socket per ogni tenant configurato"""
         self.running = True
-        self.accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
-        self.accept_thread.start()
-        
-        logger.info(f"Ultra-fast MMIO server started on {self.socket_path}")
-    
-    def _accept_loop(self):
-        """Loop di accept connessioni"""
-        while self.running:
+
+        if self.mode == 'event_loop':
+            self._exec_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="FastMMIOExec")
+            self._shards = [_EventLoopShard(self, i) for i in range(self.num_shards)]
+            for shard in self._shards:
+                shard.start()
+
+        for tenant_id in list(self.tenant_manager.config):
+            self.add_tenant(tenant_id)
+
+        logger.info(f"Ultra-fast MMIO server started in {self.socket_dir} "
+                    f"(mode={self.mode}, shards={len(self._shards) or '-'}, "
+                    f"ring={'on' if self.ring_enabled else 'off'}, tenants={len(self._listeners)})")
+
+    def add_tenant(self, tenant_id: str):
+        """Crea il socket fast-path di un tenant"""
+        tenant_config = self.tenant_manager.config[tenant_id]
+
+        with self._listeners_lock:
+            if tenant_id in self._listeners:
+                raise Exception(f"Fast MMIO socket for {tenant_id} already exists")
+
+            socket_path = self.socket_path_for(tenant_id)
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(socket_path)
+            os.chmod(socket_path, 0o600)
+            _chown_socket(socket_path, tenant_config.uid, tenant_config.gid)
+            sock.listen(10)
+
+            listener = _Listener(tenant_id, socket_path, sock)
+            self._listeners[tenant_id] = listener
+
+        if self.mode == 'event_loop':
+            self._shards[next(self._shard_rr)].add_listener(listener)
+        else:
+            listener.thread = threading.Thread(
+                target=self._accept_loop,
+                args=(listener,),
+                name=f"FastMMIOAccept-{tenant_id}",
+                daemon=True
+            )
+            listener.thread.start()
+
+        logger.info(f"Fast MMIO socket for {tenant_id} on {socket_path}")
+
+    def update_tenant(self, tenant_id: str):
+        """Riallinea il proprietario del socket dopo una modifica di uid/gid"""
+        listener = self._listeners.get(tenant_id)
+        if listener is None:
+            return
+        tenant_config = self.tenant_manager.config[tenant_id]
+        _chown_socket(listener.path, tenant_config.uid, tenant_config.gid)
+
+    def remove_tenant(self, tenant_id: str):
+        """Chiude il socket di un tenant e tutte le sue connessioni"""
+        with self._listeners_lock:
+            listener = self._listeners.pop(tenant_id, None)
+        if listener is None:
+            return
+
+        if os.path.exists(listener.path):
+            os.unlink(listener.path)
+
+        if listener.shard is not None:
+            listener.shard.remove_listener(listener)
+        else:
+            self._shutdown(listener.sock)
+            listener.sock.close()
+            # Le connessioni escono dal recv e si chiudono nel proprio thread
+            for conn in list(listener.connections):
+                self._shutdown(conn)
+
+        logger.info(f"Fast MMIO socket for {tenant_id} removed")
+
+    @staticmethod
+    def _shutdown(sock):
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _peer_allowed(self, listener: _Listener, conn) -> bool:
+        """Il processo connesso deve avere uid/gid del tenant proprietario del socket"""
+        try:
+            pid, uid, gid = _PEERCRED.unpack(
+                conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size))
+        except OSError as e:
+            logger.warning(f"Cannot read peer credentials on {listener.path}: {e}")
+            return False
+
+        tenant_config = self.tenant_manager.config.get(listener.tenant_id)
+        if tenant_config is None or uid != tenant_config.uid or gid != tenant_config.gid:
+            logger.warning(f"Fast MMIO connection rejected for {listener.tenant_id}: "
+                           f"pid={pid} uid={uid} gid={gid}")
+            return False
+        return True
+
+    def _accept_loop(self, listener: _Listener):
+        """Loop di accept connessioni di un tenant"""
+        while self.running and listener.sock.fileno() != -1:
             try:
-                conn, _ = self.server_sock.accept()
-                threading.Thread(
-                    target=self._handle_client,
-                    args=(conn,),
-                    daemon=True
-                ).start()
+                conn, _ = listener.sock.accept()
             except Exception as e:
-                if self.running:
-                    logger.error(f"Accept error: {e}")
-    
-    def _handle_client(self, conn):
+                if self.running and self._listeners.get(listener.tenant_id) is listener:
+                    logger.error(f"Accept error on {listener.path}: {e}")
+                    continue
+                return
+
+            if not self._peer_allowed(listener, conn):
+                conn.close()
+                continue
+
+            listener.connections.add(conn)
+            threading.Thread(
+                target=self._handle_client,
+                args=(conn, listener),
+                daemon=True
+            ).start()
+
+    def _handle_client(self, conn, listener: _Listener):
         """Gestisce client con cache per performance ottimali"""
-        tenant_id = None
-        
+        state = _ClientState(conn, listener)
+
         try:
-            # 1. AUTH (una volta per connessione)
-            auth_token = conn.recv(16)
-            if auth_token not in self._auth_tokens:
-                conn.send(b'\x00')
-                conn.close()
-                return
-            
-            tenant_id = self._auth_tokens[auth_token]
-            conn.send(b'\x01')
-            
-            # 2. OPERATION LOOP
             while True:
-                op_byte = conn.recv(1)
-                if not op_byte:
+                if not state.reader.recv_from(conn):
                     break
-                
-                op = op_byte[0]
-                
-                if op == 0x01:  # WRITE
-                    data = conn.recv(40)
-                    if len(data) != 40:
-                        break
-                    
-                    handle_str = data[:32].decode().strip()
-                    offset, value = struct.unpack('!II', data[32:])
-                    
-                    # Check cache
-                    cache_key = (handle_str, tenant_id)
-                    
-                    # Fast path - no lock needed for read
-                    mmio_obj = self._mmio_cache.get(cache_key)
-                    
-                    if mmio_obj is not None:
-                        # Cache hit! Skip all checks
-                        try:
-                            mmio_obj.write(offset, value)
-                        except:
-                            # Se fallisce, invalida cache
-                            with self._cache_lock:
-                                self._mmio_cache.pop(cache_key, None)
+
+                keep_open = self._process_frames(state)
+                # Tutte le risposte dei frame ricevuti partono con un solo send
+                if state.writer.end:
+                    t0 = time.perf_counter_ns()
+                    state.writer.flush_blocking(conn)
+                    if state.tenant_metrics is not None:
+                        state.tenant_metrics.send.record(time.perf_counter_ns() - t0)
+                if not keep_open:
+                    break
+
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        except Exception as e:
+            logger.error(f"Client error: {e}")
+        finally:
+            self._close_ring(state)
+            listener.connections.discard(conn)
+            conn.close()
+
+    def _process_frames(self, state) -> bool:
+        """
+        Esegue tutti i frame completi presenti nel buffer di ricezione,
+        accodando le risposte nel buffer di invio. I frame incompleti
+        restano nel buffer fino al prossimo recv. Se qualche scrittura è
+        riuscita, la versione dei buffer del tenant avanza una volta sola
+        (vedi touch_tenant_buffers), prima che le risposte partano.
+
+        Returns:
+            False se la connessione va chiusa
+        """
+        reader = state.reader
+        writer = state.writer
+        buf = reader.buf
+        clock = time.perf_counter_ns
+
+        if state.busy:
+            return True
+
+        wrote = False
+        try:
+            payload = reader.next_frame()
+            while payload >= 0:
+                # Fasi: t0 -> decode -> lookup (handle/slot) -> hw -> accodamento risposta
+                t0 = t_decoded = t_resolved = clock()
+                op = reader.op
+                length = reader.length
+                tenant_id = state.tenant_id
+                op_metrics = state.op_metrics
+                ok = True
+
+                if tenant_id is None:
+                    # 1. HELLO: versione e flag (il tenant è già verificato all'accept)
+                    if (op != OP_HELLO or length != HELLO_PAYLOAD.size
+                            or HELLO_PAYLOAD.unpack_from(buf, payload)[0] != PROTOCOL_VERSION):
+                        writer.u16(OP_HELLO, STATUS_BAD_REQUEST, reader.tag, PROTOCOL_VERSION)
+                        return False
+
+                    tenant_id = state.tenant_id = state.listener.tenant_id
+                    state.credit_flow = bool(reader.flags & FLAG_CREDITS)
+                    state.op_metrics = {}
+                    state.tenant_metrics = self.metrics.tenant(tenant_id)
+                    writer.u16(OP_HELLO, STATUS_OK, reader.tag, PROTOCOL_VERSION)
+
+                # 2. OPERAZIONI
+                elif op == OP_WRITE and length == _WRITE_SIZE:
+                    handle, offset, value = WRITE_PAYLOAD.unpack_from(buf, payload)
+                    t_decoded = clock()
+                    slot = self._handle_slot(tenant_id, handle)
+                    t_resolved = clock()
+                    ok = slot is not None and self._slot_write(tenant_id, slot, offset, value)
+                    wrote |= ok
+                    if state.credit_flow:
+                        self._return_credit(state)
+
+                elif op == OP_READ and length == _READ_SIZE:
+                    handle, offset = READ_PAYLOAD.unpack_from(buf, payload)
+                    t_decoded = clock()
+                    slot = self._handle_slot(tenant_id, handle)
+                    t_resolved = clock()
+                    value = None if slot is None else self._slot_read(tenant_id, slot, offset)
+                    if value is None:
+                        ok = False
+                        writer.u32(op, STATUS_ERROR, reader.tag, 0)
                     else:
-                        # Cache miss - use resource manager
-                        try:
-                            self.resource_manager.mmio_write(
-                                tenant_id, 
-                                handle_str, 
-                                offset, 
-                                value
-                            )
-                            
-                            # Add to cache on success
-                            if handle_str in self.resource_manager._mmios:
-                                mmio_obj = self.resource_manager._mmios[handle_str]
-                                with self._cache_lock:
-                                    self._mmio_cache[cache_key] = mmio_obj
-                                    
-                        except Exception as e:
-                            # Solo log errori gravi
-                            if logger.isEnabledFor(logging.DEBUG):
-                                logger.debug(f"Write denied: {e}")
-                    
-                elif op == 0x02:  # READ
-                    data = conn.recv(36)
-                    if len(data) != 36:
-                        break
-                    
-                    handle_str = data[:32].decode().strip()
-                    offset = struct.unpack('!I', data[32:])[0]
-                    
-                    # Check cache
-                    cache_key = (handle_str, tenant_id)
-                    mmio_obj = self._mmio_cache.get(cache_key)
-                    
-                    if mmio_obj is not None:
-                        # Cache hit!
-                        try:
-                            value = mmio_obj.read(offset)
-                            conn.send(struct.pack('!I', value))
-                        except:
-                            # Fallback to resource manager
-                            with self._cache_lock:
-                                self._mmio_cache.pop(cache_key, None)
-                            conn.send(b'\x00\x00\x00\x00')
+                        writer.u32(op, STATUS_OK, reader.tag, value)
+
+                elif op == OP_WRITE_SLOT and length == _WRITE_SLOT_SIZE:
+                    index, offset, value = WRITE_SLOT_PAYLOAD.unpack_from(buf, payload)
+                    t_decoded = clock()
+                    slots = state.slots
+                    slot = slots[index] if index < len(slots) else None
+                    t_resolved = clock()
+                    ok = slot is not None and self._slot_write(tenant_id, slot, offset, value)
+                    wrote |= ok
+                    if reader.flags & FLAG_ACK:
+                        writer.status(op, STATUS_OK if ok else STATUS_ERROR, reader.tag)
+                    elif state.credit_flow:
+                        self._return_credit(state)
+
+                elif op == OP_READ_SLOT and length == _READ_SLOT_SIZE:
+                    index, offset = READ_SLOT_PAYLOAD.unpack_from(buf, payload)
+                    t_decoded = clock()
+                    slots = state.slots
+                    slot = slots[index] if index < len(slots) else None
+                    t_resolved = clock()
+                    value = None if slot is None else self._slot_read(tenant_id, slot, offset)
+                    if value is None:
+                        ok = False
+                        writer.u32(op, STATUS_ERROR, reader.tag, 0)
                     else:
-                        # Cache miss
-                        try:
-                            value = self.resource_manager.mmio_read(
-                                tenant_id,
-                                handle_str,
-                                offset,
-                                4
-                            )
-                            conn.send(struct.pack('!I', value))
-                            
-                            # Add to cache
-                            if handle_str in self.resource_manager._mmios:
-                                mmio_obj = self.resource_manager._mmios[handle_str]
-                                with self._cache_lock:
-                                    self._mmio_cache[cache_key] = mmio_obj
-                                    
-                        except Exception as e:
-                            conn.send(b'\x00\x00\x00\x00')
-                
-                elif op == 0x06:  # WRITE_WITH_ACK
-                    data = conn.recv(40)
-                    if len(data) != 40:
-                        break
-                    
-                    handle_str = data[:32].decode().strip()
-                    offset, value = struct.unpack('!II', data[32:])
-                    
-                    # Check cache
-                    cache_key = (handle_str, tenant_id)
-                    mmio_obj = self._mmio_cache.get(cache_key)
-                    
-                    if mmio_obj is not None:
-                        # Cache hit
-                        try:
-                            mmio_obj.write(offset, value)
-                            conn.send(b'\x01')
-                        except:
-                            with self._cache_lock:
-                                self._mmio_cache.pop(cache_key, None)
-                            conn.send(b'\x00')
+                        writer.u32(op, STATUS_OK, reader.tag, value)
+
+                elif op == OP_READ_BLOCK and length == _READ_BLOCK_SIZE:
+                    index, offset, count = READ_BLOCK_PAYLOAD.unpack_from(buf, payload)
+                    t_decoded = clock()
+                    slots = state.slots
+                    slot = slots[index] if index < len(slots) else None
+                    words = None if slot is None else self._slot_block(tenant_id, slot, offset, count)
+                    t_resolved = clock()
+                    if words is None:
+                        ok = False
+                        writer.status(op, STATUS_ERROR, reader.tag)
                     else:
-                        # Cache miss
+                        writer.block_reply(op, STATUS_OK, reader.tag, words)
+
+                elif (op == OP_WRITE_BLOCK and length > _WRITE_BLOCK_HEADER_SIZE
+                        and (length - _WRITE_BLOCK_HEADER_SIZE) % 4 == 0):
+                    index, offset = WRITE_BLOCK_HEADER.unpack_from(buf, payload)
+                    count = (length - _WRITE_BLOCK_HEADER_SIZE) >> 2
+                    t_decoded = clock()
+                    slots = state.slots
+                    slot = slots[index] if index < len(slots) else None
+                    target = None if slot is None else self._slot_block(tenant_id, slot, offset, count)
+                    t_resolved = clock()
+                    ok = False
+                    if target is not None:
                         try:
-                            self.resource_manager.mmio_write(
-                                tenant_id,
-                                handle_str,
-                                offset,
-                                value
-                            )
-                            conn.send(b'\x01')
-                            
-                            # Add to cache
-                            if handle_str in self.resource_manager._mmios:
-                                mmio_obj = self.resource_manager._mmios[handle_str]
-                                with self._cache_lock:
-                                    self._mmio_cache[cache_key] = mmio_obj
-                                    
+                            target[:] = np.frombuffer(buf, dtype='<u4', count=count,
+                                                      offset=payload + _WRITE_BLOCK_HEADER_SIZE)
+                            ok = True
                         except Exception as e:
-                            conn.send(b'\x00')
-                        
-                elif op == 0x10:  # BATCH_WRITE
-                    count_data = conn.recv(2)
-                    count = struct.unpack('!H', count_data)[0]
-                    
+                            logger.debug(f"Block write failed on {slot.handle}: {e}")
+                    wrote |= ok
+                    writer.status(op, STATUS_OK if ok else STATUS_ERROR, reader.tag)
+
+                elif op == OP_WRITE_ACK and length == _WRITE_SIZE:
+                    handle, offset, value = WRITE_PAYLOAD.unpack_from(buf, payload)
+                    t_decoded = clock()
+                    slot = self._handle_slot(tenant_id, handle)
+                    t_resolved = clock()
+                    ok = slot is not None and self._slot_write(tenant_id, slot, offset, value)
+                    wrote |= ok
+                    writer.status(op, STATUS_OK if ok else STATUS_ERROR, reader.tag)
+
+                elif op == OP_BATCH_WRITE and length >= 2:
+                    count = U16.unpack_from(buf, payload)[0]
+                    if length != 2 + count * _WRITE_SIZE:
+                        logger.warning(f"Malformed BATCH_WRITE from {tenant_id}, closing connection")
+                        state.tenant_metrics.protocol_errors += 1
+                        return False
+
+                    # Decode, lookup e accessi sono interlacciati: tutto conta come hw
                     success_count = 0
-                    
-                    for i in range(count):
-                        op_data = conn.recv(40)
-                        if len(op_data) != 40:
-                            break
-                            
-                        handle_str = op_data[:32].decode().strip()
-                        offset, value = struct.unpack('!II', op_data[32:])
-                        
-                        # Try cache first
-                        cache_key = (handle_str, tenant_id)
-                        mmio_obj = self._mmio_cache.get(cache_key)
-                        
-                        if mmio_obj is not None:
-                            try:
-                                mmio_obj.write(offset, value)
-                                success_count += 1
-                                continue
-                            except:
-                                with self._cache_lock:
-                                    self._mmio_cache.pop(cache_key, None)
-                        
-                        # Fallback to resource manager
-                        try:
-                            self.resource_manager.mmio_write(
-                                tenant_id,
-                                handle_str,
-                                offset,
-                                value
-                            )
+                    item = payload + 2
+                    for _ in range(count):
+                        handle, offset, value = WRITE_PAYLOAD.unpack_from(buf, item)
+                        if self._do_write(tenant_id, handle, offset, value):
+                            success_count += 1
+                        item += _WRITE_SIZE
+
+                    ok = success_count == count
+                    wrote |= success_count > 0
+                    writer.u16(op, STATUS_OK, reader.tag, success_count)
+
+                elif op == OP_BATCH_WRITE_SLOT and length >= 2:
+                    count = U16.unpack_from(buf, payload)[0]
+                    if length != 2 + count * _WRITE_SLOT_SIZE:
+                        logger.warning(f"Malformed BATCH_WRITE_SLOT from {tenant_id}, closing connection")
+                        state.tenant_metrics.protocol_errors += 1
+                        return False
+
+                    slots = state.slots
+                    num_slots = len(slots)
+                    success_count = 0
+                    item = payload + 2
+                    for _ in range(count):
+                        index, offset, value = WRITE_SLOT_PAYLOAD.unpack_from(buf, item)
+                        slot = slots[index] if index < num_slots else None
+                        if slot is not None and self._slot_write(tenant_id, slot, offset, value):
                             success_count += 1
-                            
-                            # Try to cache
-                            if handle_str in self.resource_manager._mmios:
-                                mmio_obj = self.resource_manager._mmios[handle_str]
-                                with self._cache_lock:
-                                    self._mmio_cache[cache_key] = mmio_obj
-                        except:
-                            pass
-                    
-                    conn.send(struct.pack('!H', success_count))
-        
+                        item += _WRITE_SLOT_SIZE
+
+                    ok = success_count == count
+                    wrote |= success_count > 0
+                    writer.u16(op, STATUS_OK, reader.tag, success_count)
+
+                elif op == OP_BIND and length == _BIND_SIZE:
+                    handle = BIND_PAYLOAD.unpack_from(buf, payload)[0]
+                    t_decoded = clock()
+                    index = self._bind_slot(state, handle)
+                    t_resolved = clock()
+                    if index < 0:
+                        ok = False
+                        writer.u16(op, STATUS_ERROR, reader.tag, 0)
+                    else:
+                        writer.u16(op, STATUS_OK, reader.tag, index)
+
+                elif op == OP_EXEC and length >= 2:
+                    count = U16.unpack_from(buf, payload)[0]
+                    if count > MAX_PROGRAM_INSNS or length != 2 + count * _INSN_SIZE:
+                        logger.warning(f"Malformed EXEC from {tenant_id}, closing connection")
+                        state.tenant_metrics.protocol_errors += 1
+                        return False
+
+                    program = [INSN.unpack_from(buf, payload + 2 + i * _INSN_SIZE)
+                               for i in range(count)]
+                    t_decoded = t_resolved = clock()
+
+                    if self._exec_pool is not None and self._program_blocks(program):
+                        # Fuori dallo shard; lo shard smette di leggere la connessione
+                        # fino all'esito (le metriche le registra _run_program_offloaded)
+                        state.busy = True
+                        self._exec_pool.submit(self._run_program_offloaded, state,
+                                               reader.tag, program, t_decoded - t0)
+                        return True
+
+                    status, executed, results = self._run_program(tenant_id, state.slots, program)
+                    ok = status == STATUS_OK
+                    writer.program_reply(op, status, reader.tag, executed, results)
+
+                elif op == OP_RING_SETUP and length == 2:
+                    entries = U16.unpack_from(buf, payload)[0]
+                    if not self._setup_ring(state, entries, reader.tag):
+                        ok = False
+                        writer.u16(op, STATUS_ERROR, reader.tag, 0)
+
+                elif op == OP_UNBIND and length == 2:
+                    index = U16.unpack_from(buf, payload)[0]
+                    slots = state.slots
+                    if index < len(slots) and slots[index] is not None:
+                        slots[index] = None
+                        writer.status(op, STATUS_OK, reader.tag)
+                    else:
+                        ok = False
+                        writer.status(op, STATUS_ERROR, reader.tag)
+
+                else:
+                    # Opcode sconosciuto o lunghezza errata: lo stream non è più affidabile
+                    logger.warning(f"Invalid fast MMIO frame op=0x{op:02x} len={length} "
+                                   f"from {tenant_id}, closing connection")
+                    state.tenant_metrics.protocol_errors += 1
+                    return False
+
+                if op_metrics is not None:
+                    metrics = op_metrics.get(op)
+                    if metrics is None:
+                        metrics = op_metrics[op] = self.metrics.op(op, tenant_id)
+                    metrics.record(t_decoded - t0, t_resolved - t_decoded, clock() - t_resolved, ok)
+
+                payload = reader.next_frame()
+
+            return True
+
+        except ProtocolError as e:
+            logger.warning(f"Fast MMIO protocol error: {e}")
+            if state.tenant_metrics is not None:
+                state.tenant_metrics.protocol_errors += 1
+            return False
+
+        finally:
+            if wrote:
+                self.resource_manager.touch_tenant_buffers(state.tenant_id)
+
+    def _return_credit(self, state):
+        """Conta una scrittura senza risposta; i crediti tornano al client a blocchi"""
+        state.owed_credits += 1
+        if state.owed_credits >= CREDIT_BATCH:
+            state.writer.u16(OP_CREDIT, STATUS_OK, 0, state.owed_credits)
+            state.owed_credits = 0
+
+    def _bind(self, tenant_id: str, handle_str: str) -> Optional[_MMIOSlot]:
+        """Valida un handle tramite il resource manager (ownership, zone, limiti)"""
+        try:
+            mmio, length, epoch = self.resource_manager.bind_mmio(tenant_id, handle_str)
         except Exception as e:
-            logger.error(f"Client error: {e}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Bind denied: {e}")
+            return None
+        return _MMIOSlot(handle_str, mmio, length, epoch)
+
+    def _bind_slot(self, state, handle: bytes) -> int:
+        """BIND: assegna uno slot della connessione. Ritorna -1 se negato"""
+        slot = self._bind(state.tenant_id, decode_handle(handle))
+        if slot is None:
+            return -1
+
+        slots = state.slots
+        try:
+            index = slots.index(None)
+        except ValueError:
+            index = len(slots)
+            if index >= MAX_SLOTS:
+                return -1
+            slots.append(None)
+
+        slots[index] = slot
+        return index
+
+    def _revalidate(self, tenant_id: str, slot: _MMIOSlot) -> bool:
+        """Rivalida uno slot dopo un cambio di mmio_epoch; se negato lo slot resta revocato"""
+        tenant_metrics = self.metrics.tenant(tenant_id)
+        tenant_metrics.revalidations += 1
+        try:
+            slot.mmio, length, slot.epoch = self.resource_manager.bind_mmio(tenant_id, slot.handle)
+            slot.limit = length - 4
+            return True
+        except Exception as e:
+            logger.debug(f"Slot for {slot.handle} revoked: {e}")
+            tenant_metrics.revocations += 1
+            slot.mmio = None
+            slot.limit = -1
+            slot.epoch = self.resource_manager.mmio_epoch
+            return False
+
+    def _slot_write(self, tenant_id: str, slot: _MMIOSlot, offset: int, value: int) -> bool:
+        if slot.epoch != self.resource_manager.mmio_epoch and not self._revalidate(tenant_id, slot):
+            return False
+        # offset e value arrivano come u32 dal wire: basta il limite superiore
+        if offset > slot.limit:
+            return False
+        try:
+            slot.mmio.write(offset, value)
+            return True
+        except Exception as e:
+            logger.debug(f"Write failed on {slot.handle}: {e}")
+            return False
+
+    def _slot_read(self, tenant_id: str, slot: _MMIOSlot, offset: int) -> Optional[int]:
+        if slot.epoch != self.resource_manager.mmio_epoch and not self._revalidate(tenant_id, slot):
+            return None
+        if offset > slot.limit:
+            return None
+        try:
+            return slot.mmio.read(offset)
+        except Exception as e:
+            logger.debug(f"Read failed on {slot.handle}: {e}")
+            return None
+
+    def _slot_block(self, tenant_id: str, slot: _MMIOSlot, offset: int, count: int):
+        """Slice numpy di count word sulla regione mappata, None se fuori limiti o revocato"""
+        if slot.epoch != self.resource_manager.mmio_epoch and not self._revalidate(tenant_id, slot):
+            return None
+        if offset & 3 or count == 0 or count > MAX_BLOCK_WORDS or offset + 4 * (count - 1) > slot.limit:
+            return None
+        start = offset >> 2
+        return slot.mmio.array[start:start + count]
+
+    def _handle_slot(self, tenant_id: str, handle: bytes) -> Optional[_MMIOSlot]:
+        """Slot condiviso per le operazioni che indirizzano l'MMIO con l'handle esteso"""
+        cache_key = (handle, tenant_id)
+
+        # Fast path - no lock needed for read
+        slot = self._mmio_cache.get(cache_key)
+        if slot is not None and slot.epoch == self.resource_manager.mmio_epoch:
+            self.metrics.tenant(tenant_id).cache_hits += 1
+            return slot
+
+        # Cache miss o epoch cambiato: nuovo slot (mai modificato in place,
+        # perché lo condividono i thread delle connessioni)
+        self.metrics.tenant(tenant_id).cache_misses += 1
+        slot = self._bind(tenant_id, decode_handle(handle))
+        with self._cache_lock:
+            if slot is None:
+                self._mmio_cache.pop(cache_key, None)
+            else:
+                self._mmio_cache[cache_key] = slot
+        return slot
+
+    def _do_write(self, tenant_id: str, handle: bytes, offset: int, value: int) -> bool:
+        """Esegue una WRITE indirizzata con l'handle"""
+        slot = self._handle_slot(tenant_id, handle)
+        return slot is not None and self._slot_write(tenant_id, slot, offset, value)
+
+    @staticmethod
+    def _program_blocks(program) -> bool:
+        for insn in program:
+            if insn[0] == INSN_POLL or insn[0] == INSN_SLEEP:
+                return True
+        return False
+
+    def _run_program_offloaded(self, state, tag: int, program, decode_ns: int):
+        t0 = time.perf_counter_ns()
+        try:
+            outcome = self._run_program(state.tenant_id, state.slots, program)
+        except Exception as e:
+            logger.error(f"MMIO program error for {state.tenant_id}: {e}")
+            outcome = (STATUS_ERROR, 0, [])
+        self.metrics.op(OP_EXEC, state.tenant_id).record(
+            decode_ns, 0, time.perf_counter_ns() - t0, outcome[0] == STATUS_OK)
+        state.shard.post_program_result(state, tag, outcome)
+
+    def _run_program(self, tenant_id: str, slots: List, program) -> Tuple[int, int, List[int]]:
+        """
+        Esegue un micro-programma (OP_EXEC) sugli slot della connessione.
+
+        Il programma viene validato per intero prima di toccare l'hardware
+        (istruzioni note, slot e offset validi, tempi entro i limiti).
+
+        Returns:
+            (status, istruzioni eseguite, risultati di READ/POLL)
+        """
+        results = []
+        epoch = self.resource_manager.mmio_epoch
+        budget_us = 0
+
+        for insn, index, offset, a, b, c in program:
+            if insn == INSN_SLEEP:
+                if c > MAX_SLEEP_US:
+                    return STATUS_BAD_REQUEST, 0, results
+                budget_us += c
+                continue
+
+            if insn not in (INSN_WRITE, INSN_READ, INSN_RMW, INSN_POLL):
+                return STATUS_BAD_REQUEST, 0, results
+            if insn == INSN_POLL:
+                if c > MAX_POLL_US:
+                    return STATUS_BAD_REQUEST, 0, results
+                budget_us += c
+
+            slot = slots[index] if index < len(slots) else None
+            if slot is None:
+                return STATUS_ERROR, 0, results
+            if slot.epoch != epoch and not self._revalidate(tenant_id, slot):
+                return STATUS_ERROR, 0, results
+            if offset > slot.limit:
+                return STATUS_ERROR, 0, results
+
+        if budget_us > MAX_PROGRAM_US:
+            return STATUS_BAD_REQUEST, 0, results
+
+        executed = 0
+        wrote = False
+        try:
+            for insn, index, offset, a, b, c in program:
+                if insn == INSN_SLEEP:
+                    time.sleep(c / 1e6)
+                    executed += 1
+                    continue
+
+                slot = slots[index]
+                # Revoca durante l'esecuzione (es. cleanup del tenant)
+                if slot.epoch != self.resource_manager.mmio_epoch and not self._revalidate(tenant_id, slot):
+                    return STATUS_ERROR, executed, results
+                mmio = slot.mmio
+
+                if insn == INSN_WRITE:
+                    mmio.write(offset, a)
+                    wrote = True
+                elif insn == INSN_READ:
+                    results.append(mmio.read(offset))
+                elif insn == INSN_RMW:
+                    mmio.write(offset, (mmio.read(offset) & ~a) | (b & a))
+                    wrote = True
+                else:
+                    value, matched = self._poll(tenant_id, slot, offset, a, b, c)
+                    results.append(value)
+                    if not matched:
+                        return STATUS_TIMEOUT, executed, results
+
+                executed += 1
+
+        except Exception as e:
+            logger.debug(f"MMIO program failed at instruction {executed}: {e}")
+            return STATUS_ERROR, executed, results
+
         finally:
-            conn.close()
-    
-    def register_token(self, token: str, tenant_id: str):
-        """Pre-registra token per auth veloce"""
-        token_bytes = token[:16].ljust(16, '\x00').encode()
-        self._auth_tokens[token_bytes] = tenant_id
-    
+            # Dopo i POLL: l'acceleratore avviato dal programma ha già scritto i buffer
+            if wrote:
+                self.resource_manager.touch_tenant_buffers(tenant_id)
+
+        return STATUS_OK, executed, results
+
+    def _poll(self, tenant_id: str, slot: _MMIOSlot, offset: int,
+              mask: int, expected: int, timeout_us: int) -> Tuple[int, bool]:
+        """Attende (reg & mask) == expected. Ritorna (ultimo valore, successo)"""
+        deadline = time.perf_counter() + timeout_us / 1e6
+        delay = _POLL_BACKOFF_MIN
+        reads = 0
+
+        while True:
+            value = slot.mmio.read(offset)
+            if value & mask == expected:
+                return value, True
+            if time.perf_counter() >= deadline:
+                return value, False
+
+            if slot.epoch != self.resource_manager.mmio_epoch and not self._revalidate(tenant_id, slot):
+                raise Exception(f"MMIO {slot.handle} revoked during poll")
+
+            reads += 1
+            if reads > _POLL_SPIN_READS:
+                time.sleep(delay)
+                delay = min(delay * 2, _POLL_BACKOFF_MAX)
+
+    def _setup_ring(self, state, entries: int, tag: int) -> bool:
+        """
+        RING_SETUP: crea memfd + eventfd e li passa al client (SCM_RIGHTS)
+        insieme alla risposta. Da qui le READ/WRITE su slot viaggiano sui ring.
+
+        Sullo shard di un event loop il socket resta non bloccante: se le
+        risposte precedenti non partono subito il setup viene rifiutato.
+        """
+        if (not RING_SUPPORTED or not self.ring_enabled or state.ring is not None or
+                entries == 0 or entries > MAX_RING_ENTRIES or entries & (entries - 1)):
+            return False
+
+        ring = MMIORing.create(entries)
+        sq_bell = os.eventfd(0, os.EFD_CLOEXEC)
+        cq_bell = os.eventfd(0, os.EFD_CLOEXEC)
+        session = _RingSession(ring, sq_bell, cq_bell)
+
+        sock = state.sock
+        try:
+            # Le risposte già accodate devono precedere quella con i fd
+            if state.shard is None:
+                state.writer.flush_blocking(sock)
+            elif not state.writer.flush_nonblocking(sock):
+                raise BlockingIOError("pending replies not sent")
+            reply = U16_REPLY.pack(2, OP_RING_SETUP, STATUS_OK, tag, entries)
+            socket.send_fds(sock, [reply], [ring.memfd, sq_bell, cq_bell])
+        except OSError as e:
+            logger.warning(f"Shared ring setup failed for {state.tenant_id}: {e}")
+            ring.close()
+            os.close(sq_bell)
+            os.close(cq_bell)
+            return False
+
+        state.ring = session
+        session.thread = threading.Thread(
+            target=self._ring_worker,
+            args=(state, session),
+            name=f"FastMMIORing-{state.tenant_id}",
+            daemon=True
+        )
+        session.thread.start()
+        logger.info(f"Shared ring transport enabled for {state.tenant_id} ({entries} entries)")
+        return True
+
+    def _ring_worker(self, state, session):
+        """Consumatore della submission ring di una connessione"""
+        ring = session.ring
+        spinner = AdaptiveSpinner()
+        has_work = ring.has_submission
+        tenant_id = state.tenant_id
+        slots = state.slots
+        clock = time.perf_counter_ns
+        op_metrics = {op: self.metrics.op(op, tenant_id) for op in (OP_WRITE_SLOT, OP_READ_SLOT)}
+        # Scritture eseguite dall'ultimo avanzamento della versione dei buffer
+        wrote = False
+
+        try:
+            while self.running and not ring.closed:
+                entry = ring.pop_submission()
+                if entry is None:
+                    if wrote:
+                        wrote = False
+                        self.resource_manager.touch_tenant_buffers(tenant_id)
+                    spinner.wait(has_work, ring, SERVER_WAITING, session.sq_bell, 0.1)
+                    continue
+
+                # Le entry del ring sono già decodificate: la fase decode non esiste
+                t0 = clock()
+                op, flags, tag, index, offset, value = entry
+                slot = slots[index] if index < len(slots) else None
+                t_resolved = clock()
+
+                if op == OP_WRITE_SLOT:
+                    ok = slot is not None and self._slot_write(tenant_id, slot, offset, value)
+                    op_metrics[op].record(0, t_resolved - t0, clock() - t_resolved, ok)
+                    wrote |= ok
+                    if not flags & FLAG_ACK:
+                        continue
+                    status = STATUS_OK if ok else STATUS_ERROR
+                    value = 0
+                elif op == OP_READ_SLOT:
+                    value = None if slot is None else self._slot_read(tenant_id, slot, offset)
+                    op_metrics[op].record(0, t_resolved - t0, clock() - t_resolved, value is not None)
+                    status = STATUS_ERROR if value is None else STATUS_OK
+                    value = value or 0
+                elif op == OP_BATCH_WRITE_SLOT:
+                    # Batch vuoto: barriera per fence() (la SQ è consumata in ordine)
+                    status = STATUS_OK
+                    value = 0
+                else:
+                    state.tenant_metrics.protocol_errors += 1
+                    status = STATUS_BAD_REQUEST
+                    value = 0
+
+                if wrote:
+                    # Prima della completion: il client può leggere i buffer subito dopo
+                    wrote = False
+                    self.resource_manager.touch_tenant_buffers(tenant_id)
+                while not ring.complete(tag, status, value):
+                    # CQ pieno: il client non sta consumando le completion. Si dorme
+                    # sul doorbell della SQ (il client lo suona alla prossima submit),
+                    # il timeout copre le completion consumate senza nuove richieste
+                    if ring.closed or not self.running:
+                        return
+                    spinner.wait(ring.has_completion_space, ring, SERVER_WAITING,
+                                 session.sq_bell, 0.01)
+                ring_doorbell(ring, CLIENT_WAITING, session.cq_bell)
+
+        except Exception as e:
+            logger.error(f"Ring worker error for {tenant_id}: {e}")
+
+    def _close_ring(self, state):
+        """Ferma il consumatore del ring quando la connessione di setup si chiude"""
+        session = state.ring
+        if session is None:
+            return
+        state.ring = None
+
+        session.ring.mark_closed()
+        os.eventfd_write(session.sq_bell, 1)
+        session.thread.join(timeout=1.0)
+
+        # Le risorse si chiudono solo qui, mai dal worker: evita di scrivere su fd riciclati
+        session.ring.close()
+        os.close(session.sq_bell)
+        os.close(session.cq_bell)
+
     def clear_cache(self):
         """Pulisce la cache (utile per test)"""
         with self._cache_lock:
             self._mmio_cache.clear()
-    
+
     def stop(self):
         """Ferma server"""
         self.running = False
-        if hasattr(self, 'server_sock'):
-            self.server_sock.close()
\ No newline at end of file
+        for tenant_id in list(self._listeners):
+            self.remove_tenant(tenant_id)
+        for shard in self._shards:
+            if shard.thread:
+                shard.thread.join(timeout=2)
+        self._shards = []
+        if self._exec_pool is not None:
+            self._exec_pool.shutdown(wait=False)
+            self._exec_pool = None
@@ -7,6 +7,7 @@ from typing import Dict, Any, Callable, Optional, Tuple
 from dataclasses import dataclass
 import traceback
 import os
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -430,7 +431,7 @@ class HardwareThreadManager:
                 raise ValueError(f"Read would exceed buffer bounds")
             
             # Leggi dati
-            data_bytes = buffer.tobytes()[offset:offset+length]
+            data_bytes = buffer.reshape(-1).view(np.uint8)[offset:offset+length].tobytes()
             return data_bytes
         
         return self.execute_hardware_operation(
@@ -454,12 +455,8 @@ class HardwareThreadManager:
             if offset + data_length > buffer_size:
                 raise ValueError(f"Write would exceed buffer bounds")
             
-            # Scrivi dati
-            import numpy as np
-            temp_array = np.frombuffer(data, dtype=buffer.dtype)
-            start_idx = offset // buffer.itemsize
-            end_idx = start_idx + len(temp_array)
-            buffer.flat[start_idx:end_idx] = temp_array
+            # Scrivi dati (vista a byte: offset non vincolato al dtype)
+            buffer.reshape(-1).view(np.uint8)[offset:offset + data_length] = np.frombuffer(data, dtype=np.uint8)
             buffer.flush()
         
         return self.execute_hardware_operation(
@@ -0,0 +1,118 @@
+# hypervisor/ip_descriptors.py
+"""
+Descrittori degli IP core serializzati una volta sola per PR zone e bitstream.
+
+Prima, a ogni LoadOverlay, i dizionari degli IP della zona venivano
+ricostruiti e il servicer li convertiva campo per campo in pb2.IPCore. Ora
+ogni IP viene serializzato una volta per livello di dettaglio, come voce
+della mappa ip_cores: è il campo 2 sia di LoadOverlayResponse sia di
+OverlayInfoResponse, quindi le due risposte ricevono gli IP con un solo
+MergeFromString.
+
+Livelli (GetOverlayInfoRequest.DetailLevel):
+    BASIC     nome, tipo e indirizzi
+    NORMAL    + registri
+    DETAILED  + parametri
+
+La cache va invalidata quando cambia la configurazione delle PR zone.
+"""
+
+import os
+import sys
+import logging
+import threading
+from typing import Callable, Dict, Hashable, Iterable
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Proto', 'generated'))
+import pynq_service_pb2 as pb2
+
+logger = logging.getLogger(__name__)
+
+BASIC = pb2.GetOverlayInfoRequest.BASIC
+NORMAL = pb2.GetOverlayInfoRequest.NORMAL
+DETAILED = pb2.GetOverlayInfoRequest.DETAILED
+
+DETAIL_LEVELS = (BASIC, NORMAL, DETAILED)
+
+
+class IPDescriptors:
+    """IP core di un overlay, serializzati per livello di dettaglio"""
+
+    def __init__(self, ip_cores: Dict[str, dict]):
+        """
+        Args:
+            ip_cores: nome -> dict con name, type, base_address, address_range,
+                      parameters e registers (come ritornati da load_overlay)
+        """
+        self.names = tuple(ip_cores)
+        self._entries: Dict[int, Dict[str, bytes]] = {level: {} for level in DETAIL_LEVELS}
+        for name, ip in ip_cores.items():
+            for level in DETAIL_LEVELS:
+                entry = pb2.OverlayInfoResponse(ip_cores={name: self._ip_core(ip, level)})
+                self._entries[level][name] = entry.SerializeToString()
+        self._all = {level: b''.join(entries.values()) for level, entries in self._entries.items()}
+
+    @staticmethod
+    def _ip_core(ip: dict, level: int) -> pb2.IPCore:
+        core = pb2.IPCore(
+            name=ip['name'],
+            type=ip['type'],
+            base_address=ip['base_address'],
+            address_range=ip['address_range']
+        )
+        if level >= NORMAL:
+            for reg_name, reg_info in (ip.get('registers') or {}).items():
+                core.registers[reg_name].offset = reg_info['offset']
+                core.registers[reg_name].description = reg_info.get('description', '')
+        if level >= DETAILED:
+            for key, value in (ip.get('parameters') or {}).items():
+                core.parameters[key] = str(value)
+        return core
+
+    def __len__(self):
+        return len(self.names)
+
+    def serialized(self, detail_level: int = DETAILED, ip_names: Iterable[str] = ()) -> bytes:
+        """Voci ip_cores serializzate (tutte, o solo gli IP in ip_names che esistono)"""
+        if detail_level not in self._entries:
+            detail_level = DETAILED
+        if not ip_names:
+            return self._all[detail_level]
+        entries = self._entries[detail_level]
+        return b''.join(entries[name] for name in ip_names if name in entries)
+
+
+class IPDescriptorCache:
+    """IPDescriptors per chiave (es. (zone_id, bitstream)), costruiti alla prima richiesta"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._descriptors: Dict[Hashable, IPDescriptors] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], Dict[str, dict]]) -> IPDescriptors:
+        """Descrittori di key; build() ritorna i dict degli IP se non sono in cache"""
+        with self._lock:
+            descriptors = self._descriptors.get(key)
+            if descriptors is not None:
+                self.hits += 1
+                return descriptors
+            self.misses += 1
+            generation = self._generation
+
+        descriptors = IPDescriptors(build())
+
+        with self._lock:
+            # Un'invalidazione durante la costruzione: si usano senza salvarli
+            if generation == self._generation:
+                descriptors = self._descriptors.setdefault(key, descriptors)
+        return descriptors
+
+    def invalidate(self):
+        """Scarta tutti i descrittori (configurazione delle PR zone cambiata)"""
+        with self._lock:
+            self._descriptors.clear()
+            self._generation += 1
+        logger.info("IP descriptor cache invalidated")
@@ -164,4 +164,86 @@ class ManagementServicer(pb2_grpc.PYNQManagementServiceServicer):
             status=status
         )
         
-        return pb2.GetTenantStatusResponse(info=info)
\ No newline at end of file
+        return pb2.GetTenantStatusResponse(info=info)
+
+    def GetFastPathMetrics(self, request, context):
+        """Metriche del fast path MMIO, filtrabili per tenant e opcode"""
+        fast_server = self.server.fast_mmio_server
+        if fast_server is None:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Fast MMIO server not running")
+
+        snapshot = fast_server.metrics.snapshot(
+            tenant_id=request.tenant_id or None,
+            op=request.op.upper() or None
+        )
+
+        def summary(hist):
+            return pb2.LatencySummary(
+                count=hist['count'],
+                mean_ns=hist['mean_ns'],
+                min_ns=hist['min_ns'],
+                p50_ns=hist['p50'],
+                p90_ns=hist['p90'],
+                p99_ns=hist['p99'],
+                p999_ns=hist['p999'],
+                max_ns=hist['max_ns'],
+                buckets=[
+                    pb2.HistogramBucket(upper_ns=upper, count=count)
+                    for upper, count in hist['buckets']
+                ] if request.include_buckets else []
+            )
+
+        return pb2.FastPathMetricsResponse(
+            ops=[
+                pb2.FastPathOpMetrics(
+                    op=m['op'],
+                    tenant_id=m['tenant_id'],
+                    count=m['count'],
+                    errors=m['errors'],
+                    decode=summary(m['decode']),
+                    lookup=summary(m['lookup']),
+                    hw=summary(m['hw'])
+                )
+                for m in snapshot['ops']
+            ],
+            tenants=[
+                pb2.FastPathTenantMetrics(
+                    tenant_id=t['tenant_id'],
+                    cache_hits=t['cache_hits'],
+                    cache_misses=t['cache_misses'],
+                    cache_hit_ratio=t['cache_hit_ratio'],
+                    revalidations=t['revalidations'],
+                    revocations=t['revocations'],
+                    protocol_errors=t['protocol_errors'],
+                    send=summary(t['send'])
+                )
+                for t in snapshot['tenants']
+            ],
+            window_seconds=snapshot['window_seconds']
+        )
+
+    def ResetFastPathMetrics(self, request, context):
+        """Azzera le metriche del fast path senza riavviare il server"""
+        fast_server = self.server.fast_mmio_server
+        if fast_server is None:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Fast MMIO server not running")
+
+        fast_server.metrics.reset()
+        logger.info("Fast path metrics reset")
+        return pb2.Empty()
+
+    def GetBufferPoolStats(self, request, context):
+        """Statistiche del pool dei buffer CMA"""
+        pool = getattr(self.server.resource_manager, 'buffer_pool', None)
+        if pool is None:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Buffer pool not available")
+
+        stats = pool.stats()
+        cma_free = stats['cma_free_bytes']
+        return pb2.BufferPoolStatsResponse(
+            classes=[pb2.BufferPoolClassStats(**c) for c in stats['classes']],
+            pooled_bytes=stats['pooled_bytes'],
+            max_pooled_bytes=stats['max_pooled_bytes'],
+            trims=stats['trims'],
+            cma_free_bytes=cma_free if cma_free is not None else -1
+        )
@@ -0,0 +1,322 @@
+# hypervisor/metrics.py
+"""
+Metriche del fast path MMIO (per opcode e tenant) e delle RPC gRPC (per
+metodo e tenant): contatori e istogrammi di latenza.
+
+Gli istogrammi hanno bucket fissi log-lineari (8 sotto-bucket per ogni potenza
+di due, errore relativo massimo 12.5%): registrare un campione costa un
+bit_length e un incremento di lista, senza allocazioni.
+
+Gli aggiornamenti sono senza lock: con più thread (modalità threaded, ring,
+pool dei micro-programmi) un incremento concorrente può andare perso. Le
+metriche sono quindi approssimate, ma non rallentano mai il percorso caldo.
+"""
+
+import os
+import sys
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Proto'))
+import fast_mmio_protocol
+
+# Nomi leggibili degli opcode (OP_READ_SLOT -> 'READ_SLOT')
+OP_NAMES = {value: name[3:] for name, value in vars(fast_mmio_protocol).items()
+            if name.startswith('OP_')}
+
+_SUB_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BITS          # 8 sotto-bucket per potenza di due
+_LINEAR = _SUB_BUCKETS * 2             # Valori < 16 ns hanno un bucket ciascuno
+_MAX_SHIFT = 40                        # ~18 minuti in ns, oltre si satura
+NUM_BUCKETS = _LINEAR + _MAX_SHIFT * _SUB_BUCKETS
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def bucket_index(value: int) -> int:
+    if value < _LINEAR:
+        return value if value > 0 else 0
+    shift = value.bit_length() - _SUB_BITS - 1
+    if shift > _MAX_SHIFT:
+        return NUM_BUCKETS - 1
+    return _LINEAR + (shift - 1) * _SUB_BUCKETS + (value >> shift) - _SUB_BUCKETS
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Intervallo [lower, upper] di valori che cadono nel bucket"""
+    if index < _LINEAR:
+        return index, index
+    shift = (index - _LINEAR) // _SUB_BUCKETS + 1
+    sub = (index - _LINEAR) % _SUB_BUCKETS + _SUB_BUCKETS
+    return sub << shift, ((sub + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Istogramma di latenze in nanosecondi a bucket fissi"""
+
+    __slots__ = ('counts', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.reset()
+
+    def record(self, value: int):
+        # bucket_index() inline: è il percorso caldo
+        if value < _LINEAR:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - _SUB_BITS - 1
+            index = (_LINEAR + (shift - 1) * _SUB_BUCKETS + (value >> shift) - _SUB_BUCKETS
+                     if shift <= _MAX_SHIFT else NUM_BUCKETS - 1)
+        self.counts[index] += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, pct: float, counts=None) -> int:
+        """Limite superiore del bucket che contiene il percentile (limitato al massimo osservato)"""
+        counts = counts or list(self.counts)
+        total = sum(counts)
+        if not total:
+            return 0
+        rank = max(1, int(total * pct / 100.0 + 0.5))
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def snapshot(self) -> Dict:
+        # Copia: i contatori possono cambiare mentre si calcolano i percentili
+        counts = list(self.counts)
+        count = sum(counts)
+        first = next((i for i, n in enumerate(counts) if n), 0)
+        result = {
+            'count': count,
+            'mean_ns': self.total / count if count else 0.0,
+            'min_ns': bucket_bounds(first)[0] if count else 0,
+            'max_ns': self.max,
+            'buckets': [(bucket_bounds(i)[1], n) for i, n in enumerate(counts) if n],
+        }
+        for pct in PERCENTILES:
+            result[f"p{pct:g}".replace('.', '')] = self.percentile(pct, counts)
+        return result
+
+    def reset(self):
+        counts = self.counts
+        for i in range(NUM_BUCKETS):
+            counts[i] = 0
+        self.total = 0
+        self.max = 0
+
+
+class OpMetrics:
+    """Contatori e latenze per fase di un opcode di un tenant"""
+
+    __slots__ = ('op', 'tenant_id', 'count', 'errors', 'decode', 'lookup', 'hw')
+
+    def __init__(self, op: int, tenant_id: str):
+        self.op = op
+        self.tenant_id = tenant_id
+        self.count = 0
+        self.errors = 0
+        self.decode = LatencyHistogram()
+        self.lookup = LatencyHistogram()
+        self.hw = LatencyHistogram()
+
+    def record(self, decode_ns: int, lookup_ns: int, hw_ns: int, ok: bool):
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self.decode.record(decode_ns)
+        self.lookup.record(lookup_ns)
+        self.hw.record(hw_ns)
+
+    def snapshot(self) -> Dict:
+        return {
+            'op': OP_NAMES.get(self.op, f"0x{self.op:02x}"),
+            'tenant_id': self.tenant_id,
+            'count': self.count,
+            'errors': self.errors,
+            'decode': self.decode.snapshot(),
+            'lookup': self.lookup.snapshot(),
+            'hw': self.hw.snapshot(),
+        }
+
+    def reset(self):
+        self.count = 0
+        self.errors = 0
+        self.decode.reset()
+        self.lookup.reset()
+        self.hw.reset()
+
+
+class TenantMetrics:
+    """Contatori per tenant indipendenti dall'opcode"""
+
+    __slots__ = ('tenant_id', 'cache_hits', 'cache_misses', 'revalidations',
+                 'revocations', 'protocol_errors', 'send')
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+        self.send = LatencyHistogram()
+        self.reset()
+
+    def snapshot(self) -> Dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'tenant_id': self.tenant_id,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_ratio': self.cache_hits / lookups if lookups else 0.0,
+            'revalidations': self.revalidations,
+            'revocations': self.revocations,
+            'protocol_errors': self.protocol_errors,
+            'send': self.send.snapshot(),
+        }
+
+    def reset(self):
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.revalidations = 0
+        self.revocations = 0
+        self.protocol_errors = 0
+        self.send.reset()
+
+
+class FastPathMetrics:
+    """
+    Registro delle metriche di UltraFastMMIOServer.
+
+    Le connessioni tengono un riferimento diretto ai propri OpMetrics e
+    TenantMetrics: reset() li azzera in place, così i riferimenti restano validi.
+    """
+
+    def __init__(self):
+        self._ops: Dict[Tuple[int, str], OpMetrics] = {}
+        self._tenants: Dict[str, TenantMetrics] = {}
+        self.reset_at = time.time()
+
+    def op(self, op: int, tenant_id: str) -> OpMetrics:
+        key = (op, tenant_id)
+        metrics = self._ops.get(key)
+        if metrics is None:
+            metrics = self._ops.setdefault(key, OpMetrics(op, tenant_id))
+        return metrics
+
+    def tenant(self, tenant_id: str) -> TenantMetrics:
+        metrics = self._tenants.get(tenant_id)
+        if metrics is None:
+            metrics = self._tenants.setdefault(tenant_id, TenantMetrics(tenant_id))
+        return metrics
+
+    def all(self) -> Iterable[OpMetrics]:
+        return list(self._ops.values())
+
+    def snapshot(self, tenant_id: Optional[str] = None, op: Optional[str] = None) -> Dict:
+        """
+        Args:
+            tenant_id: filtra per tenant (None = tutti)
+            op: filtra per nome opcode, es. 'READ_SLOT' (None = tutti)
+        """
+        ops = [m.snapshot() for m in list(self._ops.values())
+               if m.count and (tenant_id is None or m.tenant_id == tenant_id)
+               and (op is None or OP_NAMES.get(m.op) == op)]
+        tenants = [m.snapshot() for m in list(self._tenants.values())
+                   if tenant_id is None or m.tenant_id == tenant_id]
+        return {
+            'ops': ops,
+            'tenants': tenants,
+            'window_seconds': time.time() - self.reset_at,
+        }
+
+    def reset(self):
+        for metrics in list(self._ops.values()):
+            metrics.reset()
+        for metrics in list(self._tenants.values()):
+            metrics.reset()
+        self.reset_at = time.time()
+
+
+class RpcMetrics:
+    """Contatori, RPC in corso e latenza di un metodo gRPC di un tenant"""
+
+    __slots__ = ('method', 'tenant_id', 'count', 'errors', 'in_flight', 'latency')
+
+    def __init__(self, method: str, tenant_id: str):
+        self.method = method
+        self.tenant_id = tenant_id
+        self.in_flight = 0
+        self.latency = LatencyHistogram()
+        self.reset()
+
+    def record(self, latency_ns: int, ok: bool):
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self.latency.record(latency_ns)
+
+    def snapshot(self) -> Dict:
+        return {
+            'method': self.method,
+            'tenant_id': self.tenant_id,
+            'count': self.count,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'latency': self.latency.snapshot(),
+        }
+
+    def reset(self):
+        # in_flight è uno stato, non un contatore: non si azzera
+        self.count = 0
+        self.errors = 0
+        self.latency.reset()
+
+
+class GrpcMetrics:
+    """
+    Registro delle metriche delle RPC gRPC dei tenant.
+
+    Le voci di un tenant sono preallocate per tutti i metodi quando viene
+    creato il suo server: l'interceptor tiene il dict metodo -> RpcMetrics e
+    il percorso della RPC non alloca né cerca chiavi composte.
+    """
+
+    def __init__(self, methods: Iterable[str]):
+        # Nomi completi, es. '/pynq.PYNQService/MMIOWrite'
+        self.methods = tuple(methods)
+        self._tenants: Dict[str, Dict[str, RpcMetrics]] = {}
+        self.reset_at = time.time()
+
+    def tenant(self, tenant_id: str) -> Dict[str, RpcMetrics]:
+        """Metriche del tenant per nome completo del metodo (create se mancanti)"""
+        metrics = self._tenants.get(tenant_id)
+        if metrics is None:
+            metrics = self._tenants.setdefault(tenant_id, {
+                method: RpcMetrics(method.rsplit('/', 1)[-1], tenant_id) for method in self.methods
+            })
+        return metrics
+
+    def remove_tenant(self, tenant_id: str):
+        self._tenants.pop(tenant_id, None)
+
+    def all(self) -> Iterable[RpcMetrics]:
+        for metrics in list(self._tenants.values()):
+            yield from metrics.values()
+
+    def snapshot(self, tenant_id: Optional[str] = None) -> Dict:
+        return {
+            'rpcs': [m.snapshot() for m in self.all()
+                     if (m.count or m.in_flight) and (tenant_id is None or m.tenant_id == tenant_id)],
+            'window_seconds': time.time() - self.reset_at,
+        }
+
+    def reset(self):
+        for metrics in self.all():
+            metrics.reset()
+        self.reset_at = time.time()
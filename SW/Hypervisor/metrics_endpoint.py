@@ -0,0 +1,214 @@
+# hypervisor/metrics_endpoint.py
+"""
+Esposizione delle metriche in formato OpenMetrics (testo) su un socket Unix
+accanto a management.sock, ad esempio:
+
+    curl --unix-socket /var/run/pynq/metrics.sock http://localhost/metrics
+
+Gli istogrammi interni (bucket log-lineari, vedi metrics.py) vengono ridotti
+ai bucket di EXPORT_BOUNDS_NS: un bucket interno finisce nel primo bucket
+esportato che contiene il suo limite superiore.
+"""
+
+import os
+import bisect
+import logging
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Callable, List, Optional
+
+from metrics import NUM_BUCKETS, OP_NAMES, bucket_bounds
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Limiti (ns) dei bucket esportati: da 1 µs a 10 s
+EXPORT_BOUNDS_NS = (
+    1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000,
+    100_000_000, 250_000_000, 500_000_000, 1_000_000_000, 2_500_000_000,
+    5_000_000_000, 10_000_000_000,
+)
+
+# Bucket interno -> indice del bucket esportato (len(EXPORT_BOUNDS_NS) = +Inf)
+_EXPORT_SLOT = [bisect.bisect_left(EXPORT_BOUNDS_NS, bucket_bounds(i)[1]) for i in range(NUM_BUCKETS)]
+_LE_LABELS = [f"{bound / 1e9:g}" for bound in EXPORT_BOUNDS_NS]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _histogram(lines: List[str], name: str, labels: str, histogram):
+    # Copia: i contatori possono cambiare durante l'export
+    counts = list(histogram.counts)
+    slots = [0] * (len(EXPORT_BOUNDS_NS) + 1)
+    for index, n in enumerate(counts):
+        if n:
+            slots[_EXPORT_SLOT[index]] += n
+
+    cumulative = 0
+    for le, n in zip(_LE_LABELS, slots):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+    total = cumulative + slots[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {total}')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.total / 1e9:.9f}')
+    lines.append(f'{name}_count{{{labels}}} {total}')
+
+
+def render_openmetrics(grpc_metrics, fast_path_metrics=None, buffer_pool=None) -> str:
+    """Testo OpenMetrics delle RPC gRPC e, se presenti, del fast path MMIO e del pool dei buffer"""
+    lines = []
+    rpcs = list(grpc_metrics.all())
+
+    lines.append('# TYPE pynq_grpc_requests counter')
+    lines.append('# HELP pynq_grpc_requests RPC completate per metodo e tenant.')
+    for rpc in rpcs:
+        lines.append(f'pynq_grpc_requests_total{{{_labels(tenant=rpc.tenant_id, method=rpc.method)}}} {rpc.count}')
+
+    lines.append('# TYPE pynq_grpc_errors counter')
+    lines.append('# HELP pynq_grpc_errors RPC terminate con errore.')
+    for rpc in rpcs:
+        lines.append(f'pynq_grpc_errors_total{{{_labels(tenant=rpc.tenant_id, method=rpc.method)}}} {rpc.errors}')
+
+    lines.append('# TYPE pynq_grpc_in_flight gauge')
+    lines.append('# HELP pynq_grpc_in_flight RPC in esecuzione.')
+    for rpc in rpcs:
+        lines.append(f'pynq_grpc_in_flight{{{_labels(tenant=rpc.tenant_id, method=rpc.method)}}} {rpc.in_flight}')
+
+    lines.append('# TYPE pynq_grpc_request_duration_seconds histogram')
+    lines.append('# UNIT pynq_grpc_request_duration_seconds seconds')
+    lines.append('# HELP pynq_grpc_request_duration_seconds Durata delle RPC (degli stream per intero).')
+    for rpc in rpcs:
+        if rpc.count:
+            _histogram(lines, 'pynq_grpc_request_duration_seconds',
+                       _labels(tenant=rpc.tenant_id, method=rpc.method), rpc.latency)
+
+    if fast_path_metrics is not None:
+        ops = [m for m in fast_path_metrics.all() if m.count]
+
+        lines.append('# TYPE pynq_fast_mmio_ops counter')
+        lines.append('# HELP pynq_fast_mmio_ops Operazioni del fast path MMIO per opcode e tenant.')
+        for m in ops:
+            op = OP_NAMES.get(m.op, f"0x{m.op:02x}")
+            lines.append(f'pynq_fast_mmio_ops_total{{{_labels(tenant=m.tenant_id, op=op)}}} {m.count}')
+
+        lines.append('# TYPE pynq_fast_mmio_errors counter')
+        lines.append('# HELP pynq_fast_mmio_errors Operazioni del fast path MMIO fallite.')
+        for m in ops:
+            op = OP_NAMES.get(m.op, f"0x{m.op:02x}")
+            lines.append(f'pynq_fast_mmio_errors_total{{{_labels(tenant=m.tenant_id, op=op)}}} {m.errors}')
+
+        lines.append('# TYPE pynq_fast_mmio_hw_duration_seconds histogram')
+        lines.append('# UNIT pynq_fast_mmio_hw_duration_seconds seconds')
+        lines.append('# HELP pynq_fast_mmio_hw_duration_seconds Tempo di accesso all\'hardware per operazione.')
+        for m in ops:
+            op = OP_NAMES.get(m.op, f"0x{m.op:02x}")
+            _histogram(lines, 'pynq_fast_mmio_hw_duration_seconds', _labels(tenant=m.tenant_id, op=op), m.hw)
+
+    if buffer_pool is not None:
+        stats = buffer_pool.stats()
+
+        for name, help_text in (('hits', 'Allocazioni servite dalla free list.'),
+                                ('misses', 'Allocazioni di buffer nuovi.'),
+                                ('recycled', 'Buffer liberati tornati nella free list.'),
+                                ('released', 'Buffer liberati davvero (pool pieno o trim).')):
+            lines.append(f'# TYPE pynq_buffer_pool_{name} counter')
+            lines.append(f'# HELP pynq_buffer_pool_{name} {help_text}')
+            for c in stats['classes']:
+                lines.append(f'pynq_buffer_pool_{name}_total{{{_labels(size=c["size"])}}} {c[name]}')
+
+        lines.append('# TYPE pynq_buffer_pool_free gauge')
+        lines.append('# HELP pynq_buffer_pool_free Buffer nella free list per classe (size 0 = oltre la più grande).')
+        for c in stats['classes']:
+            lines.append(f'pynq_buffer_pool_free{{{_labels(size=c["size"])}}} {c["free"]}')
+
+        lines.append('# TYPE pynq_buffer_pool_pooled_bytes gauge')
+        lines.append('# UNIT pynq_buffer_pool_pooled_bytes bytes')
+        lines.append('# HELP pynq_buffer_pool_pooled_bytes Memoria tenuta nelle free list.')
+        lines.append(f'pynq_buffer_pool_pooled_bytes {stats["pooled_bytes"]}')
+
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        try:
+            body = self.server.render().encode('utf-8')
+        except Exception as e:
+            logger.error(f"Metrics render error: {e}")
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Su socket Unix client_address è vuoto
+        return 'unix'
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics endpoint: {format % args}")
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsEndpoint:
+    """Server HTTP minimale su socket Unix che risponde a GET /metrics"""
+
+    def __init__(self, socket_path: str, grpc_metrics,
+                 fast_path_metrics: Optional[Callable[[], Optional[object]]] = None,
+                 buffer_pool: Optional[Callable[[], Optional[object]]] = None):
+        """
+        Args:
+            socket_path: path del socket (es. {socket_dir}/metrics.sock)
+            grpc_metrics: GrpcMetrics dei server dei tenant
+            fast_path_metrics: funzione che ritorna FastPathMetrics (o None se il fast path non è attivo)
+            buffer_pool: funzione che ritorna il BufferPool (o None, es. con il mock)
+        """
+        self.socket_path = socket_path
+        self.grpc_metrics = grpc_metrics
+        self.fast_path_metrics = fast_path_metrics or (lambda: None)
+        self.buffer_pool = buffer_pool or (lambda: None)
+        self._server = None
+        self._thread = None
+
+    def render(self) -> str:
+        return render_openmetrics(self.grpc_metrics, self.fast_path_metrics(), self.buffer_pool())
+
+    def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._server = _UnixHTTPServer(self.socket_path, _MetricsHandler)
+        self._server.render = self.render
+        os.chmod(self.socket_path, 0o600)
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsEndpoint", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint started on {self.socket_path}")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
@@ -0,0 +1,114 @@
+# hypervisor/metrics_interceptor.py
+"""
+Latenza, RPC in corso ed errori di ogni RPC di PYNQService, per metodo e tenant.
+
+Ogni socket ha il proprio server, quindi il tenant è noto quando viene creato
+l'interceptor: le RpcMetrics del tenant sono preallocate e la RPC costa due
+perf_counter_ns() e qualche incremento. Va messo prima di AuthInterceptor, così
+le RPC rifiutate contano come errori.
+
+Una RPC è un errore se l'handler solleva un'eccezione (context.abort() compreso).
+Per gli stream la latenza è la durata dell'intero stream.
+"""
+
+import time
+import logging
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+
+def _timed(behavior, rpc, streaming_response: bool):
+    """Handler sincrono che registra la RPC in rpc"""
+    if streaming_response:
+        def wrapped(request, context):
+            rpc.in_flight += 1
+            ok = False
+            t0 = time.perf_counter_ns()
+            try:
+                yield from behavior(request, context)
+                ok = True
+            finally:
+                rpc.record(time.perf_counter_ns() - t0, ok)
+                rpc.in_flight -= 1
+    else:
+        def wrapped(request, context):
+            rpc.in_flight += 1
+            ok = False
+            t0 = time.perf_counter_ns()
+            try:
+                response = behavior(request, context)
+                ok = True
+                return response
+            finally:
+                rpc.record(time.perf_counter_ns() - t0, ok)
+                rpc.in_flight -= 1
+    return wrapped
+
+
+def _timed_async(behavior, rpc, streaming_response: bool):
+    """Come _timed per gli handler grpc.aio (coroutine e async generator)"""
+    if streaming_response:
+        async def wrapped(request, context):
+            rpc.in_flight += 1
+            ok = False
+            t0 = time.perf_counter_ns()
+            try:
+                async for response in behavior(request, context):
+                    yield response
+                ok = True
+            finally:
+                rpc.record(time.perf_counter_ns() - t0, ok)
+                rpc.in_flight -= 1
+    else:
+        async def wrapped(request, context):
+            rpc.in_flight += 1
+            ok = False
+            t0 = time.perf_counter_ns()
+            try:
+                response = await behavior(request, context)
+                ok = True
+                return response
+            finally:
+                rpc.record(time.perf_counter_ns() - t0, ok)
+                rpc.in_flight -= 1
+    return wrapped
+
+
+def _wrap(handler, rpc, timed):
+    if handler.unary_unary:
+        return handler._replace(unary_unary=timed(handler.unary_unary, rpc, False))
+    if handler.unary_stream:
+        return handler._replace(unary_stream=timed(handler.unary_stream, rpc, True))
+    if handler.stream_unary:
+        return handler._replace(stream_unary=timed(handler.stream_unary, rpc, False))
+    return handler._replace(stream_stream=timed(handler.stream_stream, rpc, True))
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Registra ogni RPC del server di un tenant in GrpcMetrics"""
+
+    def __init__(self, metrics, tenant_id: str):
+        self._rpcs = metrics.tenant(tenant_id)
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        rpc = self._rpcs.get(handler_call_details.method)
+        if handler is None or rpc is None:
+            return handler
+        return _wrap(handler, rpc, _timed)
+
+
+class AioMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """MetricsInterceptor per i server grpc.aio"""
+
+    def __init__(self, metrics, tenant_id: str):
+        self._rpcs = metrics.tenant(tenant_id)
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        rpc = self._rpcs.get(handler_call_details.method)
+        if handler is None or rpc is None:
+            return handler
+        return _wrap(handler, rpc, _timed_async)
@@ -0,0 +1,128 @@
+# hypervisor/mmio_mapping.py
+"""
+Mappature MMIO condivise per finestra di indirizzi.
+
+Un pynq.MMIO per handle vuol dire un mmap di /dev/mem a ogni CreateMMIO, anche
+quando il tenant apre più volte lo stesso IP. La cache mappa una volta sola la
+finestra che contiene l'IP (l'intervallo di indirizzi della PR zone) e dà a
+ogni handle una MMIOView: una slice della vista uint32 della mappatura, con i
+limiti dell'handle. Ogni finestra conta le sue viste e viene rilasciata con
+l'ultima (ReleaseMMIO o cleanup del tenant).
+
+Una vista rilasciata resta leggibile finché qualcuno la tiene (numpy tiene
+viva la mappatura): il fast path la abbandona alla rivalidazione, perché il
+rilascio incrementa mmio_epoch.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MappedWindow:
+    """Finestra di indirizzi mappata una volta sola"""
+    base_address: int
+    length: int
+    mmio: object           # Oggetto con .array (vista uint32), es. pynq.MMIO
+    refs: int = 0
+
+
+class MMIOView:
+    """Regione di un handle dentro una finestra: read/write/array come pynq.MMIO"""
+
+    def __init__(self, window: MappedWindow, base_address: int, length: int):
+        start = base_address - window.base_address
+        self.window = window
+        self.base_address = base_address
+        self.length = length
+        self.array = window.mmio.array[start >> 2:(start + length + 3) >> 2]
+
+    def read(self, offset: int = 0, length: int = 4) -> int:
+        if length not in (1, 2, 4, 8):
+            raise Exception(f"MMIO read length must be 1, 2, 4 or 8 bytes: {length}")
+        if offset < 0 or offset % 4 != 0:
+            raise Exception(f"MMIO read offset must be non-negative and 4-byte aligned: {offset}")
+        if offset + length > self.length:
+            raise Exception(f"MMIO read out of bounds: offset {offset} + length {length} > MMIO size {self.length}")
+
+        idx = offset >> 2
+        value = int(self.array[idx])
+        if length == 8:
+            value |= int(self.array[idx + 1]) << 32
+        elif length < 4:
+            value &= (1 << (8 * length)) - 1
+        return value
+
+    def write(self, offset: int, value):
+        """Scrive una word a 32 bit (int) o word contigue (bytes)"""
+        if offset < 0 or offset % 4 != 0:
+            raise Exception(f"MMIO write offset must be non-negative and 4-byte aligned: {offset}")
+        if isinstance(value, (bytes, bytearray)):
+            if len(value) % 4 != 0:
+                raise Exception(f"MMIO write data must be a multiple of 4 bytes: {len(value)}")
+            words = np.frombuffer(value, dtype=np.uint32)
+        else:
+            words = (value & 0xFFFFFFFF,)
+        if offset + 4 * len(words) > self.length:
+            raise Exception(f"MMIO write out of bounds: offset {offset} + {4 * len(words)} > MMIO size {self.length}")
+
+        idx = offset >> 2
+        self.array[idx:idx + len(words)] = words
+
+
+class MMIOMappingCache:
+    """Finestre mappate per (base, lunghezza), con contatore delle viste"""
+
+    def __init__(self, mapper: Callable[[int, int], object]):
+        """
+        Args:
+            mapper: mappa una finestra (base, lunghezza), es. pynq.MMIO
+        """
+        self._mapper = mapper
+        self._lock = threading.Lock()
+        self._windows: Dict[Tuple[int, int], MappedWindow] = {}
+        self.maps = 0       # Finestre mappate dall'avvio
+
+    def acquire(self, window_base: int, window_length: int, base_address: int, length: int) -> MMIOView:
+        """Vista su [base_address, base_address + length), mappando la finestra se serve"""
+        start = base_address - window_base
+        if start < 0 or length <= 0 or start + length > window_length:
+            raise Exception(f"MMIO region 0x{base_address:08x}+0x{length:x} outside window "
+                            f"0x{window_base:08x}+0x{window_length:x}")
+        if start % 4 != 0:
+            raise Exception(f"MMIO base address must be 4-byte aligned: 0x{base_address:08x}")
+
+        key = (window_base, window_length)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = MappedWindow(window_base, window_length, self._mapper(window_base, window_length))
+                self._windows[key] = window
+                self.maps += 1
+                logger.info(f"Mapped MMIO window 0x{window_base:08x}+0x{window_length:x}")
+            window.refs += 1
+            return MMIOView(window, base_address, length)
+
+    def release(self, view: MMIOView):
+        """Rilascia la vista; con l'ultima la finestra esce dalla cache"""
+        window = view.window
+        key = (window.base_address, window.length)
+        with self._lock:
+            window.refs -= 1
+            if window.refs <= 0 and self._windows.get(key) is window:
+                del self._windows[key]
+                logger.info(f"Unmapped MMIO window 0x{window.base_address:08x}+0x{window.length:x}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'windows': len(self._windows),
+                'views': sum(window.refs for window in self._windows.values()),
+                'maps': self.maps
+            }
@@ -1,17 +1,31 @@
 # hypervisor/mock_resource_manager.py
 import os
 import threading
+import itertools
 import uuid
 import time
 import random
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 import numpy as np
 from multiprocessing import shared_memory
 import mmap
+
+from dma_engine import DMAEngine, DMATransferState, DMA_MM2S, DMA_S2MM, DMA_FINISHED
+from mmio_mapping import MMIOMappingCache, MMIOView
+from ip_descriptors import IPDescriptorCache, IPDescriptors
+
 logger = logging.getLogger(__name__)
 
+# Massimo numero di word per MMIOReadBlock/MMIOWriteBlock
+MAX_MMIO_BLOCK_WORDS = 16384
+
+# Op di BatchMMIO (come MMIOBatchOp nel proto) e massimo numero di op per batch
+MMIO_BATCH_READ = 0
+MMIO_BATCH_WRITE = 1
+MAX_MMIO_BATCH_OPS = 4096
+
 @dataclass
 class ManagedResource:
     handle: str
@@ -93,7 +107,9 @@ class MockMMIO:
     def __init__(self, base_address, length):
         self.base_address = base_address
         self.length = length
-        self._memory = {}  # Simula memoria
+        # Simula memoria: byte + vista uint32 come pynq.MMIO.array
+        self._memory = np.zeros((length + 3) & ~3, dtype=np.uint8)
+        self.array = self._memory.view(np.uint32)
         logger.info(f"[MOCK] Created MMIO at 0x{base_address:08x}, length: {length}")
     
     def read(self, offset, length=4):
@@ -108,12 +124,8 @@ class MockMMIO:
         if offset + length > self.length:
             raise Exception(f"MMIO read would exceed bounds")
         
-        # Leggi valore byte per byte
-        value = 0
-        for i in range(length):
-            byte_offset = offset + i
-            byte_val = self._memory.get(byte_offset, 0)
-            value |= (byte_val << (i * 8))
+        # Leggi valore (little endian come il bus AXI)
+        value = int.from_bytes(self._memory[offset:offset + length].tobytes(), 'little')
         
         logger.debug(f"[MOCK] MMIO read: offset=0x{offset:04x}, length={length}, value=0x{value:08x}")
         return value
@@ -130,11 +142,9 @@ class MockMMIO:
         if offset + length > self.length:
             raise Exception(f"MMIO write would exceed bounds")
         
-        # Scrivi valore byte per byte
-        for i in range(length):
-            byte_offset = offset + i
-            byte_val = (value >> (i * 8)) & 0xFF
-            self._memory[byte_offset] = byte_val
+        # Scrivi valore (little endian come il bus AXI)
+        data = (value & ((1 << (8 * length)) - 1)).to_bytes(length, 'little')
+        self._memory[offset:offset + length] = np.frombuffer(data, dtype=np.uint8)
         
         logger.debug(f"[MOCK] MMIO write: offset=0x{offset:04x}, value=0x{value:08x}, length={length}")
 
@@ -168,21 +178,18 @@ class MockBuffer:
                    f"shm={self.shm_name}")
     
     def read(self, offset=0, length=None):
-        """Leggi dati come bytes"""
+        """Leggi dati come bytes (copia solo la porzione richiesta)"""
+        raw = self.data.reshape(-1).view(np.uint8)
         if length is None:
-            return self.data.tobytes()[offset:]
-        return self.data.tobytes()[offset:offset+length]
+            return raw[offset:].tobytes()
+        return raw[offset:offset+length].tobytes()
     
     def write(self, data_bytes, offset=0):
         """Scrivi bytes nel buffer"""
-        # Converti bytes in array numpy
-        temp_array = np.frombuffer(data_bytes, dtype=self.dtype)
-        # Calcola quanti elementi copiare
-        elements_to_copy = min(len(temp_array), self.data.size - offset // self.dtype.itemsize)
-        # Copia nel buffer
-        flat_view = self.data.flat
-        start_idx = offset // self.dtype.itemsize
-        flat_view[start_idx:start_idx + elements_to_copy] = temp_array[:elements_to_copy]
+        raw = self.data.reshape(-1).view(np.uint8)
+        # Copia quanto entra nel buffer
+        bytes_to_copy = min(len(data_bytes), raw.size - offset)
+        raw[offset:offset + bytes_to_copy] = np.frombuffer(data_bytes, dtype=np.uint8, count=bytes_to_copy)
     
     def cleanup(self):
         """Pulisci risorse"""
@@ -193,16 +200,47 @@ class MockBuffer:
 
 
 class MockDMA:
+    """DMA in loopback: quello che manda la MM2S lo riceve la S2MM, come con un AXI-Stream FIFO tra i canali"""
+    
+    # Banda simulata (byte/s)
+    BANDWIDTH = 400 * 1024 * 1024
+    
     def __init__(self, name):
         self.name = name
-        self.sendchannel = self
-        self.recvchannel = self
+        self.max_transfer_size = 16 * 1024 * 1024  # 16MB
+        self.channels = (DMA_MM2S, DMA_S2MM)
+        self._fifo = bytearray()
+        self._cond = threading.Condition()
+        self._cancelled = False
         logger.info(f"[MOCK] Created DMA: {name}")
     
-    def transfer(self, buffer):
-        """Simula trasferimento DMA"""
-        logger.info(f"[MOCK] DMA transfer: {len(buffer)} bytes")
-        return len(buffer)
+    def transfer(self, direction: int, buffer: MockBuffer, length: int, timeout: float) -> int:
+        """Backend di DMAEngine: eseguito dal worker del canale"""
+        raw = buffer.data.reshape(-1).view(np.uint8)
+        time.sleep(length / self.BANDWIDTH)
+        
+        if direction == DMA_MM2S:
+            with self._cond:
+                self._fifo += raw[:length].tobytes()
+                self._cond.notify_all()
+            logger.debug(f"[MOCK] DMA {self.name} MM2S: {length} bytes")
+            return length
+        
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._cancelled or len(self._fifo) >= length, timeout):
+                raise TimeoutError(f"S2MM received {len(self._fifo)} of {length} bytes in {timeout:.1f}s")
+            if self._cancelled:
+                raise Exception("DMA released")
+            data = bytes(self._fifo[:length])
+            del self._fifo[:length]
+        raw[:length] = np.frombuffer(data, dtype=np.uint8)
+        logger.debug(f"[MOCK] DMA {self.name} S2MM: {length} bytes")
+        return length
+    
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
 
 class MockResourceManager:
     """Resource Manager che simula PYNQ per testing"""
@@ -211,18 +249,35 @@ class MockResourceManager:
         self.tenant_manager = tenant_manager
         self._resources: Dict[str, ManagedResource] = {}
         self._overlays: Dict[str, MockOverlay] = {}
-        self._mmios: Dict[str, MockMMIO] = {}
+        self._mmios: Dict[str, MMIOView] = {}
         self._buffers: Dict[str, MockBuffer] = {}
         self._dmas: Dict[str, MockDMA] = {}
         self._lock = threading.RLock()
         
+        # Finestre MMIO condivise (vedi PYNQResourceManager.mmio_mappings)
+        self.mmio_mappings = MMIOMappingCache(MockMMIO)
+        
+        # IP core serializzati (vedi PYNQResourceManager.ip_descriptors)
+        self.ip_descriptors = IPDescriptorCache()
+        
+        # Epoch MMIO (vedi PYNQResourceManager.mmio_epoch)
+        self.mmio_epoch = 0
+        
+        # Versioni dei buffer (vedi PYNQResourceManager._buffer_clock)
+        self._buffer_clock = itertools.count(1)
+        self._buffer_versions: Dict[str, int] = {}
+        self._tenant_buffer_epoch: Dict[str, int] = {}
+        
+        # Trasferimenti DMA (vedi PYNQResourceManager.dma_engine)
+        self.dma_engine = DMAEngine(on_complete=self._dma_completed)
+        
         logger.info("[MOCK] Initialized Mock Resource Manager")
         
     def _generate_handle(self, prefix: str) -> str:
         """Genera handle univoco"""
         return f"{prefix}_{uuid.uuid4().hex[:8]}"
     
-    def load_overlay(self, tenant_id: str, bitfile_path: str) -> Tuple[str, Dict]:
+    def load_overlay(self, tenant_id: str, bitfile_path: str) -> Tuple[str, IPDescriptors]:
         """Simula caricamento overlay"""
         with self._lock:
             # Verifica permessi
@@ -254,6 +309,14 @@ class MockResourceManager:
             # Registra con tenant manager
             self.tenant_manager.resources[tenant_id].overlays.add(handle)
             
+            logger.info(f"[MOCK] Overlay loaded successfully: {handle}")
+            return handle, self._overlay_ip_descriptors(tenant_id, overlay)
+    
+    def _overlay_ip_descriptors(self, tenant_id: str, overlay: MockOverlay) -> IPDescriptors:
+        """IP dell'overlay accessibili al tenant, dalla cache (chiave: bitstream e range permessi)"""
+        allowed_ranges = tuple(self.tenant_manager.config[tenant_id].allowed_address_ranges or ())
+        
+        def build():
             # Prepara risposta con IP cores
             ip_cores = {}
             for name, ip in overlay.ip_dict.items():
@@ -270,10 +333,28 @@ class MockResourceManager:
                         'address_range': addr_range,
                         'parameters': {k: str(v) for k, v in ip.get('parameters', {}).items()},
                         'registers': ip.get('registers', {})  # <-- AGGIUNGI QUESTA RIGA
-                    }                
+                    }
+            return ip_cores
+        
+        return self.ip_descriptors.get((overlay.bitfile_path, allowed_ranges), build)
+    
+    def get_overlay_info(self, tenant_id: str, handle: str) -> Dict:
+        """Info di un overlay del tenant (vedi PYNQResourceManager.get_overlay_info)"""
+        with self._lock:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "overlay":
+                raise Exception("Overlay handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("Overlay not owned by tenant")
             
-            logger.info(f"[MOCK] Overlay loaded successfully: {handle}")
-            return handle, ip_cores
+            return {
+                'bitfile': resource.metadata['bitfile'],
+                'loaded_at': resource.created_at,
+                'pr_zone': None,
+                'uio_device': None,
+                'properties': {'mock': 'true'},
+                'ip_cores': self._overlay_ip_descriptors(tenant_id, self._overlays[handle])
+            }
     
     def create_mmio(self, tenant_id: str, base_address: int, length: int) -> str:
         """Crea MMIO - SEMPLIFICATO senza overlay_id"""
@@ -282,8 +363,13 @@ class MockResourceManager:
             if not self.tenant_manager.is_address_allowed(tenant_id, base_address, length):
                 raise Exception(f"Tenant {tenant_id} not allowed to access address 0x{base_address:08x}")
             
-            # Crea MMIO mock
-            mmio = MockMMIO(base_address, length)
+            # Vista sulla finestra permessa che contiene la regione (senza restrizioni, la regione stessa)
+            window = (base_address, length)
+            for allowed_base, allowed_size in self.tenant_manager.config[tenant_id].allowed_address_ranges or []:
+                if allowed_base <= base_address and base_address + length <= allowed_base + allowed_size:
+                    window = (allowed_base, allowed_size)
+                    break
+            mmio = self.mmio_mappings.acquire(window[0], window[1], base_address, length)
             
             # Genera handle
             handle = self._generate_handle("mmio")
@@ -382,9 +468,156 @@ class MockResourceManager:
             # Scrivi valore
             mmio = self._mmios[handle]
             mmio.write(offset, value)
+            self._touch_tenant_buffers(tenant_id)
             
             logger.debug(f"MMIO write by {tenant_id}: handle={handle}, addr=0x{actual_address:08x}, value=0x{value:08x}")
     
+    def release_mmio(self, tenant_id: str, handle: str):
+        """Rilascia un handle MMIO (vedi PYNQResourceManager.release_mmio)"""
+        with self._lock:
+            resource, mmio = self._mmio_owned(tenant_id, handle)
+            
+            del self._mmios[handle]
+            del self._resources[handle]
+            self.tenant_manager.resources[tenant_id].mmio_handles.discard(handle)
+            self.mmio_mappings.release(mmio)
+            self.mmio_epoch += 1
+            
+            logger.info(f"[MOCK] MMIO released: {handle} for tenant {tenant_id}")
+    
+    def _mmio_owned(self, tenant_id: str, handle: str):
+        """Risorsa e oggetto MMIO di un handle del tenant (da chiamare con il lock)"""
+        if handle not in self._resources:
+            raise Exception("MMIO handle not found")
+        
+        resource = self._resources[handle]
+        if resource.tenant_id != tenant_id:
+            raise Exception("MMIO not owned by tenant")
+            
+        mmio = self._mmios.get(handle)
+        if mmio is None:
+            raise Exception("MMIO object not found")
+        return resource, mmio
+    
+    def _check_address_allowed(self, tenant_id: str, resource, offset: int, length: int):
+        """Verifica che il tenant possa ancora accedere all'intervallo della regione"""
+        actual_address = resource.metadata['base_address'] + offset
+        if not self.tenant_manager.is_address_allowed(tenant_id, actual_address, length):
+            raise Exception(f"Tenant {tenant_id} no longer allowed to access address 0x{actual_address:08x}")
+    
+    def _mmio_block_target(self, tenant_id: str, handle: str, offset: int, count: int):
+        """Verifiche comuni degli accessi a blocchi (da chiamare con il lock). Ritorna l'oggetto MMIO"""
+        resource, mmio = self._mmio_owned(tenant_id, handle)
+        mmio_length = resource.metadata['length']
+        
+        if offset < 0 or offset % 4 != 0:
+            raise Exception(f"Block offset must be non-negative and 4-byte aligned: {offset}")
+        if count <= 0 or count > MAX_MMIO_BLOCK_WORDS:
+            raise Exception(f"Block size must be between 1 and {MAX_MMIO_BLOCK_WORDS} words: {count}")
+        if offset + 4 * count > mmio_length:
+            raise Exception(f"Block out of bounds: offset {offset} + {4 * count} > MMIO size {mmio_length}")
+        
+        # Il tenant deve poter ancora accedere all'intero blocco
+        self._check_address_allowed(tenant_id, resource, offset, 4 * count)
+        return mmio
+    
+    def _mmio_batch_target(self, tenant_id: str, handle: str):
+        """(vista uint32, lunghezza) di un handle di BatchMMIO (da chiamare con il lock)"""
+        resource, mmio = self._mmio_owned(tenant_id, handle)
+        mmio_length = resource.metadata['length']
+        # Un solo controllo sull'intera regione invece che per op
+        self._check_address_allowed(tenant_id, resource, 0, mmio_length)
+        return mmio.array, mmio_length
+    
+    def mmio_read_block(self, tenant_id: str, handle: str, offset: int, count: int) -> np.ndarray:
+        """Legge count word a 32 bit contigue con una sola slice sulla regione mappata"""
+        with self._lock:
+            mmio = self._mmio_block_target(tenant_id, handle, offset, count)
+            start = offset >> 2
+            words = mmio.array[start:start + count].copy()
+            
+            logger.debug(f"[MOCK] MMIO block read by {tenant_id}: handle={handle}, offset=0x{offset:04x}, words={count}")
+            return words
+    
+    def mmio_write_block(self, tenant_id: str, handle: str, offset: int, words):
+        """Scrive word a 32 bit contigue con una sola slice sulla regione mappata"""
+        words = np.asarray(words, dtype=np.uint32)
+        with self._lock:
+            mmio = self._mmio_block_target(tenant_id, handle, offset, len(words))
+            start = offset >> 2
+            mmio.array[start:start + len(words)] = words
+            self._touch_tenant_buffers(tenant_id)
+            
+            logger.debug(f"[MOCK] MMIO block write by {tenant_id}: handle={handle}, offset=0x{offset:04x}, words={len(words)}")
+    
+    def mmio_batch(self, tenant_id: str, handles: List[str], handle_index, ops, offsets, values,
+                   continue_on_error: bool = False) -> Tuple[List[int], List[bool], str]:
+        """
+        Esegue in ordine una sequenza di letture/scritture a 32 bit sotto un solo lock.
+        
+        Ownership e limiti vengono verificati una volta per handle; per ogni op
+        restano solo allineamento e offset.
+        
+        Returns:
+            (valori letti, esiti) delle op eseguite ed errore della prima op fallita
+        """
+        count = len(ops)
+        if count > MAX_MMIO_BATCH_OPS:
+            raise Exception(f"Batch size must be at most {MAX_MMIO_BATCH_OPS} ops: {count}")
+        if len(offsets) != count or len(values) not in (0, count) or len(handle_index) not in (0, count):
+            raise Exception("Batch arrays must have one entry per op")
+        if count and (not handles or max(handle_index, default=0) >= len(handles)):
+            raise Exception("Batch handle index out of range")
+        if not values and MMIO_BATCH_WRITE in ops:
+            raise Exception("Batch write ops need a value for every op")
+        
+        results, ok, error = [], [], ''
+        with self._lock:
+            targets = [self._mmio_batch_target(tenant_id, handle) for handle in handles]
+            
+            for i in range(count):
+                array, mmio_length = targets[handle_index[i] if handle_index else 0]
+                offset = offsets[i]
+                try:
+                    if offset < 0 or offset % 4 != 0 or offset + 4 > mmio_length:
+                        raise Exception(f"Offset {offset} not 4-byte aligned or outside MMIO size {mmio_length}")
+                    if ops[i] == MMIO_BATCH_WRITE:
+                        array[offset >> 2] = values[i]
+                        results.append(0)
+                    elif ops[i] == MMIO_BATCH_READ:
+                        results.append(int(array[offset >> 2]))
+                    else:
+                        raise Exception(f"Unknown batch op {ops[i]}")
+                    ok.append(True)
+                except Exception as e:
+                    results.append(0)
+                    ok.append(False)
+                    error = error or f"op {i}: {e}"
+                    if not continue_on_error:
+                        break
+            
+            if ok and MMIO_BATCH_WRITE in ops:
+                self._touch_tenant_buffers(tenant_id)
+            
+            logger.debug(f"[MOCK] MMIO batch by {tenant_id}: {len(ok)}/{count} ops, handles={len(handles)}")
+        return results, ok, error
+    
+    def bind_mmio(self, tenant_id: str, handle: str) -> Tuple[MMIOView, int, int]:
+        """Valida un handle MMIO per il fast path. Ritorna (mmio, lunghezza, mmio_epoch)"""
+        with self._lock:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "mmio":
+                raise Exception("MMIO handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("MMIO not owned by tenant")
+            
+            base_address = resource.metadata['base_address']
+            mmio_length = resource.metadata['length']
+            if not self.tenant_manager.is_address_allowed(tenant_id, base_address, mmio_length):
+                raise Exception(f"Tenant {tenant_id} no longer allowed to access address 0x{base_address:08x}")
+            
+            return self._mmios[handle], mmio_length, self.mmio_epoch
+    
     def allocate_buffer(self, tenant_id: str, shape, dtype='uint8') -> Dict:
         """Alloca buffer con supporto numpy e shared memory"""
         with self._lock:
@@ -421,6 +654,8 @@ class MockResourceManager:
                 }
             )
             
+            self._touch_buffer(tenant_id, handle)
+            
             # Aggiorna contatori tenant
             self.tenant_manager.resources[tenant_id].buffer_handles.add(handle)
             self.tenant_manager.resources[tenant_id].total_memory_bytes += size
@@ -452,8 +687,8 @@ class MockResourceManager:
             buffer = self._buffers[handle]
             return buffer.read(offset, length)
     
-    def write_buffer(self, tenant_id: str, handle: str, data: bytes, offset: int):
-        """Scrivi dati in buffer"""
+    def write_buffer(self, tenant_id: str, handle: str, data: bytes, offset: int) -> Tuple[int, int]:
+        """Scrivi dati in buffer; ritorna (versione precedente, nuova versione)"""
         with self._lock:
             # Verifica ownership
             if handle not in self._resources:
@@ -466,8 +701,60 @@ class MockResourceManager:
             # Scrivi dati
             buffer = self._buffers[handle]
             buffer.write(data, offset)
+            return self._touch_buffer(tenant_id, handle)
+
+    def buffer_version(self, tenant_id: str, handle: str) -> int:
+        """Versione corrente di un buffer del tenant (cache di lettura dei client)"""
+        with self._lock:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "buffer":
+                raise Exception("Buffer handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("Buffer not owned by tenant")
+            
+            return max(self._buffer_versions.get(handle, 0), self._tenant_buffer_epoch.get(tenant_id, 0))
+    
+    def _touch_buffer(self, tenant_id: str, handle: str) -> Tuple[int, int]:
+        """Nuova versione di un buffer modificato (da chiamare con il lock). Ritorna (precedente, nuova)"""
+        previous = max(self._buffer_versions.get(handle, 0), self._tenant_buffer_epoch.get(tenant_id, 0))
+        version = next(self._buffer_clock)
+        self._buffer_versions[handle] = version
+        return previous, version
+    
+    def _touch_tenant_buffers(self, tenant_id: str):
+        """Nuova versione di tutti i buffer del tenant (da chiamare con il lock)"""
+        self._tenant_buffer_epoch[tenant_id] = next(self._buffer_clock)
+    
+    def touch_tenant_buffers(self, tenant_id: str):
+        """
+        Come _touch_tenant_buffers, per le scritture MMIO del fast path. Senza lock:
+        next() sull'orologio è atomico e le versioni si confrontano solo per uguaglianza.
+        """
+        self._tenant_buffer_epoch[tenant_id] = next(self._buffer_clock)
 
     
+    def free_buffer(self, tenant_id: str, handle: str):
+        """Libera un buffer (vedi PYNQResourceManager.free_buffer; qui nessun pool)"""
+        with self._lock:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "buffer":
+                raise Exception("Buffer handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("Buffer not owned by tenant")
+            
+            if self.dma_engine.buffer_busy(handle):
+                raise Exception("Buffer in use by a DMA transfer")
+            
+            size = resource.metadata['size']
+            self.tenant_manager.resources[tenant_id].buffer_handles.discard(handle)
+            self.tenant_manager.resources[tenant_id].total_memory_bytes -= size
+            
+            self._buffers.pop(handle).cleanup()
+            del self._resources[handle]
+            self._buffer_versions.pop(handle, None)
+            
+            logger.info(f"[MOCK] Buffer freed: {handle}, size={size} bytes")
+    
     def create_dma(self, tenant_id: str, dma_name: str) -> Tuple[str, Dict]:
         """Crea DMA - SEMPLIFICATO senza overlay_id"""
         with self._lock:
@@ -480,6 +767,11 @@ class MockResourceManager:
             if not tenant_overlays:
                 raise Exception("No overlay loaded for tenant")
             
+            # Il DMA deve essere un AXI DMA di un overlay del tenant
+            if not any('axi_dma' in self._overlays[res.handle].ip_dict.get(dma_name, {}).get('type', '')
+                       for res in tenant_overlays):
+                raise Exception(f"AXI DMA {dma_name} not found")
+            
             # Crea DMA mock
             dma = MockDMA(dma_name)
             
@@ -494,9 +786,11 @@ class MockResourceManager:
                 resource_type="dma",
                 created_at=time.time(),
                 metadata={
-                    "dma_name": dma_name
+                    "dma_name": dma_name,
+                    "max_transfer_size": dma.max_transfer_size
                 }
             )
+            self.dma_engine.add_dma(handle, dma, dma.channels)
             
             # Registra con tenant manager
             self.tenant_manager.resources[tenant_id].dma_handles.add(handle)
@@ -504,11 +798,60 @@ class MockResourceManager:
             info = {
                 'has_send_channel': True,
                 'has_recv_channel': True,
-                'max_transfer_size': 16 * 1024 * 1024  # 16MB
+                'max_transfer_size': dma.max_transfer_size
             }
             
             logger.info(f"[MOCK] DMA created: {handle}")
             return handle, info
+    
+    def dma_transfer(self, tenant_id: str, dma_handle: str, direction: int, buffer_handle: str,
+                     length: int, wait: bool = False, timeout_ms: int = 0) -> DMATransferState:
+        """Accoda un trasferimento sul canale del DMA (vedi PYNQResourceManager.dma_transfer)"""
+        with self._lock:
+            dma_resource = self._resources.get(dma_handle)
+            if dma_resource is None or dma_resource.resource_type != "dma":
+                raise Exception("DMA handle not found")
+            if dma_resource.tenant_id != tenant_id:
+                raise Exception("DMA not owned by tenant")
+            
+            resource = self._resources.get(buffer_handle)
+            if resource is None or resource.resource_type != "buffer":
+                raise Exception("Buffer handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("Buffer not owned by tenant")
+            
+            size = resource.metadata['size']
+            length = length or size
+            if length > size:
+                raise Exception(f"Transfer length {length} exceeds buffer size {size}")
+            max_size = dma_resource.metadata['max_transfer_size']
+            if length > max_size:
+                raise Exception(f"Transfer length {length} exceeds DMA max transfer size {max_size}")
+            if direction not in (DMA_MM2S, DMA_S2MM):
+                raise Exception(f"Invalid DMA direction {direction}")
+            
+            transfer = self.dma_engine.submit(
+                tenant_id, dma_handle, direction, buffer_handle,
+                self._buffers[buffer_handle], length, timeout_ms / 1000)
+        
+        if wait:
+            self.dma_engine.wait(transfer)
+        return transfer
+    
+    def get_dma_status(self, tenant_id: str, transfer_id: str, timeout_ms: int = 0) -> DMATransferState:
+        """Stato di un trasferimento; con timeout_ms > 0 attende al massimo timeout_ms che termini"""
+        transfer = self.dma_engine.get(tenant_id, transfer_id)
+        if timeout_ms and transfer.status not in DMA_FINISHED:
+            self.dma_engine.wait(transfer, timeout_ms / 1000)
+        return transfer
+    
+    def _dma_completed(self, transfer: DMATransferState):
+        """Una S2MM ha scritto nel buffer: nuova versione"""
+        if transfer.direction != DMA_S2MM:
+            return
+        with self._lock:
+            if transfer.buffer_handle in self._buffers:
+                self._touch_buffer(transfer.tenant_id, transfer.buffer_handle)
         
         
     def get_tenant_resources_summary(self, tenant_id: str) -> dict:
@@ -540,6 +883,11 @@ class MockResourceManager:
 
     def cleanup_tenant_resources(self, tenant_id: str):
         """Pulisce tutte le risorse di un tenant"""
+        # Prima ferma i DMA del tenant, senza lock (vedi PYNQResourceManager)
+        for handle, resource in list(self._resources.items()):
+            if resource.tenant_id == tenant_id and resource.resource_type == "dma":
+                self.dma_engine.remove_dma(handle)
+        
         with self._lock:
             handles_to_remove = []
             
@@ -564,14 +912,17 @@ class MockResourceManager:
             del self._overlays[handle]
             logger.info(f"[MOCK] Cleaned overlay: {handle}")
         elif resource.resource_type == "mmio":
-            del self._mmios[handle]
+            self.mmio_mappings.release(self._mmios.pop(handle))
+            self.mmio_epoch += 1
             logger.info(f"[MOCK] Cleaned MMIO: {handle}")
         elif resource.resource_type == "buffer":
             buffer = self._buffers[handle]
             buffer.cleanup()  # <-- FIX: era freebuffer()
             del self._buffers[handle]
+            self._buffer_versions.pop(handle, None)
             logger.info(f"[MOCK] Cleaned buffer: {handle}")
         elif resource.resource_type == "dma":
+            self.dma_engine.remove_dma(handle)
             del self._dmas[handle]
             logger.info(f"[MOCK] Cleaned DMA: {handle}")
         
@@ -1,5 +1,6 @@
 import os
 import threading
+import itertools
 import uuid
 import time
 import asyncio
@@ -19,9 +20,26 @@ import pynq.lib.dma
 # Import nostri moduli
 from pr_zone_manager import PRZoneManager
 from dfx_decoupler_manager import DFXDecouplerManager
+from dma_engine import DMAEngine, DMATransferState, DMA_MM2S, DMA_S2MM, DMA_FINISHED
+from buffer_pool import BufferPool, PoolBlock
+from mmio_mapping import MMIOMappingCache, MMIOView
+from ip_descriptors import IPDescriptorCache, IPDescriptors
 
 logger = logging.getLogger(__name__)
 
+# Massimo numero di word per MMIOReadBlock/MMIOWriteBlock
+MAX_MMIO_BLOCK_WORDS = 16384
+
+# Op di BatchMMIO (come MMIOBatchOp nel proto) e massimo numero di op per batch
+MMIO_BATCH_READ = 0
+MMIO_BATCH_WRITE = 1
+MAX_MMIO_BATCH_OPS = 4096
+
+# DMASR (status register di un canale AXI DMA): bit di idle e di errore
+DMASR_IDLE = 0x2
+DMASR_ERRORS = 0x70
+DMA_POLL_INTERVAL = 0.00005
+
 @dataclass
 class ManagedResource:
     handle: str
@@ -31,6 +49,52 @@ class ManagedResource:
     metadata: dict
     pynq_object: any = None
 
+class PYNQDMABackend:
+    """Backend di DMAEngine su pynq.lib.dma.DMA (modalità simple, senza scatter-gather)"""
+    
+    def __init__(self, description: dict):
+        self.dma = pynq.lib.dma.DMA(description)
+        # Lunghezza massima di un trasferimento: registro LENGTH largo C_SG_LENGTH_WIDTH bit
+        width = int(description.get('parameters', {}).get('C_SG_LENGTH_WIDTH', 26))
+        self.max_transfer_size = (1 << width) - 1
+        self.channels = {
+            direction: channel
+            for direction, channel in ((DMA_MM2S, getattr(self.dma, 'sendchannel', None)),
+                                       (DMA_S2MM, getattr(self.dma, 'recvchannel', None)))
+            if channel is not None
+        }
+        self._cancelled = False
+    
+    def transfer(self, direction: int, buffer, length: int, timeout: float) -> int:
+        """Eseguito dal worker del canale: avvia il trasferimento e attende idle"""
+        channel = self.channels[direction]
+        channel.transfer(buffer, nbytes=length)
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            status = channel._mmio.read(channel._offset + 4)
+            if status & DMASR_ERRORS:
+                self._reset(channel)
+                raise Exception(f"DMA error (DMASR=0x{status:08x})")
+            if status & DMASR_IDLE:
+                return length
+            if self._cancelled:
+                self._reset(channel)
+                raise Exception("DMA released")
+            if time.monotonic() >= deadline:
+                # Il canale resta occupato: reset per i trasferimenti successivi
+                self._reset(channel)
+                raise TimeoutError(f"DMA transfer of {length} bytes timed out after {timeout:.1f}s")
+            time.sleep(DMA_POLL_INTERVAL)
+    
+    def cancel(self):
+        self._cancelled = True
+    
+    @staticmethod
+    def _reset(channel):
+        channel.stop()
+        channel.start()
+
 class PYNQResourceManager:
     """Resource Manager che usa PYNQ hardware reale con supporto PR zones e DFX"""
     
@@ -39,11 +103,32 @@ class PYNQResourceManager:
         self.config_manager = config_manager
         self._resources: Dict[str, ManagedResource] = {}
         self._overlays: Dict[str, PYNQOverlay] = {}
-        self._mmios: Dict[str, PYNQMMIO] = {}
+        self._mmios: Dict[str, MMIOView] = {}
         self._buffers: Dict[str, any] = {}
         self._dmas: Dict[str, any] = {}
         self._lock = threading.RLock()
         
+        # Una mappatura di /dev/mem per finestra di PR zone, condivisa dagli handle MMIO
+        self.mmio_mappings = MMIOMappingCache(PYNQMMIO)
+        
+        # IP core per (PR zone, bitstream), già serializzati per LoadOverlay/GetOverlayInfo
+        self.ip_descriptors = IPDescriptorCache()
+        
+        # Epoch MMIO: incrementato quando un MMIO viene rimosso o una PR zone
+        # rilasciata. Il fast path lo confronta per rivalidare i suoi slot.
+        self.mmio_epoch = 0
+        
+        # Versioni dei buffer per la cache di lettura dei client: un solo orologio
+        # che avanza a ogni scrittura di un buffer (WriteBuffer, DMA) e a ogni
+        # scrittura MMIO del tenant, che può avviare un acceleratore che scrive
+        # nei suoi buffer. La versione di un buffer è la maggiore delle due.
+        self._buffer_clock = itertools.count(1)
+        self._buffer_versions: Dict[str, int] = {}
+        self._tenant_buffer_epoch: Dict[str, int] = {}
+        
+        # Trasferimenti DMA: un worker per canale, completamenti in tabella
+        self.dma_engine = DMAEngine(on_complete=self._dma_completed)
+        
         # Directory bitstream
         self.bitstream_dir = '/home/xilinx/bitstreams'
         if config_manager:
@@ -78,6 +163,17 @@ class PYNQResourceManager:
        
         self._verify_char_device_support()
         
+        # Pool dei buffer CMA: AllocateBuffer/FreeBuffer riusano buffer già allocati
+        pool_config = getattr(config_manager, 'buffer_pool', None) or {}
+        self.buffer_pool = BufferPool(
+            allocator=lambda nbytes: pynq_allocate(shape=(nbytes,), dtype=np.uint8),
+            max_pooled_bytes=int(pool_config.get('max_pooled_mb', 128)) * 1024 * 1024,
+            zero_on_free=pool_config.get('zero_on_free', True),
+            cma_low_watermark=int(pool_config.get('cma_low_watermark_mb', 32)) * 1024 * 1024
+        )
+        self._buffer_blocks: Dict[str, PoolBlock] = {}
+        self.buffer_pool.prewarm(pool_config.get('prewarm', {}))
+        
         logger.info(f"[PYNQ] Initialized Resource Manager with char device support")
         
         # Crea event loop per PYNQ se non esiste
@@ -189,9 +285,10 @@ class PYNQResourceManager:
         future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         return future.result()
     
-    def load_overlay(self, tenant_id: str, bitfile_path: str) -> Tuple[str, Dict]:
+    def load_overlay(self, tenant_id: str, bitfile_path: str) -> Tuple[str, IPDescriptors]:
         """
         Carica overlay parziale con gestione DFX e PR zones.
+        PR zone e device UIO assegnati sono in get_overlay_info().
         """
         with self._lock:
             if not self.tenant_manager.can_allocate_overlay(tenant_id):
@@ -260,16 +357,48 @@ class PYNQResourceManager:
             
             self.tenant_manager.resources[tenant_id].overlays.add(handle)
             
-            ip_cores = self._get_pr_zone_ip_cores(zone_id)
-            # NUOVO: Aggiungi info zona ai metadata degli IP cores
-            ip_cores['_zone_id'] = zone_id
-            ip_cores['_uio_device'] = uio_device
+            ip_cores = self._zone_ip_descriptors(zone_id, actual_bitstream_path)
             
             logger.info(f"[PYNQ] Partial bitstream loaded successfully: {handle} "
-                    f"in PR zone {zone_id} with {len(ip_cores)-2} accessible IPs")  # -2 per i metadata
+                    f"in PR zone {zone_id} with {len(ip_cores)} accessible IPs")
             
             return handle, ip_cores
     
+    def _zone_ip_descriptors(self, zone_id: int, bitstream: str) -> IPDescriptors:
+        """IP core della zona per il bitstream, dalla cache dei descrittori"""
+        return self.ip_descriptors.get((zone_id, bitstream), lambda: self._get_pr_zone_ip_cores(zone_id))
+    
+    def get_overlay_info(self, tenant_id: str, handle: str) -> Dict:
+        """Bitstream, PR zone, device UIO e IP core di un overlay del tenant"""
+        with self._lock:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "overlay":
+                raise Exception("Overlay handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("Overlay not owned by tenant")
+            
+            metadata = resource.metadata
+            return {
+                'bitfile': metadata['bitfile'],
+                'loaded_at': resource.created_at,
+                'pr_zone': metadata.get('pr_zone'),
+                'uio_device': metadata.get('uio_device'),
+                'properties': {
+                    'requested_bitfile': metadata.get('requested_bitfile', ''),
+                    'partial': str(metadata.get('partial', False)).lower()
+                },
+                'ip_cores': self._zone_ip_descriptors(metadata['pr_zone'], metadata['bitfile'])
+            }
+    
+    def reload_pr_zones(self):
+        """Rilegge gli indirizzi delle PR zone dalla configurazione (dopo un reload)"""
+        with self._lock:
+            self.pr_zone_addresses = {}
+            self._initialize_pr_zone_addresses()
+            self.ip_descriptors.invalidate()
+            # Gli slot del fast path vengono rivalidati con i nuovi indirizzi
+            self.mmio_epoch += 1
+    
     def _get_pr_zone_ip_cores(self, zone_id: int) -> Dict:
         """
         Ottieni gli IP cores per una specifica PR zone.
@@ -327,6 +456,7 @@ class PYNQResourceManager:
             # Verifica che l'indirizzo sia permesso per almeno una delle zone del tenant
             address_allowed = False
             allowed_zone = None
+            window = None
             
             for zone_id in tenant_zones:
                 zone_addresses = self.pr_zone_addresses.get(zone_id, [])
@@ -336,6 +466,7 @@ class PYNQResourceManager:
                         base_address + length <= allowed_base + allowed_size):
                         address_allowed = True
                         allowed_zone = zone_id
+                        window = (allowed_base, allowed_size)
                         break
                 if address_allowed:
                     break
@@ -355,9 +486,9 @@ class PYNQResourceManager:
             
             logger.info(f"[PYNQ] Creating MMIO at 0x{base_address:08x} for zone {allowed_zone}")
             
-            # Crea MMIO PYNQ reale
+            # Vista sulla finestra della zona (mappata solo dal primo handle)
             try:
-                mmio = PYNQMMIO(base_address, length)
+                mmio = self.mmio_mappings.acquire(window[0], window[1], base_address, length)
             except Exception as e:
                 logger.error(f"[PYNQ] Failed to create MMIO: {e}")
                 raise Exception(f"Failed to create MMIO: {e}")
@@ -457,29 +588,182 @@ class PYNQResourceManager:
             
             # Scrivi valore sull'hardware
             mmio.write(offset, value)
+            self._touch_tenant_buffers(tenant_id)
             
             logger.debug(f"[PYNQ] MMIO write by {tenant_id}: handle={handle}, offset=0x{offset:04x}, value=0x{value:08x}")
     
+    def release_mmio(self, tenant_id: str, handle: str):
+        """Rilascia un handle MMIO (e la mappatura della finestra, se era l'ultimo)"""
+        with self._lock:
+            resource, mmio = self._mmio_owned(tenant_id, handle)
+            
+            del self._mmios[handle]
+            del self._resources[handle]
+            self.tenant_manager.resources[tenant_id].mmio_handles.discard(handle)
+            self.mmio_mappings.release(mmio)
+            
+            # Il fast path rivalida i suoi slot e scarta quelli dell'handle
+            self.mmio_epoch += 1
+            
+            logger.info(f"[PYNQ] MMIO released: {handle} for tenant {tenant_id}")
+    
+    def _mmio_owned(self, tenant_id: str, handle: str):
+        """Risorsa e oggetto MMIO di un handle del tenant (da chiamare con il lock)"""
+        if handle not in self._resources:
+            raise Exception("MMIO handle not found")
+        
+        resource = self._resources[handle]
+        if resource.tenant_id != tenant_id:
+            raise Exception("MMIO not owned by tenant")
+            
+        mmio = self._mmios.get(handle)
+        if mmio is None:
+            raise Exception("MMIO object not found")
+        return resource, mmio
+    
+    def _mmio_block_target(self, tenant_id: str, handle: str, offset: int, count: int):
+        """Verifiche comuni degli accessi a blocchi (da chiamare con il lock). Ritorna l'oggetto MMIO"""
+        resource, mmio = self._mmio_owned(tenant_id, handle)
+        mmio_length = resource.metadata['length']
+        
+        if offset < 0 or offset % 4 != 0:
+            raise Exception(f"Block offset must be non-negative and 4-byte aligned: {offset}")
+        if count <= 0 or count > MAX_MMIO_BLOCK_WORDS:
+            raise Exception(f"Block size must be between 1 and {MAX_MMIO_BLOCK_WORDS} words: {count}")
+        if offset + 4 * count > mmio_length:
+            raise Exception(f"Block out of bounds: offset {offset} + {4 * count} > MMIO size {mmio_length}")
+        return mmio
+    
+    def _mmio_batch_target(self, tenant_id: str, handle: str):
+        """(vista uint32, lunghezza) di un handle di BatchMMIO (da chiamare con il lock)"""
+        resource, mmio = self._mmio_owned(tenant_id, handle)
+        return mmio.array, resource.metadata['length']
+    
+    def mmio_read_block(self, tenant_id: str, handle: str, offset: int, count: int) -> np.ndarray:
+        """Legge count word a 32 bit contigue con una sola slice sulla regione mappata"""
+        with self._lock:
+            mmio = self._mmio_block_target(tenant_id, handle, offset, count)
+            start = offset >> 2
+            words = mmio.array[start:start + count].copy()
+            
+            logger.debug(f"[PYNQ] MMIO block read by {tenant_id}: handle={handle}, offset=0x{offset:04x}, words={count}")
+            return words
+    
+    def mmio_write_block(self, tenant_id: str, handle: str, offset: int, words):
+        """Scrive word a 32 bit contigue con una sola slice sulla regione mappata"""
+        words = np.asarray(words, dtype=np.uint32)
+        with self._lock:
+            mmio = self._mmio_block_target(tenant_id, handle, offset, len(words))
+            start = offset >> 2
+            mmio.array[start:start + len(words)] = words
+            self._touch_tenant_buffers(tenant_id)
+            
+            logger.debug(f"[PYNQ] MMIO block write by {tenant_id}: handle={handle}, offset=0x{offset:04x}, words={len(words)}")
+    
+    def mmio_batch(self, tenant_id: str, handles: List[str], handle_index, ops, offsets, values,
+                   continue_on_error: bool = False) -> Tuple[List[int], List[bool], str]:
+        """
+        Esegue in ordine una sequenza di letture/scritture a 32 bit sotto un solo lock.
+        
+        Ownership e limiti vengono verificati una volta per handle; per ogni op
+        restano solo allineamento e offset.
+        
+        Returns:
+            (valori letti, esiti) delle op eseguite ed errore della prima op fallita
+        """
+        count = len(ops)
+        if count > MAX_MMIO_BATCH_OPS:
+            raise Exception(f"Batch size must be at most {MAX_MMIO_BATCH_OPS} ops: {count}")
+        if len(offsets) != count or len(values) not in (0, count) or len(handle_index) not in (0, count):
+            raise Exception("Batch arrays must have one entry per op")
+        if count and (not handles or max(handle_index, default=0) >= len(handles)):
+            raise Exception("Batch handle index out of range")
+        if not values and MMIO_BATCH_WRITE in ops:
+            raise Exception("Batch write ops need a value for every op")
+        
+        results, ok, error = [], [], ''
+        with self._lock:
+            targets = [self._mmio_batch_target(tenant_id, handle) for handle in handles]
+            
+            for i in range(count):
+                array, mmio_length = targets[handle_index[i] if handle_index else 0]
+                offset = offsets[i]
+                try:
+                    if offset < 0 or offset % 4 != 0 or offset + 4 > mmio_length:
+                        raise Exception(f"Offset {offset} not 4-byte aligned or outside MMIO size {mmio_length}")
+                    if ops[i] == MMIO_BATCH_WRITE:
+                        array[offset >> 2] = values[i]
+                        results.append(0)
+                    elif ops[i] == MMIO_BATCH_READ:
+                        results.append(int(array[offset >> 2]))
+                    else:
+                        raise Exception(f"Unknown batch op {ops[i]}")
+                    ok.append(True)
+                except Exception as e:
+                    results.append(0)
+                    ok.append(False)
+                    error = error or f"op {i}: {e}"
+                    if not continue_on_error:
+                        break
+            
+            if ok and MMIO_BATCH_WRITE in ops:
+                self._touch_tenant_buffers(tenant_id)
+            
+            logger.debug(f"[PYNQ] MMIO batch by {tenant_id}: {len(ok)}/{count} ops, handles={len(handles)}")
+        return results, ok, error
+    
+    def bind_mmio(self, tenant_id: str, handle: str) -> Tuple[MMIOView, int, int]:
+        """
+        Valida un handle MMIO per il fast path.
+        
+        Returns:
+            (oggetto MMIO, lunghezza in byte, mmio_epoch al momento della validazione)
+        """
+        with self._lock:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "mmio":
+                raise Exception("MMIO handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("MMIO not owned by tenant")
+            
+            # La PR zone dell'MMIO deve essere ancora assegnata al tenant
+            zone_id = resource.metadata.get('pr_zone')
+            if zone_id is not None and zone_id not in self.pr_zone_manager.get_tenant_zones(tenant_id):
+                raise Exception(f"PR zone {zone_id} no longer allocated to tenant {tenant_id}")
+            
+            mmio = self._mmios.get(handle)
+            if not mmio:
+                raise Exception("MMIO object not found")
+            
+            return mmio, resource.metadata['length'], self.mmio_epoch
+    
     def allocate_buffer(self, tenant_id: str, shape, dtype='uint8') -> Dict:
         """Alloca buffer su hardware PYNQ reale E registra nel char device"""
+        # Calcola size
+        np_shape = tuple(shape) if isinstance(shape, (list, tuple)) else (shape,)
+        np_dtype = np.dtype(dtype)
+        size = int(np.prod(np_shape)) * np_dtype.itemsize
+        
+        # Verifica limiti tenant
         with self._lock:
-            # Calcola size
-            np_shape = tuple(shape) if isinstance(shape, (list, tuple)) else (shape,)
-            np_dtype = np.dtype(dtype)
-            size = np.prod(np_shape) * np_dtype.itemsize
-            
-            # Verifica limiti tenant
             if not self.tenant_manager.can_allocate_buffer(tenant_id, size):
                 raise Exception("Buffer allocation limit reached")
+        
+        # Buffer PYNQ dal pool, fuori dal lock: una miss chiama pynq.allocate, che è lenta
+        try:
+            block = self.buffer_pool.allocate(size)
+            buffer = block.raw[:size].view(np_dtype).reshape(np_shape)
+            physical_address = buffer.physical_address
             
-            # Alloca buffer PYNQ reale
-            try:
-                buffer = pynq_allocate(shape=np_shape, dtype=np_dtype)
-                physical_address = buffer.physical_address
-                
-            except Exception as e:
-                logger.error(f"[PYNQ] Failed to allocate buffer: {e}")
-                raise Exception(f"Failed to allocate buffer: {e}")
+        except Exception as e:
+            logger.error(f"[PYNQ] Failed to allocate buffer: {e}")
+            raise Exception(f"Failed to allocate buffer: {e}")
+        
+        with self._lock:
+            # Altre allocazioni del tenant possono essere passate nel frattempo
+            if not self.tenant_manager.can_allocate_buffer(tenant_id, size):
+                self.buffer_pool.release(block)
+                raise Exception("Buffer allocation limit reached")
             
             # Genera handle
             handle = self._generate_handle("buffer")
@@ -496,6 +780,7 @@ class PYNQResourceManager:
             
             # Salva riferimenti
             self._buffers[handle] = buffer
+            self._buffer_blocks[handle] = block
             self._resources[handle] = ManagedResource(
                 handle=handle,
                 tenant_id=tenant_id,
@@ -511,6 +796,8 @@ class PYNQResourceManager:
                 pynq_object=buffer
             )
             
+            self._touch_buffer(tenant_id, handle)
+            
             # Aggiorna contatori tenant
             self.tenant_manager.resources[tenant_id].buffer_handles.add(handle)
             self.tenant_manager.resources[tenant_id].total_memory_bytes += size
@@ -588,13 +875,13 @@ class PYNQResourceManager:
                 raise Exception(f"Read would exceed buffer bounds")
             
             # Leggi dati
-            data_bytes = buffer.tobytes()[offset:offset+length]
+            data_bytes = buffer.reshape(-1).view(np.uint8)[offset:offset+length].tobytes()
             
             logger.debug(f"[PYNQ] Buffer read: handle={handle}, offset={offset}, length={length}")
             return data_bytes
 
-    def write_buffer(self, tenant_id: str, handle: str, data: bytes, offset: int):
-        """Scrivi dati in buffer PYNQ"""
+    def write_buffer(self, tenant_id: str, handle: str, data: bytes, offset: int) -> Tuple[int, int]:
+        """Scrivi dati in buffer PYNQ; ritorna (versione precedente, nuova versione)"""
         with self._lock:
             # Verifica ownership
             if handle not in self._resources:
@@ -619,65 +906,131 @@ class PYNQResourceManager:
             if offset + data_length > buffer_size:
                 raise Exception(f"Write would exceed buffer bounds")
             
-            # Scrivi dati nel buffer
-            dtype = np.dtype(resource.metadata['dtype'])
-            temp_array = np.frombuffer(data, dtype=dtype)
-            
-            # Calcola indici per il buffer
-            start_idx = offset // dtype.itemsize
-            end_idx = start_idx + len(temp_array)
-            
-            # Scrivi nel buffer PYNQ
-            buffer.flat[start_idx:end_idx] = temp_array
+            # Scrivi nel buffer PYNQ (vista a byte: offset non vincolato al dtype)
+            buffer.reshape(-1).view(np.uint8)[offset:offset + data_length] = np.frombuffer(data, dtype=np.uint8)
             
             # Assicura che i dati siano sincronizzati con la memoria fisica
             buffer.flush()
             
             logger.debug(f"[PYNQ] Buffer write: handle={handle}, offset={offset}, length={data_length}")
+            return self._touch_buffer(tenant_id, handle)
+
+    def buffer_version(self, tenant_id: str, handle: str) -> int:
+        """Versione corrente di un buffer del tenant (cache di lettura dei client)"""
+        with self._lock:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "buffer":
+                raise Exception("Buffer handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("Buffer not owned by tenant")
+            
+            return max(self._buffer_versions.get(handle, 0), self._tenant_buffer_epoch.get(tenant_id, 0))
+    
+    def _touch_buffer(self, tenant_id: str, handle: str) -> Tuple[int, int]:
+        """Nuova versione di un buffer modificato (da chiamare con il lock). Ritorna (precedente, nuova)"""
+        previous = max(self._buffer_versions.get(handle, 0), self._tenant_buffer_epoch.get(tenant_id, 0))
+        version = next(self._buffer_clock)
+        self._buffer_versions[handle] = version
+        return previous, version
+    
+    def _touch_tenant_buffers(self, tenant_id: str):
+        """Nuova versione di tutti i buffer del tenant (da chiamare con il lock)"""
+        self._tenant_buffer_epoch[tenant_id] = next(self._buffer_clock)
+    
+    def touch_tenant_buffers(self, tenant_id: str):
+        """
+        Come _touch_tenant_buffers, per le scritture MMIO del fast path. Senza lock:
+        next() sull'orologio è atomico e le versioni si confrontano solo per uguaglianza.
+        """
+        self._tenant_buffer_epoch[tenant_id] = next(self._buffer_clock)
 
     def free_buffer(self, tenant_id: str, handle: str):
-        """Libera un buffer PYNQ e rimuovi dal char device"""
+        """Libera un buffer (torna nel pool) e rimuovilo dal char device"""
         with self._lock:
             # Verifica ownership
-            if handle not in self._resources:
+            resource = self._resources.get(handle)
+            if resource is None or resource.resource_type != "buffer":
                 raise Exception("Buffer handle not found")
-                
-            resource = self._resources[handle]
             if resource.tenant_id != tenant_id:
                 raise Exception("Buffer not owned by tenant")
             
-            # Ottieni buffer
-            buffer = self._buffers.get(handle)
-            if buffer:
-                size = resource.metadata['size']
-                
-                # NUOVO: Rimuovi dal char device
-                if self._char_device_enabled and handle in self._buffer_to_offset:
-                    vm_offset = self._buffer_to_offset[handle]
-                    sysfs_remove = f"/sys/devices/virtual/pynq_char/pynq_mem_{tenant_id}/remove_buffer"
-                    
-                    try:
-                        with open(sysfs_remove, 'w') as f:
-                            f.write(f"{vm_offset:x}\n")
-                        
-                        del self._buffer_to_offset[handle]
-                        logger.info(f"[CHAR_DEV] Removed buffer {handle} from char device")
-                    except:
-                        logger.warning(f"[CHAR_DEV] Could not remove buffer from char device")
-                
-                # Aggiorna contatori tenant
-                self.tenant_manager.resources[tenant_id].buffer_handles.discard(handle)
-                self.tenant_manager.resources[tenant_id].total_memory_bytes -= size
-                
-                # Libera buffer PYNQ
-                if hasattr(buffer, 'freebuffer'):
-                    buffer.freebuffer()
-                
-                # Rimuovi riferimenti
-                del self._buffers[handle]
-                del self._resources[handle]
-                
-                logger.info(f"[PYNQ] Buffer freed: {handle}, size={size} bytes")
+            if self.dma_engine.buffer_busy(handle):
+                raise Exception("Buffer in use by a DMA transfer")
+            
+            size = resource.metadata['size']
+            
+            # Rimuovi dal char device
+            recyclable = self._unregister_buffer_from_char_device(tenant_id, handle)
+            
+            # Aggiorna contatori tenant
+            self.tenant_manager.resources[tenant_id].buffer_handles.discard(handle)
+            self.tenant_manager.resources[tenant_id].total_memory_bytes -= size
+            
+            # Rimuovi riferimenti
+            self._buffers.pop(handle, None)
+            del self._resources[handle]
+            self._buffer_versions.pop(handle, None)
+            block = self._buffer_blocks.pop(handle, None)
+        
+        # Nel pool fuori dal lock: l'azzeramento costa quanto una copia del buffer
+        if block is not None:
+            self._recycle_block(block, recyclable)
+        
+        logger.info(f"[PYNQ] Buffer freed: {handle}, size={size} bytes")
+    
+    def _unregister_buffer_from_char_device(self, tenant_id: str, handle: str) -> bool:
+        """
+        Rimuove il buffer dal char device del tenant.
+        
+        Returns:
+            False se il buffer resta mappato (non va riciclato)
+        """
+        if not self._char_device_enabled or handle not in self._buffer_to_offset:
+            return True
+        
+        vm_offset = self._buffer_to_offset[handle]
+        sysfs_remove = f"/sys/devices/virtual/pynq_char/pynq_mem_{tenant_id}/remove_buffer"
+        
+        try:
+            with open(sysfs_remove, 'w') as f:
+                f.write(f"{vm_offset:x}\n")
+        except OSError as e:
+            logger.warning(f"[CHAR_DEV] Could not remove buffer {handle} from char device: {e}")
+            return False
+        
+        del self._buffer_to_offset[handle]
+        logger.info(f"[CHAR_DEV] Removed buffer {handle} from char device")
+        return True
+    
+    def _recycle_block(self, block, recyclable: bool):
+        """Rimette il blocco nel pool, o lo restituisce alla CMA se ancora mappato nel char device"""
+        if recyclable:
+            self.buffer_pool.release(block)
+        else:
+            # Un altro tenant non deve ricevere memoria che il vecchio può ancora mappare
+            self.buffer_pool.discard(block)
+    
+    def _resolve_dma(self, tenant_id: str, dma_name: str) -> Tuple[int, dict]:
+        """Trova l'AXI DMA nella shell e la PR zone del tenant che lo contiene"""
+        ip_dict = self.static_overlay.ip_dict if self.static_overlay else {}
+        description = ip_dict.get(dma_name)
+        if description is None:
+            # Nomi gerarchici (es. pr_0/axi_dma_0): basta l'ultimo componente
+            matches = [d for name, d in ip_dict.items() if name.split('/')[-1] == dma_name]
+            if len(matches) > 1:
+                raise Exception(f"DMA name {dma_name} is ambiguous, use the full name")
+            description = matches[0] if matches else None
+        
+        if description is None or 'axi_dma' not in description.get('type', ''):
+            raise Exception(f"AXI DMA {dma_name} not found")
+        
+        phys_addr = description['phys_addr']
+        for zone_id in self.pr_zone_manager.get_tenant_zones(tenant_id):
+            for base, size in self.pr_zone_addresses.get(zone_id, []):
+                if base <= phys_addr < base + size:
+                    return zone_id, description
+        
+        raise Exception(f"DMA {dma_name} at 0x{phys_addr:08x} not in tenant's PR zones")
     
     def create_dma(self, tenant_id: str, dma_name: str) -> Tuple[str, Dict]:
         """Crea DMA handle per un DMA nella PR zone del tenant"""
@@ -687,16 +1040,21 @@ class PYNQResourceManager:
             if not tenant_zones:
                 raise Exception(f"Tenant {tenant_id} has no PR zones allocated")
             
-            # Per ora assumiamo che il DMA sia nella prima zona del tenant
-            # In un design reale, dovresti mappare i DMA alle zone specifiche
-            zone_id = list(tenant_zones)[0]
+            zone_id, description = self._resolve_dma(tenant_id, dma_name)
             
             logger.info(f"[PYNQ] Creating DMA {dma_name} for tenant {tenant_id} in zone {zone_id}")
             
+            try:
+                backend = PYNQDMABackend(description)
+            except Exception as e:
+                logger.error(f"[PYNQ] Failed to create DMA: {e}")
+                raise Exception(f"Failed to create DMA: {e}")
+            
             # Genera handle
             handle = self._generate_handle("dma")
             
             # Salva riferimenti
+            self._dmas[handle] = backend
             self._resources[handle] = ManagedResource(
                 handle=handle,
                 tenant_id=tenant_id,
@@ -704,23 +1062,84 @@ class PYNQResourceManager:
                 created_at=time.time(),
                 metadata={
                     "dma_name": dma_name,
-                    "pr_zone": zone_id
+                    "pr_zone": zone_id,
+                    "phys_addr": description['phys_addr'],
+                    "max_transfer_size": backend.max_transfer_size
                 },
-                pynq_object=None
+                pynq_object=backend.dma
             )
+            self.dma_engine.add_dma(handle, backend, tuple(backend.channels))
             
             # Registra con tenant manager
             self.tenant_manager.resources[tenant_id].dma_handles.add(handle)
             
-            # Info DMA (esempio)
             dma_info = {
-                'has_send_channel': True,
-                'has_recv_channel': True,
-                'max_transfer_size': 67108864  # 64MB
+                'has_send_channel': DMA_MM2S in backend.channels,
+                'has_recv_channel': DMA_S2MM in backend.channels,
+                'max_transfer_size': backend.max_transfer_size
             }
             
             return handle, dma_info
     
+    def dma_transfer(self, tenant_id: str, dma_handle: str, direction: int, buffer_handle: str,
+                     length: int, wait: bool = False, timeout_ms: int = 0) -> DMATransferState:
+        """
+        Accoda un trasferimento sul canale del DMA.
+        length 0 = tutto il buffer; con wait=False ritorna subito (stato PENDING),
+        il client segue il trasferimento con get_dma_status.
+        """
+        with self._lock:
+            dma_resource = self._resources.get(dma_handle)
+            if dma_resource is None or dma_resource.resource_type != "dma":
+                raise Exception("DMA handle not found")
+            if dma_resource.tenant_id != tenant_id:
+                raise Exception("DMA not owned by tenant")
+            
+            # La PR zone del DMA deve essere ancora assegnata al tenant
+            zone_id = dma_resource.metadata.get('pr_zone')
+            if zone_id not in self.pr_zone_manager.get_tenant_zones(tenant_id):
+                raise Exception(f"PR zone {zone_id} no longer allocated to tenant {tenant_id}")
+            
+            resource = self._resources.get(buffer_handle)
+            if resource is None or resource.resource_type != "buffer":
+                raise Exception("Buffer handle not found")
+            if resource.tenant_id != tenant_id:
+                raise Exception("Buffer not owned by tenant")
+            
+            size = resource.metadata['size']
+            length = length or size
+            if length > size:
+                raise Exception(f"Transfer length {length} exceeds buffer size {size}")
+            max_size = dma_resource.metadata['max_transfer_size']
+            if length > max_size:
+                raise Exception(f"Transfer length {length} exceeds DMA max transfer size {max_size}")
+            if direction not in (DMA_MM2S, DMA_S2MM):
+                raise Exception(f"Invalid DMA direction {direction}")
+            
+            transfer = self.dma_engine.submit(
+                tenant_id, dma_handle, direction, buffer_handle,
+                self._buffers[buffer_handle], length, timeout_ms / 1000)
+        
+        # Attesa fuori dal lock: il worker lo prende a fine trasferimento
+        if wait:
+            self.dma_engine.wait(transfer)
+        return transfer
+    
+    def get_dma_status(self, tenant_id: str, transfer_id: str, timeout_ms: int = 0) -> DMATransferState:
+        """Stato di un trasferimento; con timeout_ms > 0 attende al massimo timeout_ms che termini"""
+        transfer = self.dma_engine.get(tenant_id, transfer_id)
+        if timeout_ms and transfer.status not in DMA_FINISHED:
+            self.dma_engine.wait(transfer, timeout_ms / 1000)
+        return transfer
+    
+    def _dma_completed(self, transfer: DMATransferState):
+        """Callback del DMAEngine: una S2MM ha scritto nel buffer, nuova versione"""
+        if transfer.direction != DMA_S2MM:
+            return
+        with self._lock:
+            if transfer.buffer_handle in self._buffers:
+                self._touch_buffer(transfer.tenant_id, transfer.buffer_handle)
+    
     def unload_overlay(self, tenant_id: str, handle: str):
         """Scarica overlay parziale e libera la PR zone"""
         with self._lock:
@@ -747,6 +1166,7 @@ class PYNQResourceManager:
             released_zone = self.pr_zone_manager.release_zone_by_handle(handle)
             if released_zone is not None:
                 logger.info(f"[PYNQ] Released PR zone {released_zone} for overlay {handle}")
+                self.mmio_epoch += 1
             
             # Rimuovi da registri
             del self._resources[handle]
@@ -808,11 +1228,17 @@ class PYNQResourceManager:
 
     def cleanup_tenant_resources(self, tenant_id: str):
         """Pulisce tutte le risorse di un tenant incluse le PR zones"""
+        # Prima ferma i DMA del tenant, senza lock: i worker lo prendono a fine trasferimento
+        for handle, resource in list(self._resources.items()):
+            if resource.tenant_id == tenant_id and resource.resource_type == "dma":
+                self.dma_engine.remove_dma(handle)
+        
         with self._lock:
             # Prima rilascia tutte le PR zones del tenant
             released_zones = self.pr_zone_manager.release_all_tenant_zones(tenant_id)
             if released_zones:
                 logger.info(f"[PYNQ] Released PR zones {released_zones} for tenant {tenant_id}")
+                self.mmio_epoch += 1
                 
                 # Decouple le zone rilasciate per sicurezza
                 for zone_id in released_zones:
@@ -846,24 +1272,22 @@ class PYNQResourceManager:
                 logger.info(f"[PYNQ] Cleaned overlay: {handle}")
                 
             elif resource.resource_type == "mmio":
-                # MMIO viene pulito automaticamente
-                if handle in self._mmios:
-                    del self._mmios[handle]
+                # La finestra viene rilasciata con l'ultima vista
+                mmio = self._mmios.pop(handle, None)
+                if mmio is not None:
+                    self.mmio_mappings.release(mmio)
+                self.mmio_epoch += 1
                 logger.info(f"[PYNQ] Cleaned MMIO: {handle}")
                 
             elif resource.resource_type == "buffer":
                 # Buffer PYNQ
                 buffer = self._buffers.get(handle)
                 if buffer is not None:  # FIX: usa 'is not None' invece di 'if buffer'
-                    try:
-                        # PYNQ buffers non hanno sempre freebuffer, dipende dalla versione
-                        if hasattr(buffer, 'freebuffer') and callable(buffer.freebuffer):
-                            buffer.freebuffer()
-                        elif hasattr(buffer, 'close') and callable(buffer.close):
-                            buffer.close()
-                        # Se nessuno dei due metodi esiste, il buffer verrà rilasciato dal GC
-                    except Exception as e:
-                        logger.warning(f"[PYNQ] Error freeing buffer {handle}: {e}")
+                    # Il buffer torna nel pool, se non è più mappato nel char device
+                    recyclable = self._unregister_buffer_from_char_device(resource.tenant_id, handle)
+                    block = self._buffer_blocks.pop(handle, None)
+                    if block is not None:
+                        self._recycle_block(block, recyclable)
                     
                     # Aggiorna contatori tenant
                     size = resource.metadata.get('size', 0)
@@ -875,10 +1299,11 @@ class PYNQResourceManager:
                     # Rimuovi riferimento
                     if handle in self._buffers:
                         del self._buffers[handle]
+                    self._buffer_versions.pop(handle, None)
                     logger.info(f"[PYNQ] Cleaned buffer: {handle}")
                     
             elif resource.resource_type == "dma":
-                # DMA viene pulito automaticamente
+                self.dma_engine.remove_dma(handle)
                 if handle in self._dmas:
                     del self._dmas[handle]
                 logger.info(f"[PYNQ] Cleaned DMA: {handle}")
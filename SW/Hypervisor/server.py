@@ -31,9 +31,17 @@ from servicer import PYNQServicer
 import time
 from config_manager import DynamicConfigManager
 from management_service import ManagementServicer
+from fast_mmio_server import UltraFastMMIOServer
+from tenant_executor import FairTenantExecutor, StreamThreadExecutor, StreamExecutorInterceptor
+from aio_servicer import AioTenantServers
+from auth_interceptor import AuthInterceptor, AioAuthInterceptor
+from metrics import GrpcMetrics
+from metrics_interceptor import MetricsInterceptor, AioMetricsInterceptor
+from metrics_endpoint import MetricsEndpoint
 
 # Import generated proto
 sys.path.append('./generated')
+import pynq_service_pb2 as pb2
 import pynq_service_pb2_grpc as pb2_grpc
 
 # Setup logging
@@ -61,6 +69,32 @@ class PYNQMultiTenantServer:
         self.servers = {}
         self.management_server = None
         
+        # Latenze ed errori delle RPC per metodo e tenant, esposte su metrics.sock
+        service = pb2.DESCRIPTOR.services_by_name['PYNQService']
+        self.grpc_metrics = GrpcMetrics(f"/{service.full_name}/{method.name}" for method in service.methods)
+        self.metrics_endpoint = None
+        
+        # Pool condiviso dai server gRPC dei tenant (grpc_mode: shared)
+        self.grpc_executor = None
+        if self.config_manager.grpc_mode == 'shared':
+            self.grpc_executor = FairTenantExecutor(
+                max_workers=self.config_manager.grpc_workers,
+                max_per_tenant=self.config_manager.grpc_tenant_concurrency
+            )
+        
+        # Le RPC in streaming dei server sincroni non occupano i worker dei pool
+        self.stream_executor = None
+        if self.config_manager.grpc_mode != 'aio':
+            self.stream_executor = StreamThreadExecutor(
+                max_streams=self.config_manager.grpc_stream_threads,
+                max_per_tenant=self.config_manager.grpc_tenant_streams
+            )
+        
+        # Server grpc.aio su un event loop dedicato (grpc_mode: aio)
+        self.aio_servers = None
+        if self.config_manager.grpc_mode == 'aio':
+            self.aio_servers = AioTenantServers(self.tenant_manager, self.resource_manager)
+        
         # Setup signal handlers
         signal.signal(signal.SIGTERM, self._handle_signal)
         signal.signal(signal.SIGINT, self._handle_signal)
@@ -112,21 +146,44 @@ class PYNQMultiTenantServer:
         if os.path.exists(socket_path):
             os.unlink(socket_path)
         
-        # Crea server
-        server = grpc.server(
-            futures.ThreadPoolExecutor(max_workers=20),
-            options=[
-                ('grpc.max_send_message_length', 100 * 1024 * 1024),
-                ('grpc.max_receive_message_length', 100 * 1024 * 1024),
-            ]
-        )
-        
-        # Aggiungi servicer
-        servicer = PYNQServicer(self.tenant_manager, self.resource_manager)
-        pb2_grpc.add_PYNQServiceServicer_to_server(servicer, server)
+        options = [
+            ('grpc.max_send_message_length', 100 * 1024 * 1024),
+            ('grpc.max_receive_message_length', 100 * 1024 * 1024),
+        ]
         
-        # Bind a Unix socket
-        server.add_insecure_port(f'unix://{socket_path}')
+        if self.aio_servers:
+            # Servicer asyncio: crea e lega il server sul loop grpc.aio
+            server = self.aio_servers.create_server(
+                tenant_id, f'unix://{socket_path}', options,
+                interceptors=[
+                    AioMetricsInterceptor(self.grpc_metrics, tenant_id),
+                    AioAuthInterceptor(self.tenant_manager, tenant_id),
+                ]
+            )
+        else:
+            # Crea server: un grpc.server per socket (le RPC non dicono da quale socket
+            # arrivano), ma in modalità shared tutti eseguono sullo stesso pool limitato
+            if self.grpc_executor:
+                executor = self.grpc_executor.executor_for(tenant_id)
+            else:
+                executor = futures.ThreadPoolExecutor(max_workers=20)
+            
+            server = grpc.server(
+                executor,
+                interceptors=[
+                    StreamExecutorInterceptor(self.stream_executor, tenant_id),
+                    MetricsInterceptor(self.grpc_metrics, tenant_id),
+                    AuthInterceptor(self.tenant_manager, tenant_id),
+                ],
+                options=options
+            )
+            
+            # Aggiungi servicer
+            servicer = PYNQServicer(self.tenant_manager, self.resource_manager, tenant_id=tenant_id)
+            pb2_grpc.add_PYNQServiceServicer_to_server(servicer, server)
+            
+            # Bind a Unix socket
+            server.add_insecure_port(f'unix://{socket_path}')
         
         # Set permissions
         os.chmod(socket_path, 0o600)
@@ -155,6 +212,17 @@ class PYNQMultiTenantServer:
             self.servers[tenant_id] = server
             logger.info(f"Started server for tenant {tenant_id}")
         
+        # Fast path MMIO: un socket per tenant in socket_dir
+        self.fast_mmio_server = UltraFastMMIOServer(
+            self.resource_manager,
+            self.tenant_manager,
+            socket_dir=self.config_manager.socket_dir,
+            mode=self.config_manager.fast_mmio_mode,
+            num_shards=self.config_manager.fast_mmio_shards,
+            ring_enabled=self.config_manager.fast_mmio_ring
+        )
+        self.fast_mmio_server.start()
+        
         # Crea char devices per tenants
         logger.info("Creating char devices for tenants...")
         for tenant_id in self.config_manager.tenants:
@@ -192,6 +260,15 @@ class PYNQMultiTenantServer:
         # Ferma management server
         if self.management_server:
             self.management_server.stop(grace=5)
+        if self.metrics_endpoint:
+            self.metrics_endpoint.stop()
+        
+        if self.grpc_executor:
+            self.grpc_executor.shutdown(wait=False)
+        if self.stream_executor:
+            self.stream_executor.shutdown(wait=False)
+        if self.aio_servers:
+            self.aio_servers.stop()
         
         if self.fast_mmio_server:
             self.fast_mmio_server.stop()
@@ -213,12 +290,18 @@ class PYNQMultiTenantServer:
             self.tenant_manager.config[tenant_id] = self.config_manager.tenants[tenant_id]
             self.tenant_manager.resources[tenant_id] = TenantResources()
             self.create_and_start_tenant_server(tenant_id)
+            if self.fast_mmio_server:
+                self.fast_mmio_server.add_tenant(tenant_id)
             
         elif event_type == 'tenant_removed':
             tenant_id = data
             if USE_REAL_PYNQ:
                 self.resource_manager.cleanup_tenant_resources(tenant_id)
             self.stop_tenant_server(tenant_id)
+            self.tenant_manager.revoke_tenant_sessions(tenant_id)
+            self.grpc_metrics.remove_tenant(tenant_id)
+            if self.fast_mmio_server:
+                self.fast_mmio_server.remove_tenant(tenant_id)
             if tenant_id in self.tenant_manager.config:
                 del self.tenant_manager.config[tenant_id]
                 del self.tenant_manager.resources[tenant_id]
@@ -226,6 +309,13 @@ class PYNQMultiTenantServer:
         elif event_type == 'tenant_updated':
             tenant_id = data
             self.tenant_manager.config[tenant_id] = self.config_manager.tenants[tenant_id]
+            if self.fast_mmio_server:
+                self.fast_mmio_server.update_tenant(tenant_id)
+        
+        elif event_type == 'pr_zones_changed':
+            # Indirizzi delle zone e descrittori degli IP (solo PYNQResourceManager)
+            if hasattr(self.resource_manager, 'reload_pr_zones'):
+                self.resource_manager.reload_pr_zones()
 
     def create_and_start_tenant_server(self, tenant_id: str):
         """Crea e avvia server per nuovo tenant"""
@@ -274,6 +364,15 @@ class PYNQMultiTenantServer:
         
         self.management_server.start()
         logger.info(f"Management server started on {management_socket}")
+        
+        # Metriche OpenMetrics accanto a management.sock
+        self.metrics_endpoint = MetricsEndpoint(
+            os.path.join(self.config_manager.socket_dir, "metrics.sock"),
+            self.grpc_metrics,
+            lambda: self.fast_mmio_server.metrics if self.fast_mmio_server else None,
+            lambda: getattr(self.resource_manager, 'buffer_pool', None)
+        )
+        self.metrics_endpoint.start()
 
 def main():
     parser = argparse.ArgumentParser(description='PYNQ Multi-Tenant Server')
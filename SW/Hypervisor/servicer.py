@@ -1,8 +1,10 @@
 # hypervisor/servicer.py
+import os
 import grpc
 import time
 import logging
-from typing import Dict
+import numpy as np
+from typing import Dict, Optional, Tuple
 from tenant_manager import TenantManager, TenantResources
 # Import generated proto
 import sys
@@ -11,27 +13,52 @@ import pynq_service_pb2 as pb2
 import pynq_service_pb2_grpc as pb2_grpc
 
 from tenant_manager import TenantManager
+from auth_interceptor import current_tenant
 
 
 logger = logging.getLogger(__name__)
 
+# POLL di MMIOStream: letture consecutive, poi sleep con backoff esponenziale
+MMIO_STREAM_MAX_POLL_US = 5_000_000
+_POLL_SPIN_READS = 32
+_POLL_BACKOFF_MIN = 0.00005
+_POLL_BACKOFF_MAX = 0.001
+
+# ReadBufferStream/WriteBufferStream: bytes per chunk (il client può chiedere chunk diversi fino al massimo)
+BUFFER_CHUNK_SIZE = 1024 * 1024
+BUFFER_CHUNK_MAX = 4 * 1024 * 1024
+
+# WatchCompletions: ogni quanto uno stream senza completamenti controlla se il client è ancora connesso
+WATCH_IDLE_CHECK = 1.0
+
 class PYNQServicer(pb2_grpc.PYNQServiceServicer):
-    def __init__(self, tenant_manager: TenantManager, resource_manager):
+    def __init__(self, tenant_manager: TenantManager, resource_manager,
+                 tenant_id: Optional[str] = None):
         self.tenant_manager = tenant_manager
         self.resource_manager = resource_manager
+        # Tenant proprietario del socket su cui è esposto il servicer (None = qualsiasi)
+        self.socket_tenant = tenant_id
         logger.info("PYNQServicer initialized")
     
     def _get_tenant_id(self, context) -> str:
         """Estrai tenant_id dal token nei metadata"""
+        # Già autenticato da AuthInterceptor
+        tenant_id = current_tenant.get()
+        if tenant_id:
+            return tenant_id
+        
         metadata = dict(context.invocation_metadata())
         token = metadata.get('auth-token')
         
         if not token:
             context.abort(grpc.StatusCode.UNAUTHENTICATED, 'Missing auth token')
             
-        tenant_id = self.tenant_manager.validate_token(token)
+        tenant_id = self.tenant_manager.lookup_token(token)
         if not tenant_id:
             context.abort(grpc.StatusCode.UNAUTHENTICATED, 'Invalid or expired token')
+        
+        if self.socket_tenant and tenant_id != self.socket_tenant:
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'Token not valid on this socket')
             
         return tenant_id
     
@@ -40,6 +67,13 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
         """Autentica tenant"""
         logger.info(f"Authentication request from tenant: {request.tenant_id}")
         
+        if self.socket_tenant and request.tenant_id != self.socket_tenant:
+            logger.warning(f"Authentication failed: {request.tenant_id} on socket of {self.socket_tenant}")
+            return pb2.AuthResponse(
+                success=False,
+                message="Authentication failed"
+            )
+        
         token = self.tenant_manager.authenticate(request.tenant_id, request.api_key)
         
         if not token:
@@ -70,36 +104,13 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
             )
             logger.info(f"Overlay loaded successfully: {overlay_id}")
             
-            # Estrai metadata (zone_id e uio_device) dagli ip_cores
-            zone_id = ip_cores.pop('_zone_id', None)
-            uio_device = ip_cores.pop('_uio_device', None)
-            
-            # Converti IP cores in formato proto
-            proto_ip_cores = {}
-            for name, ip_info in ip_cores.items():
-                proto_ip_core = pb2.IPCore(
-                    name=ip_info['name'],
-                    type=ip_info['type'],
-                    base_address=ip_info['base_address'],
-                    address_range=ip_info['address_range'],
-                    parameters=ip_info['parameters']
-                )
-                
-                # Aggiungi registri se presenti
-                if 'registers' in ip_info and ip_info['registers']:
-                    for reg_name, reg_info in ip_info['registers'].items():
-                        proto_ip_core.registers[reg_name].offset = reg_info['offset']
-                        proto_ip_core.registers[reg_name].description = reg_info.get('description', '')
-                    
-                    logger.debug(f"Added {len(ip_info['registers'])} registers to {name}")
-                
-                proto_ip_cores[name] = proto_ip_core
+            info = self.resource_manager.get_overlay_info(tenant_id, overlay_id)
+            zone_id = info['pr_zone']
+            uio_device = info['uio_device']
             
-            # Costruisci risposta con info UIO device
-            response = pb2.LoadOverlayResponse(
-                overlay_id=overlay_id,
-                ip_cores=proto_ip_cores
-            )
+            # IP cores già serializzati (con registri e parametri): un solo parse
+            response = pb2.LoadOverlayResponse(overlay_id=overlay_id)
+            response.MergeFromString(ip_cores.serialized())
             
             # NUOVO: Aggiungi info UIO device se disponibile
             if uio_device:
@@ -119,14 +130,36 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
             context.abort(grpc.StatusCode.INTERNAL, str(e))
     
     def GetOverlayInfo(self, request, context):
-        """Ottieni info overlay"""
+        """Info di un overlay: IP cores filtrati per nome e livello di dettaglio"""
         tenant_id = self._get_tenant_id(context)
         
-        # TODO: Implementare recupero info overlay
-        return pb2.OverlayInfoResponse(
+        try:
+            info = self.resource_manager.get_overlay_info(tenant_id, request.overlay_id)
+        except Exception as e:
+            logger.error(f"GetOverlayInfo error: {e}")
+            context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+        
+        bitfile = info['bitfile']
+        try:
+            bitstream_size = os.path.getsize(bitfile)
+        except OSError:
+            bitstream_size = 0
+        
+        properties = dict(info['properties'])
+        if info['pr_zone'] is not None:
+            properties['pr_zone'] = str(info['pr_zone'])
+        if info['uio_device']:
+            properties['uio_device'] = info['uio_device']
+        
+        response = pb2.OverlayInfoResponse(
             overlay_id=request.overlay_id,
-            loaded_at=int(time.time())
+            loaded_at=int(info['loaded_at']),
+            bitfile_path=bitfile,
+            bitstream_size=bitstream_size,
+            properties=properties
         )
+        response.MergeFromString(info['ip_cores'].serialized(request.detail_level, request.ip_names))
+        return response
     
     # MMIO operations - SEMPLIFICATO!
     def CreateMMIO(self, request, context):
@@ -148,7 +181,19 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
         except Exception as e:
             logger.error(f"CreateMMIO error: {e}")
             context.abort(grpc.StatusCode.INTERNAL, str(e))
-    
+
+    def ReleaseMMIO(self, request, context):
+        """Rilascia un handle MMIO (la finestra mappata resta finché ha altri handle)"""
+        tenant_id = self._get_tenant_id(context)
+
+        try:
+            self.resource_manager.release_mmio(tenant_id, request.handle)
+            return pb2.Empty()
+
+        except Exception as e:
+            logger.error(f"ReleaseMMIO error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+
     def MMIORead(self, request, context):
         """Leggi da MMIO"""
         tenant_id = self._get_tenant_id(context)
@@ -169,9 +214,8 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
     
     def MMIOWrite(self, request, context):
         """Scrivi su MMIO"""
-        t0 = time.perf_counter()
         tenant_id = self._get_tenant_id(context)
-        t1 = time.perf_counter()
+        
         try:
             self.resource_manager.mmio_write(
                 tenant_id,
@@ -179,14 +223,130 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
                 request.offset,
                 request.value
             )
-            t2 = time.perf_counter()
-            logger.info(f"MMIO Write timing: auth={(t1-t0)*1000:.2f}ms, write={(t2-t1)*1000:.2f}ms")
             return pb2.Empty()
             
         except Exception as e:
             logger.error(f"MMIOWrite error: {e}")
             context.abort(grpc.StatusCode.INTERNAL, str(e))
     
+    def MMIOStream(self, request_iterator, context):
+        """Canale registri bidirezionale: auth una volta, poi un frame per accesso"""
+        tenant_id = self._get_tenant_id(context)
+        
+        for request in request_iterator:
+            response = self._mmio_stream_op(tenant_id, request)
+            if response is not None:
+                yield response
+    
+    def _mmio_stream_op(self, tenant_id: str, request):
+        """Esegue un frame di MMIOStream; None per le WRITE riuscite senza ack"""
+        try:
+            if request.op == pb2.MMIO_STREAM_WRITE:
+                self.resource_manager.mmio_write(tenant_id, request.handle, request.offset, request.value)
+                if not request.ack:
+                    return None
+                return pb2.MMIOStreamResponse(seq=request.seq, ok=True)
+            
+            if request.op == pb2.MMIO_STREAM_READ:
+                value = self.resource_manager.mmio_read(tenant_id, request.handle, request.offset, 4)
+                return pb2.MMIOStreamResponse(seq=request.seq, ok=True, value=value)
+            
+            if request.op == pb2.MMIO_STREAM_POLL:
+                return self._mmio_stream_poll(tenant_id, request)
+            
+            if request.op == pb2.MMIO_STREAM_FENCE:
+                return pb2.MMIOStreamResponse(seq=request.seq, ok=True)
+            
+            raise ValueError(f"Unknown MMIOStream op {request.op}")
+            
+        except Exception as e:
+            logger.error(f"MMIOStream error: {e}")
+            return pb2.MMIOStreamResponse(seq=request.seq, ok=False, error=str(e))
+    
+    def _mmio_stream_poll(self, tenant_id: str, request):
+        """Attende (reg & mask) == value entro timeout_us"""
+        timeout_us = min(request.timeout_us, MMIO_STREAM_MAX_POLL_US)
+        deadline = time.monotonic() + timeout_us / 1e6
+        mask = request.mask
+        expected = request.value & mask
+        backoff = _POLL_BACKOFF_MIN
+        reads = 0
+        
+        while True:
+            value = self.resource_manager.mmio_read(tenant_id, request.handle, request.offset, 4)
+            if value & mask == expected:
+                return pb2.MMIOStreamResponse(seq=request.seq, ok=True, value=value)
+            if time.monotonic() >= deadline:
+                return pb2.MMIOStreamResponse(seq=request.seq, ok=False, value=value,
+                                              timeout=True, error="POLL timeout")
+            reads += 1
+            if reads > _POLL_SPIN_READS:
+                time.sleep(backoff)
+                backoff = min(backoff * 2, _POLL_BACKOFF_MAX)
+    
+    def MMIOReadBlock(self, request, context):
+        """Leggi un blocco di registri a 32 bit contigui"""
+        tenant_id = self._get_tenant_id(context)
+        
+        try:
+            words = self.resource_manager.mmio_read_block(
+                tenant_id,
+                request.handle,
+                request.offset,
+                request.count
+            )
+            
+            return pb2.MMIOReadBlockResponse(data=words.astype('<u4', copy=False).tobytes())
+            
+        except Exception as e:
+            logger.error(f"MMIOReadBlock error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
+    def MMIOWriteBlock(self, request, context):
+        """Scrivi un blocco di registri a 32 bit contigui"""
+        tenant_id = self._get_tenant_id(context)
+        
+        if len(request.data) % 4 != 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Block data must be a multiple of 4 bytes")
+        
+        try:
+            self.resource_manager.mmio_write_block(
+                tenant_id,
+                request.handle,
+                request.offset,
+                np.frombuffer(request.data, dtype='<u4')
+            )
+            return pb2.Empty()
+            
+        except Exception as e:
+            logger.error(f"MMIOWriteBlock error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
+    def BatchMMIO(self, request, context):
+        """Sequenza di letture/scritture registri in una sola RPC"""
+        tenant_id = self._get_tenant_id(context)
+        
+        if not request.values and pb2.MMIO_BATCH_WRITE in request.ops:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Batch write ops need a value for every op")
+        
+        try:
+            values, ok, error = self.resource_manager.mmio_batch(
+                tenant_id,
+                list(request.handles),
+                request.handle_index,
+                request.ops,
+                request.offsets,
+                request.values,
+                request.continue_on_error
+            )
+            if error:
+                logger.warning(f"BatchMMIO from {tenant_id}: {error}")
+            return pb2.BatchMMIOResponse(values=values, ok=ok, error=error)
+            
+        except Exception as e:
+            logger.error(f"BatchMMIO error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
     # Buffer operations
     def AllocateBuffer(self, request, context):
         """Alloca buffer e ritorna info per il client"""
@@ -230,6 +390,11 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
         tenant_id = self._get_tenant_id(context)
         
         try:
+            # Versione letta prima dei dati: una scrittura concorrente la fa solo invecchiare
+            version = self.resource_manager.buffer_version(tenant_id, request.handle)
+            if request.known_version and request.known_version == version:
+                return pb2.ReadBufferResponse(version=version, not_modified=True)
+            
             data = self.resource_manager.read_buffer(
                 tenant_id,
                 request.handle,
@@ -237,7 +402,7 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
                 request.length
             )
             
-            return pb2.ReadBufferResponse(data=data)
+            return pb2.ReadBufferResponse(data=data, version=version)
             
         except Exception as e:
             logger.error(f"ReadBuffer error: {e}")
@@ -248,24 +413,98 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
         tenant_id = self._get_tenant_id(context)
         
         try:
-            self.resource_manager.write_buffer(
+            previous, version = self.resource_manager.write_buffer(
                 tenant_id,
                 request.handle,
                 request.data,
                 request.offset
             )
             
-            return pb2.Empty()
+            return pb2.WriteBufferResponse(version=version, previous_version=previous)
             
         except Exception as e:
             logger.error(f"WriteBuffer error: {e}")
             context.abort(grpc.StatusCode.INTERNAL, str(e))
     
+    def ReadBufferStream(self, request, context):
+        """Leggi dati da buffer a chunk: in memoria c'è un chunk alla volta"""
+        tenant_id = self._get_tenant_id(context)
+        
+        try:
+            version = self.resource_manager.buffer_version(tenant_id, request.handle)
+            if request.known_version and request.known_version == version:
+                yield pb2.BufferChunk(version=version, not_modified=True)
+                return
+            
+            for offset, length in self._buffer_chunks(request):
+                data = self.resource_manager.read_buffer(tenant_id, request.handle, offset, length)
+                yield pb2.BufferChunk(offset=offset, data=data, version=version)
+                
+        except Exception as e:
+            logger.error(f"ReadBufferStream error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
+    def WriteBufferStream(self, request_iterator, context):
+        """Scrivi dati in buffer a chunk, man mano che arrivano"""
+        tenant_id = self._get_tenant_id(context)
+        handle = ''
+        response = None
+        
+        try:
+            for chunk in request_iterator:
+                handle, previous, version = self._write_buffer_chunk(tenant_id, handle, chunk)
+                response = self._chain_write_versions(response, previous, version)
+            
+            return response or pb2.WriteBufferResponse()
+            
+        except Exception as e:
+            logger.error(f"WriteBufferStream error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
+    @staticmethod
+    def _buffer_chunks(request):
+        """(offset, length) dei chunk di una ReadBufferRequest"""
+        chunk_size = min(request.chunk_size or BUFFER_CHUNK_SIZE, BUFFER_CHUNK_MAX)
+        end = request.offset + request.length
+        for offset in range(request.offset, end, chunk_size):
+            yield offset, min(chunk_size, end - offset)
+    
+    def _write_buffer_chunk(self, tenant_id: str, handle: str, chunk) -> Tuple[str, int, int]:
+        """Scrive un chunk di WriteBufferStream; ritorna (handle dello stream, versione precedente, nuova)"""
+        handle = chunk.handle or handle
+        if not handle:
+            raise Exception("First chunk must carry the buffer handle")
+        if len(chunk.data) > BUFFER_CHUNK_MAX:
+            raise Exception(f"Chunk of {len(chunk.data)} bytes exceeds {BUFFER_CHUNK_MAX}")
+        
+        previous, version = self.resource_manager.write_buffer(tenant_id, handle, chunk.data, chunk.offset)
+        return handle, previous, version
+    
+    @staticmethod
+    def _chain_write_versions(response, previous: int, version: int):
+        """
+        WriteBufferResponse dello stream dopo un altro chunk: la versione
+        precedente resta quella del primo chunk solo se nessun'altra scrittura
+        si è inserita tra due chunk.
+        """
+        if response is None:
+            return pb2.WriteBufferResponse(version=version, previous_version=previous)
+        if previous != response.version:
+            response.previous_version = 0
+        response.version = version
+        return response
+    
     def FreeBuffer(self, request, context):
-        """Libera buffer - TODO"""
+        """Libera un buffer (sulla board torna nel pool dei buffer CMA)"""
         tenant_id = self._get_tenant_id(context)
-        # TODO: Implementare deallocazione buffer
-        return pb2.Empty()
+        
+        try:
+            self.resource_manager.free_buffer(tenant_id, request.handle)
+            return pb2.Empty()
+            
+        except Exception as e:
+            logger.error(f"FreeBuffer error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
     
     def CreateDMA(self, request, context):
         """Crea DMA handle - SEMPLIFICATO!"""
@@ -291,16 +530,83 @@ class PYNQServicer(pb2_grpc.PYNQServiceServicer):
             context.abort(grpc.StatusCode.INTERNAL, str(e))
     
     def DMATransfer(self, request, context):
-        """Esegui trasferimento DMA - TODO"""
+        """Accoda un trasferimento DMA; con wait attende che termini"""
         tenant_id = self._get_tenant_id(context)
-        # TODO: Implementare trasferimento DMA
-        return pb2.DMATransferResponse(transfer_id="transfer_todo")
+        
+        try:
+            transfer = self.resource_manager.dma_transfer(
+                tenant_id,
+                request.dma_handle,
+                request.direction,
+                request.buffer_handle,
+                request.length,
+                wait=request.wait,
+                timeout_ms=request.timeout_ms
+            )
+            
+            return pb2.DMATransferResponse(
+                transfer_id=transfer.transfer_id,
+                status=transfer.status,
+                bytes_transferred=transfer.bytes_transferred,
+                error=transfer.error
+            )
+            
+        except Exception as e:
+            logger.error(f"DMATransfer error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
     
     def GetDMAStatus(self, request, context):
-        """Ottieni stato DMA - TODO"""
+        """Stato di un trasferimento DMA (con timeout_ms attende che termini)"""
         tenant_id = self._get_tenant_id(context)
-        # TODO: Implementare stato DMA
-        return pb2.GetDMAStatusResponse(status=0)
+        
+        try:
+            transfer = self.resource_manager.get_dma_status(
+                tenant_id, request.transfer_id, request.timeout_ms)
+            
+            return pb2.GetDMAStatusResponse(
+                status=transfer.status,
+                bytes_transferred=transfer.bytes_transferred,
+                error=transfer.error
+            )
+            
+        except Exception as e:
+            logger.error(f"GetDMAStatus error: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
+    def WatchCompletions(self, request, context):
+        """Stream dei trasferimenti DMA del tenant che terminano"""
+        tenant_id = self._get_tenant_id(context)
+        
+        try:
+            watcher = self.resource_manager.dma_engine.subscribe(tenant_id)
+        except Exception as e:
+            logger.error(f"WatchCompletions error: {e}")
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        
+        context.add_callback(watcher.close)
+        try:
+            yield pb2.CompletionBatch()
+            while context.is_active() and not watcher.closed:
+                batch, overflow = watcher.next_batch(WATCH_IDLE_CHECK)
+                if batch or overflow:
+                    yield self._completion_batch(batch, overflow)
+        finally:
+            watcher.close()
+    
+    @staticmethod
+    def _completion_batch(batch, overflow: bool):
+        return pb2.CompletionBatch(
+            completions=[
+                pb2.DMACompletion(
+                    transfer_id=transfer.transfer_id,
+                    status=transfer.status,
+                    bytes_transferred=transfer.bytes_transferred,
+                    error=transfer.error
+                )
+                for transfer in batch
+            ],
+            overflow=overflow
+        )
     
     def CleanupResources(self, request, context):
         """Pulisci tutte le risorse del tenant corrente"""
@@ -0,0 +1,312 @@
+# hypervisor/tenant_executor.py
+"""
+Executor condiviso dai server gRPC dei tenant.
+
+Un solo pool di worker limitato serve le RPC di tutti i tenant. Ogni tenant
+ha la propria coda FIFO: i worker prendono il lavoro dai tenant a rotazione
+e un tenant non occupa mai più di max_per_tenant worker, quindi un tenant
+con molte RPC lente non può affamare gli altri (le sue RPC in eccesso
+restano in coda, non vengono rifiutate).
+
+Le RPC in streaming (MMIOStream, ReadBufferStream, WriteBufferStream,
+WatchCompletions) restano aperte finché il client le chiude e per quasi tutto
+il tempo attendono il client: nel pool occuperebbero un worker e un posto del
+tenant per l'intera durata. StreamExecutorInterceptor le esegue invece su
+StreamThreadExecutor, un thread per stream fuori dal pool, con un limite
+globale e uno per tenant: gli stream oltre i limiti vengono rifiutati.
+"""
+
+import itertools
+import threading
+import logging
+from collections import deque
+from concurrent import futures
+from typing import Dict
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+
+class FairTenantExecutor:
+    """Pool di worker con code per tenant servite a rotazione"""
+
+    def __init__(self, max_workers: int = 8, max_per_tenant: int = 4,
+                 thread_name_prefix: str = "TenantRPC"):
+        self.max_workers = max(1, max_workers)
+        self.max_per_tenant = max(1, min(max_per_tenant, self.max_workers))
+
+        self._cond = threading.Condition()
+        # tenant_id -> deque di (future, fn, args, kwargs)
+        self._queues: Dict[str, deque] = {}
+        # tenant_id -> RPC in esecuzione
+        self._running: Dict[str, int] = {}
+        # Tenant con lavoro in coda e sotto il limite, nell'ordine in cui verranno serviti
+        self._ready = deque()
+        self._in_ready = set()
+
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"{thread_name_prefix}-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def executor_for(self, tenant_id: str) -> futures.Executor:
+        """Executor da passare a grpc.server() per il socket di un tenant"""
+        return _TenantExecutorView(self, tenant_id)
+
+    def submit(self, tenant_id: str, fn, *args, **kwargs) -> futures.Future:
+        future = futures.Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+
+            queue = self._queues.get(tenant_id)
+            if queue is None:
+                queue = self._queues[tenant_id] = deque()
+                self._running[tenant_id] = 0
+            queue.append((future, fn, args, kwargs))
+            if self._mark_ready(tenant_id):
+                self._cond.notify()
+        return future
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """RPC in esecuzione e in coda per tenant"""
+        with self._cond:
+            return {
+                tenant_id: {'running': self._running[tenant_id], 'queued': len(queue)}
+                for tenant_id, queue in self._queues.items()
+            }
+
+    def shutdown(self, wait: bool = True):
+        with self._cond:
+            self._shutdown = True
+            # Le RPC ancora in coda non partiranno più
+            for queue in self._queues.values():
+                while queue:
+                    queue.popleft()[0].cancel()
+            self._ready.clear()
+            self._in_ready.clear()
+            self._cond.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _mark_ready(self, tenant_id: str) -> bool:
+        """
+        Accoda il tenant alla rotazione se ha lavoro e sta sotto il limite (lock acquisito).
+
+        Returns:
+            True se il tenant è stato accodato
+        """
+        if (tenant_id in self._in_ready or not self._queues[tenant_id]
+                or self._running[tenant_id] >= self.max_per_tenant):
+            return False
+        self._ready.append(tenant_id)
+        self._in_ready.add(tenant_id)
+        return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._ready and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown:
+                    return
+
+                tenant_id = self._ready.popleft()
+                self._in_ready.discard(tenant_id)
+                future, fn, args, kwargs = self._queues[tenant_id].popleft()
+                self._running[tenant_id] += 1
+                # Il tenant torna in fondo alla rotazione
+                if self._mark_ready(tenant_id):
+                    self._cond.notify()
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+                    logger.debug(f"RPC task for {tenant_id} raised: {e}")
+
+            with self._cond:
+                self._running[tenant_id] -= 1
+                if self._mark_ready(tenant_id):
+                    self._cond.notify()
+
+
+class _TenantExecutorView(futures.Executor):
+    """Vista di FairTenantExecutor legata a un tenant (il pool resta del server)"""
+
+    def __init__(self, shared: FairTenantExecutor, tenant_id: str):
+        self._shared = shared
+        self.tenant_id = tenant_id
+
+    def submit(self, fn, *args, **kwargs):
+        return self._shared.submit(self.tenant_id, fn, *args, **kwargs)
+
+    def shutdown(self, wait=True, **kwargs):
+        pass
+
+
+class StreamThreadExecutor:
+    """
+    Un thread per RPC in streaming, con un limite globale e uno per tenant.
+
+    StreamExecutorInterceptor prenota il posto quando arriva la RPC (oltre i
+    limiti la rifiuta con RESOURCE_EXHAUSTED) e grpc avvia lo stream sulla
+    vista del tenant, che rilascia il posto quando il thread termina.
+    """
+
+    def __init__(self, max_streams: int = 32, max_per_tenant: int = 8,
+                 thread_name_prefix: str = "TenantStream"):
+        self.max_streams = max(1, max_streams)
+        self.max_per_tenant = max(1, min(max_per_tenant, self.max_streams))
+        self._name_prefix = thread_name_prefix
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        # tenant_id -> stream prenotati o in esecuzione
+        self._streams: Dict[str, int] = {}
+        self._views: Dict[str, _TenantStreamView] = {}
+        self._threads = set()
+        self._shutdown = False
+        self.active = 0
+        self.rejected = 0
+
+    def acquire(self, tenant_id: str) -> bool:
+        """Prenota un thread per uno stream del tenant (False oltre i limiti o dopo shutdown)"""
+        with self._lock:
+            streams = self._streams.get(tenant_id, 0)
+            if (self._shutdown or self.active >= self.max_streams
+                    or streams >= self.max_per_tenant):
+                self.rejected += 1
+                return False
+            self._streams[tenant_id] = streams + 1
+            self.active += 1
+            return True
+
+    def release(self, tenant_id: str):
+        with self._lock:
+            self._streams[tenant_id] -= 1
+            self.active -= 1
+
+    @property
+    def closed(self) -> bool:
+        return self._shutdown
+
+    def executor_for(self, tenant_id: str) -> futures.ThreadPoolExecutor:
+        """Pool da assegnare (experimental_thread_pool) agli stream del tenant"""
+        with self._lock:
+            view = self._views.get(tenant_id)
+            if view is None:
+                view = self._views[tenant_id] = _TenantStreamView(self, tenant_id)
+            return view
+
+    def stats(self) -> Dict[str, int]:
+        """Stream in esecuzione per tenant"""
+        with self._lock:
+            return {tenant_id: count for tenant_id, count in self._streams.items() if count}
+
+    def shutdown(self, wait: bool = True):
+        """Nessuno stream nuovo; con wait attende quelli in corso (terminano con lo stop del server)"""
+        with self._lock:
+            self._shutdown = True
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _start(self, tenant_id: str, fn, args, kwargs) -> futures.Future:
+        future = futures.Future()
+        thread = threading.Thread(
+            target=self._run, args=(tenant_id, future, fn, args, kwargs),
+            name=f"{self._name_prefix}-{next(self._ids)}", daemon=True
+        )
+        with self._lock:
+            self._threads.add(thread)
+        thread.start()
+        return future
+
+    def _run(self, tenant_id, future, fn, args, kwargs):
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+                    logger.debug(f"Stream RPC of {tenant_id} raised: {e}")
+        finally:
+            self.release(tenant_id)
+            with self._lock:
+                self._threads.discard(threading.current_thread())
+
+
+class _TenantStreamView(futures.ThreadPoolExecutor):
+    """
+    Vista di StreamThreadExecutor legata a un tenant. Deriva da ThreadPoolExecutor
+    solo perché grpc accetta come pool di un handler (experimental_thread_pool)
+    soltanto istanze di quella classe; non crea thread propri.
+    """
+
+    def __init__(self, shared: StreamThreadExecutor, tenant_id: str):
+        super().__init__(max_workers=1)
+        self._shared = shared
+        self.tenant_id = tenant_id
+
+    def submit(self, fn, *args, **kwargs):
+        # Il posto è già stato prenotato da StreamExecutorInterceptor
+        return self._shared._start(self.tenant_id, fn, args, kwargs)
+
+    def shutdown(self, wait=True, **kwargs):
+        pass
+
+
+def _on_executor(behavior, executor: futures.ThreadPoolExecutor):
+    """Handler eseguito da grpc su executor invece che sul pool del server"""
+    def wrapped(request, context):
+        return behavior(request, context)
+    wrapped.experimental_thread_pool = executor
+    return wrapped
+
+
+def _rejected(code: grpc.StatusCode, details: str):
+    def behavior(request, context):
+        context.abort(code, details)
+    return behavior
+
+
+class StreamExecutorInterceptor(grpc.ServerInterceptor):
+    """
+    Sposta le RPC in streaming del tenant su StreamThreadExecutor, entro i suoi
+    limiti (va messo primo nella lista)
+    """
+
+    def __init__(self, executor: StreamThreadExecutor, tenant_id: str):
+        self.executor = executor
+        self.tenant_id = tenant_id
+        self._pool = executor.executor_for(tenant_id)
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or not (handler.request_streaming or handler.response_streaming):
+            return handler
+
+        if self.executor.acquire(self.tenant_id):
+            wrap = lambda behavior: _on_executor(behavior, self._pool)
+        elif self.executor.closed:
+            reject = _rejected(grpc.StatusCode.UNAVAILABLE, 'Server shutting down')
+            wrap = lambda behavior: reject
+        else:
+            logger.warning(f"Stream limit reached for {self.tenant_id}: {handler_call_details.method} rejected")
+            reject = _rejected(grpc.StatusCode.RESOURCE_EXHAUSTED, 'Too many concurrent streams')
+            wrap = lambda behavior: reject
+
+        if handler.unary_stream:
+            return handler._replace(unary_stream=wrap(handler.unary_stream))
+        if handler.stream_unary:
+            return handler._replace(stream_unary=wrap(handler.stream_unary))
+        return handler._replace(stream_stream=wrap(handler.stream_stream))
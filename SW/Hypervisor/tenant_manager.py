@@ -1,7 +1,8 @@
 # hypervisor/tenant_manager.py
 import threading
 import time
-from typing import Dict, Optional, Set
+from types import MappingProxyType
+from typing import Dict, Optional, Set, Tuple, Mapping
 from dataclasses import dataclass, field
 import logging
 from config import TenantConfig
@@ -27,6 +28,9 @@ class TenantManager:
     def __init__(self, config: Dict[str, TenantConfig]):
         self.config = config
         self.sessions: Dict[str, TenantSession] = {}
+        # Snapshot immutabile token -> (tenant_id, expires_at) letto senza lock
+        # dal percorso caldo; ogni modifica delle sessioni pubblica un nuovo snapshot
+        self._token_snapshot: Mapping[str, Tuple[str, float]] = MappingProxyType({})
         self.resources: Dict[str, TenantResources] = {}
         self._lock = threading.RLock()
         
@@ -61,24 +65,36 @@ class TenantManager:
             )
             
             self.sessions[token] = session
+            self._publish_sessions()
             logger.info(f"Authentication successful for tenant {tenant_id}")
             return token
     
-    def validate_token(self, token: str) -> Optional[str]:
-        """Valida token e ritorna tenant_id"""
+    def lookup_token(self, token: str) -> Optional[str]:
+        """Valida token e ritorna tenant_id, senza lock: legge lo snapshot corrente"""
+        entry = self._token_snapshot.get(token)
+        if entry is None or time.time() > entry[1]:
+            return None
+        return entry[0]
+    
+    def revoke_tenant_sessions(self, tenant_id: str):
+        """Revoca tutte le sessioni di un tenant (es. tenant rimosso)"""
         with self._lock:
-            session = self.sessions.get(token)
-            if not session:
-                logger.debug(f"Token validation failed: token not found")
-                return None
-                
-            if time.time() > session.expires_at:
+            tokens = [t for t, s in self.sessions.items() if s.tenant_id == tenant_id]
+            for token in tokens:
                 del self.sessions[token]
-                logger.debug(f"Token validation failed: token expired for tenant {session.tenant_id}")
-                return None
-            
-            logger.debug(f"Token validated for tenant {session.tenant_id}")
-            return session.tenant_id
+            if tokens:
+                self._publish_sessions()
+                logger.info(f"Revoked {len(tokens)} sessions of tenant {tenant_id}")
+    
+    def _publish_sessions(self):
+        """Sostituisce lo snapshot dei token scartando le sessioni scadute (lock acquisito)"""
+        now = time.time()
+        for token in [t for t, s in self.sessions.items() if now > s.expires_at]:
+            del self.sessions[token]
+        self._token_snapshot = MappingProxyType({
+            token: (session.tenant_id, session.expires_at)
+            for token, session in self.sessions.items()
+        })
     
     def can_allocate_overlay(self, tenant_id: str) -> bool:
         """Controlla se il tenant può allocare un altro overlay"""
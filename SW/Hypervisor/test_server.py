@@ -4,13 +4,38 @@
 import grpc
 import sys
 import os
+import socket
+import tempfile
+import time
+
+import numpy as np
 
 # Aggiungi path per i proto
 sys.path.append(os.path.join(os.path.dirname(__file__), 'Proto', 'generated'))
 sys.path.append('../Proto/generated')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Proto', 'generated'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import pynq_service_pb2 as pb2
 import pynq_service_pb2_grpc as pb2_grpc
 
+from config import TenantConfig
+from tenant_manager import TenantManager
+from mock_resource_manager import MockResourceManager
+from fast_mmio_server import UltraFastMMIOServer
+from servicer import PYNQServicer, BUFFER_CHUNK_SIZE, BUFFER_CHUNK_MAX
+from auth_interceptor import AuthInterceptor
+from tenant_executor import FairTenantExecutor, StreamThreadExecutor, StreamExecutorInterceptor
+from buffer_pool import BufferPool
+from dma_engine import MAX_PENDING_COMPLETIONS, MAX_COMPLETION_BATCH
+from fast_mmio_protocol import (
+    PROTOCOL_VERSION, OP_HELLO, OP_BIND, OP_WRITE_SLOT, OP_READ_SLOT, OP_READ_BLOCK, OP_EXEC,
+    FLAG_NONE, FLAG_ACK, STATUS_OK, STATUS_ERROR, STATUS_TIMEOUT, HEADER, INSN, INSN_POLL,
+    MAX_READER_BUFFER, ProtocolError,
+    HELLO_FRAME, HELLO_PAYLOAD, BIND_FRAME, BIND_PAYLOAD, WRITE_SLOT_FRAME, WRITE_SLOT_PAYLOAD,
+    READ_SLOT_FRAME, READ_SLOT_PAYLOAD, READ_BLOCK_FRAME, READ_BLOCK_PAYLOAD, U16, U32,
+    FrameReader, FrameWriter, encode_handle
+)
+
 def test_basic():
     print("=== PYNQ Multi-tenant Test ===\n")
     
@@ -151,5 +176,754 @@ def test_basic():
     
     print("=== Test completed! ===")
 
+# --- Test sul backend mock (nessun server esterno, nessuna board) ---
+
+MOCK_TENANT = 'tenant1'
+MOCK_BASE = 0xA0000000
+
+
+def _mock_fast_server(mode: str):
+    """TenantManager, MockResourceManager e fast path avviato in una directory temporanea"""
+    tenant_manager = TenantManager({
+        MOCK_TENANT: TenantConfig(tenant_id=MOCK_TENANT, uid=os.getuid(), gid=os.getgid(), api_key='')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    server = UltraFastMMIOServer(resource_manager, tenant_manager,
+                                 socket_dir=tempfile.mkdtemp(), mode=mode)
+    server.start()
+    return tenant_manager, resource_manager, server
+
+
+def _mock_grpc_server(tenant_manager, resource_manager, tenant_id: str, executor=None, interceptors=(),
+                      options=()):
+    """Server gRPC sincrono del tenant su un socket UDS temporaneo: (server, stub, metadata)"""
+    server = grpc.server(executor or FairTenantExecutor(max_workers=4).executor_for(tenant_id),
+                         interceptors=list(interceptors) + [AuthInterceptor(tenant_manager, tenant_id)],
+                         options=list(options))
+    pb2_grpc.add_PYNQServiceServicer_to_server(
+        PYNQServicer(tenant_manager, resource_manager, tenant_id=tenant_id), server)
+    address = f"unix://{tempfile.mkdtemp()}/{tenant_id}.sock"
+    server.add_insecure_port(address)
+    server.start()
+    stub = pb2_grpc.PYNQServiceStub(grpc.insecure_channel(address))
+    return server, stub, [('auth-token', tenant_manager.authenticate(tenant_id, ''))]
+
+
+class _RawFastClient:
+    """Frame del fast path scritti a mano, senza il client del proxy"""
+
+    def __init__(self, socket_path: str):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.reader = FrameReader(capacity=64)
+        payload = self.request(HELLO_FRAME, HELLO_PAYLOAD.size, OP_HELLO, FLAG_NONE, PROTOCOL_VERSION)
+        assert self.reader.op == OP_HELLO and self.reader.flags == STATUS_OK
+        assert U16.unpack_from(self.reader.buf, payload)[0] == PROTOCOL_VERSION
+
+    def request(self, frame, size: int, op: int, flags: int, *fields) -> int:
+        """Invia un frame (tag 7) e ritorna l'offset del payload della risposta"""
+        self.sock.sendall(frame.pack(size, op, flags, 7, *fields))
+        payload = self.reader.read_frame(self.sock)
+        assert self.reader.tag == 7
+        return payload
+
+    def bind(self, handle: str) -> int:
+        payload = self.request(BIND_FRAME, BIND_PAYLOAD.size, OP_BIND, FLAG_NONE, encode_handle(handle))
+        assert self.reader.flags == STATUS_OK
+        return U16.unpack_from(self.reader.buf, payload)[0]
+
+    def read(self, slot: int, offset: int):
+        """(status, valore) di un READ_SLOT"""
+        payload = self.request(READ_SLOT_FRAME, READ_SLOT_PAYLOAD.size, OP_READ_SLOT, FLAG_NONE, slot, offset)
+        if self.reader.flags != STATUS_OK:
+            return self.reader.flags, None
+        return STATUS_OK, U32.unpack_from(self.reader.buf, payload)[0]
+
+    def close(self):
+        self.sock.close()
+
+
+def test_fast_protocol_roundtrip():
+    print("=== Fast MMIO protocol round-trip ===\n")
+
+    # 1. Codec: frame spezzati in pezzi da 3 byte in un FrameReader che deve crescere
+    print("1. Reassembling split frames...")
+    frames = (WRITE_SLOT_FRAME.pack(WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_ACK, 1, 3, 0x10, 0xCAFEBABE)
+              + READ_BLOCK_FRAME.pack(READ_BLOCK_PAYLOAD.size, OP_READ_BLOCK, FLAG_NONE, 2, 3, 0x20, 4))
+    writer = FrameWriter(capacity=16)
+    writer.u32(OP_READ_SLOT, STATUS_OK, 3, 0xDEADBEEF)
+    writer.program_reply(OP_READ_SLOT, STATUS_ERROR, 4, 1, [5, 6])
+    frames += bytes(writer.view[:writer.end])
+
+    left, right = socket.socketpair()
+    reader = FrameReader(capacity=8)
+    for i in range(0, len(frames), 3):
+        left.sendall(frames[i:i + 3])
+        reader.recv_from(right)
+    left.close()
+
+    decoded = []
+    payload = reader.next_frame()
+    while payload >= 0:
+        decoded.append((reader.op, reader.flags, reader.tag, bytes(reader.buf[payload:payload + reader.length])))
+        payload = reader.next_frame()
+    right.close()
+
+    assert [frame[:3] for frame in decoded] == [
+        (OP_WRITE_SLOT, FLAG_ACK, 1), (OP_READ_BLOCK, FLAG_NONE, 2),
+        (OP_READ_SLOT, STATUS_OK, 3), (OP_READ_SLOT, STATUS_ERROR, 4)]
+    assert WRITE_SLOT_PAYLOAD.unpack(decoded[0][3]) == (3, 0x10, 0xCAFEBABE)
+    assert READ_BLOCK_PAYLOAD.unpack(decoded[1][3]) == (3, 0x20, 4)
+    assert U32.unpack(decoded[2][3]) == (0xDEADBEEF,)
+    assert decoded[3][3] == U16.pack(1) + U32.pack(5) + U32.pack(6)
+    print(f"✅ {len(decoded)} frames decoded\n")
+
+    # 2. Stessi frame contro il server, in entrambe le modalità
+    for mode in ('threaded', 'event_loop'):
+        print(f"2. HELLO / BIND / WRITE_SLOT / READ_SLOT ({mode})...")
+        _, resource_manager, server = _mock_fast_server(mode)
+        try:
+            handle = resource_manager.create_mmio(MOCK_TENANT, MOCK_BASE, 0x1000)
+            client = _RawFastClient(server.socket_path_for(MOCK_TENANT))
+            slot = client.bind(handle)
+
+            client.request(WRITE_SLOT_FRAME, WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_ACK,
+                           slot, 0x10, 0xCAFEBABE)
+            assert client.reader.op == OP_WRITE_SLOT and client.reader.flags == STATUS_OK
+            assert client.read(slot, 0x10) == (STATUS_OK, 0xCAFEBABE)
+            # Fuori dai limiti dell'handle
+            assert client.read(slot, 0x1000)[0] == STATUS_ERROR
+            client.close()
+            print("✅ Round-trip OK\n")
+        finally:
+            server.stop()
+
+
+def test_slot_revocation():
+    print("=== Fast MMIO slot revocation ===\n")
+
+    for mode in ('threaded', 'event_loop'):
+        print(f"1. Releasing an MMIO bumps mmio_epoch ({mode})...")
+        _, resource_manager, server = _mock_fast_server(mode)
+        try:
+            kept = resource_manager.create_mmio(MOCK_TENANT, MOCK_BASE, 0x1000)
+            released = resource_manager.create_mmio(MOCK_TENANT, MOCK_BASE + 0x1000, 0x1000)
+            client = _RawFastClient(server.socket_path_for(MOCK_TENANT))
+            kept_slot = client.bind(kept)
+            released_slot = client.bind(released)
+            assert client.read(released_slot, 0)[0] == STATUS_OK
+
+            epoch = resource_manager.mmio_epoch
+            resource_manager.release_mmio(MOCK_TENANT, released)
+            assert resource_manager.mmio_epoch != epoch
+
+            # Lo slot rilasciato è revocato, l'altro viene rivalidato e resta valido
+            assert client.read(released_slot, 0)[0] == STATUS_ERROR
+            assert client.read(released_slot, 0)[0] == STATUS_ERROR
+            assert client.read(kept_slot, 0)[0] == STATUS_OK
+            client.close()
+            print("✅ Released slot revoked, other slot still valid\n")
+        finally:
+            server.stop()
+
+
+def test_exec_offload_backpressure():
+    print("=== Blocking OP_EXEC stops reading the connection ===\n")
+
+    # 1. FrameReader non cresce oltre un frame massimo
+    print("1. FrameReader growth cap...")
+    left, right = socket.socketpair()
+    left.setblocking(False)
+    right.setblocking(False)
+    reader = FrameReader(capacity=4096)
+    frame = WRITE_SLOT_FRAME.pack(WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_NONE, 0, 0, 0, 0)
+    capped = False
+    while not capped:
+        # Frame completi mai consumati: il buffer cresce fino al limite
+        try:
+            left.send(frame * 4096)
+        except BlockingIOError:
+            pass
+        try:
+            while True:
+                reader.recv_from(right)
+        except BlockingIOError:
+            pass
+        except ProtocolError:
+            capped = True
+    assert len(reader.buf) == MAX_READER_BUFFER
+    left.close()
+    right.close()
+    print("✅ Buffer capped, ProtocolError raised\n")
+
+    # 2. Un POLL lento fuori dallo shard: i frame successivi restano nel kernel
+    print("2. Flooding frames behind a blocking POLL program...")
+    _, resource_manager, server = _mock_fast_server('event_loop')
+    try:
+        handle = resource_manager.create_mmio(MOCK_TENANT, MOCK_BASE, 0x1000)
+        client = _RawFastClient(server.socket_path_for(MOCK_TENANT))
+        slot = client.bind(handle)
+
+        program = U16.pack(1) + INSN.pack(INSN_POLL, slot, 0x10, 1, 1, 300_000)
+        client.sock.sendall(HEADER.pack(len(program), OP_EXEC, FLAG_NONE, 9) + program)
+        time.sleep(0.05)
+
+        client.sock.setblocking(False)
+        sent = 0
+        deadline = time.monotonic() + 0.2
+        while time.monotonic() < deadline:
+            try:
+                sent += client.sock.send(frame * 1024)
+            except BlockingIOError:
+                time.sleep(0.01)
+        shard = server._shards[0]
+        paused = list(shard._paused)
+        assert len(paused) == 1 and len(paused[0].reader.buf) <= 65536, "connection still read while busy"
+
+        # Esito del programma, poi i frame in coda vengono serviti
+        client.sock.setblocking(True)
+        client.reader.read_frame(client.sock)
+        assert client.reader.op == OP_EXEC and client.reader.flags == STATUS_TIMEOUT
+        client.sock.sendall(WRITE_SLOT_FRAME.pack(WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_NONE, 0,
+                                                  slot, 0x20, 0x5A5A))
+        assert client.read(slot, 0x20) == (STATUS_OK, 0x5A5A)
+        assert not shard._paused
+        client.close()
+        print(f"✅ {sent} bytes stayed in the kernel, connection resumed\n")
+    finally:
+        server.stop()
+
+
+def test_stream_limits():
+    print("=== Stream threads: global and per-tenant limits ===\n")
+
+    tenant_manager = TenantManager({
+        tenant: TenantConfig(tenant_id=tenant, uid=os.getuid(), gid=os.getgid(), api_key='')
+        for tenant in ('tenant1', 'tenant2')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    pool = FairTenantExecutor(max_workers=1, max_per_tenant=1)
+    streams = StreamThreadExecutor(max_streams=3, max_per_tenant=2)
+    servers, stubs = [], {}
+    for tenant in ('tenant1', 'tenant2'):
+        server, stub, metadata = _mock_grpc_server(
+            tenant_manager, resource_manager, tenant, pool.executor_for(tenant),
+            [StreamExecutorInterceptor(streams, tenant)])
+        servers.append(server)
+        stubs[tenant] = (stub, metadata)
+
+    def open_watch(tenant):
+        stub, metadata = stubs[tenant]
+        call = stub.WatchCompletions(pb2.WatchCompletionsRequest(), metadata=metadata)
+        try:
+            next(call)
+            return call, None
+        except grpc.RpcError as e:
+            return call, e.code()
+
+    try:
+        print("1. Per-tenant limit...")
+        opened = [open_watch('tenant1') for _ in range(2)]
+        assert all(code is None for _, code in opened)
+        assert open_watch('tenant1')[1] == grpc.StatusCode.RESOURCE_EXHAUSTED
+        print("✅ Third stream of tenant1 rejected")
+
+        print("\n2. Global limit...")
+        call, code = open_watch('tenant2')
+        assert code is None
+        opened.append((call, code))
+        assert open_watch('tenant2')[1] == grpc.StatusCode.RESOURCE_EXHAUSTED
+        assert streams.active == 3 and streams.stats() == {'tenant1': 2, 'tenant2': 1}
+
+        # Gli stream non occupano il pool limitato (un solo worker)
+        stub, metadata = stubs['tenant1']
+        stub.AllocateBuffer(pb2.AllocateBufferRequest(shape=[16], dtype='uint32'), metadata=metadata)
+        print("✅ Global limit enforced, unary RPCs still served")
+
+        print("\n3. Streams closed, then shutdown...")
+        for call, _ in opened:
+            call.cancel()
+        deadline = time.monotonic() + 5
+        while streams.active and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert streams.active == 0
+        call, code = open_watch('tenant1')
+        assert code is None
+        call.cancel()
+        streams.shutdown(wait=True)
+        assert open_watch('tenant1')[1] == grpc.StatusCode.UNAVAILABLE
+        print("✅ Slots released on close, new streams refused after shutdown\n")
+    finally:
+        for server in servers:
+            server.stop(0)
+        pool.shutdown(wait=False)
+
+
+def test_mmio_stream():
+    print("=== MMIOStream: ordered register frames over one stream ===\n")
+
+    tenant_manager = TenantManager({
+        MOCK_TENANT: TenantConfig(tenant_id=MOCK_TENANT, uid=os.getuid(), gid=os.getgid(), api_key='')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    server, stub, metadata = _mock_grpc_server(tenant_manager, resource_manager, MOCK_TENANT)
+    handle = resource_manager.create_mmio(MOCK_TENANT, MOCK_BASE, 0x1000)
+
+    def frame(seq, op, offset=0, value=0, **fields):
+        return pb2.MMIOStreamRequest(seq=seq, op=op, handle=handle, offset=offset, value=value, **fields)
+
+    try:
+        # 1. Risposte solo per READ, POLL, FENCE, WRITE con ack e WRITE fallite, in ordine
+        print("1. Mixed frames...")
+        requests = [
+            frame(1, pb2.MMIO_STREAM_WRITE, 0x10, 5),
+            frame(2, pb2.MMIO_STREAM_WRITE, 0x14, 6, ack=True),
+            frame(3, pb2.MMIO_STREAM_READ, 0x10),
+            frame(4, pb2.MMIO_STREAM_WRITE, 0x2000, 1),            # fuori dalla regione
+            frame(5, pb2.MMIO_STREAM_FENCE),
+            frame(6, pb2.MMIO_STREAM_POLL, 0x14, 6, mask=0xFF, timeout_us=1000),
+            frame(7, pb2.MMIO_STREAM_POLL, 0x14, 7, mask=0xFF, timeout_us=2000),
+        ]
+        responses = list(stub.MMIOStream(iter(requests), metadata=metadata))
+        assert [r.seq for r in responses] == [2, 3, 4, 5, 6, 7]
+        assert responses[0].ok and responses[1].ok and responses[1].value == 5
+        assert not responses[2].ok and responses[2].error
+        assert responses[3].ok
+        assert responses[4].ok and responses[4].value == 6 and not responses[4].timeout
+        assert not responses[5].ok and responses[5].timeout and responses[5].value == 6
+        print("✅ Silent write, ack, read, failed write, fence, poll and poll timeout\n")
+
+        # 2. L'autenticazione vale per tutto lo stream
+        print("2. Stream without token...")
+        try:
+            list(stub.MMIOStream(iter([frame(1, pb2.MMIO_STREAM_READ, 0x10)])))
+            raise AssertionError("MMIOStream accepted without a token")
+        except grpc.RpcError as e:
+            assert e.code() == grpc.StatusCode.UNAUTHENTICATED
+        print("✅ UNAUTHENTICATED\n")
+    finally:
+        server.stop(0)
+
+
+def test_buffer_streams():
+    print("=== Chunked ReadBufferStream / WriteBufferStream ===\n")
+
+    tenant_manager = TenantManager({
+        MOCK_TENANT: TenantConfig(tenant_id=MOCK_TENANT, uid=os.getuid(), gid=os.getgid(), api_key='')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    # Limiti dei messaggi come in server.py: il controllo sui chunk è quello del servicer
+    server, stub, metadata = _mock_grpc_server(tenant_manager, resource_manager, MOCK_TENANT, options=[
+        ('grpc.max_receive_message_length', 100 * 1024 * 1024),
+    ])
+    size = 3 * BUFFER_CHUNK_SIZE + 100
+    data = np.random.default_rng(0).integers(0, 256, size, dtype=np.uint8).tobytes()
+
+    try:
+        handle = stub.AllocateBuffer(pb2.AllocateBufferRequest(shape=[size], dtype='uint8'),
+                                     metadata=metadata).handle
+
+        # 1. Scrittura a chunk: l'handle solo nel primo
+        print("1. WriteBufferStream...")
+        before = resource_manager.buffer_version(MOCK_TENANT, handle)
+        chunks = [pb2.BufferChunk(handle=handle if offset == 0 else '', offset=offset,
+                                  data=data[offset:offset + BUFFER_CHUNK_SIZE])
+                  for offset in range(0, size, BUFFER_CHUNK_SIZE)]
+        response = stub.WriteBufferStream(iter(chunks), metadata=metadata)
+        assert response.previous_version == before
+        assert response.version == resource_manager.buffer_version(MOCK_TENANT, handle) > before
+        assert resource_manager.read_buffer(MOCK_TENANT, handle, 0, size) == data
+        print(f"✅ {len(chunks)} chunks written, version {before} -> {response.version}\n")
+
+        # 2. Lettura a chunk: dimensione richiesta, default del server e limite massimo
+        print("2. ReadBufferStream...")
+        for chunk_size, expected in ((BUFFER_CHUNK_SIZE // 2, BUFFER_CHUNK_SIZE // 2),
+                                     (0, BUFFER_CHUNK_SIZE),
+                                     (64 * BUFFER_CHUNK_MAX, BUFFER_CHUNK_MAX)):
+            request = pb2.ReadBufferRequest(handle=handle, offset=100, length=size - 100,
+                                            chunk_size=chunk_size)
+            received = list(stub.ReadBufferStream(request, metadata=metadata))
+            assert [c.offset for c in received] == list(range(100, size, expected))
+            assert max(len(c.data) for c in received) == min(expected, size - 100)
+            assert b''.join(c.data for c in received) == data[100:]
+            assert {c.version for c in received} == {response.version}
+        print("✅ Chunk sizes honoured and capped\n")
+
+        # 3. Chunk non validi
+        print("3. Invalid chunks...")
+        for bad in ([pb2.BufferChunk(offset=0, data=b'x')],
+                    [pb2.BufferChunk(handle=handle, offset=0, data=bytes(BUFFER_CHUNK_MAX + 1))]):
+            try:
+                stub.WriteBufferStream(iter(bad), metadata=metadata)
+                raise AssertionError("Invalid chunk accepted")
+            except grpc.RpcError as e:
+                assert e.code() == grpc.StatusCode.INTERNAL
+        print("✅ Missing handle and oversized chunk rejected\n")
+    finally:
+        resource_manager.cleanup_tenant_resources(MOCK_TENANT)
+        server.stop(0)
+
+
+def test_batch_mmio():
+    print("=== BatchMMIO: packed register ops in one RPC ===\n")
+
+    tenant_manager = TenantManager({
+        tenant: TenantConfig(tenant_id=tenant, uid=os.getuid(), gid=os.getgid(), api_key='')
+        for tenant in (MOCK_TENANT, 'tenant2')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    server, stub, metadata = _mock_grpc_server(tenant_manager, resource_manager, MOCK_TENANT)
+    ctrl = resource_manager.create_mmio(MOCK_TENANT, MOCK_BASE, 0x1000)
+    data = resource_manager.create_mmio(MOCK_TENANT, MOCK_BASE + 0x1000, 0x1000)
+    foreign = resource_manager.create_mmio('tenant2', MOCK_BASE + 0x2000, 0x1000)
+    W, R = pb2.MMIO_BATCH_WRITE, pb2.MMIO_BATCH_READ
+
+    def batch(handles, ops, **fields):
+        """ops: (indice handle, op, offset, valore)"""
+        return stub.BatchMMIO(pb2.BatchMMIORequest(
+            handles=handles,
+            handle_index=[op[0] for op in ops],
+            ops=[op[1] for op in ops],
+            offsets=[op[2] for op in ops],
+            values=[op[3] for op in ops],
+            **fields
+        ), metadata=metadata)
+
+    def rpc_error(call):
+        try:
+            call()
+        except grpc.RpcError as e:
+            return e.code()
+        raise AssertionError("BatchMMIO accepted an invalid request")
+
+    try:
+        # 1. Setup di un kernel su due handle, poi rilettura nello stesso batch
+        print("1. Kernel setup...")
+        response = batch([ctrl, data], [
+            (1, W, 0x10, 0x1000), (1, W, 0x14, 0), (1, W, 0x1C, 256), (0, W, 0x00, 1),
+            (1, R, 0x10, 0), (0, R, 0x00, 0),
+        ])
+        assert list(response.ok) == [True] * 6 and not response.error
+        assert list(response.values) == [0, 0, 0, 0, 0x1000, 1]
+        assert resource_manager.mmio_read(MOCK_TENANT, data, 0x1C, 4) == 256
+        print("✅ 6 ops, 2 handles, one RPC\n")
+
+        # 2. Alla prima op fallita il batch si ferma, a meno di continue_on_error
+        print("2. Failing op...")
+        ops = [(0, W, 0x20, 1), (0, W, 0x1001, 2), (0, W, 0x24, 3)]
+        response = batch([ctrl], ops)
+        assert list(response.ok) == [True, False] and response.error.startswith("op 1:")
+        assert resource_manager.mmio_read(MOCK_TENANT, ctrl, 0x24, 4) == 0
+        response = batch([ctrl], ops, continue_on_error=True)
+        assert list(response.ok) == [True, False, True]
+        assert resource_manager.mmio_read(MOCK_TENANT, ctrl, 0x24, 4) == 3
+        print("✅ Stopped at op 1, or skipped it with continue_on_error\n")
+
+        # 3. Richieste non valide
+        print("3. Invalid requests...")
+        assert rpc_error(lambda: stub.BatchMMIO(pb2.BatchMMIORequest(
+            handles=[ctrl], ops=[W], offsets=[0x20]), metadata=metadata)) == grpc.StatusCode.INVALID_ARGUMENT
+        reads = stub.BatchMMIO(pb2.BatchMMIORequest(handles=[ctrl], ops=[R], offsets=[0x20]),
+                               metadata=metadata)
+        assert list(reads.values) == [1] and list(reads.ok) == [True]
+        assert rpc_error(lambda: batch([ctrl, foreign], [(1, R, 0, 0)])) == grpc.StatusCode.INTERNAL
+        assert rpc_error(lambda: batch([ctrl], [(1, R, 0, 0)])) == grpc.StatusCode.INTERNAL
+        assert rpc_error(lambda: stub.BatchMMIO(pb2.BatchMMIORequest(
+            handles=[ctrl], ops=[R, R], offsets=[0]), metadata=metadata)) == grpc.StatusCode.INTERNAL
+        print("✅ Writes without values, foreign handle, bad index and short arrays rejected\n")
+    finally:
+        server.stop(0)
+
+
+def test_buffer_versions():
+    print("=== Buffer versions and not_modified reads ===\n")
+
+    tenant_manager = TenantManager({
+        tenant: TenantConfig(tenant_id=tenant, uid=os.getuid(), gid=os.getgid(), api_key='')
+        for tenant in (MOCK_TENANT, 'tenant2')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    server, stub, metadata = _mock_grpc_server(tenant_manager, resource_manager, MOCK_TENANT)
+    fast_server = UltraFastMMIOServer(resource_manager, tenant_manager, socket_dir=tempfile.mkdtemp(),
+                                      mode='event_loop')
+    fast_server.start()
+
+    def read(handle, known_version=0, stream=False):
+        request = pb2.ReadBufferRequest(handle=handle, offset=0, length=64, known_version=known_version)
+        if stream:
+            chunks = list(stub.ReadBufferStream(request, metadata=metadata))
+            return chunks[0].version, chunks[0].not_modified, b''.join(c.data for c in chunks)
+        response = stub.ReadBuffer(request, metadata=metadata)
+        return response.version, response.not_modified, response.data
+
+    try:
+        handle = stub.AllocateBuffer(pb2.AllocateBufferRequest(shape=[64], dtype='uint8'),
+                                     metadata=metadata).handle
+        other = resource_manager.allocate_buffer('tenant2', [64])['handle']
+
+        # 1. Versione invariata: nessun dato, in entrambe le RPC di lettura
+        print("1. Unchanged buffer...")
+        version, not_modified, data = read(handle)
+        assert version and not not_modified and len(data) == 64
+        for stream in (False, True):
+            assert read(handle, version, stream) == (version, True, b'')
+        print(f"✅ not_modified at version {version}\n")
+
+        # 2. Una scrittura avanza la versione e la risposta riporta quella precedente
+        print("2. WriteBuffer...")
+        response = stub.WriteBuffer(pb2.WriteBufferRequest(handle=handle, offset=8, data=b'\x01\x02'),
+                                    metadata=metadata)
+        assert response.previous_version == version and response.version > version
+        new_version, not_modified, data = read(handle, version)
+        assert (new_version, not_modified, data[8:10]) == (response.version, False, b'\x01\x02')
+        print(f"✅ {version} -> {new_version}\n")
+
+        # 3. Le scritture MMIO (l'acceleratore può scrivere nei buffer) toccano i buffer del tenant
+        print("3. MMIO writes...")
+        other_version = resource_manager.buffer_version('tenant2', other)
+        mmio = stub.CreateMMIO(pb2.CreateMMIORequest(base_address=MOCK_BASE, length=0x1000),
+                               metadata=metadata).handle
+        stub.MMIOWrite(pb2.MMIOWriteRequest(handle=mmio, offset=0, value=1), metadata=metadata)
+        assert not read(handle, new_version)[1]
+        after_grpc = resource_manager.buffer_version(MOCK_TENANT, handle)
+
+        client = _RawFastClient(fast_server.socket_path_for(MOCK_TENANT))
+        client.request(WRITE_SLOT_FRAME, WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_ACK,
+                       client.bind(mmio), 0x10, 5)
+        assert client.reader.flags == STATUS_OK
+        client.close()
+        assert resource_manager.buffer_version(MOCK_TENANT, handle) > after_grpc
+        assert resource_manager.buffer_version('tenant2', other) == other_version
+        print("✅ gRPC and fast-path MMIO writes invalidate only the tenant's buffers\n")
+    finally:
+        fast_server.stop()
+        resource_manager.cleanup_tenant_resources(MOCK_TENANT)
+        resource_manager.cleanup_tenant_resources('tenant2')
+        server.stop(0)
+
+
+def test_dma_engine():
+    print("=== DMA engine: queued transfers and status ===\n")
+
+    tenant_manager = TenantManager({
+        tenant: TenantConfig(tenant_id=tenant, uid=os.getuid(), gid=os.getgid(), api_key='')
+        for tenant in (MOCK_TENANT, 'tenant2')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    server, stub, metadata = _mock_grpc_server(tenant_manager, resource_manager, MOCK_TENANT)
+    pattern = bytes(range(256)) * 16
+
+    def rpc_error(call):
+        try:
+            call()
+        except grpc.RpcError as e:
+            return e.code()
+        raise AssertionError("Invalid DMA request accepted")
+
+    def allocate(size=len(pattern)):
+        return stub.AllocateBuffer(pb2.AllocateBufferRequest(shape=[size], dtype='uint8'),
+                                   metadata=metadata).handle
+
+    def transfer(direction, buffer, **fields):
+        return stub.DMATransfer(pb2.DMATransferRequest(dma_handle=dma, direction=direction,
+                                                       buffer_handle=buffer, **fields), metadata=metadata)
+
+    try:
+        stub.LoadOverlay(pb2.LoadOverlayRequest(bitfile_path='base.bit'), metadata=metadata)
+        dma = stub.CreateDMA(pb2.CreateDMARequest(dma_name='axi_dma_0'), metadata=metadata).handle
+        src, dst = allocate(), allocate()
+        stub.WriteBuffer(pb2.WriteBufferRequest(handle=src, offset=0, data=pattern), metadata=metadata)
+
+        # 1. S2MM accodata senza attesa, poi MM2S con wait: il loopback la completa
+        print("1. Loopback transfer...")
+        dst_version = resource_manager.buffer_version(MOCK_TENANT, dst)
+        receive = transfer(pb2.DMA_S2MM, dst, wait=False)
+        assert receive.transfer_id and receive.status in (pb2.DMA_PENDING, pb2.DMA_RUNNING)
+        send = transfer(pb2.DMA_MM2S, src, wait=True)
+        assert (send.status, send.bytes_transferred) == (pb2.DMA_DONE, len(pattern))
+        status = stub.GetDMAStatus(pb2.GetDMAStatusRequest(transfer_id=receive.transfer_id, timeout_ms=5000),
+                                   metadata=metadata)
+        assert (status.status, status.bytes_transferred) == (pb2.DMA_DONE, len(pattern))
+        data = stub.ReadBuffer(pb2.ReadBufferRequest(handle=dst, offset=0, length=len(pattern)),
+                               metadata=metadata)
+        assert data.data == pattern and data.version > dst_version
+        print(f"✅ {len(pattern)} bytes looped back, destination version advanced\n")
+
+        # 2. Timeout del trasferimento e buffer occupato
+        print("2. Timeout and busy buffer...")
+        pending = transfer(pb2.DMA_S2MM, dst, timeout_ms=200)
+        assert rpc_error(lambda: stub.FreeBuffer(pb2.FreeBufferRequest(handle=dst), metadata=metadata)) \
+            == grpc.StatusCode.INTERNAL
+        status = stub.GetDMAStatus(pb2.GetDMAStatusRequest(transfer_id=pending.transfer_id, timeout_ms=5000),
+                                   metadata=metadata)
+        assert status.status == pb2.DMA_TIMEOUT and status.error
+        stub.FreeBuffer(pb2.FreeBufferRequest(handle=dst), metadata=metadata)
+        print("✅ DMA_TIMEOUT, buffer freed once the transfer ended\n")
+
+        # 3. Richieste non valide
+        print("3. Invalid requests...")
+        small = allocate(64)
+        foreign = resource_manager.allocate_buffer('tenant2', [64])['handle']
+        assert rpc_error(lambda: transfer(pb2.DMA_MM2S, small, length=128)) == grpc.StatusCode.INTERNAL
+        assert rpc_error(lambda: transfer(pb2.DMA_MM2S, foreign)) == grpc.StatusCode.INTERNAL
+        assert rpc_error(lambda: stub.CreateDMA(pb2.CreateDMARequest(dma_name='axi_gpio_0'),
+                                                metadata=metadata)) == grpc.StatusCode.INTERNAL
+        assert rpc_error(lambda: stub.GetDMAStatus(pb2.GetDMAStatusRequest(transfer_id='xfer_missing'),
+                                                   metadata=metadata)) == grpc.StatusCode.INTERNAL
+        try:
+            resource_manager.get_dma_status('tenant2', send.transfer_id)
+            raise AssertionError("Transfer visible to another tenant")
+        except Exception as e:
+            assert "not found" in str(e)
+        print("✅ Oversized length, foreign buffer, non-DMA IP and unknown transfer rejected\n")
+    finally:
+        resource_manager.cleanup_tenant_resources(MOCK_TENANT)
+        resource_manager.cleanup_tenant_resources('tenant2')
+        server.stop(0)
+
+
+def test_watch_completions():
+    print("=== WatchCompletions: pushed DMA completion events ===\n")
+
+    tenant_manager = TenantManager({
+        tenant: TenantConfig(tenant_id=tenant, uid=os.getuid(), gid=os.getgid(), api_key='')
+        for tenant in (MOCK_TENANT, 'tenant2')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    engine = resource_manager.dma_engine
+    server, stub, metadata = _mock_grpc_server(tenant_manager, resource_manager, MOCK_TENANT)
+
+    def transfer(direction, buffer, **fields):
+        return stub.DMATransfer(pb2.DMATransferRequest(dma_handle=dma, direction=direction,
+                                                       buffer_handle=buffer, **fields),
+                                metadata=metadata).transfer_id
+
+    try:
+        stub.LoadOverlay(pb2.LoadOverlayRequest(bitfile_path='base.bit'), metadata=metadata)
+        dma = stub.CreateDMA(pb2.CreateDMARequest(dma_name='axi_dma_0'), metadata=metadata).handle
+        src, dst = (stub.AllocateBuffer(pb2.AllocateBufferRequest(shape=[4096], dtype='uint8'),
+                                        metadata=metadata).handle for _ in range(2))
+        other_watcher = engine.subscribe('tenant2')
+
+        # 1. Primo messaggio vuoto, poi i completamenti del tenant
+        print("1. Stream of completions...")
+        call = stub.WatchCompletions(pb2.WatchCompletionsRequest(), metadata=metadata)
+        first = next(call)
+        assert not first.completions and not first.overflow
+        expected = {transfer(pb2.DMA_S2MM, dst), transfer(pb2.DMA_MM2S, src)}
+        received = {}
+        while len(received) < len(expected):
+            for completion in next(call).completions:
+                received[completion.transfer_id] = completion
+        assert set(received) == expected
+        assert all((c.status, c.bytes_transferred) == (pb2.DMA_DONE, 4096) for c in received.values())
+        assert other_watcher.drain() == ([], False)
+        print(f"✅ {len(received)} completions pushed, none to the other tenant\n")
+
+        # 2. Completamenti contemporanei nello stesso messaggio
+        print("2. Batching...")
+        watcher = engine.subscribe(MOCK_TENANT)
+        ids = {transfer(pb2.DMA_S2MM, dst, timeout_ms=20) for _ in range(4)}
+        for transfer_id in ids:
+            engine.wait(engine.get(MOCK_TENANT, transfer_id), 5)
+        batch, overflow = watcher.next_batch(1)
+        assert {t.transfer_id for t in batch} == ids and not overflow
+        assert all(t.status == pb2.DMA_TIMEOUT for t in batch)
+        print(f"✅ {len(batch)} completions in one batch\n")
+
+        # 3. Troppi completamenti non consegnati: overflow, poi si riparte pulito
+        print("3. Overflow...")
+        sample = batch[0]
+        for _ in range(MAX_PENDING_COMPLETIONS + 1):
+            watcher._push(sample)
+        batch, overflow = watcher.drain()
+        assert len(batch) == MAX_COMPLETION_BATCH and overflow
+        assert watcher.drain()[1] is False
+        watcher.close()
+        print("✅ Overflow reported once, batches capped\n")
+
+        # 4. Lo stream chiuso dal client si deregistra
+        print("4. Cancel...")
+        call.cancel()
+        other_watcher.close()
+        deadline = time.monotonic() + 5
+        while engine._watchers and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not engine._watchers
+        print("✅ Watchers unsubscribed\n")
+    finally:
+        resource_manager.cleanup_tenant_resources(MOCK_TENANT)
+        server.stop(0)
+
+
+def test_buffer_pool_reuse():
+    print("=== Buffer pool reuse and zeroing ===\n")
+
+    allocated = []
+
+    def allocator(nbytes):
+        buffer = np.zeros(nbytes, dtype=np.uint8)
+        allocated.append(buffer)
+        return buffer
+
+    # 1. Un buffer liberato torna dalla free list della sua classe, azzerato
+    print("1. Reusing a freed buffer...")
+    pool = BufferPool(allocator, cma_low_watermark=0)
+    block = pool.allocate(5000)
+    assert len(block.raw) == pool.class_for(5000) >= 5000
+    # Anche oltre i byte chiesti: la coda della classe è visibile al prossimo tenant
+    block.raw[:] = 0xAB
+    pool.release(block)
+
+    again = pool.allocate(4500)
+    assert again.raw is block.raw and len(allocated) == 1
+    assert not again.raw.any()
+    size_class = pool.stats()['classes'][0]
+    assert (size_class['hits'], size_class['misses']) == (1, 1)
+    print(f"✅ Same buffer reused and zeroed (class {size_class['size']} bytes)\n")
+
+    # 2. Senza zero_on_free i dati restano; con il pool pieno il buffer viene liberato
+    print("2. zero_on_free=False and full pool...")
+    pool = BufferPool(allocator, zero_on_free=False, cma_low_watermark=0)
+    block = pool.allocate(4096)
+    block.raw[:] = 1
+    pool.release(block)
+    assert pool.allocate(4096).raw.all()
+
+    pool = BufferPool(allocator, max_pooled_bytes=0, cma_low_watermark=0)
+    block = pool.allocate(4096)
+    pool.release(block)
+    assert pool.pooled_bytes == 0 and pool.allocate(4096).raw is not block.raw
+    print("✅ OK\n")
+
+    # 3. Un buffer ancora mappato nel char device non rientra nel pool
+    print("3. Discarding a buffer...")
+    pool = BufferPool(allocator, cma_low_watermark=0)
+    block = pool.allocate(4096)
+    pool.discard(block)
+    assert pool.pooled_bytes == 0 and pool.allocate(4096).raw is not block.raw
+    size_class = pool.stats()['classes'][0]
+    assert (size_class['released'], size_class['in_use']) == (1, 1)
+    print("✅ Discarded buffer not recycled\n")
+
+
+def test_mock_backend():
+    test_fast_protocol_roundtrip()
+    test_slot_revocation()
+    test_exec_offload_backpressure()
+    test_stream_limits()
+    test_mmio_stream()
+    test_batch_mmio()
+    test_buffer_streams()
+    test_buffer_versions()
+    test_dma_engine()
+    test_watch_completions()
+    test_buffer_pool_reuse()
+    print("=== Mock backend tests passed! ===")
+
+
 if __name__ == '__main__':
-    test_basic()
\ No newline at end of file
+    if '--mock' in sys.argv:
+        test_mock_backend()
+    else:
+        test_basic()
\ No newline at end of file
@@ -0,0 +1,289 @@
+# proto/fast_mmio_protocol.py
+"""
+Codec del protocollo fast MMIO (v3), condiviso da client e server.
+
+Ogni frame ha un header a lunghezza fissa seguito dal payload:
+
+    length(u32) | op(u8) | flags/status(u8) | tag(u16) | payload[length]
+
+- nelle richieste il byte dopo l'opcode contiene i flag, nelle risposte lo status
+- il tag viene copiato nella risposta (serve per associare richieste e risposte)
+
+Tutti gli struct sono precompilati e lavorano con pack_into/unpack_from su
+buffer preallocati: nel loop caldo non si creano bytes/bytearray per operazione.
+
+Ogni tenant ha il proprio socket (<socket_dir>/<tenant>_mmio.sock, permessi
+0600): il server ricava il tenant dal socket e lo verifica con SO_PEERCRED,
+per cui HELLO negozia solo versione e flag.
+"""
+
+import struct
+
+PROTOCOL_VERSION = 3
+
+# Header
+HEADER = struct.Struct('!IBBH')
+HEADER_SIZE = HEADER.size
+
+# Opcodes
+OP_HELLO = 0x00
+OP_WRITE = 0x01
+OP_READ = 0x02
+OP_WRITE_SLOT = 0x03
+OP_READ_SLOT = 0x04
+OP_READ_BLOCK = 0x05      # count word a 32 bit contigue -> dati
+OP_WRITE_ACK = 0x06
+OP_WRITE_BLOCK = 0x07     # slot, offset + word a 32 bit -> status
+OP_BATCH_WRITE = 0x10
+OP_BATCH_WRITE_SLOT = 0x11
+OP_BIND = 0x20            # handle -> slot per-connessione
+OP_UNBIND = 0x21
+OP_RING_SETUP = 0x30      # Crea i ring condivisi (vedi fast_mmio_ring.py)
+OP_CREDIT = 0x40          # Server -> client: restituisce crediti (u16)
+OP_EXEC = 0x50            # Micro-programma di accessi ai registri
+
+# Flags (richieste)
+FLAG_NONE = 0x00
+FLAG_ACK = 0x01           # WRITE_SLOT: richiede una risposta di status
+FLAG_CREDITS = 0x02       # HELLO: il client usa il controllo di flusso a crediti
+
+# Status (risposte)
+STATUS_OK = 0
+STATUS_ERROR = 1          # Operazione negata o fallita sull'hardware
+STATUS_BAD_REQUEST = 2    # Frame malformato o opcode sconosciuto
+STATUS_TIMEOUT = 4        # OP_EXEC: POLL scaduto
+
+HANDLE_SIZE = 32
+MAX_FRAME_PAYLOAD = 1024 * 1024
+MAX_READER_BUFFER = HEADER_SIZE + MAX_FRAME_PAYLOAD   # Un frame massimo
+MAX_SLOTS = 4096          # Slot MMIO per connessione
+MAX_BLOCK_WORDS = 16384   # Word per READ_BLOCK/WRITE_BLOCK (i dati sono uint32 little endian)
+
+# Controllo di flusso (client pipelined): ogni richiesta consuma un credito.
+# Le richieste con risposta lo restituiscono con la risposta stessa, le
+# scritture fire-and-forget con frame OP_CREDIT ogni CREDIT_BATCH scritture.
+INITIAL_CREDITS = 256
+CREDIT_BATCH = 32
+
+# Payload
+HELLO_PAYLOAD = struct.Struct('!H')               # version
+WRITE_PAYLOAD = struct.Struct('!32sII')           # handle, offset, value
+READ_PAYLOAD = struct.Struct('!32sI')             # handle, offset
+WRITE_SLOT_PAYLOAD = struct.Struct('!HII')        # slot, offset, value
+READ_SLOT_PAYLOAD = struct.Struct('!HI')          # slot, offset
+BIND_PAYLOAD = struct.Struct('!32s')              # handle
+READ_BLOCK_PAYLOAD = struct.Struct('!HIH')        # slot, offset, count
+WRITE_BLOCK_HEADER = struct.Struct('!HI')         # slot, offset, seguito dalle word
+BATCH_COUNT = struct.Struct('!H')                 # count, seguito da count * (WRITE|WRITE_SLOT)_PAYLOAD
+U16 = struct.Struct('!H')
+U32 = struct.Struct('!I')
+
+# Micro-programmi (OP_EXEC)
+# Payload: count(u16) + count * INSN. Risposta: eseguite(u16) + risultati u32
+# (uno per ogni READ e POLL, nell'ordine del programma).
+#
+#   INSN_WRITE  slot, offset, a=valore
+#   INSN_READ   slot, offset                     -> risultato
+#   INSN_RMW    slot, offset, a=maschera, b=valore: reg = (reg & ~a) | (b & a)
+#   INSN_POLL   slot, offset, a=maschera, b=atteso, c=timeout_us
+#               attende (reg & a) == b           -> risultato (ultimo valore letto)
+#   INSN_SLEEP  c=microsecondi
+INSN_WRITE = 1
+INSN_READ = 2
+INSN_RMW = 3
+INSN_POLL = 4
+INSN_SLEEP = 5
+INSN = struct.Struct('!BxHIIII')                  # insn, slot, offset, a, b, c
+
+MAX_PROGRAM_INSNS = 256
+MAX_SLEEP_US = 100_000
+MAX_POLL_US = 5_000_000
+MAX_PROGRAM_US = 10_000_000                       # Somma di timeout POLL e SLEEP
+
+# Frame completi (header + payload) per pack_into in un colpo solo
+HELLO_FRAME = struct.Struct('!IBBHH')
+WRITE_FRAME = struct.Struct('!IBBH32sII')
+READ_FRAME = struct.Struct('!IBBH32sI')
+WRITE_SLOT_FRAME = struct.Struct('!IBBHHII')
+READ_SLOT_FRAME = struct.Struct('!IBBHHI')
+BIND_FRAME = struct.Struct('!IBBH32s')
+READ_BLOCK_FRAME = struct.Struct('!IBBHHIH')
+UNBIND_FRAME = struct.Struct('!IBBHH')
+BATCH_HEADER_FRAME = struct.Struct('!IBBHH')
+STATUS_REPLY = HEADER
+U16_REPLY = struct.Struct('!IBBHH')
+U32_REPLY = struct.Struct('!IBBHI')
+
+
+class ProtocolError(Exception):
+    """Frame non valido sul fast path"""
+
+
+def encode_handle(handle: str) -> bytes:
+    """Handle ASCII paddato a HANDLE_SIZE byte"""
+    return handle.ljust(HANDLE_SIZE)[:HANDLE_SIZE].encode()
+
+
+def decode_handle(raw) -> str:
+    return bytes(raw).decode().strip()
+
+
+class FrameReader:
+    """
+    Buffer di ricezione preallocato con riassemblaggio dei frame.
+
+    Si riempie con recv_into (socket bloccanti o non bloccanti); next_frame()
+    ritorna l'offset del payload del prossimo frame completo nel buffer, oppure
+    -1 se il frame non è ancora arrivato per intero. I campi dell'header
+    del frame corrente sono in self.op, self.flags, self.tag, self.length.
+    """
+
+    __slots__ = ('buf', 'view', 'start', 'end', 'op', 'flags', 'tag', 'length')
+
+    def __init__(self, capacity: int = 65536):
+        self.buf = bytearray(capacity)
+        self.view = memoryview(self.buf)
+        self.start = 0
+        self.end = 0
+        self.op = 0
+        self.flags = 0
+        self.tag = 0
+        self.length = 0
+
+    def recv_from(self, sock) -> int:
+        """
+        Un solo recv_into nello spazio libero del buffer.
+
+        Returns:
+            byte ricevuti (0 = connessione chiusa dal peer)
+        """
+        if self.end == len(self.buf):
+            self._make_room()
+        received = sock.recv_into(self.view[self.end:])
+        self.end += received
+        return received
+
+    def next_frame(self) -> int:
+        available = self.end - self.start
+        if available < HEADER_SIZE:
+            return -1
+
+        length, op, flags, tag = HEADER.unpack_from(self.buf, self.start)
+        if length > MAX_FRAME_PAYLOAD:
+            raise ProtocolError(f"Frame too large: {length} bytes")
+
+        if available < HEADER_SIZE + length:
+            # Frame incompleto: assicura che ci sia spazio per riceverlo tutto
+            if self.start + HEADER_SIZE + length > len(self.buf):
+                self._make_room(HEADER_SIZE + length)
+            return -1
+
+        self.op = op
+        self.flags = flags
+        self.tag = tag
+        self.length = length
+
+        payload = self.start + HEADER_SIZE
+        self.start = payload + length
+        if self.start == self.end:
+            # Buffer vuoto: riparti dall'inizio senza copie
+            self.start = self.end = 0
+        return payload
+
+    def read_frame(self, sock) -> int:
+        """Versione bloccante di next_frame: riceve finché non c'è un frame completo"""
+        payload = self.next_frame()
+        while payload < 0:
+            if not self.recv_from(sock):
+                raise ConnectionError("Fast MMIO connection closed")
+            payload = self.next_frame()
+        return payload
+
+    def _make_room(self, needed: int = 0):
+        """Compatta i dati pendenti all'inizio e cresce se il frame non ci sta"""
+        pending = self.end - self.start
+        if pending and self.start:
+            self.buf[0:pending] = self.buf[self.start:self.end]
+        self.start = 0
+        self.end = pending
+
+        if needed > len(self.buf) or pending == len(self.buf):
+            # Cresce fino a contenere un frame massimo, non oltre: i dati
+            # oltre quel limite sono frame completi che il chiamante deve consumare
+            new_size = min(max(needed, len(self.buf) * 2), MAX_READER_BUFFER)
+            if new_size <= len(self.buf):
+                raise ProtocolError(f"Receive buffer full ({len(self.buf)} bytes)")
+            self.view.release()
+            self.buf.extend(bytes(new_size - len(self.buf)))
+            self.view = memoryview(self.buf)
+
+
+class FrameWriter:
+    """Buffer di invio preallocato: le risposte si accumulano e partono con un solo send"""
+
+    __slots__ = ('buf', 'view', 'end')
+
+    def __init__(self, capacity: int = 65536):
+        self.buf = bytearray(capacity)
+        self.view = memoryview(self.buf)
+        self.end = 0
+
+    def reserve(self, nbytes: int) -> int:
+        """Ritorna l'offset a cui scrivere nbytes, crescendo il buffer se serve"""
+        offset = self.end
+        if offset + nbytes > len(self.buf):
+            self.view.release()
+            self.buf.extend(bytes(max(nbytes, len(self.buf))))
+            self.view = memoryview(self.buf)
+        self.end = offset + nbytes
+        return offset
+
+    def status(self, op: int, status: int, tag: int):
+        STATUS_REPLY.pack_into(self.buf, self.reserve(HEADER_SIZE), 0, op, status, tag)
+
+    def u16(self, op: int, status: int, tag: int, value: int):
+        U16_REPLY.pack_into(self.buf, self.reserve(U16_REPLY.size), 2, op, status, tag, value)
+
+    def u32(self, op: int, status: int, tag: int, value: int):
+        U32_REPLY.pack_into(self.buf, self.reserve(U32_REPLY.size), 4, op, status, tag, value)
+
+    def program_reply(self, op: int, status: int, tag: int, executed: int, results):
+        """Risposta OP_EXEC: istruzioni eseguite + risultati u32"""
+        offset = self.reserve(HEADER_SIZE + 2 + 4 * len(results))
+        U16_REPLY.pack_into(self.buf, offset, 2 + 4 * len(results), op, status, tag, executed)
+        offset += U16_REPLY.size
+        for value in results:
+            U32.pack_into(self.buf, offset, value)
+            offset += 4
+
+    def block_reply(self, op: int, status: int, tag: int, words):
+        """Risposta READ_BLOCK: copia le word (buffer contiguo uint32) direttamente nel buffer di invio"""
+        data = memoryview(words).cast('B')
+        offset = self.reserve(HEADER_SIZE + len(data))
+        STATUS_REPLY.pack_into(self.buf, offset, len(data), op, status, tag)
+        offset += HEADER_SIZE
+        self.buf[offset:offset + len(data)] = data
+
+    def flush_blocking(self, sock):
+        if self.end:
+            sock.sendall(self.view[:self.end])
+            self.end = 0
+
+    def flush_nonblocking(self, sock) -> bool:
+        """
+        Invia quanto possibile senza bloccare.
+
+        Returns:
+            True se il buffer è stato svuotato
+        """
+        if not self.end:
+            return True
+        try:
+            sent = sock.send(self.view[:self.end])
+        except (BlockingIOError, InterruptedError):
+            return False
+
+        if sent < self.end:
+            self.buf[0:self.end - sent] = self.buf[sent:self.end]
+        self.end -= sent
+        return self.end == 0
@@ -0,0 +1,224 @@
+# proto/fast_mmio_ring.py
+"""
+Trasporto a ring condivisi per il fast path MMIO.
+
+Il server crea per ogni connessione un memfd con due ring SPSC:
+
+- submission ring (SQ): il client produce, il server consuma
+- completion ring (CQ): il server produce, il client consuma
+
+e due eventfd usati come campanelli (doorbell) solo quando il consumatore
+sta dormendo. Il socket fast MMIO serve solo per il setup (OP_RING_SETUP,
+con i file descriptor passati via SCM_RIGHTS) e per BIND/UNBIND.
+
+Layout del memfd (little endian nativo, indici u32 a scorrimento libero):
+
+    [0, 512)          blocco di controllo, un campo per cache line
+    [512, ...)        SQ: entries * SQ_ENTRY (16 byte)
+    [..., ...)        CQ: entries * CQ_ENTRY (8 byte)
+
+Limiti noti:
+- CPython non espone barriere di memoria: l'ordine "scrivo l'entry, poi
+  pubblico il tail" è garantito solo su CPU con ordinamento forte (x86).
+  Su ARM (Zynq/ZynqMP) gli store possono in teoria essere riordinati; in
+  pratica tra i due store ci sono centinaia di istruzioni dell'interprete,
+  ma non è una garanzia formale.
+- Per lo stesso motivo il protocollo "flag waiting + ricontrollo" può
+  perdere un risveglio: chi dorme usa sempre un timeout sul doorbell, quindi
+  il caso peggiore è latenza aggiuntiva, non un blocco.
+
+Per questo il server abilita il ring solo su CPU con ordinamento forte
+(STRONG_MEMORY_ORDER); su ARM va richiesto esplicitamente (fast_mmio_ring).
+"""
+
+import os
+import mmap
+import platform
+import select
+import struct
+import time
+
+RING_SUPPORTED = hasattr(os, 'memfd_create') and hasattr(os, 'eventfd')
+
+# Store visti dall'altro processo nell'ordine del programma (x86, TSO)
+STRONG_MEMORY_ORDER = platform.machine().lower() in ('x86_64', 'amd64', 'i386', 'i686')
+
+DEFAULT_RING_ENTRIES = 256
+MAX_RING_ENTRIES = 4096
+
+# Blocco di controllo: indici in unità u32, un campo ogni 64 byte
+SQ_HEAD = 0
+SQ_TAIL = 16
+CQ_HEAD = 32
+CQ_TAIL = 48
+SERVER_WAITING = 64
+CLIENT_WAITING = 80
+CLOSED = 96
+CTRL_SIZE = 512
+
+# op, flags, tag, slot, offset, value
+SQ_ENTRY = struct.Struct('<BBHHxxII')
+# tag, status, value
+CQ_ENTRY = struct.Struct('<HBxI')
+
+_U32_MASK = 0xFFFFFFFF
+
+# Spin adattivo prima di dormire sul doorbell (su un solo core lo spin
+# toglie solo tempo al produttore: si va direttamente a dormire)
+_MULTICORE = (os.cpu_count() or 1) > 1
+SPIN_MIN_NS = 2_000 if _MULTICORE else 0
+SPIN_MAX_NS = 200_000 if _MULTICORE else 0
+
+
+def ring_size(entries: int) -> int:
+    return CTRL_SIZE + entries * (SQ_ENTRY.size + CQ_ENTRY.size)
+
+
+class MMIORing:
+    """Vista su un memfd con SQ e CQ (usata sia dal client che dal server)"""
+
+    def __init__(self, memfd: int, entries: int):
+        if entries <= 0 or entries & (entries - 1):
+            raise ValueError(f"Ring entries must be a power of two: {entries}")
+
+        self.memfd = memfd
+        self.entries = entries
+        self.mask = entries - 1
+        self.mm = mmap.mmap(memfd, ring_size(entries))
+        self.ctrl = memoryview(self.mm).cast('I')
+        self.sq_offset = CTRL_SIZE
+        self.cq_offset = CTRL_SIZE + entries * SQ_ENTRY.size
+
+    @classmethod
+    def create(cls, entries: int = DEFAULT_RING_ENTRIES) -> 'MMIORing':
+        """Crea un nuovo memfd azzerato (lato server)"""
+        memfd = os.memfd_create('pynq_mmio_ring', os.MFD_CLOEXEC)
+        try:
+            os.ftruncate(memfd, ring_size(entries))
+            return cls(memfd, entries)
+        except Exception:
+            os.close(memfd)
+            raise
+
+    # --- Submission ring ---
+
+    def submit(self, op: int, flags: int, tag: int, slot: int, offset: int, value: int) -> bool:
+        """Accoda una richiesta (client). False se il ring è pieno"""
+        ctrl = self.ctrl
+        tail = ctrl[SQ_TAIL]
+        if (tail - ctrl[SQ_HEAD]) & _U32_MASK >= self.entries:
+            return False
+        SQ_ENTRY.pack_into(self.mm, self.sq_offset + (tail & self.mask) * SQ_ENTRY.size,
+                           op, flags, tag, slot, offset, value)
+        ctrl[SQ_TAIL] = (tail + 1) & _U32_MASK
+        return True
+
+    def pop_submission(self):
+        """Estrae la prossima richiesta (server). None se il ring è vuoto"""
+        ctrl = self.ctrl
+        head = ctrl[SQ_HEAD]
+        if head == ctrl[SQ_TAIL]:
+            return None
+        entry = SQ_ENTRY.unpack_from(self.mm, self.sq_offset + (head & self.mask) * SQ_ENTRY.size)
+        ctrl[SQ_HEAD] = (head + 1) & _U32_MASK
+        return entry
+
+    def has_submission(self) -> bool:
+        return self.ctrl[SQ_HEAD] != self.ctrl[SQ_TAIL]
+
+    # --- Completion ring ---
+
+    def complete(self, tag: int, status: int, value: int) -> bool:
+        """Pubblica una completion (server). False se il ring è pieno"""
+        ctrl = self.ctrl
+        tail = ctrl[CQ_TAIL]
+        if (tail - ctrl[CQ_HEAD]) & _U32_MASK >= self.entries:
+            return False
+        CQ_ENTRY.pack_into(self.mm, self.cq_offset + (tail & self.mask) * CQ_ENTRY.size,
+                           tag, status, value)
+        ctrl[CQ_TAIL] = (tail + 1) & _U32_MASK
+        return True
+
+    def pop_completion(self):
+        """Estrae la prossima completion (client). None se il ring è vuoto"""
+        ctrl = self.ctrl
+        head = ctrl[CQ_HEAD]
+        if head == ctrl[CQ_TAIL]:
+            return None
+        entry = CQ_ENTRY.unpack_from(self.mm, self.cq_offset + (head & self.mask) * CQ_ENTRY.size)
+        ctrl[CQ_HEAD] = (head + 1) & _U32_MASK
+        return entry
+
+    def has_completion(self) -> bool:
+        return self.ctrl[CQ_HEAD] != self.ctrl[CQ_TAIL]
+
+    def has_completion_space(self) -> bool:
+        return (self.ctrl[CQ_TAIL] - self.ctrl[CQ_HEAD]) & _U32_MASK < self.entries
+
+    # --- Stato ---
+
+    @property
+    def closed(self) -> bool:
+        return self.ctrl[CLOSED] != 0
+
+    def mark_closed(self):
+        self.ctrl[CLOSED] = 1
+
+    def close(self):
+        self.ctrl.release()
+        self.mm.close()
+        os.close(self.memfd)
+
+
+def ring_doorbell(ring: MMIORing, waiting_index: int, doorbell_fd: int):
+    """Suona il doorbell solo se il consumatore ha dichiarato di dormire"""
+    if ring.ctrl[waiting_index]:
+        os.eventfd_write(doorbell_fd, 1)
+
+
+class AdaptiveSpinner:
+    """
+    Attesa lato consumatore: spin per una finestra adattiva, poi sleep sull'eventfd.
+
+    La finestra raddoppia quando il lavoro arriva durante lo spin e si dimezza
+    quando si finisce a dormire, così un tenant che fa polling continuo non
+    paga syscall mentre uno idle non brucia CPU.
+    """
+
+    __slots__ = ('spin_ns', 'min_ns', 'max_ns')
+
+    def __init__(self, min_ns: int = SPIN_MIN_NS, max_ns: int = SPIN_MAX_NS):
+        self.spin_ns = min_ns
+        self.min_ns = min_ns
+        self.max_ns = max_ns
+
+    def wait(self, ready, ring: MMIORing, waiting_index: int, doorbell_fd: int,
+             timeout: float) -> bool:
+        """
+        Attende finché ready() è vera o scade il timeout del singolo sleep.
+
+        Returns:
+            True se ready() è vera all'uscita
+        """
+        now = time.perf_counter_ns
+        deadline = now() + self.spin_ns
+        while now() < deadline:
+            if ready():
+                self.spin_ns = min(self.max_ns, self.spin_ns * 2)
+                return True
+
+        self.spin_ns = max(self.min_ns, self.spin_ns // 2)
+
+        ctrl = ring.ctrl
+        ctrl[waiting_index] = 1
+        try:
+            # Ricontrollo dopo aver pubblicato il flag (vedi limiti nel docstring del modulo)
+            if ready():
+                return True
+            readable, _, _ = select.select([doorbell_fd], [], [], timeout)
+            if readable:
+                os.eventfd_read(doorbell_fd)
+        finally:
+            ctrl[waiting_index] = 0
+
+        return ready()
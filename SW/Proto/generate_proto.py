@@ -3,6 +3,7 @@
 
 import os
 import sys
+import shutil
 from pathlib import Path
 from grpc_tools import protoc
 
@@ -13,6 +14,8 @@ def generate_proto():
     root_dir = Path(__file__).parent
     proto_dir = root_dir
     out_dir = root_dir / "generated"
+    # Il client importa gli stub dalla sua directory: stessa copia
+    client_dir = root_dir.parent / "client"
     
     # Crea directory output
     out_dir.mkdir(exist_ok=True)
@@ -44,6 +47,10 @@ def generate_proto():
     # Crea __init__.py
     (out_dir / "__init__.py").touch()
     
+    # Copia gli stub nel client
+    for stub in out_dir.glob("*_pb2*.py"):
+        shutil.copy(stub, client_dir / stub.name)
+    
     print("✅ Generazione completata!")
     return True
 
@@ -1,22 +1,12 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
-# NO CHECKED-IN PROTOBUF GENCODE
 # source: pynq_service.proto
-# Protobuf Python Version: 5.29.0
+# Protobuf Python Version: 4.25.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
-from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
 from google.protobuf.internal import builder as _builder
-_runtime_version.ValidateProtobufRuntimeVersion(
-    _runtime_version.Domain.PUBLIC,
-    5,
-    29,
-    0,
-    '',
-    'pynq_service.proto'
-)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -24,25 +14,33 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12pynq_service.proto\x12\x04pynq\"\x07\n\x05\x45mpty\"&\n\x05\x45rror\x12\x0c\n\x04\x63ode\x18\x01 \x01(\r\x12\x0f\n\x07message\x18\x02 \x01(\t\"1\n\x0b\x41uthRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x0f\n\x07\x61pi_key\x18\x02 \x01(\t\"[\n\x0c\x41uthResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rsession_token\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x12\n\nexpires_at\x18\x04 \x01(\x03\"]\n\x12LoadOverlayRequest\x12\x14\n\x0c\x62itfile_path\x18\x01 \x01(\t\x12\x10\n\x08\x64ownload\x18\x02 \x01(\x08\x12\x1f\n\x17partial_reconfiguration\x18\x03 \x01(\x08\"\xb0\x01\n\x13LoadOverlayResponse\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x38\n\x08ip_cores\x18\x02 \x03(\x0b\x32&.pynq.LoadOverlayResponse.IpCoresEntry\x12\r\n\x05\x65rror\x18\x03 \x01(\t\x1a<\n\x0cIpCoresEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1b\n\x05value\x18\x02 \x01(\x0b\x32\x0c.pynq.IPCore:\x02\x38\x01\"\xac\x02\n\x06IPCore\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x14\n\x0c\x62\x61se_address\x18\x03 \x01(\x04\x12\x15\n\raddress_range\x18\x04 \x01(\r\x12\x30\n\nparameters\x18\x05 \x03(\x0b\x32\x1c.pynq.IPCore.ParametersEntry\x12.\n\tregisters\x18\x06 \x03(\x0b\x32\x1b.pynq.IPCore.RegistersEntry\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x44\n\x0eRegistersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.pynq.RegisterInfo:\x02\x38\x01\"\xb0\x01\n\x15GetOverlayInfoRequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12=\n\x0c\x64\x65tail_level\x18\x02 \x01(\x0e\x32\'.pynq.GetOverlayInfoRequest.DetailLevel\x12\x10\n\x08ip_names\x18\x03 \x03(\t\"2\n\x0b\x44\x65tailLevel\x12\t\n\x05\x42\x41SIC\x10\x00\x12\n\n\x06NORMAL\x10\x01\x12\x0c\n\x08\x44\x45TAILED\x10\x02\"\xd4\x02\n\x13OverlayInfoResponse\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x38\n\x08ip_cores\x18\x02 \x03(\x0b\x32&.pynq.OverlayInfoResponse.IpCoresEntry\x12\x11\n\tloaded_at\x18\x03 \x01(\x03\x12\x14\n\x0c\x62itfile_path\x18\x04 \x01(\t\x12\x16\n\x0e\x62itstream_size\x18\x05 \x01(\x04\x12=\n\nproperties\x18\x06 \x03(\x0b\x32).pynq.OverlayInfoResponse.PropertiesEntry\x1a<\n\x0cIpCoresEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1b\n\x05value\x18\x02 \x01(\x0b\x32\x0c.pynq.IPCore:\x02\x38\x01\x1a\x31\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"9\n\x14UnloadOverlayRequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\r\n\x05\x66orce\x18\x02 \x01(\x08\"^\n\x11\x43reateMMIORequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x0f\n\x07ip_name\x18\x02 \x01(\t\x12\x14\n\x0c\x62\x61se_address\x18\x03 \x01(\x04\x12\x0e\n\x06length\x18\x04 \x01(\r\"$\n\x12\x43reateMMIOResponse\x12\x0e\n\x06handle\x18\x01 \x01(\t\"A\n\x0fMMIOReadRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\x0e\n\x06length\x18\x03 \x01(\r\"!\n\x10MMIOReadResponse\x12\r\n\x05value\x18\x01 \x01(\x04\"A\n\x10MMIOWriteRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\r\n\x05value\x18\x03 \x01(\x04\"$\n\x12ReleaseMMIORequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\"5\n\x15\x41llocateBufferRequest\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\r\n\x05\x64type\x18\x02 \x01(\t\"\xac\x01\n\x16\x41llocateBufferResponse\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\r\n\x05shape\x18\x02 \x03(\x05\x12\r\n\x05\x64type\x18\x03 \x01(\t\x12\x0c\n\x04size\x18\x04 \x01(\x03\x12\x15\n\x08shm_name\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x1d\n\x10physical_address\x18\x06 \x01(\x04H\x01\x88\x01\x01\x42\x0b\n\t_shm_nameB\x13\n\x11_physical_address\"C\n\x11ReadBufferRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0e\n\x06length\x18\x03 \x01(\x03\"\"\n\x12ReadBufferResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"B\n\x12WriteBufferRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"#\n\x11\x46reeBufferRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\"8\n\x10\x43reateDMARequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x10\n\x08\x64ma_name\x18\x02 \x01(\t\"W\n\x11\x43reateDMAResponse\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x18\n\x10has_send_channel\x18\x02 \x01(\x08\x12\x18\n\x10has_recv_channel\x18\x03 \x01(\x08\"\x84\x01\n\x12\x44MATransferRequest\x12\x12\n\ndma_handle\x18\x01 \x01(\t\x12\x11\n\tdirection\x18\x02 \x01(\r\x12\x15\n\rbuffer_handle\x18\x03 \x01(\t\x12\x0e\n\x06length\x18\x04 \x01(\x04\x12\x0c\n\x04wait\x18\x05 \x01(\x08\x12\x12\n\ntimeout_ms\x18\x06 \x01(\r\"d\n\x13\x44MATransferResponse\x12\x13\n\x0btransfer_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\r\x12\x19\n\x11\x62ytes_transferred\x18\x03 \x01(\x04\x12\r\n\x05\x65rror\x18\x04 \x01(\t\"*\n\x13GetDMAStatusRequest\x12\x13\n\x0btransfer_id\x18\x01 \x01(\t\"A\n\x14GetDMAStatusResponse\x12\x0e\n\x06status\x18\x01 \x01(\r\x12\x19\n\x11\x62ytes_transferred\x18\x02 \x01(\x04\"*\n\x0c\x41\x64\x64ressRange\x12\r\n\x05start\x18\x01 \x01(\x04\x12\x0b\n\x03\x65nd\x18\x02 \x01(\x04\"\xa1\x02\n\x13\x43reateTenantRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x0b\n\x03uid\x18\x02 \x01(\r\x12\x0b\n\x03gid\x18\x03 \x01(\r\x12\x0f\n\x07\x61pi_key\x18\x04 \x01(\t\x12\x30\n\x06limits\x18\x05 \x01(\x0b\x32 .pynq.CreateTenantRequest.Limits\x12\x1a\n\x12\x61llowed_bitstreams\x18\x06 \x03(\t\x12\x32\n\x16\x61llowed_address_ranges\x18\x07 \x03(\x0b\x32\x12.pynq.AddressRange\x1aJ\n\x06Limits\x12\x14\n\x0cmax_overlays\x18\x01 \x01(\r\x12\x13\n\x0bmax_buffers\x18\x02 \x01(\r\x12\x15\n\rmax_memory_mb\x18\x03 \x01(\r\"M\n\x14\x43reateTenantResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bsocket_path\x18\x03 \x01(\t\"\xc1\x02\n\x13UpdateTenantRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x32\n\x07updates\x18\x02 \x01(\x0b\x32!.pynq.UpdateTenantRequest.Updates\x1a\xe2\x01\n\x07Updates\x12\x0f\n\x07\x61pi_key\x18\x01 \x01(\t\x12\x30\n\x06limits\x18\x02 \x01(\x0b\x32 .pynq.CreateTenantRequest.Limits\x12\x16\n\x0e\x61\x64\x64_bitstreams\x18\x03 \x03(\t\x12\x19\n\x11remove_bitstreams\x18\x04 \x03(\t\x12.\n\x12\x61\x64\x64_address_ranges\x18\x05 \x03(\x0b\x32\x12.pynq.AddressRange\x12\x31\n\x15remove_address_ranges\x18\x06 \x03(\x0b\x32\x12.pynq.AddressRange\"8\n\x14UpdateTenantResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"7\n\x13\x44\x65leteTenantRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\r\n\x05\x66orce\x18\x02 \x01(\x08\"8\n\x14\x44\x65leteTenantResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\",\n\x12ListTenantsRequest\x12\x16\n\x0einclude_status\x18\x01 \x01(\x08\"8\n\x13ListTenantsResponse\x12!\n\x07tenants\x18\x01 \x03(\x0b\x32\x10.pynq.TenantInfo\"\xab\x01\n\nTenantInfo\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x0b\n\x03uid\x18\x02 \x01(\r\x12\x0b\n\x03gid\x18\x03 \x01(\r\x12\x30\n\x06limits\x18\x04 \x01(\x0b\x32 .pynq.CreateTenantRequest.Limits\x12\x1a\n\x12\x61llowed_bitstreams\x18\x05 \x03(\t\x12\"\n\x06status\x18\x06 \x01(\x0b\x32\x12.pynq.TenantStatus\"\x81\x01\n\x0cTenantStatus\x12\x0e\n\x06online\x18\x01 \x01(\x08\x12\x17\n\x0f\x61\x63tive_overlays\x18\x02 \x01(\r\x12\x16\n\x0e\x61\x63tive_buffers\x18\x03 \x01(\r\x12\x19\n\x11memory_used_bytes\x18\x04 \x01(\x04\x12\x15\n\rlast_activity\x18\x05 \x01(\x03\";\n\x13\x41\x64\x64\x42itstreamRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x11\n\tbitstream\x18\x02 \x01(\t\">\n\x16RemoveBitstreamRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x11\n\tbitstream\x18\x02 \x01(\t\"\xac\x01\n\x13UpdateLimitsRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x33\n\x06limits\x18\x02 \x01(\x0b\x32#.pynq.UpdateLimitsRequest.NewLimits\x1aM\n\tNewLimits\x12\x14\n\x0cmax_overlays\x18\x01 \x01(\r\x12\x13\n\x0bmax_buffers\x18\x02 \x01(\r\x12\x15\n\rmax_memory_mb\x18\x03 \x01(\r\"F\n\x16GetTenantStatusRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x19\n\x11include_resources\x18\x02 \x01(\x08\"\xe6\x01\n\x17GetTenantStatusResponse\x12\x1e\n\x04info\x18\x01 \x01(\x0b\x32\x10.pynq.TenantInfo\x12@\n\tresources\x18\x02 \x01(\x0b\x32-.pynq.GetTenantStatusResponse.ActiveResources\x1ai\n\x0f\x41\x63tiveResources\x12\x13\n\x0boverlay_ids\x18\x01 \x03(\t\x12\x14\n\x0cmmio_handles\x18\x02 \x03(\t\x12\x16\n\x0e\x62uffer_handles\x18\x03 \x03(\t\x12\x13\n\x0b\x64ma_handles\x18\x04 \x03(\t\"\xe4\x02\n\x14SystemStatusResponse\x12\x15\n\rtotal_tenants\x18\x01 \x01(\r\x12\x16\n\x0eonline_tenants\x18\x02 \x01(\r\x12\x19\n\x11total_memory_used\x18\x03 \x01(\x04\x12\x1d\n\x15total_overlays_loaded\x18\x04 \x01(\r\x12:\n\x06system\x18\x05 \x01(\x0b\x32*.pynq.SystemStatusResponse.SystemResources\x12!\n\x07tenants\x18\x06 \x03(\x0b\x32\x10.pynq.TenantInfo\x1a\x83\x01\n\x0fSystemResources\x12\x1e\n\x16total_memory_available\x18\x01 \x01(\x04\x12\x19\n\x11total_memory_used\x18\x02 \x01(\x04\x12\x19\n\x11\x63pu_usage_percent\x18\x03 \x01(\x02\x12\x1a\n\x12\x61\x63tive_connections\x18\x04 \x01(\r\"\xae\x01\n\x0f\x43leanupResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x42\n\x0fresources_freed\x18\x03 \x03(\x0b\x32).pynq.CleanupResponse.ResourcesFreedEntry\x1a\x35\n\x13ResourcesFreedEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"6\n\x12\x44isconnectResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"&\n\x11HeartbeatResponse\x12\x11\n\ttimestamp\x18\x01 \x01(\x03\"3\n\x0cRegisterInfo\x12\x0e\n\x06offset\x18\x01 \x01(\r\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t2\xd1\x08\n\x0bPYNQService\x12\x35\n\x0c\x41uthenticate\x12\x11.pynq.AuthRequest\x1a\x12.pynq.AuthResponse\x12\x42\n\x0bLoadOverlay\x12\x18.pynq.LoadOverlayRequest\x1a\x19.pynq.LoadOverlayResponse\x12H\n\x0eGetOverlayInfo\x12\x1b.pynq.GetOverlayInfoRequest\x1a\x19.pynq.OverlayInfoResponse\x12\x38\n\rUnloadOverlay\x12\x1a.pynq.UnloadOverlayRequest\x1a\x0b.pynq.Empty\x12?\n\nCreateMMIO\x12\x17.pynq.CreateMMIORequest\x1a\x18.pynq.CreateMMIOResponse\x12\x39\n\x08MMIORead\x12\x15.pynq.MMIOReadRequest\x1a\x16.pynq.MMIOReadResponse\x12\x30\n\tMMIOWrite\x12\x16.pynq.MMIOWriteRequest\x1a\x0b.pynq.Empty\x12\x34\n\x0bReleaseMMIO\x12\x18.pynq.ReleaseMMIORequest\x1a\x0b.pynq.Empty\x12K\n\x0e\x41llocateBuffer\x12\x1b.pynq.AllocateBufferRequest\x1a\x1c.pynq.AllocateBufferResponse\x12?\n\nReadBuffer\x12\x17.pynq.ReadBufferRequest\x1a\x18.pynq.ReadBufferResponse\x12\x34\n\x0bWriteBuffer\x12\x18.pynq.WriteBufferRequest\x1a\x0b.pynq.Empty\x12\x32\n\nFreeBuffer\x12\x17.pynq.FreeBufferRequest\x1a\x0b.pynq.Empty\x12<\n\tCreateDMA\x12\x16.pynq.CreateDMARequest\x1a\x17.pynq.CreateDMAResponse\x12\x42\n\x0b\x44MATransfer\x12\x18.pynq.DMATransferRequest\x1a\x19.pynq.DMATransferResponse\x12\x45\n\x0cGetDMAStatus\x12\x19.pynq.GetDMAStatusRequest\x1a\x1a.pynq.GetDMAStatusResponse\x12\x36\n\x10\x43leanupResources\x12\x0b.pynq.Empty\x1a\x15.pynq.CleanupResponse\x12\x33\n\nDisconnect\x12\x0b.pynq.Empty\x1a\x18.pynq.DisconnectResponse\x12\x31\n\tHeartbeat\x12\x0b.pynq.Empty\x1a\x17.pynq.HeartbeatResponse2\xfe\x04\n\x15PYNQManagementService\x12\x45\n\x0c\x43reateTenant\x12\x19.pynq.CreateTenantRequest\x1a\x1a.pynq.CreateTenantResponse\x12\x45\n\x0cUpdateTenant\x12\x19.pynq.UpdateTenantRequest\x1a\x1a.pynq.UpdateTenantResponse\x12\x45\n\x0c\x44\x65leteTenant\x12\x19.pynq.DeleteTenantRequest\x1a\x1a.pynq.DeleteTenantResponse\x12\x42\n\x0bListTenants\x12\x18.pynq.ListTenantsRequest\x1a\x19.pynq.ListTenantsResponse\x12=\n\x13\x41\x64\x64\x41llowedBitstream\x12\x19.pynq.AddBitstreamRequest\x1a\x0b.pynq.Empty\x12\x43\n\x16RemoveAllowedBitstream\x12\x1c.pynq.RemoveBitstreamRequest\x1a\x0b.pynq.Empty\x12<\n\x12UpdateTenantLimits\x12\x19.pynq.UpdateLimitsRequest\x1a\x0b.pynq.Empty\x12N\n\x0fGetTenantStatus\x12\x1c.pynq.GetTenantStatusRequest\x1a\x1d.pynq.GetTenantStatusResponse\x12:\n\x0fGetSystemStatus\x12\x0b.pynq.Empty\x1a\x1a.pynq.SystemStatusResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12pynq_service.proto\x12\x04pynq\"\x07\n\x05\x45mpty\"&\n\x05\x45rror\x12\x0c\n\x04\x63ode\x18\x01 \x01(\r\x12\x0f\n\x07message\x18\x02 \x01(\t\"1\n\x0b\x41uthRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x0f\n\x07\x61pi_key\x18\x02 \x01(\t\"[\n\x0c\x41uthResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x15\n\rsession_token\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x12\n\nexpires_at\x18\x04 \x01(\x03\"]\n\x12LoadOverlayRequest\x12\x14\n\x0c\x62itfile_path\x18\x01 \x01(\t\x12\x10\n\x08\x64ownload\x18\x02 \x01(\x08\x12\x1f\n\x17partial_reconfiguration\x18\x03 \x01(\x08\"\xc9\x01\n\x13LoadOverlayResponse\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x38\n\x08ip_cores\x18\x02 \x03(\x0b\x32&.pynq.LoadOverlayResponse.IpCoresEntry\x12\x12\n\nuio_device\x18\x03 \x01(\t\x12\x12\n\npr_zone_id\x18\x04 \x01(\x05\x1a<\n\x0cIpCoresEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1b\n\x05value\x18\x02 \x01(\x0b\x32\x0c.pynq.IPCore:\x02\x38\x01\"\xac\x02\n\x06IPCore\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x14\n\x0c\x62\x61se_address\x18\x03 \x01(\x04\x12\x15\n\raddress_range\x18\x04 \x01(\r\x12\x30\n\nparameters\x18\x05 \x03(\x0b\x32\x1c.pynq.IPCore.ParametersEntry\x12.\n\tregisters\x18\x06 \x03(\x0b\x32\x1b.pynq.IPCore.RegistersEntry\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x44\n\x0eRegistersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12!\n\x05value\x18\x02 \x01(\x0b\x32\x12.pynq.RegisterInfo:\x02\x38\x01\"\xb0\x01\n\x15GetOverlayInfoRequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12=\n\x0c\x64\x65tail_level\x18\x02 \x01(\x0e\x32\'.pynq.GetOverlayInfoRequest.DetailLevel\x12\x10\n\x08ip_names\x18\x03 \x03(\t\"2\n\x0b\x44\x65tailLevel\x12\t\n\x05\x42\x41SIC\x10\x00\x12\n\n\x06NORMAL\x10\x01\x12\x0c\n\x08\x44\x45TAILED\x10\x02\"\xd4\x02\n\x13OverlayInfoResponse\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x38\n\x08ip_cores\x18\x02 \x03(\x0b\x32&.pynq.OverlayInfoResponse.IpCoresEntry\x12\x11\n\tloaded_at\x18\x03 \x01(\x03\x12\x14\n\x0c\x62itfile_path\x18\x04 \x01(\t\x12\x16\n\x0e\x62itstream_size\x18\x05 \x01(\x04\x12=\n\nproperties\x18\x06 \x03(\x0b\x32).pynq.OverlayInfoResponse.PropertiesEntry\x1a<\n\x0cIpCoresEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1b\n\x05value\x18\x02 \x01(\x0b\x32\x0c.pynq.IPCore:\x02\x38\x01\x1a\x31\n\x0fPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"9\n\x14UnloadOverlayRequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\r\n\x05\x66orce\x18\x02 \x01(\x08\"^\n\x11\x43reateMMIORequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x0f\n\x07ip_name\x18\x02 \x01(\t\x12\x14\n\x0c\x62\x61se_address\x18\x03 \x01(\x04\x12\x0e\n\x06length\x18\x04 \x01(\r\"$\n\x12\x43reateMMIOResponse\x12\x0e\n\x06handle\x18\x01 \x01(\t\"A\n\x0fMMIOReadRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\x0e\n\x06length\x18\x03 \x01(\r\"!\n\x10MMIOReadResponse\x12\r\n\x05value\x18\x01 \x01(\x04\"A\n\x10MMIOWriteRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\r\n\x05value\x18\x03 \x01(\x04\"E\n\x14MMIOReadBlockRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\r\n\x05\x63ount\x18\x03 \x01(\r\"%\n\x15MMIOReadBlockResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"E\n\x15MMIOWriteBlockRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"\x95\x01\n\x10\x42\x61tchMMIORequest\x12\x0f\n\x07handles\x18\x01 \x03(\t\x12\x14\n\x0chandle_index\x18\x02 \x03(\r\x12\x1e\n\x03ops\x18\x03 \x03(\x0e\x32\x11.pynq.MMIOBatchOp\x12\x0f\n\x07offsets\x18\x04 \x03(\r\x12\x0e\n\x06values\x18\x05 \x03(\r\x12\x19\n\x11\x63ontinue_on_error\x18\x06 \x01(\x08\">\n\x11\x42\x61tchMMIOResponse\x12\x0e\n\x06values\x18\x01 \x03(\r\x12\n\n\x02ok\x18\x02 \x03(\x08\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"\x9e\x01\n\x11MMIOStreamRequest\x12\x0b\n\x03seq\x18\x01 \x01(\r\x12\x1e\n\x02op\x18\x02 \x01(\x0e\x32\x12.pynq.MMIOStreamOp\x12\x0e\n\x06handle\x18\x03 \x01(\t\x12\x0e\n\x06offset\x18\x04 \x01(\r\x12\r\n\x05value\x18\x05 \x01(\x04\x12\x0c\n\x04mask\x18\x06 \x01(\r\x12\x12\n\ntimeout_us\x18\x07 \x01(\r\x12\x0b\n\x03\x61\x63k\x18\x08 \x01(\x08\"\\\n\x12MMIOStreamResponse\x12\x0b\n\x03seq\x18\x01 \x01(\r\x12\n\n\x02ok\x18\x02 \x01(\x08\x12\r\n\x05value\x18\x03 \x01(\x04\x12\r\n\x05\x65rror\x18\x04 \x01(\t\x12\x0f\n\x07timeout\x18\x05 \x01(\x08\"$\n\x12ReleaseMMIORequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\"5\n\x15\x41llocateBufferRequest\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\r\n\x05\x64type\x18\x02 \x01(\t\"\x86\x02\n\x16\x41llocateBufferResponse\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\r\n\x05shape\x18\x02 \x03(\x05\x12\r\n\x05\x64type\x18\x03 \x01(\t\x12\x0c\n\x04size\x18\x04 \x01(\x03\x12\x15\n\x08shm_name\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x1d\n\x10physical_address\x18\x06 \x01(\x04H\x01\x88\x01\x01\x12\x16\n\tvm_offset\x18\x07 \x01(\x04H\x02\x88\x01\x01\x12\x1d\n\x10\x63har_device_path\x18\x08 \x01(\tH\x03\x88\x01\x01\x42\x0b\n\t_shm_nameB\x13\n\x11_physical_addressB\x0c\n\n_vm_offsetB\x13\n\x11_char_device_path\"n\n\x11ReadBufferRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0e\n\x06length\x18\x03 \x01(\x03\x12\x12\n\nchunk_size\x18\x04 \x01(\x05\x12\x15\n\rknown_version\x18\x05 \x01(\x03\"I\n\x12ReadBufferResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0f\n\x07version\x18\x02 \x01(\x03\x12\x14\n\x0cnot_modified\x18\x03 \x01(\x08\"B\n\x12WriteBufferRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"@\n\x13WriteBufferResponse\x12\x0f\n\x07version\x18\x01 \x01(\x03\x12\x18\n\x10previous_version\x18\x02 \x01(\x03\"b\n\x0b\x42ufferChunk\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\x12\x0f\n\x07version\x18\x04 \x01(\x03\x12\x14\n\x0cnot_modified\x18\x05 \x01(\x08\"#\n\x11\x46reeBufferRequest\x12\x0e\n\x06handle\x18\x01 \x01(\t\"8\n\x10\x43reateDMARequest\x12\x12\n\noverlay_id\x18\x01 \x01(\t\x12\x10\n\x08\x64ma_name\x18\x02 \x01(\t\"r\n\x11\x43reateDMAResponse\x12\x0e\n\x06handle\x18\x01 \x01(\t\x12\x18\n\x10has_send_channel\x18\x02 \x01(\x08\x12\x18\n\x10has_recv_channel\x18\x03 \x01(\x08\x12\x19\n\x11max_transfer_size\x18\x04 \x01(\x04\"\x98\x01\n\x12\x44MATransferRequest\x12\x12\n\ndma_handle\x18\x01 \x01(\t\x12%\n\tdirection\x18\x02 \x01(\x0e\x32\x12.pynq.DMADirection\x12\x15\n\rbuffer_handle\x18\x03 \x01(\t\x12\x0e\n\x06length\x18\x04 \x01(\x04\x12\x0c\n\x04wait\x18\x05 \x01(\x08\x12\x12\n\ntimeout_ms\x18\x06 \x01(\r\"u\n\x13\x44MATransferResponse\x12\x13\n\x0btransfer_id\x18\x01 \x01(\t\x12\x1f\n\x06status\x18\x02 \x01(\x0e\x32\x0f.pynq.DMAStatus\x12\x19\n\x11\x62ytes_transferred\x18\x03 \x01(\x04\x12\r\n\x05\x65rror\x18\x04 \x01(\t\">\n\x13GetDMAStatusRequest\x12\x13\n\x0btransfer_id\x18\x01 \x01(\t\x12\x12\n\ntimeout_ms\x18\x02 \x01(\r\"a\n\x14GetDMAStatusResponse\x12\x1f\n\x06status\x18\x01 \x01(\x0e\x32\x0f.pynq.DMAStatus\x12\x19\n\x11\x62ytes_transferred\x18\x02 \x01(\x04\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"\x19\n\x17WatchCompletionsRequest\"o\n\rDMACompletion\x12\x13\n\x0btransfer_id\x18\x01 \x01(\t\x12\x1f\n\x06status\x18\x02 \x01(\x0e\x32\x0f.pynq.DMAStatus\x12\x19\n\x11\x62ytes_transferred\x18\x03 \x01(\x04\x12\r\n\x05\x65rror\x18\x04 \x01(\t\"M\n\x0f\x43ompletionBatch\x12(\n\x0b\x63ompletions\x18\x01 \x03(\x0b\x32\x13.pynq.DMACompletion\x12\x10\n\x08overflow\x18\x02 \x01(\x08\"*\n\x0c\x41\x64\x64ressRange\x12\r\n\x05start\x18\x01 \x01(\x04\x12\x0b\n\x03\x65nd\x18\x02 \x01(\x04\"\xa1\x02\n\x13\x43reateTenantRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x0b\n\x03uid\x18\x02 \x01(\r\x12\x0b\n\x03gid\x18\x03 \x01(\r\x12\x0f\n\x07\x61pi_key\x18\x04 \x01(\t\x12\x30\n\x06limits\x18\x05 \x01(\x0b\x32 .pynq.CreateTenantRequest.Limits\x12\x1a\n\x12\x61llowed_bitstreams\x18\x06 \x03(\t\x12\x32\n\x16\x61llowed_address_ranges\x18\x07 \x03(\x0b\x32\x12.pynq.AddressRange\x1aJ\n\x06Limits\x12\x14\n\x0cmax_overlays\x18\x01 \x01(\r\x12\x13\n\x0bmax_buffers\x18\x02 \x01(\r\x12\x15\n\rmax_memory_mb\x18\x03 \x01(\r\"M\n\x14\x43reateTenantResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bsocket_path\x18\x03 \x01(\t\"\xc1\x02\n\x13UpdateTenantRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x32\n\x07updates\x18\x02 \x01(\x0b\x32!.pynq.UpdateTenantRequest.Updates\x1a\xe2\x01\n\x07Updates\x12\x0f\n\x07\x61pi_key\x18\x01 \x01(\t\x12\x30\n\x06limits\x18\x02 \x01(\x0b\x32 .pynq.CreateTenantRequest.Limits\x12\x16\n\x0e\x61\x64\x64_bitstreams\x18\x03 \x03(\t\x12\x19\n\x11remove_bitstreams\x18\x04 \x03(\t\x12.\n\x12\x61\x64\x64_address_ranges\x18\x05 \x03(\x0b\x32\x12.pynq.AddressRange\x12\x31\n\x15remove_address_ranges\x18\x06 \x03(\x0b\x32\x12.pynq.AddressRange\"8\n\x14UpdateTenantResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"7\n\x13\x44\x65leteTenantRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\r\n\x05\x66orce\x18\x02 \x01(\x08\"8\n\x14\x44\x65leteTenantResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\",\n\x12ListTenantsRequest\x12\x16\n\x0einclude_status\x18\x01 \x01(\x08\"8\n\x13ListTenantsResponse\x12!\n\x07tenants\x18\x01 \x03(\x0b\x32\x10.pynq.TenantInfo\"\xab\x01\n\nTenantInfo\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x0b\n\x03uid\x18\x02 \x01(\r\x12\x0b\n\x03gid\x18\x03 \x01(\r\x12\x30\n\x06limits\x18\x04 \x01(\x0b\x32 .pynq.CreateTenantRequest.Limits\x12\x1a\n\x12\x61llowed_bitstreams\x18\x05 \x03(\t\x12\"\n\x06status\x18\x06 \x01(\x0b\x32\x12.pynq.TenantStatus\"\x81\x01\n\x0cTenantStatus\x12\x0e\n\x06online\x18\x01 \x01(\x08\x12\x17\n\x0f\x61\x63tive_overlays\x18\x02 \x01(\r\x12\x16\n\x0e\x61\x63tive_buffers\x18\x03 \x01(\r\x12\x19\n\x11memory_used_bytes\x18\x04 \x01(\x04\x12\x15\n\rlast_activity\x18\x05 \x01(\x03\";\n\x13\x41\x64\x64\x42itstreamRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x11\n\tbitstream\x18\x02 \x01(\t\">\n\x16RemoveBitstreamRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x11\n\tbitstream\x18\x02 \x01(\t\"\xac\x01\n\x13UpdateLimitsRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x33\n\x06limits\x18\x02 \x01(\x0b\x32#.pynq.UpdateLimitsRequest.NewLimits\x1aM\n\tNewLimits\x12\x14\n\x0cmax_overlays\x18\x01 \x01(\r\x12\x13\n\x0bmax_buffers\x18\x02 \x01(\r\x12\x15\n\rmax_memory_mb\x18\x03 \x01(\r\"F\n\x16GetTenantStatusRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x19\n\x11include_resources\x18\x02 \x01(\x08\"\xe6\x01\n\x17GetTenantStatusResponse\x12\x1e\n\x04info\x18\x01 \x01(\x0b\x32\x10.pynq.TenantInfo\x12@\n\tresources\x18\x02 \x01(\x0b\x32-.pynq.GetTenantStatusResponse.ActiveResources\x1ai\n\x0f\x41\x63tiveResources\x12\x13\n\x0boverlay_ids\x18\x01 \x03(\t\x12\x14\n\x0cmmio_handles\x18\x02 \x03(\t\x12\x16\n\x0e\x62uffer_handles\x18\x03 \x03(\t\x12\x13\n\x0b\x64ma_handles\x18\x04 \x03(\t\"\xe4\x02\n\x14SystemStatusResponse\x12\x15\n\rtotal_tenants\x18\x01 \x01(\r\x12\x16\n\x0eonline_tenants\x18\x02 \x01(\r\x12\x19\n\x11total_memory_used\x18\x03 \x01(\x04\x12\x1d\n\x15total_overlays_loaded\x18\x04 \x01(\r\x12:\n\x06system\x18\x05 \x01(\x0b\x32*.pynq.SystemStatusResponse.SystemResources\x12!\n\x07tenants\x18\x06 \x03(\x0b\x32\x10.pynq.TenantInfo\x1a\x83\x01\n\x0fSystemResources\x12\x1e\n\x16total_memory_available\x18\x01 \x01(\x04\x12\x19\n\x11total_memory_used\x18\x02 \x01(\x04\x12\x19\n\x11\x63pu_usage_percent\x18\x03 \x01(\x02\x12\x1a\n\x12\x61\x63tive_connections\x18\x04 \x01(\r\"P\n\x16\x46\x61stPathMetricsRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\n\n\x02op\x18\x02 \x01(\t\x12\x17\n\x0finclude_buckets\x18\x03 \x01(\x08\"2\n\x0fHistogramBucket\x12\x10\n\x08upper_ns\x18\x01 \x01(\x04\x12\r\n\x05\x63ount\x18\x02 \x01(\x04\"\xb9\x01\n\x0eLatencySummary\x12\r\n\x05\x63ount\x18\x01 \x01(\x04\x12\x0f\n\x07mean_ns\x18\x02 \x01(\x01\x12\x0e\n\x06min_ns\x18\x03 \x01(\x04\x12\x0e\n\x06p50_ns\x18\x04 \x01(\x04\x12\x0e\n\x06p90_ns\x18\x05 \x01(\x04\x12\x0e\n\x06p99_ns\x18\x06 \x01(\x04\x12\x0f\n\x07p999_ns\x18\x07 \x01(\x04\x12\x0e\n\x06max_ns\x18\x08 \x01(\x04\x12&\n\x07\x62uckets\x18\t \x03(\x0b\x32\x15.pynq.HistogramBucket\"\xbf\x01\n\x11\x46\x61stPathOpMetrics\x12\n\n\x02op\x18\x01 \x01(\t\x12\x11\n\ttenant_id\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x04\x12\x0e\n\x06\x65rrors\x18\x04 \x01(\x04\x12$\n\x06\x64\x65\x63ode\x18\x05 \x01(\x0b\x32\x14.pynq.LatencySummary\x12$\n\x06lookup\x18\x06 \x01(\x0b\x32\x14.pynq.LatencySummary\x12 \n\x02hw\x18\x07 \x01(\x0b\x32\x14.pynq.LatencySummary\"\xd6\x01\n\x15\x46\x61stPathTenantMetrics\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x12\n\ncache_hits\x18\x02 \x01(\x04\x12\x14\n\x0c\x63\x61\x63he_misses\x18\x03 \x01(\x04\x12\x17\n\x0f\x63\x61\x63he_hit_ratio\x18\x04 \x01(\x01\x12\x15\n\rrevalidations\x18\x05 \x01(\x04\x12\x13\n\x0brevocations\x18\x06 \x01(\x04\x12\x17\n\x0fprotocol_errors\x18\x07 \x01(\x04\x12\"\n\x04send\x18\x08 \x01(\x0b\x32\x14.pynq.LatencySummary\"\x85\x01\n\x17\x46\x61stPathMetricsResponse\x12$\n\x03ops\x18\x01 \x03(\x0b\x32\x17.pynq.FastPathOpMetrics\x12,\n\x07tenants\x18\x02 \x03(\x0b\x32\x1b.pynq.FastPathTenantMetrics\x12\x16\n\x0ewindow_seconds\x18\x03 \x01(\x01\"\x9d\x01\n\x14\x42ufferPoolClassStats\x12\x0c\n\x04size\x18\x01 \x01(\x04\x12\x0c\n\x04hits\x18\x02 \x01(\x04\x12\x0e\n\x06misses\x18\x03 \x01(\x04\x12\x10\n\x08recycled\x18\x04 \x01(\x04\x12\x10\n\x08released\x18\x05 \x01(\x04\x12\x0e\n\x06in_use\x18\x06 \x01(\x04\x12\x0c\n\x04\x66ree\x18\x07 \x01(\x04\x12\x17\n\x0frequested_bytes\x18\x08 \x01(\x04\"\x9d\x01\n\x17\x42ufferPoolStatsResponse\x12+\n\x07\x63lasses\x18\x01 \x03(\x0b\x32\x1a.pynq.BufferPoolClassStats\x12\x14\n\x0cpooled_bytes\x18\x02 \x01(\x04\x12\x18\n\x10max_pooled_bytes\x18\x03 \x01(\x04\x12\r\n\x05trims\x18\x04 \x01(\x04\x12\x16\n\x0e\x63ma_free_bytes\x18\x05 \x01(\x03\"\xae\x01\n\x0f\x43leanupResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x42\n\x0fresources_freed\x18\x03 \x03(\x0b\x32).pynq.CleanupResponse.ResourcesFreedEntry\x1a\x35\n\x13ResourcesFreedEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\"6\n\x12\x44isconnectResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"&\n\x11HeartbeatResponse\x12\x11\n\ttimestamp\x18\x01 \x01(\x03\"3\n\x0cRegisterInfo\x12\x0e\n\x06offset\x18\x01 \x01(\r\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t*8\n\x0bMMIOBatchOp\x12\x13\n\x0fMMIO_BATCH_READ\x10\x00\x12\x14\n\x10MMIO_BATCH_WRITE\x10\x01*h\n\x0cMMIOStreamOp\x12\x14\n\x10MMIO_STREAM_READ\x10\x00\x12\x15\n\x11MMIO_STREAM_WRITE\x10\x01\x12\x14\n\x10MMIO_STREAM_POLL\x10\x02\x12\x15\n\x11MMIO_STREAM_FENCE\x10\x03**\n\x0c\x44MADirection\x12\x0c\n\x08\x44MA_MM2S\x10\x00\x12\x0c\n\x08\x44MA_S2MM\x10\x01*[\n\tDMAStatus\x12\x0f\n\x0b\x44MA_PENDING\x10\x00\x12\x0f\n\x0b\x44MA_RUNNING\x10\x01\x12\x0c\n\x08\x44MA_DONE\x10\x02\x12\r\n\tDMA_ERROR\x10\x03\x12\x0f\n\x0b\x44MA_TIMEOUT\x10\x04\x32\xbb\x0c\n\x0bPYNQService\x12\x35\n\x0c\x41uthenticate\x12\x11.pynq.AuthRequest\x1a\x12.pynq.AuthResponse\x12\x42\n\x0bLoadOverlay\x12\x18.pynq.LoadOverlayRequest\x1a\x19.pynq.LoadOverlayResponse\x12H\n\x0eGetOverlayInfo\x12\x1b.pynq.GetOverlayInfoRequest\x1a\x19.pynq.OverlayInfoResponse\x12\x38\n\rUnloadOverlay\x12\x1a.pynq.UnloadOverlayRequest\x1a\x0b.pynq.Empty\x12?\n\nCreateMMIO\x12\x17.pynq.CreateMMIORequest\x1a\x18.pynq.CreateMMIOResponse\x12\x39\n\x08MMIORead\x12\x15.pynq.MMIOReadRequest\x1a\x16.pynq.MMIOReadResponse\x12\x30\n\tMMIOWrite\x12\x16.pynq.MMIOWriteRequest\x1a\x0b.pynq.Empty\x12H\n\rMMIOReadBlock\x12\x1a.pynq.MMIOReadBlockRequest\x1a\x1b.pynq.MMIOReadBlockResponse\x12:\n\x0eMMIOWriteBlock\x12\x1b.pynq.MMIOWriteBlockRequest\x1a\x0b.pynq.Empty\x12<\n\tBatchMMIO\x12\x16.pynq.BatchMMIORequest\x1a\x17.pynq.BatchMMIOResponse\x12\x34\n\x0bReleaseMMIO\x12\x18.pynq.ReleaseMMIORequest\x1a\x0b.pynq.Empty\x12\x43\n\nMMIOStream\x12\x17.pynq.MMIOStreamRequest\x1a\x18.pynq.MMIOStreamResponse(\x01\x30\x01\x12K\n\x0e\x41llocateBuffer\x12\x1b.pynq.AllocateBufferRequest\x1a\x1c.pynq.AllocateBufferResponse\x12?\n\nReadBuffer\x12\x17.pynq.ReadBufferRequest\x1a\x18.pynq.ReadBufferResponse\x12\x42\n\x0bWriteBuffer\x12\x18.pynq.WriteBufferRequest\x1a\x19.pynq.WriteBufferResponse\x12@\n\x10ReadBufferStream\x12\x17.pynq.ReadBufferRequest\x1a\x11.pynq.BufferChunk0\x01\x12\x43\n\x11WriteBufferStream\x12\x11.pynq.BufferChunk\x1a\x19.pynq.WriteBufferResponse(\x01\x12\x32\n\nFreeBuffer\x12\x17.pynq.FreeBufferRequest\x1a\x0b.pynq.Empty\x12<\n\tCreateDMA\x12\x16.pynq.CreateDMARequest\x1a\x17.pynq.CreateDMAResponse\x12\x42\n\x0b\x44MATransfer\x12\x18.pynq.DMATransferRequest\x1a\x19.pynq.DMATransferResponse\x12\x45\n\x0cGetDMAStatus\x12\x19.pynq.GetDMAStatusRequest\x1a\x1a.pynq.GetDMAStatusResponse\x12J\n\x10WatchCompletions\x12\x1d.pynq.WatchCompletionsRequest\x1a\x15.pynq.CompletionBatch0\x01\x12\x36\n\x10\x43leanupResources\x12\x0b.pynq.Empty\x1a\x15.pynq.CleanupResponse\x12\x33\n\nDisconnect\x12\x0b.pynq.Empty\x1a\x18.pynq.DisconnectResponse\x12\x31\n\tHeartbeat\x12\x0b.pynq.Empty\x1a\x17.pynq.HeartbeatResponse2\xc5\x06\n\x15PYNQManagementService\x12\x45\n\x0c\x43reateTenant\x12\x19.pynq.CreateTenantRequest\x1a\x1a.pynq.CreateTenantResponse\x12\x45\n\x0cUpdateTenant\x12\x19.pynq.UpdateTenantRequest\x1a\x1a.pynq.UpdateTenantResponse\x12\x45\n\x0c\x44\x65leteTenant\x12\x19.pynq.DeleteTenantRequest\x1a\x1a.pynq.DeleteTenantResponse\x12\x42\n\x0bListTenants\x12\x18.pynq.ListTenantsRequest\x1a\x19.pynq.ListTenantsResponse\x12=\n\x13\x41\x64\x64\x41llowedBitstream\x12\x19.pynq.AddBitstreamRequest\x1a\x0b.pynq.Empty\x12\x43\n\x16RemoveAllowedBitstream\x12\x1c.pynq.RemoveBitstreamRequest\x1a\x0b.pynq.Empty\x12<\n\x12UpdateTenantLimits\x12\x19.pynq.UpdateLimitsRequest\x1a\x0b.pynq.Empty\x12N\n\x0fGetTenantStatus\x12\x1c.pynq.GetTenantStatusRequest\x1a\x1d.pynq.GetTenantStatusResponse\x12:\n\x0fGetSystemStatus\x12\x0b.pynq.Empty\x1a\x1a.pynq.SystemStatusResponse\x12Q\n\x12GetFastPathMetrics\x12\x1c.pynq.FastPathMetricsRequest\x1a\x1d.pynq.FastPathMetricsResponse\x12\x30\n\x14ResetFastPathMetrics\x12\x0b.pynq.Empty\x1a\x0b.pynq.Empty\x12@\n\x12GetBufferPoolStats\x12\x0b.pynq.Empty\x1a\x1d.pynq.BufferPoolStatsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'pynq_service_pb2', _globals)
-if not _descriptor._USE_C_DESCRIPTORS:
-  DESCRIPTOR._loaded_options = None
-  _globals['_LOADOVERLAYRESPONSE_IPCORESENTRY']._loaded_options = None
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_LOADOVERLAYRESPONSE_IPCORESENTRY']._options = None
   _globals['_LOADOVERLAYRESPONSE_IPCORESENTRY']._serialized_options = b'8\001'
-  _globals['_IPCORE_PARAMETERSENTRY']._loaded_options = None
+  _globals['_IPCORE_PARAMETERSENTRY']._options = None
   _globals['_IPCORE_PARAMETERSENTRY']._serialized_options = b'8\001'
-  _globals['_IPCORE_REGISTERSENTRY']._loaded_options = None
+  _globals['_IPCORE_REGISTERSENTRY']._options = None
   _globals['_IPCORE_REGISTERSENTRY']._serialized_options = b'8\001'
-  _globals['_OVERLAYINFORESPONSE_IPCORESENTRY']._loaded_options = None
+  _globals['_OVERLAYINFORESPONSE_IPCORESENTRY']._options = None
   _globals['_OVERLAYINFORESPONSE_IPCORESENTRY']._serialized_options = b'8\001'
-  _globals['_OVERLAYINFORESPONSE_PROPERTIESENTRY']._loaded_options = None
+  _globals['_OVERLAYINFORESPONSE_PROPERTIESENTRY']._options = None
   _globals['_OVERLAYINFORESPONSE_PROPERTIESENTRY']._serialized_options = b'8\001'
-  _globals['_CLEANUPRESPONSE_RESOURCESFREEDENTRY']._loaded_options = None
+  _globals['_CLEANUPRESPONSE_RESOURCESFREEDENTRY']._options = None
   _globals['_CLEANUPRESPONSE_RESOURCESFREEDENTRY']._serialized_options = b'8\001'
+  _globals['_MMIOBATCHOP']._serialized_start=7806
+  _globals['_MMIOBATCHOP']._serialized_end=7862
+  _globals['_MMIOSTREAMOP']._serialized_start=7864
+  _globals['_MMIOSTREAMOP']._serialized_end=7968
+  _globals['_DMADIRECTION']._serialized_start=7970
+  _globals['_DMADIRECTION']._serialized_end=8012
+  _globals['_DMASTATUS']._serialized_start=8014
+  _globals['_DMASTATUS']._serialized_end=8105
   _globals['_EMPTY']._serialized_start=28
   _globals['_EMPTY']._serialized_end=35
   _globals['_ERROR']._serialized_start=37
@@ -54,119 +52,159 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_LOADOVERLAYREQUEST']._serialized_start=221
   _globals['_LOADOVERLAYREQUEST']._serialized_end=314
   _globals['_LOADOVERLAYRESPONSE']._serialized_start=317
-  _globals['_LOADOVERLAYRESPONSE']._serialized_end=493
-  _globals['_LOADOVERLAYRESPONSE_IPCORESENTRY']._serialized_start=433
-  _globals['_LOADOVERLAYRESPONSE_IPCORESENTRY']._serialized_end=493
-  _globals['_IPCORE']._serialized_start=496
-  _globals['_IPCORE']._serialized_end=796
-  _globals['_IPCORE_PARAMETERSENTRY']._serialized_start=677
-  _globals['_IPCORE_PARAMETERSENTRY']._serialized_end=726
-  _globals['_IPCORE_REGISTERSENTRY']._serialized_start=728
-  _globals['_IPCORE_REGISTERSENTRY']._serialized_end=796
-  _globals['_GETOVERLAYINFOREQUEST']._serialized_start=799
-  _globals['_GETOVERLAYINFOREQUEST']._serialized_end=975
-  _globals['_GETOVERLAYINFOREQUEST_DETAILLEVEL']._serialized_start=925
-  _globals['_GETOVERLAYINFOREQUEST_DETAILLEVEL']._serialized_end=975
-  _globals['_OVERLAYINFORESPONSE']._serialized_start=978
-  _globals['_OVERLAYINFORESPONSE']._serialized_end=1318
-  _globals['_OVERLAYINFORESPONSE_IPCORESENTRY']._serialized_start=433
-  _globals['_OVERLAYINFORESPONSE_IPCORESENTRY']._serialized_end=493
-  _globals['_OVERLAYINFORESPONSE_PROPERTIESENTRY']._serialized_start=1269
-  _globals['_OVERLAYINFORESPONSE_PROPERTIESENTRY']._serialized_end=1318
-  _globals['_UNLOADOVERLAYREQUEST']._serialized_start=1320
-  _globals['_UNLOADOVERLAYREQUEST']._serialized_end=1377
-  _globals['_CREATEMMIOREQUEST']._serialized_start=1379
-  _globals['_CREATEMMIOREQUEST']._serialized_end=1473
-  _globals['_CREATEMMIORESPONSE']._serialized_start=1475
-  _globals['_CREATEMMIORESPONSE']._serialized_end=1511
-  _globals['_MMIOREADREQUEST']._serialized_start=1513
-  _globals['_MMIOREADREQUEST']._serialized_end=1578
-  _globals['_MMIOREADRESPONSE']._serialized_start=1580
-  _globals['_MMIOREADRESPONSE']._serialized_end=1613
-  _globals['_MMIOWRITEREQUEST']._serialized_start=1615
-  _globals['_MMIOWRITEREQUEST']._serialized_end=1680
-  _globals['_RELEASEMMIOREQUEST']._serialized_start=1682
-  _globals['_RELEASEMMIOREQUEST']._serialized_end=1718
-  _globals['_ALLOCATEBUFFERREQUEST']._serialized_start=1720
-  _globals['_ALLOCATEBUFFERREQUEST']._serialized_end=1773
-  _globals['_ALLOCATEBUFFERRESPONSE']._serialized_start=1776
-  _globals['_ALLOCATEBUFFERRESPONSE']._serialized_end=1948
-  _globals['_READBUFFERREQUEST']._serialized_start=1950
-  _globals['_READBUFFERREQUEST']._serialized_end=2017
-  _globals['_READBUFFERRESPONSE']._serialized_start=2019
-  _globals['_READBUFFERRESPONSE']._serialized_end=2053
-  _globals['_WRITEBUFFERREQUEST']._serialized_start=2055
-  _globals['_WRITEBUFFERREQUEST']._serialized_end=2121
-  _globals['_FREEBUFFERREQUEST']._serialized_start=2123
-  _globals['_FREEBUFFERREQUEST']._serialized_end=2158
-  _globals['_CREATEDMAREQUEST']._serialized_start=2160
-  _globals['_CREATEDMAREQUEST']._serialized_end=2216
-  _globals['_CREATEDMARESPONSE']._serialized_start=2218
-  _globals['_CREATEDMARESPONSE']._serialized_end=2305
-  _globals['_DMATRANSFERREQUEST']._serialized_start=2308
-  _globals['_DMATRANSFERREQUEST']._serialized_end=2440
-  _globals['_DMATRANSFERRESPONSE']._serialized_start=2442
-  _globals['_DMATRANSFERRESPONSE']._serialized_end=2542
-  _globals['_GETDMASTATUSREQUEST']._serialized_start=2544
-  _globals['_GETDMASTATUSREQUEST']._serialized_end=2586
-  _globals['_GETDMASTATUSRESPONSE']._serialized_start=2588
-  _globals['_GETDMASTATUSRESPONSE']._serialized_end=2653
-  _globals['_ADDRESSRANGE']._serialized_start=2655
-  _globals['_ADDRESSRANGE']._serialized_end=2697
-  _globals['_CREATETENANTREQUEST']._serialized_start=2700
-  _globals['_CREATETENANTREQUEST']._serialized_end=2989
-  _globals['_CREATETENANTREQUEST_LIMITS']._serialized_start=2915
-  _globals['_CREATETENANTREQUEST_LIMITS']._serialized_end=2989
-  _globals['_CREATETENANTRESPONSE']._serialized_start=2991
-  _globals['_CREATETENANTRESPONSE']._serialized_end=3068
-  _globals['_UPDATETENANTREQUEST']._serialized_start=3071
-  _globals['_UPDATETENANTREQUEST']._serialized_end=3392
-  _globals['_UPDATETENANTREQUEST_UPDATES']._serialized_start=3166
-  _globals['_UPDATETENANTREQUEST_UPDATES']._serialized_end=3392
-  _globals['_UPDATETENANTRESPONSE']._serialized_start=3394
-  _globals['_UPDATETENANTRESPONSE']._serialized_end=3450
-  _globals['_DELETETENANTREQUEST']._serialized_start=3452
-  _globals['_DELETETENANTREQUEST']._serialized_end=3507
-  _globals['_DELETETENANTRESPONSE']._serialized_start=3509
-  _globals['_DELETETENANTRESPONSE']._serialized_end=3565
-  _globals['_LISTTENANTSREQUEST']._serialized_start=3567
-  _globals['_LISTTENANTSREQUEST']._serialized_end=3611
-  _globals['_LISTTENANTSRESPONSE']._serialized_start=3613
-  _globals['_LISTTENANTSRESPONSE']._serialized_end=3669
-  _globals['_TENANTINFO']._serialized_start=3672
-  _globals['_TENANTINFO']._serialized_end=3843
-  _globals['_TENANTSTATUS']._serialized_start=3846
-  _globals['_TENANTSTATUS']._serialized_end=3975
-  _globals['_ADDBITSTREAMREQUEST']._serialized_start=3977
-  _globals['_ADDBITSTREAMREQUEST']._serialized_end=4036
-  _globals['_REMOVEBITSTREAMREQUEST']._serialized_start=4038
-  _globals['_REMOVEBITSTREAMREQUEST']._serialized_end=4100
-  _globals['_UPDATELIMITSREQUEST']._serialized_start=4103
-  _globals['_UPDATELIMITSREQUEST']._serialized_end=4275
-  _globals['_UPDATELIMITSREQUEST_NEWLIMITS']._serialized_start=4198
-  _globals['_UPDATELIMITSREQUEST_NEWLIMITS']._serialized_end=4275
-  _globals['_GETTENANTSTATUSREQUEST']._serialized_start=4277
-  _globals['_GETTENANTSTATUSREQUEST']._serialized_end=4347
-  _globals['_GETTENANTSTATUSRESPONSE']._serialized_start=4350
-  _globals['_GETTENANTSTATUSRESPONSE']._serialized_end=4580
-  _globals['_GETTENANTSTATUSRESPONSE_ACTIVERESOURCES']._serialized_start=4475
-  _globals['_GETTENANTSTATUSRESPONSE_ACTIVERESOURCES']._serialized_end=4580
-  _globals['_SYSTEMSTATUSRESPONSE']._serialized_start=4583
-  _globals['_SYSTEMSTATUSRESPONSE']._serialized_end=4939
-  _globals['_SYSTEMSTATUSRESPONSE_SYSTEMRESOURCES']._serialized_start=4808
-  _globals['_SYSTEMSTATUSRESPONSE_SYSTEMRESOURCES']._serialized_end=4939
-  _globals['_CLEANUPRESPONSE']._serialized_start=4942
-  _globals['_CLEANUPRESPONSE']._serialized_end=5116
-  _globals['_CLEANUPRESPONSE_RESOURCESFREEDENTRY']._serialized_start=5063
-  _globals['_CLEANUPRESPONSE_RESOURCESFREEDENTRY']._serialized_end=5116
-  _globals['_DISCONNECTRESPONSE']._serialized_start=5118
-  _globals['_DISCONNECTRESPONSE']._serialized_end=5172
-  _globals['_HEARTBEATRESPONSE']._serialized_start=5174
-  _globals['_HEARTBEATRESPONSE']._serialized_end=5212
-  _globals['_REGISTERINFO']._serialized_start=5214
-  _globals['_REGISTERINFO']._serialized_end=5265
-  _globals['_PYNQSERVICE']._serialized_start=5268
-  _globals['_PYNQSERVICE']._serialized_end=6373
-  _globals['_PYNQMANAGEMENTSERVICE']._serialized_start=6376
-  _globals['_PYNQMANAGEMENTSERVICE']._serialized_end=7014
+  _globals['_LOADOVERLAYRESPONSE']._serialized_end=518
+  _globals['_LOADOVERLAYRESPONSE_IPCORESENTRY']._serialized_start=458
+  _globals['_LOADOVERLAYRESPONSE_IPCORESENTRY']._serialized_end=518
+  _globals['_IPCORE']._serialized_start=521
+  _globals['_IPCORE']._serialized_end=821
+  _globals['_IPCORE_PARAMETERSENTRY']._serialized_start=702
+  _globals['_IPCORE_PARAMETERSENTRY']._serialized_end=751
+  _globals['_IPCORE_REGISTERSENTRY']._serialized_start=753
+  _globals['_IPCORE_REGISTERSENTRY']._serialized_end=821
+  _globals['_GETOVERLAYINFOREQUEST']._serialized_start=824
+  _globals['_GETOVERLAYINFOREQUEST']._serialized_end=1000
+  _globals['_GETOVERLAYINFOREQUEST_DETAILLEVEL']._serialized_start=950
+  _globals['_GETOVERLAYINFOREQUEST_DETAILLEVEL']._serialized_end=1000
+  _globals['_OVERLAYINFORESPONSE']._serialized_start=1003
+  _globals['_OVERLAYINFORESPONSE']._serialized_end=1343
+  _globals['_OVERLAYINFORESPONSE_IPCORESENTRY']._serialized_start=458
+  _globals['_OVERLAYINFORESPONSE_IPCORESENTRY']._serialized_end=518
+  _globals['_OVERLAYINFORESPONSE_PROPERTIESENTRY']._serialized_start=1294
+  _globals['_OVERLAYINFORESPONSE_PROPERTIESENTRY']._serialized_end=1343
+  _globals['_UNLOADOVERLAYREQUEST']._serialized_start=1345
+  _globals['_UNLOADOVERLAYREQUEST']._serialized_end=1402
+  _globals['_CREATEMMIOREQUEST']._serialized_start=1404
+  _globals['_CREATEMMIOREQUEST']._serialized_end=1498
+  _globals['_CREATEMMIORESPONSE']._serialized_start=1500
+  _globals['_CREATEMMIORESPONSE']._serialized_end=1536
+  _globals['_MMIOREADREQUEST']._serialized_start=1538
+  _globals['_MMIOREADREQUEST']._serialized_end=1603
+  _globals['_MMIOREADRESPONSE']._serialized_start=1605
+  _globals['_MMIOREADRESPONSE']._serialized_end=1638
+  _globals['_MMIOWRITEREQUEST']._serialized_start=1640
+  _globals['_MMIOWRITEREQUEST']._serialized_end=1705
+  _globals['_MMIOREADBLOCKREQUEST']._serialized_start=1707
+  _globals['_MMIOREADBLOCKREQUEST']._serialized_end=1776
+  _globals['_MMIOREADBLOCKRESPONSE']._serialized_start=1778
+  _globals['_MMIOREADBLOCKRESPONSE']._serialized_end=1815
+  _globals['_MMIOWRITEBLOCKREQUEST']._serialized_start=1817
+  _globals['_MMIOWRITEBLOCKREQUEST']._serialized_end=1886
+  _globals['_BATCHMMIOREQUEST']._serialized_start=1889
+  _globals['_BATCHMMIOREQUEST']._serialized_end=2038
+  _globals['_BATCHMMIORESPONSE']._serialized_start=2040
+  _globals['_BATCHMMIORESPONSE']._serialized_end=2102
+  _globals['_MMIOSTREAMREQUEST']._serialized_start=2105
+  _globals['_MMIOSTREAMREQUEST']._serialized_end=2263
+  _globals['_MMIOSTREAMRESPONSE']._serialized_start=2265
+  _globals['_MMIOSTREAMRESPONSE']._serialized_end=2357
+  _globals['_RELEASEMMIOREQUEST']._serialized_start=2359
+  _globals['_RELEASEMMIOREQUEST']._serialized_end=2395
+  _globals['_ALLOCATEBUFFERREQUEST']._serialized_start=2397
+  _globals['_ALLOCATEBUFFERREQUEST']._serialized_end=2450
+  _globals['_ALLOCATEBUFFERRESPONSE']._serialized_start=2453
+  _globals['_ALLOCATEBUFFERRESPONSE']._serialized_end=2715
+  _globals['_READBUFFERREQUEST']._serialized_start=2717
+  _globals['_READBUFFERREQUEST']._serialized_end=2827
+  _globals['_READBUFFERRESPONSE']._serialized_start=2829
+  _globals['_READBUFFERRESPONSE']._serialized_end=2902
+  _globals['_WRITEBUFFERREQUEST']._serialized_start=2904
+  _globals['_WRITEBUFFERREQUEST']._serialized_end=2970
+  _globals['_WRITEBUFFERRESPONSE']._serialized_start=2972
+  _globals['_WRITEBUFFERRESPONSE']._serialized_end=3036
+  _globals['_BUFFERCHUNK']._serialized_start=3038
+  _globals['_BUFFERCHUNK']._serialized_end=3136
+  _globals['_FREEBUFFERREQUEST']._serialized_start=3138
+  _globals['_FREEBUFFERREQUEST']._serialized_end=3173
+  _globals['_CREATEDMAREQUEST']._serialized_start=3175
+  _globals['_CREATEDMAREQUEST']._serialized_end=3231
+  _globals['_CREATEDMARESPONSE']._serialized_start=3233
+  _globals['_CREATEDMARESPONSE']._serialized_end=3347
+  _globals['_DMATRANSFERREQUEST']._serialized_start=3350
+  _globals['_DMATRANSFERREQUEST']._serialized_end=3502
+  _globals['_DMATRANSFERRESPONSE']._serialized_start=3504
+  _globals['_DMATRANSFERRESPONSE']._serialized_end=3621
+  _globals['_GETDMASTATUSREQUEST']._serialized_start=3623
+  _globals['_GETDMASTATUSREQUEST']._serialized_end=3685
+  _globals['_GETDMASTATUSRESPONSE']._serialized_start=3687
+  _globals['_GETDMASTATUSRESPONSE']._serialized_end=3784
+  _globals['_WATCHCOMPLETIONSREQUEST']._serialized_start=3786
+  _globals['_WATCHCOMPLETIONSREQUEST']._serialized_end=3811
+  _globals['_DMACOMPLETION']._serialized_start=3813
+  _globals['_DMACOMPLETION']._serialized_end=3924
+  _globals['_COMPLETIONBATCH']._serialized_start=3926
+  _globals['_COMPLETIONBATCH']._serialized_end=4003
+  _globals['_ADDRESSRANGE']._serialized_start=4005
+  _globals['_ADDRESSRANGE']._serialized_end=4047
+  _globals['_CREATETENANTREQUEST']._serialized_start=4050
+  _globals['_CREATETENANTREQUEST']._serialized_end=4339
+  _globals['_CREATETENANTREQUEST_LIMITS']._serialized_start=4265
+  _globals['_CREATETENANTREQUEST_LIMITS']._serialized_end=4339
+  _globals['_CREATETENANTRESPONSE']._serialized_start=4341
+  _globals['_CREATETENANTRESPONSE']._serialized_end=4418
+  _globals['_UPDATETENANTREQUEST']._serialized_start=4421
+  _globals['_UPDATETENANTREQUEST']._serialized_end=4742
+  _globals['_UPDATETENANTREQUEST_UPDATES']._serialized_start=4516
+  _globals['_UPDATETENANTREQUEST_UPDATES']._serialized_end=4742
+  _globals['_UPDATETENANTRESPONSE']._serialized_start=4744
+  _globals['_UPDATETENANTRESPONSE']._serialized_end=4800
+  _globals['_DELETETENANTREQUEST']._serialized_start=4802
+  _globals['_DELETETENANTREQUEST']._serialized_end=4857
+  _globals['_DELETETENANTRESPONSE']._serialized_start=4859
+  _globals['_DELETETENANTRESPONSE']._serialized_end=4915
+  _globals['_LISTTENANTSREQUEST']._serialized_start=4917
+  _globals['_LISTTENANTSREQUEST']._serialized_end=4961
+  _globals['_LISTTENANTSRESPONSE']._serialized_start=4963
+  _globals['_LISTTENANTSRESPONSE']._serialized_end=5019
+  _globals['_TENANTINFO']._serialized_start=5022
+  _globals['_TENANTINFO']._serialized_end=5193
+  _globals['_TENANTSTATUS']._serialized_start=5196
+  _globals['_TENANTSTATUS']._serialized_end=5325
+  _globals['_ADDBITSTREAMREQUEST']._serialized_start=5327
+  _globals['_ADDBITSTREAMREQUEST']._serialized_end=5386
+  _globals['_REMOVEBITSTREAMREQUEST']._serialized_start=5388
+  _globals['_REMOVEBITSTREAMREQUEST']._serialized_end=5450
+  _globals['_UPDATELIMITSREQUEST']._serialized_start=5453
+  _globals['_UPDATELIMITSREQUEST']._serialized_end=5625
+  _globals['_UPDATELIMITSREQUEST_NEWLIMITS']._serialized_start=5548
+  _globals['_UPDATELIMITSREQUEST_NEWLIMITS']._serialized_end=5625
+  _globals['_GETTENANTSTATUSREQUEST']._serialized_start=5627
+  _globals['_GETTENANTSTATUSREQUEST']._serialized_end=5697
+  _globals['_GETTENANTSTATUSRESPONSE']._serialized_start=5700
+  _globals['_GETTENANTSTATUSRESPONSE']._serialized_end=5930
+  _globals['_GETTENANTSTATUSRESPONSE_ACTIVERESOURCES']._serialized_start=5825
+  _globals['_GETTENANTSTATUSRESPONSE_ACTIVERESOURCES']._serialized_end=5930
+  _globals['_SYSTEMSTATUSRESPONSE']._serialized_start=5933
+  _globals['_SYSTEMSTATUSRESPONSE']._serialized_end=6289
+  _globals['_SYSTEMSTATUSRESPONSE_SYSTEMRESOURCES']._serialized_start=6158
+  _globals['_SYSTEMSTATUSRESPONSE_SYSTEMRESOURCES']._serialized_end=6289
+  _globals['_FASTPATHMETRICSREQUEST']._serialized_start=6291
+  _globals['_FASTPATHMETRICSREQUEST']._serialized_end=6371
+  _globals['_HISTOGRAMBUCKET']._serialized_start=6373
+  _globals['_HISTOGRAMBUCKET']._serialized_end=6423
+  _globals['_LATENCYSUMMARY']._serialized_start=6426
+  _globals['_LATENCYSUMMARY']._serialized_end=6611
+  _globals['_FASTPATHOPMETRICS']._serialized_start=6614
+  _globals['_FASTPATHOPMETRICS']._serialized_end=6805
+  _globals['_FASTPATHTENANTMETRICS']._serialized_start=6808
+  _globals['_FASTPATHTENANTMETRICS']._serialized_end=7022
+  _globals['_FASTPATHMETRICSRESPONSE']._serialized_start=7025
+  _globals['_FASTPATHMETRICSRESPONSE']._serialized_end=7158
+  _globals['_BUFFERPOOLCLASSSTATS']._serialized_start=7161
+  _globals['_BUFFERPOOLCLASSSTATS']._serialized_end=7318
+  _globals['_BUFFERPOOLSTATSRESPONSE']._serialized_start=7321
+  _globals['_BUFFERPOOLSTATSRESPONSE']._serialized_end=7478
+  _globals['_CLEANUPRESPONSE']._serialized_start=7481
+  _globals['_CLEANUPRESPONSE']._serialized_end=7655
+  _globals['_CLEANUPRESPONSE_RESOURCESFREEDENTRY']._serialized_start=7602
+  _globals['_CLEANUPRESPONSE_RESOURCESFREEDENTRY']._serialized_end=7655
+  _globals['_DISCONNECTRESPONSE']._serialized_start=7657
+  _globals['_DISCONNECTRESPONSE']._serialized_end=7711
+  _globals['_HEARTBEATRESPONSE']._serialized_start=7713
+  _globals['_HEARTBEATRESPONSE']._serialized_end=7751
+  _globals['_REGISTERINFO']._serialized_start=7753
+  _globals['_REGISTERINFO']._serialized_end=7804
+  _globals['_PYNQSERVICE']._serialized_start=8108
+  _globals['_PYNQSERVICE']._serialized_end=9703
+  _globals['_PYNQMANAGEMENTSERVICE']._serialized_start=9706
+  _globals['_PYNQMANAGEMENTSERVICE']._serialized_end=10543
 # @@protoc_insertion_point(module_scope)
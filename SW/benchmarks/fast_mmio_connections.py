@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# benchmarks/fast_mmio_connections.py
+"""
+Benchmark del fast path MMIO al crescere del numero di connessioni.
+
+Avvia UltraFastMMIOServer in un processo separato con MockResourceManager
+(nessun hardware richiesto) e misura la latenza p50/p99 delle READ con
+N connessioni concorrenti, ognuna con una operazione in volo (closed loop).
+
+Esempio:
+    python3 benchmarks/fast_mmio_connections.py --modes threaded event_loop --shards 2
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import argparse
+import selectors
+import tempfile
+import multiprocessing
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Hypervisor'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Proto'))
+
+from fast_mmio_protocol import (
+    PROTOCOL_VERSION, FrameReader, encode_handle,
+    OP_HELLO, OP_BIND, OP_READ_SLOT, FLAG_NONE, STATUS_OK,
+    HELLO_PAYLOAD, BIND_PAYLOAD, READ_SLOT_PAYLOAD, U16,
+    HELLO_FRAME, BIND_FRAME, READ_SLOT_FRAME,
+)
+
+DEFAULT_CONNECTIONS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+TENANT_ID = 'bench_tenant'
+MMIO_BASE = 0xA0000000
+MMIO_LENGTH = 0x1000
+
+# Attesa massima dell'avvio del processo server
+SERVER_START_TIMEOUT = 30.0
+
+
+def _run_server(socket_dir, mode, num_shards, ready, stop):
+    """Processo server: tenant fittizio + MockResourceManager + fast MMIO server"""
+    try:
+        import logging
+        logging.basicConfig(level=logging.WARNING)
+
+        from config import TenantConfig
+        from tenant_manager import TenantManager
+        from mock_resource_manager import MockResourceManager
+        from fast_mmio_server import UltraFastMMIOServer
+
+        tenant_manager = TenantManager({
+            TENANT_ID: TenantConfig(tenant_id=TENANT_ID, uid=os.getuid(), gid=os.getgid(), api_key='')
+        })
+        resource_manager = MockResourceManager(tenant_manager)
+        handle = resource_manager.create_mmio(TENANT_ID, MMIO_BASE, MMIO_LENGTH)
+
+        server = UltraFastMMIOServer(
+            resource_manager, tenant_manager,
+            socket_dir=socket_dir, mode=mode, num_shards=num_shards
+        )
+        server.start()
+    except BaseException:
+        # Il processo padre riceve l'errore invece di attendere per sempre
+        import traceback
+        ready.send(('error', traceback.format_exc()))
+        raise
+
+    ready.send(('ok', handle))
+    stop.wait()
+    server.stop()
+
+
+def _wait_ready(ready, proc, timeout=SERVER_START_TIMEOUT):
+    """Handle inviato dal processo server; errore se il figlio termina o fallisce prima"""
+    deadline = time.monotonic() + timeout
+    while not ready.poll(0.1):
+        if not proc.is_alive():
+            raise RuntimeError(f"Server process exited with code {proc.exitcode} before becoming ready")
+        if time.monotonic() >= deadline:
+            proc.terminate()
+            raise RuntimeError(f"Server process not ready after {timeout:.0f}s")
+    status, value = ready.recv()
+    if status != 'ok':
+        raise RuntimeError(f"Server process failed to start:\n{value}")
+    return value
+
+
+def _connect(socket_path, handle):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socket_path)
+    sock.sendall(HELLO_FRAME.pack(HELLO_PAYLOAD.size, OP_HELLO, FLAG_NONE, 0, PROTOCOL_VERSION))
+
+    reader = FrameReader(capacity=4096)
+    reader.read_frame(sock)
+    if reader.flags != STATUS_OK:
+        raise RuntimeError("Fast protocol handshake failed")
+
+    sock.sendall(BIND_FRAME.pack(BIND_PAYLOAD.size, OP_BIND, FLAG_NONE, 0, encode_handle(handle)))
+    payload = reader.read_frame(sock)
+    if reader.flags != STATUS_OK:
+        raise RuntimeError("Fast protocol bind failed")
+    slot = U16.unpack_from(reader.buf, payload)[0]
+
+    sock.setblocking(False)
+    return sock, reader, slot
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(socket_path, handle, num_connections, duration):
+    """
+    Closed loop: una READ in volo per connessione, tutte guidate da un solo
+    thread client con selectors per non misurare la contesa del client.
+    """
+    sel = selectors.DefaultSelector()
+    sent_at = {}
+    pending = {}
+    requests = {}
+    for _ in range(num_connections):
+        sock, reader, slot = _connect(socket_path, handle)
+        sel.register(sock, selectors.EVENT_READ)
+        pending[sock] = reader
+        requests[sock] = READ_SLOT_FRAME.pack(READ_SLOT_PAYLOAD.size, OP_READ_SLOT, FLAG_NONE, 0, slot, 0x00)
+
+    latencies = []
+    t_end = time.perf_counter() + duration
+
+    for sock in pending:
+        sent_at[sock] = time.perf_counter()
+        sock.sendall(requests[sock])
+
+    while time.perf_counter() < t_end:
+        for key, _ in sel.select(timeout=1.0):
+            sock = key.fileobj
+            reader = pending[sock]
+            reader.recv_from(sock)
+            now = time.perf_counter()
+
+            while reader.next_frame() >= 0:
+                if reader.flags != STATUS_OK:
+                    raise RuntimeError("Fast MMIO read failed")
+                latencies.append((now - sent_at[sock]) * 1e6)
+                sent_at[sock] = time.perf_counter()
+                sock.sendall(requests[sock])
+
+    for sock in pending:
+        sel.unregister(sock)
+        sock.close()
+    sel.close()
+
+    latencies.sort()
+    return {
+        'connections': num_connections,
+        'ops': len(latencies),
+        'ops_per_sec': len(latencies) / duration,
+        'p50_us': _percentile(latencies, 50),
+        'p99_us': _percentile(latencies, 99),
+    }
+
+
+def run_mode(mode, num_shards, connections, duration):
+    # Il tenant del benchmark ha uid/gid del processo: SO_PEERCRED lo accetta
+    socket_dir = tempfile.mkdtemp(prefix='fast_mmio_bench_')
+    socket_path = os.path.join(socket_dir, f"{TENANT_ID}_mmio.sock")
+
+    ready_r, ready_w = multiprocessing.Pipe(duplex=False)
+    stop = multiprocessing.Event()
+    proc = multiprocessing.Process(
+        target=_run_server,
+        args=(socket_dir, mode, num_shards, ready_w, stop),
+        daemon=True
+    )
+    proc.start()
+    handle = _wait_ready(ready_r, proc)
+
+    results = []
+    try:
+        for n in connections:
+            result = measure(socket_path, handle, n, duration)
+            result['mode'] = mode
+            result['shards'] = num_shards if mode == 'event_loop' else None
+            results.append(result)
+            print(f"{mode:<11} conns={n:<4} ops/s={result['ops_per_sec']:>10.0f}  "
+                  f"p50={result['p50_us']:>8.1f} µs  p99={result['p99_us']:>8.1f} µs")
+    finally:
+        stop.set()
+        proc.join(timeout=5)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fast MMIO connection scaling benchmark')
+    parser.add_argument('--modes', nargs='+', default=['threaded', 'event_loop'],
+                        choices=['threaded', 'event_loop'])
+    parser.add_argument('--shards', type=int, default=1, help='Shard per la modalità event_loop')
+    parser.add_argument('--connections', type=int, nargs='+', default=DEFAULT_CONNECTIONS)
+    parser.add_argument('--duration', type=float, default=2.0, help='Secondi per ogni punto')
+    parser.add_argument('--json', help='Salva i risultati in un file JSON')
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        results.extend(run_mode(mode, args.shards, args.connections, args.duration))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
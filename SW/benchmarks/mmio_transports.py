@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+# benchmarks/mmio_transports.py
+"""
+Suite di benchmark dei trasporti MMIO, senza hardware.
+
+Avvia l'hypervisor (PYNQServicer gRPC + UltraFastMMIOServer) con
+MockResourceManager in un processo figlio e misura latenza e throughput di
+ogni trasporto:
+
+- grpc:   MMIORead / MMIOWrite / MMIOReadBlock / MMIOWriteBlock sul socket del tenant
+- fast:   protocollo fast MMIO (READ_SLOT, WRITE_SLOT con ACK, READ_BLOCK, WRITE_BLOCK,
+          BATCH_WRITE_SLOT)
+- direct: client/pynq_proxy/mmio.py su un memfd al posto del device UIO
+
+Operazioni: read e write di un registro, read_block e write_block di word
+contigue, batch_write di registri indipendenti in una sola richiesta (non
+disponibile via gRPC). Per ogni trasporto si variano operazione, dimensione
+del payload (word per le operazioni a blocchi/batch) e numero di client
+concorrenti (closed loop, un thread e una connessione per client). Il numero
+di operazioni per punto è fisso, così due esecuzioni sulla stessa macchina
+sono confrontabili.
+
+Con --baseline i risultati sono confrontati con un JSON salvato in precedenza
+(--save-baseline) e il processo esce con codice 1 se un punto peggiora oltre
+--threshold. La baseline va generata sulla macchina dove gira il confronto.
+
+Esempio:
+    python3 benchmarks/mmio_transports.py --save-baseline baseline.json
+    python3 benchmarks/mmio_transports.py --baseline baseline.json --json run.json
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import multiprocessing
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Hypervisor'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Proto'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Proto', 'generated'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'client', 'pynq_proxy'))
+
+from fast_mmio_protocol import (
+    PROTOCOL_VERSION, FrameReader, encode_handle,
+    OP_HELLO, OP_BIND, OP_READ_SLOT, OP_WRITE_SLOT, OP_READ_BLOCK, OP_WRITE_BLOCK, OP_BATCH_WRITE_SLOT,
+    FLAG_NONE, FLAG_ACK, STATUS_OK, HEADER_SIZE,
+    HELLO_PAYLOAD, BIND_PAYLOAD, READ_SLOT_PAYLOAD, WRITE_SLOT_PAYLOAD, READ_BLOCK_PAYLOAD,
+    WRITE_BLOCK_HEADER, HEADER, U16, U32, HELLO_FRAME, BIND_FRAME, READ_SLOT_FRAME, WRITE_SLOT_FRAME, READ_BLOCK_FRAME,
+    BATCH_HEADER_FRAME, MAX_BLOCK_WORDS,
+)
+
+TRANSPORTS = ['grpc', 'fast', 'direct']
+OPS = ['read', 'write', 'read_block', 'write_block', 'batch_write']
+SIZED_OPS = ('read_block', 'write_block', 'batch_write')
+# Combinazioni senza un equivalente nel trasporto
+UNSUPPORTED = {('grpc', 'batch_write')}
+DEFAULT_CONCURRENCY = [1, 4, 16]
+DEFAULT_SIZES = [16, 256, 4096]
+
+TENANT_ID = 'bench_tenant'
+MMIO_BASE = 0xA0000000
+MMIO_LENGTH = 4 * MAX_BLOCK_WORDS
+
+# Chiave di un punto di misura (per il confronto con la baseline)
+RESULT_KEY = ('transport', 'op', 'size', 'concurrency')
+
+# Attesa massima dell'avvio del processo server
+SERVER_START_TIMEOUT = 30.0
+
+
+def _run_hypervisor(socket_dir, fast_mode, ready, stop):
+    """Processo figlio: servizio gRPC del tenant + fast MMIO server su MockResourceManager"""
+    try:
+        import logging
+        logging.basicConfig(level=logging.WARNING)
+
+        import grpc
+        from concurrent import futures
+        import pynq_service_pb2_grpc as pb2_grpc
+        from config import TenantConfig
+        from tenant_manager import TenantManager
+        from mock_resource_manager import MockResourceManager
+        from servicer import PYNQServicer
+        from fast_mmio_server import UltraFastMMIOServer
+
+        tenant_manager = TenantManager({
+            TENANT_ID: TenantConfig(tenant_id=TENANT_ID, uid=os.getuid(), gid=os.getgid(), api_key='')
+        })
+        resource_manager = MockResourceManager(tenant_manager)
+        handle = resource_manager.create_mmio(TENANT_ID, MMIO_BASE, MMIO_LENGTH)
+
+        grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=20))
+        pb2_grpc.add_PYNQServiceServicer_to_server(
+            PYNQServicer(tenant_manager, resource_manager), grpc_server)
+        grpc_server.add_insecure_port(f"unix://{os.path.join(socket_dir, TENANT_ID + '.sock')}")
+        grpc_server.start()
+
+        fast_server = UltraFastMMIOServer(
+            resource_manager, tenant_manager,
+            socket_dir=socket_dir, mode=fast_mode
+        )
+        fast_server.start()
+    except BaseException:
+        # Il processo padre riceve l'errore invece di attendere per sempre
+        import traceback
+        ready.send(('error', traceback.format_exc()))
+        raise
+
+    ready.send(('ok', handle))
+    stop.wait()
+    fast_server.stop()
+    grpc_server.stop(grace=1)
+
+
+class _GrpcClient:
+    def __init__(self, socket_dir, handle):
+        import grpc
+        import pynq_service_pb2 as pb2
+        import pynq_service_pb2_grpc as pb2_grpc
+
+        self.pb2 = pb2
+        self.handle = handle
+        self.channel = grpc.insecure_channel(f"unix://{os.path.join(socket_dir, TENANT_ID + '.sock')}")
+        self.stub = pb2_grpc.PYNQServiceStub(self.channel)
+        auth = self.stub.Authenticate(pb2.AuthRequest(tenant_id=TENANT_ID, api_key=''))
+        if not auth.success:
+            raise RuntimeError("gRPC authentication failed")
+        self.metadata = (('auth-token', auth.session_token),)
+
+    def read(self, offset):
+        return self.stub.MMIORead(self.pb2.MMIOReadRequest(handle=self.handle, offset=offset, length=4),
+                                  metadata=self.metadata).value
+
+    def write(self, offset, value):
+        self.stub.MMIOWrite(self.pb2.MMIOWriteRequest(handle=self.handle, offset=offset, value=value),
+                            metadata=self.metadata)
+
+    def read_block(self, offset, count):
+        response = self.stub.MMIOReadBlock(
+            self.pb2.MMIOReadBlockRequest(handle=self.handle, offset=offset, count=count),
+            metadata=self.metadata)
+        return np.frombuffer(response.data, dtype='<u4')
+
+    def write_block(self, offset, words):
+        self.stub.MMIOWriteBlock(
+            self.pb2.MMIOWriteBlockRequest(handle=self.handle, offset=offset, data=words.tobytes()),
+            metadata=self.metadata)
+
+    def close(self):
+        self.channel.close()
+
+
+class _FastClient:
+    """Client sincrono sul protocollo fast MMIO (una richiesta in volo)"""
+
+    def __init__(self, socket_dir, handle):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(os.path.join(socket_dir, f"{TENANT_ID}_mmio.sock"))
+        self.reader = FrameReader(capacity=4 * MAX_BLOCK_WORDS + HEADER_SIZE)
+
+        self.sock.sendall(HELLO_FRAME.pack(HELLO_PAYLOAD.size, OP_HELLO, FLAG_NONE, 0, PROTOCOL_VERSION))
+        self._reply()
+        self.sock.sendall(BIND_FRAME.pack(BIND_PAYLOAD.size, OP_BIND, FLAG_NONE, 0, encode_handle(handle)))
+        self.slot = U16.unpack_from(self.reader.buf, self._reply())[0]
+
+        self._batch = bytearray(BATCH_HEADER_FRAME.size + MAX_BLOCK_WORDS * WRITE_SLOT_PAYLOAD.size)
+
+    def _reply(self):
+        payload = self.reader.read_frame(self.sock)
+        if self.reader.flags != STATUS_OK:
+            raise RuntimeError(f"Fast MMIO op 0x{self.reader.op:02x} failed (status={self.reader.flags})")
+        return payload
+
+    def read(self, offset):
+        self.sock.sendall(READ_SLOT_FRAME.pack(READ_SLOT_PAYLOAD.size, OP_READ_SLOT, FLAG_NONE, 0,
+                                               self.slot, offset))
+        return U32.unpack_from(self.reader.buf, self._reply())[0]
+
+    def write(self, offset, value):
+        self.sock.sendall(WRITE_SLOT_FRAME.pack(WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_ACK, 0,
+                                                self.slot, offset, value))
+        self._reply()
+
+    def read_block(self, offset, count):
+        self.sock.sendall(READ_BLOCK_FRAME.pack(READ_BLOCK_PAYLOAD.size, OP_READ_BLOCK, FLAG_NONE, 0,
+                                                self.slot, offset, count))
+        payload = self._reply()
+        return np.frombuffer(self.reader.buf, dtype='<u4', count=count, offset=payload).copy()
+
+    def write_block(self, offset, words):
+        payload = WRITE_BLOCK_HEADER.pack(self.slot, offset) + words.tobytes()
+        self.sock.sendall(HEADER.pack(len(payload), OP_WRITE_BLOCK, FLAG_NONE, 0) + payload)
+        self._reply()
+
+    def batch_write(self, offset, words):
+        buf = self._batch
+        item = BATCH_HEADER_FRAME.size
+        for i, value in enumerate(words.tolist()):
+            WRITE_SLOT_PAYLOAD.pack_into(buf, item, self.slot, offset + 4 * i, value)
+            item += WRITE_SLOT_PAYLOAD.size
+        BATCH_HEADER_FRAME.pack_into(buf, 0, item - HEADER_SIZE, OP_BATCH_WRITE_SLOT, FLAG_NONE, 0, len(words))
+        self.sock.sendall(memoryview(buf)[:item])
+        if U16.unpack_from(self.reader.buf, self._reply())[0] != len(words):
+            raise RuntimeError("Fast MMIO batch write partially failed")
+
+    def close(self):
+        self.sock.close()
+
+
+class _DirectClient:
+    """pynq_proxy MMIO mappato su un memfd (stand-in del device UIO)"""
+
+    def __init__(self, memfd):
+        from mmio import MMIO
+        self.mmio = MMIO(MMIO_BASE, MMIO_LENGTH, uio_device=f"/proc/self/fd/{memfd}")
+
+    def read(self, offset):
+        return self.mmio.read(offset)
+
+    def write(self, offset, value):
+        self.mmio.write(offset, value)
+
+    def read_block(self, offset, count):
+        return self.mmio.read_block(offset, count)
+
+    def write_block(self, offset, words):
+        self.mmio.write_block(offset, words)
+
+    def batch_write(self, offset, words):
+        write = self.mmio.write
+        for i, value in enumerate(words.tolist()):
+            write(offset + 4 * i, value)
+
+    def close(self):
+        self.mmio.close()
+
+
+def _wait_ready(ready, proc, timeout=SERVER_START_TIMEOUT):
+    """Handle inviato dal processo server; errore se il figlio termina o fallisce prima"""
+    deadline = time.monotonic() + timeout
+    while not ready.poll(0.1):
+        if not proc.is_alive():
+            raise RuntimeError(f"Server process exited with code {proc.exitcode} before becoming ready")
+        if time.monotonic() >= deadline:
+            proc.terminate()
+            raise RuntimeError(f"Server process not ready after {timeout:.0f}s")
+    status, value = ready.recv()
+    if status != 'ok':
+        raise RuntimeError(f"Server process failed to start:\n{value}")
+    return value
+
+
+def _operation(client, op, size):
+    """Ritorna una funzione senza argomenti che esegue una operazione del workload"""
+    if op == 'read':
+        return lambda: client.read(0x10)
+    if op == 'write':
+        return lambda: client.write(0x10, 0x12345678)
+    if op == 'read_block':
+        return lambda: client.read_block(0, size)
+    words = np.arange(size, dtype='<u4')
+    if op == 'write_block':
+        return lambda: client.write_block(0, words)
+    return lambda: client.batch_write(0, words)
+
+
+def _percentiles(latencies_us):
+    values = np.asarray(latencies_us)
+    p50, p90, p99, p999 = np.percentile(values, [50, 90, 99, 99.9])
+    return {
+        'mean_us': float(values.mean()),
+        'p50_us': float(p50),
+        'p90_us': float(p90),
+        'p99_us': float(p99),
+        'p999_us': float(p999),
+    }
+
+
+def measure(make_client, transport, op, size, concurrency, iterations, warmup):
+    """
+    Closed loop: concurrency thread, ognuno con il proprio client, eseguono
+    warmup + iterations operazioni. Le latenze del warmup sono scartate.
+    """
+    clients = [make_client() for _ in range(concurrency)]
+    latencies = [[] for _ in range(concurrency)]
+    spans = [None] * concurrency
+    errors = []
+    start_barrier = threading.Barrier(concurrency)
+
+    def worker(index):
+        run = _operation(clients[index], op, size)
+        samples = latencies[index]
+        clock = time.perf_counter_ns
+        try:
+            for _ in range(warmup):
+                run()
+            start_barrier.wait()
+            t_start = clock()
+            for _ in range(iterations):
+                t0 = clock()
+                run()
+                samples.append((clock() - t0) / 1000.0)
+            spans[index] = (t_start, clock())
+        except Exception as e:
+            errors.append(e)
+            start_barrier.abort()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for client in clients:
+        client.close()
+    if errors:
+        raise RuntimeError(f"{transport}/{op} failed: {errors[0]}")
+
+    samples = [value for worker_samples in latencies for value in worker_samples]
+    elapsed = (max(end for _, end in spans) - min(start for start, _ in spans)) / 1e9
+    result = {
+        'transport': transport,
+        'op': op,
+        'size': size if op in SIZED_OPS else 1,
+        'concurrency': concurrency,
+        'ops': len(samples),
+        'ops_per_sec': len(samples) / elapsed if elapsed > 0 else 0.0,
+    }
+    result.update(_percentiles(samples))
+    return result
+
+
+def run_suite(args):
+    socket_dir = tempfile.mkdtemp(prefix='mmio_transports_')
+    ready_r, ready_w = multiprocessing.Pipe(duplex=False)
+    stop = multiprocessing.Event()
+    proc = multiprocessing.Process(
+        target=_run_hypervisor,
+        args=(socket_dir, args.fast_mode, ready_w, stop),
+        daemon=True
+    )
+    proc.start()
+    handle = _wait_ready(ready_r, proc)
+
+    memfd = os.memfd_create('mmio_bench', 0)
+    os.ftruncate(memfd, MMIO_LENGTH)
+
+    factories = {
+        'grpc': lambda: _GrpcClient(socket_dir, handle),
+        'fast': lambda: _FastClient(socket_dir, handle),
+        'direct': lambda: _DirectClient(memfd),
+    }
+
+    results = []
+    try:
+        for transport in args.transports:
+            for op in args.ops:
+                if (transport, op) in UNSUPPORTED:
+                    continue
+                for size in (args.sizes if op in SIZED_OPS else [1]):
+                    for concurrency in args.concurrency:
+                        result = measure(factories[transport], transport, op, size, concurrency,
+                                         args.iterations, args.warmup)
+                        results.append(result)
+                        print(f"{transport:<7} {op:<12} size={result['size']:<5} conc={concurrency:<3} "
+                              f"ops/s={result['ops_per_sec']:>10.0f}  p50={result['p50_us']:>8.1f} µs  "
+                              f"p99={result['p99_us']:>8.1f} µs")
+    finally:
+        stop.set()
+        proc.join(timeout=5)
+        os.close(memfd)
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Confronta con la baseline: regressione se p50 o p99 crescono, o il
+    throughput cala, più di threshold (frazione, es. 0.2 = 20%).
+
+    Returns:
+        lista di (chiave, metrica, baseline, attuale)
+    """
+    reference = {tuple(r[k] for k in RESULT_KEY): r for r in baseline['results']}
+    regressions = []
+
+    for result in results:
+        key = tuple(result[k] for k in RESULT_KEY)
+        base = reference.get(key)
+        if base is None:
+            continue
+        for metric in ('p50_us', 'p99_us'):
+            if result[metric] > base[metric] * (1 + threshold):
+                regressions.append((key, metric, base[metric], result[metric]))
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append((key, 'ops_per_sec', base['ops_per_sec'], result['ops_per_sec']))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MMIO transport benchmark suite (mock backend)')
+    parser.add_argument('--transports', nargs='+', default=TRANSPORTS, choices=TRANSPORTS)
+    parser.add_argument('--ops', nargs='+', default=OPS, choices=OPS)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Word per read_block, write_block e batch_write')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--iterations', type=int, default=2000, help='Operazioni misurate per client')
+    parser.add_argument('--warmup', type=int, default=200, help='Operazioni scartate per client')
+    parser.add_argument('--fast-mode', default='event_loop', choices=['threaded', 'event_loop'])
+    parser.add_argument('--json', help='Salva i risultati in un file JSON')
+    parser.add_argument('--save-baseline', help='Salva i risultati come nuova baseline')
+    parser.add_argument('--baseline', help='Baseline JSON con cui confrontare i risultati')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Peggioramento tollerato rispetto alla baseline (default 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        if not 0 < size <= MAX_BLOCK_WORDS:
+            parser.error(f"--sizes must be between 1 and {MAX_BLOCK_WORDS}")
+
+    report = {
+        'meta': {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'fast_mode': args.fast_mode,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+        },
+        'results': run_suite(args),
+    }
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report['results'], baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions (threshold {args.threshold:.0%}):")
+            for key, metric, before, after in regressions:
+                print(f"  {'/'.join(str(k) for k in key):<28} {metric:<12} {before:>12.1f} -> {after:>12.1f}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -75,11 +75,18 @@ class Connection:
         logger.info(f"Authenticated as {self.tenant_id}")
         
     def call_with_auth(self, method_name: str, request):
-        """Chiama metodo gRPC con autenticazione"""
+        """
+        Chiama metodo gRPC con autenticazione.
+        
+        request può essere anche una funzione senza argomenti che crea la
+        richiesta (per le RPC client-streaming: l'iteratore dei messaggi),
+        così un nuovo tentativo dopo la riautenticazione riparte da capo.
+        """
         if not self.channel:
             self.connect()
             
         metadata = [('auth-token', self.token)]
+        make_request = request if callable(request) else (lambda: request)
         
         # Traccia se vengono create risorse
         if method_name in ['LoadOverlay', 'CreateMMIO', 'AllocateBuffer', 'CreateDMA']:
@@ -87,7 +94,7 @@ class Connection:
         
         try:
             method = getattr(self.stub, method_name)
-            return method(request, metadata=metadata)
+            return method(make_request(), metadata=metadata)
         except grpc.RpcError as e:
             if e.code() == grpc.StatusCode.UNAUTHENTICATED:
                 # Token scaduto, riautentica
@@ -95,9 +102,28 @@ class Connection:
                 self._authenticate()
                 # Riprova
                 metadata = [('auth-token', self.token)]
-                return method(request, metadata=metadata)
+                return method(make_request(), metadata=metadata)
             raise
     
+    def stream_with_auth(self, method_name: str, request):
+        """Come call_with_auth per le RPC server-streaming: itera le risposte"""
+        responses = self.call_with_auth(method_name, request)
+        try:
+            # L'errore di autenticazione arriva con la prima risposta
+            first = next(responses, None)
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.UNAUTHENTICATED:
+                raise
+            logger.info("Token expired, re-authenticating...")
+            self._authenticate()
+            responses = getattr(self.stub, method_name)(request, metadata=[('auth-token', self.token)])
+            first = next(responses, None)
+        
+        if first is None:
+            return
+        yield first
+        yield from responses
+    
     def cleanup_resources(self):
         """Pulisce esplicitamente tutte le risorse sul server"""
         if not self.channel or not self.token:
@@ -7,8 +7,9 @@ from .overlay import Overlay
 from .mmio import MMIO
 from .allocate import allocate, ProxyBuffer
 from .fast_mmio import FastMMIO, UltraFastMMIO
+from .dma import DMA
 # Esporta API compatibile con PYNQ
-__all__ = ['Overlay', 'MMIO', 'allocate']
+__all__ = ['Overlay', 'MMIO', 'allocate', 'DMA']
 
 # Versione
 __version__ = '0.1.0'
\ No newline at end of file
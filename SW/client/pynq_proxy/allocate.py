@@ -9,6 +9,47 @@ import pynq_service_pb2 as pb2
 
 logger = logging.getLogger(__name__)
 
+# Modalità gRPC: oltre questa dimensione il buffer viaggia a chunk su
+# WriteBufferStream/ReadBufferStream invece che in un solo messaggio
+BUFFER_CHUNK_SIZE = 1024 * 1024
+
+# Intervalli sporchi: quelli più vicini di DIRTY_MERGE_GAP byte vengono uniti
+# (un chunk in meno vale qualche byte in più), oltre DIRTY_MAX_RANGES si
+# sincronizza un solo intervallo che li copre tutti
+DIRTY_MERGE_GAP = 4096
+DIRTY_MAX_RANGES = 64
+
+# Cache di lettura (modalità gRPC): il buffer tiene l'ultima copia letta e la
+# versione che aveva sul server, e la rilegge solo dopo invalidate_buffers().
+# Con revalidate=True la lettura successiva chiede prima al server se la
+# versione è cambiata; con revalidate=False (MMIO: un acceleratore avviato può
+# scrivere nei buffer dopo l'ultima operazione vista dal server) rilegge tutto.
+_device_epoch = 0
+_reload_epoch = 0
+
+
+def invalidate_buffers(revalidate: bool = True):
+    """Invalida la cache di lettura di tutti i ProxyBuffer del processo"""
+    global _device_epoch, _reload_epoch
+    _device_epoch += 1
+    if not revalidate:
+        _reload_epoch = _device_epoch
+
+
+def _add_range(ranges, start: int, end: int):
+    """Aggiunge [start, end) alla lista ordinata di intervalli disgiunti, unendo i vicini"""
+    merged = []
+    for s, e in ranges:
+        if e + DIRTY_MERGE_GAP < start or s - DIRTY_MERGE_GAP > end:
+            merged.append((s, e))
+        else:
+            start, end = min(s, start), max(e, end)
+    merged.append((start, end))
+    merged.sort()
+    if len(merged) > DIRTY_MAX_RANGES:
+        merged = [(merged[0][0], merged[-1][1])]
+    return merged
+
 class ProxyBuffer:
     """Buffer proxy con supporto char device zero-copy, shared memory, o gRPC"""
     
@@ -81,6 +122,18 @@ class ProxyBuffer:
         self._array = np.zeros(shape, dtype=dtype)
         self._access_mode = 'grpc'
         self._dirty = False
+        # Byte [start, end) scritti da __setitem__ dall'ultimo sync_to_device
+        self._dirty_ranges = []
+        # Byte coperti da viste restituite da __getitem__: possono essere scritti
+        # senza passare da __setitem__. sync_to_device li confronta con _shadow
+        # (copia dei byte all'ultimo sync o all'ultima lettura, creata con la
+        # prima vista) e invia solo le parti cambiate
+        self._exposed_ranges = []
+        self._shadow = None
+        # Cache di lettura: versione sul server della copia locale (0 = non valida)
+        # e _device_epoch in cui è stata verificata
+        self._version = 0
+        self._epoch = 0
         logger.info(f"Buffer {self._handle} using GRPC (fallback)")
     
     def __getitem__(self, key):
@@ -90,9 +143,17 @@ class ProxyBuffer:
         if self._access_mode in ['char_device', 'shared_memory']:
             return self._array[key]  # Accesso diretto!
         else:
-            if not self._dirty:
-                self.sync_from_device()
-            return self._array[key]
+            if not self._dirty and not (self._version and self._epoch == _device_epoch):
+                # Dopo invalidate_buffers() basta una risposta senza dati se il buffer non è cambiato
+                self._read_from_device(self._version if self._epoch >= _reload_epoch else 0)
+            result = self._array[key]
+            if isinstance(result, np.ndarray) and np.may_share_memory(result, self._array):
+                span = self._byte_range(result)
+                if span:
+                    if self._shadow is None:
+                        self._shadow = self._raw_view().copy()
+                    self._exposed_ranges = _add_range(self._exposed_ranges, *span)
+            return result
     
     def __setitem__(self, key, value):
         if self._closed:
@@ -102,8 +163,46 @@ class ProxyBuffer:
             self._array[key] = value  # Scrittura diretta!
         else:
             self._array[key] = value
+            self._mark_dirty(key)
             self._dirty = True
     
+    def _mark_dirty(self, key):
+        """Registra i byte scritti da self._array[key] = ... (per eccesso se non si può fare di meglio)"""
+        try:
+            target = self._array[key]
+            if not isinstance(target, np.ndarray):
+                # Indice intero completo: la vista con un asse in più punta allo stesso elemento
+                target = self._array[..., np.newaxis][key]
+        except Exception:
+            target = None
+        
+        if isinstance(target, np.ndarray) and target.size == 0:
+            return
+        span = None
+        if isinstance(target, np.ndarray) and np.may_share_memory(target, self._array):
+            span = self._byte_range(target)
+        if span:
+            self._dirty_ranges = _add_range(self._dirty_ranges, *span)
+        else:
+            # Indicizzazione avanzata (copia): non si sa quali byte, tutto il buffer
+            self._dirty_ranges = [(0, self._array.nbytes)]
+    
+    def _byte_range(self, view):
+        """Intervallo di byte [start, end) di self._array coperto da una vista (None se vuota o esterna)"""
+        if view.size == 0:
+            return None
+        start = end = view.__array_interface__['data'][0] - self._array.__array_interface__['data'][0]
+        for dim, stride in zip(view.shape, view.strides):
+            extent = (dim - 1) * stride
+            if extent < 0:
+                start += extent
+            else:
+                end += extent
+        end += view.itemsize
+        if start < 0 or end > self._array.nbytes:
+            return None
+        return start, end
+    
     def sync_to_device(self):
         """Sincronizza buffer con device"""
         if self._closed:
@@ -115,15 +214,76 @@ class ProxyBuffer:
         elif self._access_mode == 'shared_memory':
             logger.debug(f"Buffer {self._handle} - shared memory, no sync needed")
         else:
-            # gRPC: invia dati
-            request = pb2.WriteBufferRequest(
-                handle=self._handle,
-                offset=0,
-                data=self._array.tobytes()
-            )
-            self._connection.call_with_auth('WriteBuffer', request)
+            # gRPC: invia solo gli intervalli scritti (e quelli cambiati tramite viste)
+            ranges = self._dirty_ranges
+            for start, end in self._exposed_changes():
+                ranges = _add_range(ranges, start, end)
+            if not ranges:
+                self._dirty = False
+                return
+            
+            epoch = _device_epoch
+            cached = self._version if self._epoch == epoch else 0
+            if len(ranges) == 1 and ranges[0][1] - ranges[0][0] <= BUFFER_CHUNK_SIZE:
+                start, end = ranges[0]
+                request = pb2.WriteBufferRequest(
+                    handle=self._handle,
+                    offset=start,
+                    data=self._raw_view()[start:end].tobytes()
+                )
+                response = self._connection.call_with_auth('WriteBuffer', request)
+            else:
+                response = self._connection.call_with_auth('WriteBufferStream', lambda: self._write_chunks(ranges))
+            
+            # La copia locale resta valida se era aggiornata prima della scrittura
+            # (o la scrittura copre tutto il buffer) e nessun altro ha scritto nel frattempo
+            if response.previous_version and (response.previous_version == cached
+                                              or ranges == [(0, self._array.nbytes)]):
+                self._version, self._epoch = response.version, epoch
+            else:
+                self._version = 0
+            
+            if self._shadow is not None:
+                raw = self._raw_view()
+                for start, end in ranges:
+                    self._shadow[start:end] = raw[start:end]
+            
+            logger.debug(f"Buffer {self._handle} - synced {sum(e - s for s, e in ranges)} of {self._array.nbytes} bytes")
+            self._dirty_ranges = []
             self._dirty = False
     
+    def _exposed_changes(self):
+        """Intervalli esposti da viste con elementi diversi da _shadow (uno per intervallo)"""
+        if self._shadow is None:
+            return []
+        raw = self._raw_view()
+        item = self._array.itemsize
+        changes = []
+        for start, end in self._exposed_ranges:
+            changed = np.flatnonzero(raw[start:end] != self._shadow[start:end])
+            if changed.size:
+                first = start + int(changed[0])
+                last = start + int(changed[-1]) + 1
+                changes.append((first - first % item, min(end, -(-last // item) * item)))
+        return changes
+    
+    def _write_chunks(self, ranges):
+        """Chunk di WriteBufferStream copiati uno alla volta dalla memoria dell'array"""
+        raw = self._raw_view()
+        first = True
+        for start, end in ranges:
+            for offset in range(start, end, BUFFER_CHUNK_SIZE):
+                yield pb2.BufferChunk(
+                    handle=self._handle if first else '',
+                    offset=offset,
+                    data=raw[offset:min(end, offset + BUFFER_CHUNK_SIZE)].tobytes()
+                )
+                first = False
+    
+    def _raw_view(self):
+        """Vista a byte dell'array locale (senza copia)"""
+        return self._array.reshape(-1).view(np.uint8)
+    
     def sync_from_device(self):
         """Sincronizza da device"""
         if self._closed:
@@ -135,15 +295,45 @@ class ProxyBuffer:
         elif self._access_mode == 'shared_memory':
             logger.debug(f"Buffer {self._handle} - shared memory, no sync needed")
         else:
-            # gRPC: leggi dati
-            request = pb2.ReadBufferRequest(
-                handle=self._handle,
-                offset=0,
-                length=self._array.nbytes
-            )
+            self._read_from_device(0)
+    
+    def _read_from_device(self, known_version: int):
+        """gRPC: legge il buffer direttamente nell'array locale, se non è più alla versione known_version"""
+        epoch = _device_epoch
+        request = pb2.ReadBufferRequest(
+            handle=self._handle,
+            offset=0,
+            length=self._array.nbytes,
+            chunk_size=BUFFER_CHUNK_SIZE,
+            known_version=known_version
+        )
+        raw = self._raw_view()
+        modified = True
+        if self._array.nbytes > BUFFER_CHUNK_SIZE:
+            for chunk in self._connection.stream_with_auth('ReadBufferStream', request):
+                version = chunk.version
+                if chunk.not_modified:
+                    modified = False
+                    break
+                raw[chunk.offset:chunk.offset + len(chunk.data)] = np.frombuffer(chunk.data, dtype=np.uint8)
+        else:
             response = self._connection.call_with_auth('ReadBuffer', request)
-            self._array = np.frombuffer(response.data, dtype=self.dtype).reshape(self.shape)
-            self._dirty = False
+            version = response.version
+            modified = not response.not_modified
+            if modified:
+                raw[:] = np.frombuffer(response.data, dtype=np.uint8)
+        
+        # Copia locale uguale al device: le viste ripartono da qui
+        if modified and self._shadow is not None:
+            self._shadow[:] = raw
+        
+        self._version, self._epoch = version, epoch
+        self._dirty_ranges = []
+        self._dirty = False
+    
+    def invalidate(self):
+        """Scarta la copia locale: la lettura successiva rilegge il buffer dal device"""
+        self._version = 0
     
     def close(self):
         """Cleanup"""
@@ -178,7 +368,14 @@ class ProxyBuffer:
         return f"ProxyBuffer({self._access_mode}, {status}, shape={self.shape}, dtype={self.dtype})"
     
     def freebuffer(self):
+        """Chiude il buffer e lo libera sul server (come pynq: dopo non è più utilizzabile)"""
+        if self._closed:
+            return
         self.close()
+        try:
+            self._connection.call_with_auth('FreeBuffer', pb2.FreeBufferRequest(handle=self._handle))
+        except Exception as e:
+            logger.warning(f"FreeBuffer {self._handle} failed: {e}")
     
     def __del__(self):
         if hasattr(self, '_closed') and not self._closed:
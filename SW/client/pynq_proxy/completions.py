@@ -0,0 +1,150 @@
+# client/pynq_proxy/completions.py
+"""
+Completamenti dei trasferimenti DMA su un solo stream WatchCompletions.
+
+Il server notifica ogni trasferimento del tenant che termina: i canali DMA
+attendono un Future invece di interrogare GetDMAStatus, quindi un container
+può tenere in volo molti trasferimenti senza polling. Se lo stream si chiude
+(o il server segnala completamenti persi) i trasferimenti in attesa vengono
+riletti con GetDMAStatus.
+"""
+
+import os
+import sys
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict
+
+import grpc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from connection import Connection
+import pynq_service_pb2 as pb2
+
+logger = logging.getLogger(__name__)
+
+# Attesa del primo messaggio dello stream (conferma della registrazione)
+WATCH_OPEN_TIMEOUT = 5.0
+
+# Completamenti arrivati prima che il canale registrasse il Future
+MAX_EARLY_COMPLETIONS = 1024
+
+_FINISHED = (pb2.DMA_DONE, pb2.DMA_ERROR, pb2.DMA_TIMEOUT)
+
+
+class CompletionWatcher:
+    """Stream WatchCompletions del processo, condiviso da tutti i canali DMA"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> 'CompletionWatcher':
+        """Watcher corrente, riaperto se lo stream si è chiuso"""
+        with cls._instance_lock:
+            watcher = cls._instance
+            if watcher is None or watcher.closed:
+                reauth = watcher is not None and watcher.unauthenticated
+                watcher = cls._instance = cls(reauth=reauth)
+            return watcher
+
+    def __init__(self, reauth: bool = False):
+        conn = Connection()
+        conn.connect()
+        if reauth:
+            conn._authenticate()
+
+        self._pending: Dict[str, Future] = {}
+        self._early: 'OrderedDict[str, pb2.DMACompletion]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._opened = threading.Event()
+        self.closed = False
+        self.unauthenticated = False
+
+        self._responses = conn.stub.WatchCompletions(
+            pb2.WatchCompletionsRequest(),
+            metadata=[('auth-token', conn.token)]
+        )
+        self._reader = threading.Thread(target=self._read_loop, name="CompletionWatcher", daemon=True)
+        self._reader.start()
+
+        # Dopo il primo messaggio ogni completamento arriva sullo stream
+        if not self._opened.wait(WATCH_OPEN_TIMEOUT) or self.closed:
+            self.close()
+            raise Exception("WatchCompletions stream not available")
+
+    def _read_loop(self):
+        error = None
+        try:
+            for batch in self._responses:
+                self._opened.set()
+                for completion in batch.completions:
+                    self._complete(completion)
+                if batch.overflow:
+                    logger.warning("Completion events lost, refreshing pending DMA transfers")
+                    self._refresh_pending()
+        except grpc.RpcError as e:
+            error = e
+            self.unauthenticated = e.code() == grpc.StatusCode.UNAUTHENTICATED
+        finally:
+            with self._lock:
+                self.closed = True
+            self._opened.set()
+            if error is not None and error.code() != grpc.StatusCode.CANCELLED:
+                logger.warning(f"WatchCompletions closed: {error}")
+            # Chi attende ancora lo scopre con GetDMAStatus
+            self._refresh_pending()
+
+    def _complete(self, completion):
+        with self._lock:
+            future = self._pending.pop(completion.transfer_id, None)
+            if future is None:
+                self._early[completion.transfer_id] = completion
+                while len(self._early) > MAX_EARLY_COMPLETIONS:
+                    self._early.popitem(last=False)
+                return
+        future.set_result(completion)
+
+    def _refresh_pending(self):
+        with self._lock:
+            pending = list(self._pending.items())
+        for transfer_id, future in pending:
+            try:
+                response = Connection().call_with_auth(
+                    'GetDMAStatus', pb2.GetDMAStatusRequest(transfer_id=transfer_id))
+            except Exception as e:
+                self._fail(transfer_id, e)
+                continue
+            if response.status in _FINISHED:
+                self._complete(pb2.DMACompletion(
+                    transfer_id=transfer_id,
+                    status=response.status,
+                    bytes_transferred=response.bytes_transferred,
+                    error=response.error
+                ))
+            elif self.closed:
+                self._fail(transfer_id, Exception("WatchCompletions stream closed"))
+
+    def _fail(self, transfer_id: str, error: Exception):
+        with self._lock:
+            future = self._pending.pop(transfer_id, None)
+        if future is not None:
+            future.set_exception(error)
+
+    def watch(self, transfer_id: str) -> Future:
+        """Future del completamento (pb2.DMACompletion) di un trasferimento avviato dopo get()"""
+        future = Future()
+        with self._lock:
+            if self.closed:
+                raise Exception("WatchCompletions stream closed")
+            completion = self._early.pop(transfer_id, None)
+            if completion is None:
+                self._pending[transfer_id] = future
+                return future
+        future.set_result(completion)
+        return future
+
+    def close(self):
+        self._responses.cancel()
@@ -0,0 +1,186 @@
+# client/pynq_proxy/dma.py
+"""
+AXI DMA proxy compatibile con pynq.lib.dma.DMA.
+
+channel.transfer() accoda il trasferimento sul server (DMATransfer con
+wait=False) e ritorna subito un Future: i dati si muovono alla velocità del
+DMA e non passano da WriteBuffer/ReadBuffer. Il completamento arriva sullo
+stream WatchCompletions del processo (CompletionWatcher); senza stream
+channel.wait() lo chiede con GetDMAStatus, che lato server attende la fine
+del trasferimento (long-poll).
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from client.pynq_proxy.overlay import IPCore
+from client.pynq_proxy.completions import CompletionWatcher
+from client.connection import Connection
+
+import pynq_service_pb2 as pb2
+
+logger = logging.getLogger(__name__)
+
+# Attesa massima di una singola GetDMAStatus: wait() la ripete fino al suo timeout
+STATUS_POLL_MS = 1000
+
+_FINISHED = (pb2.DMA_DONE, pb2.DMA_ERROR, pb2.DMA_TIMEOUT)
+
+
+class DMAChannel:
+    """Canale MM2S (sendchannel) o S2MM (recvchannel) di un DMA"""
+
+    def __init__(self, dma: 'DMA', direction: int):
+        self._dma = dma
+        self._direction = direction
+        self._transfer_id = None
+        self._buffer = None
+        self._status = pb2.DMA_DONE
+        self._error = ''
+        self._lock = threading.Lock()
+        self._future = None
+        self._watch = None
+        self.transferred = 0
+
+    @property
+    def running(self):
+        # Il canale viene avviato dal server insieme al DMA
+        return True
+
+    @property
+    def idle(self):
+        """True se l'ultimo trasferimento è terminato"""
+        if self._status not in _FINISHED:
+            self._update(0)
+        return self._status in _FINISHED
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def transfer(self, array, start: int = 0, nbytes: int = 0) -> Future:
+        """
+        Avvia il trasferimento di nbytes byte di array (0 = tutto il buffer).
+        Ritorna subito un Future con i byte trasferiti (o l'errore del
+        trasferimento); wait() attende la fine come in PYNQ.
+        """
+        if start:
+            raise ValueError("DMA transfer with start offset not supported")
+        if not self.idle:
+            raise RuntimeError("DMA channel not idle")
+
+        # MM2S: il DMA legge il buffer sul device, prima va sincronizzato
+        if self._direction == pb2.DMA_MM2S:
+            array.sync_to_device()
+
+        # Lo stream va aperto prima: i completamenti successivi arrivano tutti
+        try:
+            watcher = CompletionWatcher.get()
+        except Exception as e:
+            logger.debug(f"WatchCompletions not available ({e}), using GetDMAStatus")
+            watcher = None
+
+        request = pb2.DMATransferRequest(
+            dma_handle=self._dma._handle,
+            direction=self._direction,
+            buffer_handle=array._handle,
+            length=nbytes,
+            wait=False
+        )
+        response = self._dma._connection.call_with_auth('DMATransfer', request)
+
+        self._transfer_id = response.transfer_id
+        self._buffer = array
+        self._future = Future()
+        self._watch = None
+        self._set_status(response.status, response.bytes_transferred, response.error)
+
+        if self._status not in _FINISHED and watcher is not None:
+            try:
+                self._watch = watcher.watch(self._transfer_id)
+                self._watch.add_done_callback(self._on_completion)
+            except Exception as e:
+                logger.debug(f"WatchCompletions closed ({e}), using GetDMAStatus")
+        return self._future
+
+    def _on_completion(self, watch: Future):
+        """Callback dello stream (thread del CompletionWatcher)"""
+        if watch is not self._watch or watch.exception() is not None:
+            return
+        completion = watch.result()
+        self._set_status(completion.status, completion.bytes_transferred, completion.error)
+
+    def wait(self, timeout: float = None):
+        """Attende la fine del trasferimento (timeout in secondi, None = senza limite)"""
+        if self._future is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if self._watch is not None and self._status not in _FINISHED:
+            try:
+                completion = self._watch.result(timeout)
+                self._set_status(completion.status, completion.bytes_transferred, completion.error)
+            except FutureTimeoutError:
+                raise TimeoutError(f"DMA transfer {self._transfer_id} still running after {timeout}s")
+            except Exception as e:
+                # Stream chiuso: si prosegue con GetDMAStatus
+                logger.debug(f"WatchCompletions failed ({e}), using GetDMAStatus")
+
+        while self._status not in _FINISHED:
+            poll_ms = STATUS_POLL_MS
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"DMA transfer {self._transfer_id} still running after {timeout}s")
+                poll_ms = max(1, min(poll_ms, int(remaining * 1000)))
+            self._update(poll_ms)
+
+        self._future.result()
+
+    def _update(self, timeout_ms: int):
+        if self._transfer_id is None:
+            return
+        request = pb2.GetDMAStatusRequest(transfer_id=self._transfer_id, timeout_ms=timeout_ms)
+        response = self._dma._connection.call_with_auth('GetDMAStatus', request)
+        self._set_status(response.status, response.bytes_transferred, response.error)
+
+    def _set_status(self, status: int, transferred: int, error: str):
+        with self._lock:
+            finished = status in _FINISHED and self._status not in _FINISHED
+            self._status = status
+            self.transferred = transferred
+            self._error = error
+        if not finished:
+            return
+
+        # S2MM terminata: il DMA ha scritto nel buffer, la copia locale non vale più
+        if self._direction == pb2.DMA_S2MM:
+            self._buffer.invalidate()
+
+        if status == pb2.DMA_DONE:
+            self._future.set_result(transferred)
+        elif status == pb2.DMA_TIMEOUT:
+            self._future.set_exception(TimeoutError(f"DMA transfer timed out: {error}"))
+        else:
+            self._future.set_exception(RuntimeError(f"DMA transfer failed: {error}"))
+
+
+class DMA(IPCore):
+    """AXI DMA di un overlay: registri come IPCore, trasferimenti eseguiti dal server"""
+
+    def __init__(self, base_addr, length, ip_name=None, overlay_id=None, registers=None, uio_device=None):
+        super().__init__(base_addr, length, ip_name=ip_name, overlay_id=overlay_id,
+                         registers=registers, uio_device=uio_device)
+        self._connection = Connection()
+
+        response = self._connection.call_with_auth('CreateDMA', pb2.CreateDMARequest(dma_name=ip_name))
+        self._handle = response.handle
+        self.max_transfer_size = response.max_transfer_size
+
+        self.sendchannel = DMAChannel(self, pb2.DMA_MM2S) if response.has_send_channel else None
+        self.recvchannel = DMAChannel(self, pb2.DMA_S2MM) if response.has_recv_channel else None
+
+        logger.info(f"DMA {ip_name} created with handle {self._handle}")
@@ -1,64 +1,561 @@
 # client/pynq_proxy/fast_mmio.py
 import socket
-import struct
 import threading
 import time
 import os
 import sys
+import asyncio
+import struct
+from collections import deque
+from concurrent.futures import Future, wait as _wait_futures
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 
 # Import per creare handle iniziale
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from connection import Connection
 import pynq_service_pb2 as pb2
+from .allocate import invalidate_buffers
+
+# Codec condiviso con il server
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Proto'))
+from fast_mmio_protocol import (
+    PROTOCOL_VERSION, FrameReader, encode_handle,
+    OP_HELLO, OP_WRITE_SLOT, OP_READ_SLOT, OP_BIND, OP_RING_SETUP, OP_CREDIT, OP_EXEC,
+    OP_BATCH_WRITE_SLOT, BATCH_HEADER_FRAME,
+    FLAG_NONE, FLAG_ACK, FLAG_CREDITS, INITIAL_CREDITS, HEADER, HEADER_SIZE,
+    STATUS_OK, STATUS_TIMEOUT, BATCH_COUNT, INSN, MAX_PROGRAM_INSNS,
+    INSN_WRITE, INSN_READ, INSN_RMW, INSN_POLL, INSN_SLEEP,
+    OP_READ_BLOCK, OP_WRITE_BLOCK, MAX_BLOCK_WORDS, READ_BLOCK_PAYLOAD, READ_BLOCK_FRAME,
+    WRITE_BLOCK_HEADER, HELLO_PAYLOAD, WRITE_SLOT_PAYLOAD, READ_SLOT_PAYLOAD, BIND_PAYLOAD, U16, U32,
+    HELLO_FRAME, WRITE_SLOT_FRAME, READ_SLOT_FRAME, BIND_FRAME, U16_REPLY,
+)
+from fast_mmio_ring import (
+    RING_SUPPORTED, DEFAULT_RING_ENTRIES, SERVER_WAITING, CLIENT_WAITING,
+    MMIORing, AdaptiveSpinner, ring_doorbell,
+)
+
+# Timeout complessivo di una operazione sul ring (server non più attivo)
+RING_TIMEOUT = 5.0
+RING_FULL_BACKOFF = 0.00005     # Attesa tra due tentativi con la SQ piena
+
+# Write combining: flush dopo COALESCE_MAX_WRITES scritture o COALESCE_MAX_DELAY secondi
+COALESCE_MAX_WRITES = 64
+COALESCE_MAX_DELAY = 0.0005
+
+# Registro di controllo degli IP HLS (ap_start): una scrittura qui può avviare
+# l'acceleratore, che poi scrive nei buffer del tenant
+CONTROL_REGISTER = 0x00
+
+# Batch vuoto: il server risponde solo dopo aver eseguito tutti i frame precedenti
+_BARRIER_FRAME = BATCH_HEADER_FRAME.pack(2, OP_BATCH_WRITE_SLOT, FLAG_NONE, 0, 0)
+
+
+def gather(futures, timeout: Optional[float] = None) -> List:
+    """
+    Attende un insieme di future (es. da read_async) e ritorna i risultati
+    nello stesso ordine. Solleva la prima eccezione incontrata.
+    """
+    futures = list(futures)
+    _, not_done = _wait_futures(futures, timeout=timeout)
+    if not_done:
+        raise TimeoutError(f"{len(not_done)} fast MMIO operations still pending")
+    return [future.result() for future in futures]
+
+
+def _program_result(status: int, buf, payload: int, length: int) -> List[int]:
+    """Decodifica la risposta OP_EXEC; solleva se il programma non è terminato"""
+    executed = U16.unpack_from(buf, payload)[0]
+    results = list(struct.unpack_from(f'!{(length - 2) // 4}I', buf, payload + 2))
+    if status == STATUS_TIMEOUT:
+        raise TimeoutError(f"MMIO program poll timed out at instruction {executed}")
+    if status != STATUS_OK:
+        raise Exception(f"MMIO program failed at instruction {executed} (status={status})")
+    return results
+
+
+class _FastConnection:
+    """Socket fast-path autenticato, condiviso tra le istanze UltraFastMMIO"""
+
+    def __init__(self, socket_path: str, use_ring: bool = False, hello_flags: int = FLAG_NONE):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.lock = threading.Lock()
+        self.reader = FrameReader(capacity=4096)
+
+        # Trasporto a ring condivisi (opzionale)
+        self.ring = None
+        self.sq_bell = -1
+        self.cq_bell = -1
+        self._spinner = AdaptiveSpinner()
+        self._next_tag = 0
+        # Scritture sulla SQ non ancora confermate da una completion
+        self._ring_unsynced = False
+
+        # _WriteCombiner se le scritture fire-and-forget vengono accorpate
+        self.combiner = None
+
+        # HELLO: solo versione e flag, il server riconosce il tenant dal socket (SO_PEERCRED)
+        hello = bytearray(HELLO_FRAME.size)
+        HELLO_FRAME.pack_into(hello, 0, HELLO_PAYLOAD.size, OP_HELLO, hello_flags, 0,
+                              PROTOCOL_VERSION)
+        self.sock.sendall(hello)
+
+        payload = self.reader.read_frame(self.sock)
+        server_version = U16.unpack_from(self.reader.buf, payload)[0]
+        if self.reader.op != OP_HELLO or self.reader.flags != STATUS_OK:
+            self.close()
+            raise Exception(f"Fast protocol handshake failed (server v{server_version}, "
+                            f"client v{PROTOCOL_VERSION})")
+
+        if use_ring:
+            self._setup_ring()
+
+    def _setup_ring(self, entries: int = DEFAULT_RING_ENTRIES):
+        """Richiede i ring condivisi: il server risponde passando memfd + doorbell"""
+        if not RING_SUPPORTED:
+            raise Exception("Shared ring transport requires os.memfd_create and os.eventfd")
+
+        self.sock.sendall(U16_REPLY.pack(2, OP_RING_SETUP, FLAG_NONE, 0, entries))
+        reply, fds, _, _ = socket.recv_fds(self.sock, U16_REPLY.size, 3)
+
+        _, op, status, _, granted = U16_REPLY.unpack(reply)
+        if op != OP_RING_SETUP or status != STATUS_OK or len(fds) != 3:
+            for fd in fds:
+                os.close(fd)
+            raise Exception(f"Shared ring setup refused (status={status})")
+
+        memfd, self.sq_bell, self.cq_bell = fds
+        try:
+            self.ring = MMIORing(memfd, granted)
+        except Exception:
+            for fd in fds:
+                os.close(fd)
+            self.sq_bell = self.cq_bell = -1
+            raise
+
+    def close(self):
+        """Chiude il socket e, se presenti, i ring con i loro doorbell"""
+        ring = self.ring
+        if ring is not None:
+            self.ring = None
+            # Il worker del server esce al prossimo controllo del flag
+            ring.mark_closed()
+            ring.close()
+            os.close(self.sq_bell)
+            os.close(self.cq_bell)
+            self.sq_bell = self.cq_bell = -1
+        self.sock.close()
+
+    def ring_submit(self, op: int, flags: int, slot: int, offset: int, value: int) -> int:
+        """Accoda sulla submission ring e sveglia il server se dorme. Ritorna il tag"""
+        ring = self.ring
+        tag = self._next_tag
+        self._next_tag = (tag + 1) & 0xFFFF
+
+        deadline = None
+        while not ring.submit(op, flags, tag, slot, offset, value):
+            # SQ pieno: il server è indietro (o il suo worker è uscito)
+            if ring.closed:
+                raise ConnectionError("Fast MMIO ring closed by the server")
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + RING_TIMEOUT
+            elif now > deadline:
+                raise ConnectionError("Fast MMIO ring full: server not consuming submissions")
+            os.eventfd_write(self.sq_bell, 1)
+            time.sleep(RING_FULL_BACKOFF)
+        ring_doorbell(ring, SERVER_WAITING, self.sq_bell)
+        self._ring_unsynced = True
+        return tag
+
+    def ring_wait(self, tag: int) -> int:
+        """Attende la completion di tag. Ritorna il valore o solleva se status != OK"""
+        ring = self.ring
+        deadline = time.monotonic() + RING_TIMEOUT
+
+        while True:
+            entry = ring.pop_completion()
+            if entry is None:
+                if ring.closed:
+                    raise ConnectionError("Fast MMIO ring closed by the server")
+                if (not self._spinner.wait(ring.has_completion, ring, CLIENT_WAITING,
+                                           self.cq_bell, 0.05)
+                        and time.monotonic() > deadline):
+                    raise Exception("Fast MMIO ring timeout")
+                continue
+
+            completed_tag, status, value = entry
+            if completed_tag != tag:
+                # Con il lock della connessione c'è al massimo una completion in volo
+                raise Exception(f"Unexpected ring completion tag {completed_tag} (expected {tag})")
+            # Il worker consuma la SQ in ordine: tutto ciò che precede tag è eseguito
+            self._ring_unsynced = False
+            if status != STATUS_OK:
+                raise Exception(f"Fast MMIO operation failed (status={status})")
+            return value
+
+    def expect_reply(self, op: int) -> int:
+        """Legge la risposta alla richiesta appena inviata. Ritorna l'offset del payload"""
+        reader = self.reader
+        payload = reader.read_frame(self.sock)
+        if reader.op != op:
+            raise Exception(f"Unexpected fast MMIO reply op=0x{reader.op:02x}")
+        if reader.flags != STATUS_OK:
+            raise Exception(f"Fast MMIO operation failed (status={reader.flags})")
+        return payload
+
+    def send_batch(self, frame):
+        """Invia un frame OP_BATCH_WRITE_SLOT completo. Ritorna le scritture riuscite"""
+        with self.lock:
+            self.sock.sendall(frame)
+            payload = self.expect_reply(OP_BATCH_WRITE_SLOT)
+            return U16.unpack_from(self.reader.buf, payload)[0]
+
+    def flush_writes(self):
+        """Invia le scritture accorpate in attesa (prima di ogni operazione con risposta)"""
+        combiner = self.combiner
+        if combiner is not None and combiner.count:
+            combiner.flush()
+
+    def sync_ring(self):
+        """
+        Con il lock acquisito: attende che il server abbia eseguito le scritture
+        accodate sulla SQ. Le operazioni sul socket (blocchi, programmi) vengono
+        servite fuori dal ring worker e li sorpasserebbero.
+        """
+        if self._ring_unsynced:
+            # Batch vuoto sul ring: il worker consuma la SQ in ordine
+            self.ring_wait(self.ring_submit(OP_BATCH_WRITE_SLOT, FLAG_NONE, 0, 0, 0))
+
+    def fence(self):
+        """
+        Ritorna quando il server ha eseguito tutte le scritture inviate finora
+        su questa connessione (accorpate o fire-and-forget).
+        """
+        if self.ring is not None:
+            with self.lock:
+                self.sync_ring()
+            return
+
+        combiner = self.combiner
+        completion = combiner.flush() if combiner is not None else None
+        if completion is None:
+            completion = self.send_batch(_BARRIER_FRAME)
+        if isinstance(completion, Future):
+            completion.result()
+        if combiner is not None:
+            combiner.raise_errors()
+
+
+class _PipelinedConnection(_FastConnection):
+    """
+    Connessione con più richieste in volo: ogni richiesta ha un tag, un thread
+    lettore associa le risposte (anche fuori ordine) alle future in attesa.
+    Ogni richiesta consuma un credito; senza crediti il mittente si blocca,
+    così le scritture fire-and-forget non possono sommergere il server.
+    """
+
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path, hello_flags=FLAG_CREDITS)
+
+        self._pending: Dict[int, Tuple[int, Future]] = {}
+        self._credits = threading.Semaphore(INITIAL_CREDITS)
+        self._error: Optional[Exception] = None
+
+        self._send_buf = bytearray(max(WRITE_SLOT_FRAME.size, READ_SLOT_FRAME.size, BIND_FRAME.size))
+        self._send_view = memoryview(self._send_buf)
+
+        self._reader_thread = threading.Thread(
+            target=self._read_loop,
+            name="FastMMIOReader",
+            daemon=True
+        )
+        self._reader_thread.start()
+
+    def submit(self, frame, op: int, flags: int, *fields, reply: bool = True) -> Optional[Future]:
+        """
+        Invia una richiesta senza attendere la risposta.
+
+        Args:
+            frame: struct del frame completo (header + payload)
+            reply: False per le scritture fire-and-forget
+
+        Returns:
+            Future con il valore della risposta (None se reply=False)
+        """
+        self._credits.acquire()
+        future = Future() if reply else None
+
+        with self.lock:
+            if self._error is not None:
+                self._credits.release()
+                raise self._error
+
+            tag = self._next_tag
+            self._next_tag = (tag + 1) & 0xFFFF
+            if reply:
+                self._pending[tag] = (op, future)
+
+            size = frame.size
+            frame.pack_into(self._send_buf, 0, size - HEADER_SIZE, op, flags, tag, *fields)
+            self.sock.sendall(self._send_view[:size])
+
+        return future
+
+    def submit_payload(self, op: int, flags: int, payload: bytes) -> Future:
+        """Come submit, per richieste a lunghezza variabile (es. OP_EXEC)"""
+        self._credits.acquire()
+        future = Future()
+
+        with self.lock:
+            if self._error is not None:
+                self._credits.release()
+                raise self._error
+
+            tag = self._next_tag
+            self._next_tag = (tag + 1) & 0xFFFF
+            self._pending[tag] = (op, future)
+            self.sock.sendall(HEADER.pack(len(payload), op, flags, tag) + payload)
+
+        return future
+
+    def send_batch(self, frame) -> Future:
+        """Come _FastConnection.send_batch, ma senza attendere: la future ha le scritture riuscite"""
+        return self.submit_payload(OP_BATCH_WRITE_SLOT, FLAG_NONE, frame[HEADER_SIZE:])
+
+    def _read_loop(self):
+        reader = self.reader
+        buf = reader.buf
+        try:
+            while True:
+                payload = reader.read_frame(self.sock)
+
+                if reader.op == OP_CREDIT:
+                    self._credits.release(U16.unpack_from(buf, payload)[0])
+                    continue
+
+                entry = self._pending.pop(reader.tag, None)
+                if entry is None:
+                    continue
+                self._credits.release()
+                op, future = entry
+
+                if op == OP_READ_BLOCK and reader.flags == STATUS_OK:
+                    future.set_result(np.frombuffer(reader.buf, dtype='<u4', count=reader.length // 4,
+                                                    offset=payload).astype(np.uint32))
+                elif op == OP_EXEC:
+                    try:
+                        future.set_result(_program_result(reader.flags, reader.buf,
+                                                          payload, reader.length))
+                    except Exception as e:
+                        future.set_exception(e)
+                elif reader.flags != STATUS_OK:
+                    future.set_exception(
+                        Exception(f"Fast MMIO operation failed (status={reader.flags})"))
+                elif reader.length == 4:
+                    future.set_result(U32.unpack_from(buf, payload)[0])
+                elif reader.length == 2:
+                    future.set_result(U16.unpack_from(buf, payload)[0])
+                else:
+                    future.set_result(None)
+
+        except Exception as e:
+            self._error = ConnectionError(f"Fast MMIO connection lost: {e}")
+        finally:
+            if self._error is None:
+                self._error = ConnectionError("Fast MMIO connection closed")
+            with self.lock:
+                pending = [future for _, future in self._pending.values()]
+                self._pending.clear()
+            for future in pending:
+                future.set_exception(self._error)
+            # Sblocca chi è in attesa di crediti: troverà self._error
+            self._credits.release(INITIAL_CREDITS)
+            self.close()
+
+
+class _WriteCombiner:
+    """
+    Write combining lato client: le scritture fire-and-forget di una connessione
+    si accumulano e partono come un solo OP_BATCH_WRITE_SLOT quando:
+
+    - arriva un'operazione con risposta (read, write_async, block, execute)
+    - si raggiungono max_writes scritture
+    - passano max_delay secondi dalla prima scrittura in attesa
+    - si chiama fence()
+
+    Il batch porta lo slot di ogni scrittura, quindi l'ordine tra più
+    UltraFastMMIO sulla stessa connessione è preservato. Le scritture fallite
+    (risposta con meno successi del batch) non fanno fallire l'operazione che
+    ha causato il flush: l'errore viene sollevato dal fence() successivo.
+    """
+
+    def __init__(self, conn, max_writes: int = COALESCE_MAX_WRITES,
+                 max_delay: float = COALESCE_MAX_DELAY):
+        self.conn = conn
+        self.max_writes = max(1, min(max_writes, 0xFFFF))
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.count = 0
+
+        self._buf = bytearray(BATCH_HEADER_FRAME.size + self.max_writes * WRITE_SLOT_PAYLOAD.size)
+        self._view = memoryview(self._buf)
+        # Batch inviati in modalità pipelined, non ancora verificati: (future, scritture)
+        self._pending = deque()
+        self._error: Optional[Exception] = None
+
+        self._armed = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="FastMMIOCombiner", daemon=True)
+        self._thread.start()
+
+    def add(self, slot: int, offset: int, value: int):
+        with self.lock:
+            count = self.count
+            WRITE_SLOT_PAYLOAD.pack_into(self._buf, BATCH_HEADER_FRAME.size + count * WRITE_SLOT_PAYLOAD.size,
+                                         slot, offset, value)
+            self.count = count + 1
+            if not count:
+                self._armed.set()
+            if self.count >= self.max_writes:
+                self._flush_locked()
+
+    def flush(self):
+        """
+        Returns:
+            None se non c'era nulla da inviare, altrimenti le scritture riuscite
+            (int) o una Future con lo stesso valore (connessione pipelined)
+        """
+        with self.lock:
+            return self._flush_locked()
+
+    def _flush_locked(self):
+        count = self.count
+        if not count:
+            return None
+        self.count = 0
+
+        size = BATCH_HEADER_FRAME.size + count * WRITE_SLOT_PAYLOAD.size
+        BATCH_HEADER_FRAME.pack_into(self._buf, 0, size - HEADER_SIZE, OP_BATCH_WRITE_SLOT,
+                                     FLAG_NONE, 0, count)
+        completion = self.conn.send_batch(self._view[:size])
+
+        if isinstance(completion, Future):
+            pending = self._pending
+            while pending and pending[0][0].done():
+                self._check(*pending.popleft())
+            pending.append((completion, count))
+        else:
+            self._check(completion, count)
+        return completion
+
+    def _check(self, completion, count: int):
+        try:
+            done = completion.result() if isinstance(completion, Future) else completion
+        except Exception as e:
+            self._error = e
+            return
+        if done != count:
+            self._error = Exception(f"{count - done} of {count} coalesced MMIO writes failed")
+
+    def raise_errors(self):
+        """Verifica i batch ancora in sospeso e solleva il primo errore dall'ultimo fence"""
+        with self.lock:
+            pending, self._pending = self._pending, deque()
+        for completion, count in pending:
+            self._check(completion, count)
+
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _flush_loop(self):
+        """Soglia di tempo: flush max_delay dopo la prima scrittura accodata"""
+        while self.conn.sock.fileno() != -1:
+            if not self._armed.wait(1.0):
+                continue
+            time.sleep(self.max_delay)
+            self._armed.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self._error = e
+
 
 class UltraFastMMIO:
-    """Client MMIO ultra-veloce che bypassa gRPC"""
+    """
+    Client MMIO ultra-veloce che bypassa gRPC.
+    
+    La cache di lettura dei ProxyBuffer viene invalidata solo dove l'hardware
+    può aver scritto nei buffer: scritture del registro di controllo, execute()
+    e fence() (al momento dell'invio: le varianti async non ne attendono l'esito).
+    Letture e scritture degli altri registri non la toccano.
+    """
     
     _connection_pool = {}
     _pool_lock = threading.Lock()
     
-    def __init__(self, base_addr: int, length: int = 4):
+    def __init__(self, base_addr: int, length: int = 4, use_ring: bool = None,
+                 pipelined: bool = None, coalesce: bool = None):
+        """
+        Args:
+            use_ring: usa i ring in memoria condivisa invece di send/recv per ogni
+                      operazione (default: variabile PYNQ_MMIO_RING=1); su ARM il
+                      server li rifiuta se fast_mmio_ring non è abilitato
+            pipelined: più operazioni in volo sulla stessa connessione, con
+                       read_async()/write_async() (default: PYNQ_MMIO_PIPELINE=1)
+            coalesce: accorpa le write() in batch (vedi _WriteCombiner); usare
+                      fence() prima di scritture che avviano l'hardware
+                      (default: PYNQ_MMIO_COALESCE=1)
+        """
+        if use_ring is None:
+            use_ring = os.environ.get('PYNQ_MMIO_RING', '0') == '1'
+        if pipelined is None:
+            pipelined = os.environ.get('PYNQ_MMIO_PIPELINE', '0') == '1'
+        if coalesce is None:
+            coalesce = os.environ.get('PYNQ_MMIO_COALESCE', '0') == '1'
+        if use_ring and pipelined:
+            raise ValueError("use_ring and pipelined are mutually exclusive")
+        if use_ring and coalesce:
+            raise ValueError("use_ring and coalesce are mutually exclusive")
+        self.use_ring = use_ring
+        self.pipelined = pipelined
+        self.coalesce = coalesce
         self.base_addr = base_addr
         self.length = length
         self._handle_str = None
         self._handle_bytes = None
+        self._slot = None
         self._conn = None
+
+        # Buffer preallocati per i frame (niente allocazioni per operazione)
+        self._write_buf = bytearray(WRITE_SLOT_FRAME.size)
+        self._read_buf = bytearray(READ_SLOT_FRAME.size)
         
         self._get_connection()
         self._create_mmio_handle()
+        self._bind_slot()
     
     def _get_connection(self):
         """Ottieni connessione dal pool"""
-        socket_path = "/var/run/pynq/mmio_fast.sock"
-        
-        with self._pool_lock:
-            if socket_path in self._connection_pool:
-                self._conn = self._connection_pool[socket_path]
-                try:
-                    # Test se ancora viva
-                    self._conn.send(b'')
-                except:
-                    del self._connection_pool[socket_path]
-                    self._create_new_connection(socket_path)
-            else:
-                self._create_new_connection(socket_path)
-    
-    def _create_new_connection(self, socket_path):
-        """Crea nuova connessione veloce"""
-        self._conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self._conn.connect(socket_path)
-        
-        # Auth con token semplice
+        # Socket fast-path del tenant, accanto al socket gRPC
         tenant_id = os.environ.get('TENANT_ID', 'tenant1')
-        token = f"fast_{tenant_id}"
-        token_bytes = token[:16].ljust(16, '\x00').encode()
-        self._conn.send(token_bytes)
+        socket_dir = os.environ.get('PYNQ_SOCKET_DIR', '/var/run/pynq')
+        socket_path = os.path.join(socket_dir, f"{tenant_id}_mmio.sock")
         
-        response = self._conn.recv(1)
-        if response != b'\x01':
-            raise Exception("Fast protocol auth failed")
+        pool_key = (socket_path, self.use_ring, self.pipelined, self.coalesce)
         
-        self._connection_pool[socket_path] = self._conn
+        with self._pool_lock:
+            conn = self._connection_pool.get(pool_key)
+            if conn is None or conn.sock.fileno() == -1:
+                if self.pipelined:
+                    conn = _PipelinedConnection(socket_path)
+                else:
+                    conn = _FastConnection(socket_path, use_ring=self.use_ring)
+                if self.coalesce:
+                    conn.combiner = _WriteCombiner(conn)
+                self._connection_pool[pool_key] = conn
+            self._conn = conn
     
     def _create_mmio_handle(self):
         """Crea handle via gRPC normale"""
@@ -72,34 +569,223 @@ class UltraFastMMIO:
         self._handle_str = response.handle
         
         # Padda a 32 bytes per il protocollo
-        self._handle_bytes = self._handle_str.ljust(32)[:32].encode()
+        self._handle_bytes = encode_handle(self._handle_str)
+    
+    def _bind_slot(self):
+        """Registra l'handle sulla connessione: le operazioni usano poi lo slot intero"""
+        conn = self._conn
+        if self.pipelined:
+            self._slot = conn.submit(BIND_FRAME, OP_BIND, FLAG_NONE, self._handle_bytes).result()
+            return
+        with conn.lock:
+            conn.sock.sendall(BIND_FRAME.pack(BIND_PAYLOAD.size, OP_BIND, FLAG_NONE, 0,
+                                              self._handle_bytes))
+            payload = conn.expect_reply(OP_BIND)
+            self._slot = U16.unpack_from(conn.reader.buf, payload)[0]
     
     def write(self, offset: int, value: int):
-        """Write veloce"""
-        # Messaggio: op(1) + handle_str(32) + offset(4) + value(4) = 41 bytes
-        msg = struct.pack('!B', 0x01) + self._handle_bytes + struct.pack('!II', offset, value)
-        self._conn.send(msg)
+        """Write veloce (fire-and-forget, nessuna risposta dal server)"""
+        if offset == CONTROL_REGISTER:
+            invalidate_buffers(revalidate=False)
+        buf = self._write_buf
+        conn = self._conn
+        if conn.combiner is not None:
+            conn.combiner.add(self._slot, offset, value)
+            return
+        if self.pipelined:
+            conn.submit(WRITE_SLOT_FRAME, OP_WRITE_SLOT, FLAG_NONE, self._slot, offset, value,
+                        reply=False)
+            return
+        with conn.lock:
+            if conn.ring is not None:
+                conn.ring_submit(OP_WRITE_SLOT, FLAG_NONE, self._slot, offset, value)
+                return
+            WRITE_SLOT_FRAME.pack_into(buf, 0, WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_NONE, 0,
+                                       self._slot, offset, value)
+            conn.sock.sendall(buf)
     
     def read(self, offset: int, length: int = 4) -> int:
         """Read veloce"""
-        # Messaggio: op(1) + handle_str(32) + offset(4) = 37 bytes  
-        msg = struct.pack('!B', 0x02) + self._handle_bytes + struct.pack('!I', offset)
-        self._conn.send(msg)
+        if self.pipelined:
+            return self.read_async(offset).result()
+        buf = self._read_buf
+        conn = self._conn
+        conn.flush_writes()
+        with conn.lock:
+            if conn.ring is not None:
+                return conn.ring_wait(conn.ring_submit(OP_READ_SLOT, FLAG_NONE, self._slot, offset, 0))
+            READ_SLOT_FRAME.pack_into(buf, 0, READ_SLOT_PAYLOAD.size, OP_READ_SLOT, FLAG_NONE, 0,
+                                      self._slot, offset)
+            conn.sock.sendall(buf)
+            payload = conn.expect_reply(OP_READ_SLOT)
+            return U32.unpack_from(conn.reader.buf, payload)[0]
+    
+    def read_async(self, offset: int) -> Future:
+        """
+        Read senza attesa: ritorna una concurrent.futures.Future con il valore.
+        Fuori dalla modalità pipelined la lettura è eseguita subito.
+        """
+        if self.pipelined:
+            self._conn.flush_writes()
+            return self._conn.submit(READ_SLOT_FRAME, OP_READ_SLOT, FLAG_NONE, self._slot, offset)
+        return self._completed(self.read, offset)
+    
+    def write_async(self, offset: int, value: int) -> Future:
+        """Write con conferma, senza attesa: la future si risolve con l'ACK del server"""
+        if offset == CONTROL_REGISTER:
+            invalidate_buffers(revalidate=False)
+        if self.pipelined:
+            self._conn.flush_writes()
+            return self._conn.submit(WRITE_SLOT_FRAME, OP_WRITE_SLOT, FLAG_ACK,
+                                     self._slot, offset, value)
+        return self._completed(self._write_acked, offset, value)
+    
+    async def aread(self, offset: int) -> int:
+        """Variante asyncio di read_async"""
+        return await asyncio.wrap_future(self.read_async(offset))
+    
+    async def awrite(self, offset: int, value: int):
+        """Variante asyncio di write_async"""
+        await asyncio.wrap_future(self.write_async(offset, value))
+    
+    def read_block(self, offset: int, count: int) -> np.ndarray:
+        """
+        Legge count registri a 32 bit contigui a partire da offset
+        (una richiesta ogni MAX_BLOCK_WORDS word).
+        """
+        if count <= 0:
+            return np.empty(0, dtype=np.uint32)
+        self._conn.flush_writes()
+        if self.pipelined:
+            return np.concatenate(gather(self._read_block_async_chunks(offset, count)))
         
-        data = self._conn.recv(4)
-        return struct.unpack('!I', data)[0]
+        result = np.empty(count, dtype=np.uint32)
+        conn = self._conn
+        done = 0
+        with conn.lock:
+            if conn.ring is not None:
+                conn.sync_ring()
+            while done < count:
+                chunk = min(count - done, MAX_BLOCK_WORDS)
+                conn.sock.sendall(READ_BLOCK_FRAME.pack(READ_BLOCK_PAYLOAD.size, OP_READ_BLOCK, FLAG_NONE, 0,
+                                                        self._slot, offset + 4 * done, chunk))
+                payload = conn.expect_reply(OP_READ_BLOCK)
+                result[done:done + chunk] = np.frombuffer(conn.reader.buf, dtype='<u4',
+                                                          count=chunk, offset=payload)
+                done += chunk
+        return result
     
-    def write_with_timing(self, offset: int, value: int) -> float:
-        """Write con timing completo"""
-        msg = struct.pack('!B', 0x06) + self._handle_bytes + struct.pack('!II', offset, value)
+    def _read_block_async_chunks(self, offset: int, count: int) -> List[Future]:
+        futures = []
+        for done in range(0, count, MAX_BLOCK_WORDS):
+            chunk = min(count - done, MAX_BLOCK_WORDS)
+            futures.append(self._conn.submit(READ_BLOCK_FRAME, OP_READ_BLOCK, FLAG_NONE,
+                                             self._slot, offset + 4 * done, chunk))
+        return futures
+    
+    def write_block(self, offset: int, data):
+        """Scrive registri a 32 bit contigui a partire da offset (array-like di uint32)"""
+        if offset == CONTROL_REGISTER:
+            invalidate_buffers(revalidate=False)
+        words = np.ascontiguousarray(data, dtype='<u4').ravel()
+        futures = []
+        conn = self._conn
+        conn.flush_writes()
+        for done in range(0, len(words), MAX_BLOCK_WORDS):
+            chunk = words[done:done + MAX_BLOCK_WORDS]
+            payload = WRITE_BLOCK_HEADER.pack(self._slot, offset + 4 * done) + chunk.tobytes()
+            if self.pipelined:
+                futures.append(conn.submit_payload(OP_WRITE_BLOCK, FLAG_NONE, payload))
+                continue
+            with conn.lock:
+                if conn.ring is not None:
+                    conn.sync_ring()
+                conn.sock.sendall(HEADER.pack(len(payload), OP_WRITE_BLOCK, FLAG_NONE, 0) + payload)
+                conn.expect_reply(OP_WRITE_BLOCK)
+        gather(futures)
+    
+    def program(self) -> 'MMIOProgram':
+        """Nuovo micro-programma con questo MMIO come target di default"""
+        return MMIOProgram(self)
+    
+    def execute(self, program: 'MMIOProgram') -> List[int]:
+        """
+        Esegue un micro-programma lato server in un solo round trip.
         
-        start = time.perf_counter()
-        self._conn.send(msg)
-        ack = self._conn.recv(1)
-        end = time.perf_counter()
+        Returns:
+            valori di READ e POLL nell'ordine del programma
+        """
+        conn = self._conn
+        if self.pipelined:
+            return self.execute_async(program).result()
         
-        if ack != b'\x01':
-            raise Exception("Write failed")
+        invalidate_buffers(revalidate=False)
+        payload = program.encode()
+        conn.flush_writes()
+        with conn.lock:
+            # Anche con il trasporto a ring i programmi viaggiano sul socket,
+            # dopo le scritture già accodate sulla SQ
+            if conn.ring is not None:
+                conn.sync_ring()
+            conn.sock.sendall(HEADER.pack(len(payload), OP_EXEC, FLAG_NONE, 0) + payload)
+            reader = conn.reader
+            offset = reader.read_frame(conn.sock)
+            if reader.op != OP_EXEC:
+                raise Exception(f"Unexpected fast MMIO reply op=0x{reader.op:02x}")
+            return _program_result(reader.flags, reader.buf, offset, reader.length)
+    
+    def execute_async(self, program: 'MMIOProgram') -> Future:
+        invalidate_buffers(revalidate=False)
+        if self.pipelined:
+            self._conn.flush_writes()
+            return self._conn.submit_payload(OP_EXEC, FLAG_NONE, program.encode())
+        return self._completed(self.execute, program)
+    
+    def fence(self):
+        """
+        Barriera di scrittura: ritorna quando tutte le write() precedenti sulla
+        connessione sono state eseguite sull'hardware (solleva se qualcuna
+        delle scritture accorpate è fallita). Tipicamente prima di scrivere
+        il bit di start di un IP.
+        """
+        invalidate_buffers(revalidate=False)
+        self._conn.fence()
+    
+    def _write_acked(self, offset: int, value: int):
+        self.write_with_timing(offset, value)
+    
+    @staticmethod
+    def _completed(func, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def write_with_timing(self, offset: int, value: int) -> float:
+        """Write con timing completo"""
+        buf = self._write_buf
+        conn = self._conn
+        if self.pipelined:
+            start = time.perf_counter()
+            self.write_async(offset, value).result()
+            return (time.perf_counter() - start) * 1e6
+        conn.flush_writes()
+        with conn.lock:
+            if conn.ring is not None:
+                start = time.perf_counter()
+                conn.ring_wait(conn.ring_submit(OP_WRITE_SLOT, FLAG_ACK, self._slot, offset, value))
+                end = time.perf_counter()
+                return (end - start) * 1e6
+
+            WRITE_SLOT_FRAME.pack_into(buf, 0, WRITE_SLOT_PAYLOAD.size, OP_WRITE_SLOT, FLAG_ACK, 0,
+                                       self._slot, offset, value)
+
+            start = time.perf_counter()
+            conn.sock.sendall(buf)
+            conn.expect_reply(OP_WRITE_SLOT)
+            end = time.perf_counter()
         
         return (end - start) * 1e6
     
@@ -142,5 +828,69 @@ class UltraFastMMIO:
         print(f"   Hardware time:      {hw_time:.2f} µs")
         print(f"   Total time:         {total_time:.2f} µs")
 
+class MMIOProgram:
+    """
+    Sequenza di accessi ai registri eseguita dal server in un solo round trip.
+    
+    Esempio (avvio kernel HLS e attesa del bit ap_done):
+    
+        prog = ip.program()
+        prog.write(0x10, in_addr).write(0x1C, out_addr).write(0x00, 0x01)
+        prog.poll(0x00, mask=0x02, value=0x02, timeout_us=1_000_000)
+        ctrl, = prog.run()
+    
+    Ogni istruzione può indirizzare un altro UltraFastMMIO (target=...) purché
+    usi la stessa connessione fast. Il programma codificato viene riusato tra
+    più run().
+    """
+    
+    def __init__(self, mmio: UltraFastMMIO):
+        self.mmio = mmio
+        self._insns = []
+        self._encoded = None
+    
+    def _add(self, insn: int, target, offset: int = 0, a: int = 0, b: int = 0, c: int = 0):
+        target = target or self.mmio
+        if target._conn is not self.mmio._conn:
+            raise ValueError("All program targets must share the same fast MMIO connection")
+        if len(self._insns) >= MAX_PROGRAM_INSNS:
+            raise ValueError(f"MMIO program too long (max {MAX_PROGRAM_INSNS} instructions)")
+        self._insns.append((insn, target._slot, offset, a, b, c))
+        self._encoded = None
+        return self
+    
+    def write(self, offset: int, value: int, target: UltraFastMMIO = None) -> 'MMIOProgram':
+        return self._add(INSN_WRITE, target, offset, value)
+    
+    def read(self, offset: int, target: UltraFastMMIO = None) -> 'MMIOProgram':
+        return self._add(INSN_READ, target, offset)
+    
+    def rmw(self, offset: int, mask: int, value: int, target: UltraFastMMIO = None) -> 'MMIOProgram':
+        """Read-modify-write: reg = (reg & ~mask) | (value & mask)"""
+        return self._add(INSN_RMW, target, offset, mask, value)
+    
+    def poll(self, offset: int, mask: int, value: int, timeout_us: int = 1_000_000,
+             target: UltraFastMMIO = None) -> 'MMIOProgram':
+        """Attende (reg & mask) == value; il risultato è l'ultimo valore letto"""
+        return self._add(INSN_POLL, target, offset, mask, value, timeout_us)
+    
+    def sleep(self, us: int) -> 'MMIOProgram':
+        return self._add(INSN_SLEEP, self.mmio, c=us)
+    
+    def encode(self) -> bytes:
+        if self._encoded is None:
+            self._encoded = BATCH_COUNT.pack(len(self._insns)) + b''.join(
+                INSN.pack(*insn) for insn in self._insns)
+        return self._encoded
+    
+    def run(self) -> List[int]:
+        return self.mmio.execute(self)
+    
+    def run_async(self) -> Future:
+        return self.mmio.execute_async(self)
+    
+    def __len__(self):
+        return len(self._insns)
+
 # Alias per compatibilità
 FastMMIO = UltraFastMMIO
\ No newline at end of file
@@ -1,13 +1,28 @@
 # client/pynq_proxy/mmio.py
 import os
 import mmap
+import time
 import numpy as np
 import logging
+try:
+    from .allocate import invalidate_buffers
+except ImportError:
+    # Modulo importato da solo (es. benchmarks): nessun ProxyBuffer da invalidare
+    def invalidate_buffers(revalidate: bool = True):
+        pass
 
 logger = logging.getLogger(__name__)
 
 class MMIO:
-    """Memory-mapped I/O con accesso diretto via UIO device"""
+    """
+    Memory-mapped I/O con accesso diretto via UIO device.
+    
+    Senza device UIO (container senza /dev/uio*) i registri passano dal
+    server su un unico stream gRPC MMIOStream condiviso dal processo.
+    
+    Ogni accesso invalida la cache di lettura dei ProxyBuffer: una scrittura
+    può avviare un acceleratore, una lettura può osservarne il completamento.
+    """
     
     def __init__(self, base_addr: int, length: int = 4, uio_device: str = None, debug: bool = False):
         """
@@ -20,16 +35,22 @@ class MMIO:
         length : int
             Lunghezza della regione MMIO
         uio_device : str
-            Path al device UIO (es. "/dev/uio0")
+            Path al device UIO (es. "/dev/uio0"); None = accesso remoto via MMIOStream
         debug : bool
             Abilita debug logging
         """
-        if uio_device is None:
-            raise ValueError("uio_device must be specified for direct access")
-            
         self.base_addr = base_addr
         self.length = length
         self.debug = debug
+        self._stream = None
+        
+        if uio_device is None:
+            from .mmio_stream import MMIOStreamSession
+            self._stream = MMIOStreamSession.get()
+            self._handle = self._stream.create_handle(base_addr, length)
+            if self.debug:
+                logger.debug(f"MMIO 0x{base_addr:08x} via MMIOStream (handle {self._handle})")
+            return
         
         # Open UIO device
         self.fd = os.open(uio_device, os.O_RDWR | os.O_SYNC)
@@ -54,8 +75,11 @@ class MMIO:
         if offset + length > self.length:
             raise ValueError(f"Access outside MMIO range")
             
-        idx = offset >> 2
-        value = int(self.array[idx])
+        if self._stream is not None:
+            value = self._stream.read(self._handle, offset)
+        else:
+            value = int(self.array[offset >> 2])
+        invalidate_buffers(revalidate=False)
         
         if self.debug:
             logger.debug(f"MMIO read: 0x{self.base_addr + offset:08x} = 0x{value:08x}")
@@ -69,14 +93,119 @@ class MMIO:
         if offset >= self.length:
             raise ValueError(f"Offset outside MMIO range")
             
-        idx = offset >> 2
-        self.array[idx] = np.uint32(value)
+        if self._stream is not None:
+            self._stream.write(self._handle, offset, int(value) & 0xFFFFFFFF)
+        else:
+            self.array[offset >> 2] = np.uint32(value)
+        invalidate_buffers(revalidate=False)
         
         if self.debug:
             logger.debug(f"MMIO write: 0x{self.base_addr + offset:08x} = 0x{value:08x}")
     
+    def read_block(self, offset: int, count: int) -> np.ndarray:
+        """Read di count registri a 32 bit contigui (copia)"""
+        if offset % 4 != 0:
+            raise ValueError("Offset must be 4-byte aligned")
+        if count < 0 or offset + 4 * count > self.length:
+            raise ValueError(f"Access outside MMIO range")
+        
+        if self._stream is not None:
+            words = self._stream.read_block(self._handle, offset, count)
+        else:
+            idx = offset >> 2
+            words = self.array[idx:idx + count].copy()
+        invalidate_buffers(revalidate=False)
+        return words
+    
+    def write_block(self, offset: int, data):
+        """Write di registri a 32 bit contigui"""
+        words = np.asarray(data, dtype=np.uint32).ravel()
+        if offset % 4 != 0:
+            raise ValueError("Offset must be 4-byte aligned")
+        if offset + 4 * len(words) > self.length:
+            raise ValueError(f"Access outside MMIO range")
+        
+        if self._stream is not None:
+            self._stream.write_block(self._handle, offset, words)
+        else:
+            idx = offset >> 2
+            self.array[idx:idx + len(words)] = words
+        invalidate_buffers(revalidate=False)
+    
+    def batch(self, ops) -> list:
+        """
+        Esegue in ordine una sequenza di accessi a 32 bit.
+        
+        ops: lista di (offset, value) per le scritture e (offset, None) per le
+        letture. In modalità remota è una sola RPC BatchMMIO (es. argomenti e
+        ap_start di un kernel HLS). Ritorna i valori letti (None per le scritture).
+        """
+        ops = [(offset, None if value is None else int(value) & 0xFFFFFFFF) for offset, value in ops]
+        for offset, _ in ops:
+            if offset % 4 != 0:
+                raise ValueError("Offset must be 4-byte aligned")
+            if offset < 0 or offset + 4 > self.length:
+                raise ValueError(f"Access outside MMIO range")
+        
+        if self._stream is not None:
+            results = self._stream.batch(self._handle, ops)
+        else:
+            results = []
+            for offset, value in ops:
+                if value is None:
+                    results.append(int(self.array[offset >> 2]))
+                else:
+                    self.array[offset >> 2] = np.uint32(value)
+                    results.append(0)
+        invalidate_buffers(revalidate=False)
+        
+        return [result if value is None else None for (_, value), result in zip(ops, results)]
+    
+    def poll(self, offset: int, mask: int, value: int, timeout: float = 1.0) -> int:
+        """
+        Attende (registro & mask) == value; ritorna l'ultimo valore letto.
+        In modalità remota l'attesa avviene sul server (un solo frame).
+        """
+        if offset % 4 != 0:
+            raise ValueError("Offset must be 4-byte aligned")
+        if offset >= self.length:
+            raise ValueError(f"Offset outside MMIO range")
+        
+        if self._stream is not None:
+            current = self._stream.poll(self._handle, offset, mask, value, int(timeout * 1e6))
+            invalidate_buffers(revalidate=False)
+            return current
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            current = int(self.array[offset >> 2])
+            if current & mask == value & mask:
+                invalidate_buffers(revalidate=False)
+                return current
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"MMIO poll timed out (last value 0x{current:08x})")
+            time.sleep(0)
+    
+    def flush(self):
+        """Attende che le scritture remote siano state eseguite (no-op con UIO)"""
+        if self._stream is not None:
+            self._stream.fence()
+            invalidate_buffers(revalidate=False)
+    
     def close(self):
-        """Cleanup resources"""
+        """Cleanup resources (in modalità remota rilascia l'handle sul server)"""
+        stream = getattr(self, '_stream', None)
+        if stream is not None:
+            # Lo stream è del processo e resta aperto: le scritture già inviate vengono eseguite
+            self._stream = None
+            try:
+                stream.release_handle(self._handle)
+            except Exception as e:
+                logger.warning(f"ReleaseMMIO {self._handle} failed: {e}")
+            return
+        # La vista numpy tiene esportato il buffer: va rilasciata prima del mmap
+        if hasattr(self, 'array'):
+            del self.array
         if hasattr(self, 'mmap'):
             self.mmap.close()
         if hasattr(self, 'fd'):
@@ -84,6 +213,11 @@ class MMIO:
     
     def __del__(self):
         try:
+            if getattr(self, '_stream', None) is not None:
+                # Niente RPC dal garbage collector (può girare nel thread dello stream):
+                # l'handle resta al tenant fino a close() o al cleanup
+                self._stream = None
+                return
             self.close()
         except:
             pass
\ No newline at end of file
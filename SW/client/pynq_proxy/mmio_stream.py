@@ -0,0 +1,209 @@
+# client/pynq_proxy/mmio_stream.py
+"""
+Accesso ai registri via gRPC su un solo stream MMIOStream a lunga durata.
+
+Per i container senza device UIO né socket fast-path: auth e overhead
+HTTP/2 si pagano all'apertura dello stream, poi ogni accesso è un frame.
+Le scritture non attendono risposta (il server risponde solo in caso di
+errore, che viene sollevato dall'operazione successiva o da fence());
+letture, POLL e FENCE attendono la risposta con lo stesso seq. Il server
+esegue i frame nell'ordine di invio.
+"""
+
+import os
+import sys
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import grpc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from connection import Connection
+import pynq_service_pb2 as pb2
+
+logger = logging.getLogger(__name__)
+
+# Attesa massima di una risposta oltre al timeout del POLL
+STREAM_REPLY_TIMEOUT = 10.0
+
+
+class MMIOStreamSession:
+    """Stream MMIOStream del processo, condiviso da tutti gli MMIO remoti"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> 'MMIOStreamSession':
+        """Sessione corrente, riaperta se lo stream si è chiuso"""
+        with cls._instance_lock:
+            session = cls._instance
+            if session is None or session.closed:
+                reauth = session is not None and session.unauthenticated
+                session = cls._instance = cls(reauth=reauth)
+            return session
+
+    def __init__(self, reauth: bool = False):
+        conn = Connection()
+        conn.connect()
+        if reauth:
+            conn._authenticate()
+
+        self._requests = queue.SimpleQueue()
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._write_error: Optional[Exception] = None
+        # WRITE inviate dopo l'ultimo FENCE (le RPC unarie vanno ordinate dopo di loro)
+        self._unfenced = False
+        self.closed = False
+        self.unauthenticated = False
+
+        self._responses = conn.stub.MMIOStream(
+            self._request_iter(),
+            metadata=[('auth-token', conn.token)]
+        )
+        self._reader = threading.Thread(target=self._read_loop, name="MMIOStreamReader", daemon=True)
+        self._reader.start()
+
+    def _request_iter(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            yield request
+
+    def _read_loop(self):
+        error = None
+        try:
+            for response in self._responses:
+                with self._lock:
+                    future = self._pending.pop(response.seq, None)
+                if future is not None:
+                    future.set_result(response)
+                elif not response.ok:
+                    # Scrittura fire-and-forget fallita
+                    self._write_error = Exception(f"MMIO write failed: {response.error}")
+        except grpc.RpcError as e:
+            error = e
+            self.unauthenticated = e.code() == grpc.StatusCode.UNAUTHENTICATED
+        finally:
+            with self._lock:
+                self.closed = True
+                pending = list(self._pending.values())
+                self._pending.clear()
+            for future in pending:
+                future.set_exception(Exception(f"MMIOStream closed: {error}"))
+
+    def _submit(self, op: int, handle: str, offset: int, value: int = 0, mask: int = 0,
+                timeout_us: int = 0, reply: bool = True) -> Optional[Future]:
+        if self._write_error is not None:
+            error, self._write_error = self._write_error, None
+            raise error
+
+        future = Future() if reply else None
+        with self._lock:
+            if self.closed:
+                raise Exception("MMIOStream closed")
+            self._seq = (self._seq + 1) & 0xFFFFFFFF
+            if future is not None:
+                self._pending[self._seq] = future
+            # Sotto lock: l'ordine della coda è l'ordine dei seq
+            self._requests.put(pb2.MMIOStreamRequest(
+                seq=self._seq, op=op, handle=handle, offset=offset, value=value,
+                mask=mask, timeout_us=timeout_us
+            ))
+        return future
+
+    @staticmethod
+    def _result(future: Future, timeout: float = STREAM_REPLY_TIMEOUT):
+        response = future.result(timeout=timeout)
+        if response.timeout:
+            raise TimeoutError(f"MMIO poll timed out (last value 0x{response.value:08x})")
+        if not response.ok:
+            raise Exception(response.error)
+        return response
+
+    def create_handle(self, base_addr: int, length: int) -> str:
+        """Crea l'handle MMIO sul server (RPC unaria, una volta per regione)"""
+        response = Connection().call_with_auth('CreateMMIO', pb2.CreateMMIORequest(
+            base_address=base_addr,
+            length=length
+        ))
+        return response.handle
+
+    def read(self, handle: str, offset: int) -> int:
+        return self._result(self._submit(pb2.MMIO_STREAM_READ, handle, offset)).value
+
+    def write(self, handle: str, offset: int, value: int):
+        self._unfenced = True
+        self._submit(pb2.MMIO_STREAM_WRITE, handle, offset, value, reply=False)
+
+    def poll(self, handle: str, offset: int, mask: int, value: int, timeout_us: int) -> int:
+        """Attende (reg & mask) == value sul server; ritorna l'ultimo valore letto"""
+        future = self._submit(pb2.MMIO_STREAM_POLL, handle, offset, value, mask, timeout_us)
+        return self._result(future, STREAM_REPLY_TIMEOUT + timeout_us / 1e6).value
+
+    def fence(self):
+        """Attende che il server abbia eseguito tutti i frame inviati (e segnala le WRITE fallite)"""
+        self._unfenced = False
+        self._result(self._submit(pb2.MMIO_STREAM_FENCE, '', 0))
+        if self._write_error is not None:
+            error, self._write_error = self._write_error, None
+            raise error
+
+    def _fence_writes(self):
+        """FENCE solo se ci sono WRITE senza risposta prima di una RPC unaria"""
+        if self._unfenced or self._write_error is not None:
+            self.fence()
+    
+    def release_handle(self, handle: str):
+        """ReleaseMMIO dopo i frame già inviati sull'handle"""
+        self._fence_writes()
+        Connection().call_with_auth('ReleaseMMIO', pb2.ReleaseMMIORequest(handle=handle))
+    
+    def read_block(self, handle: str, offset: int, count: int) -> np.ndarray:
+        """Burst con RPC unaria, ordinato dopo i frame già inviati"""
+        self._fence_writes()
+        response = Connection().call_with_auth('MMIOReadBlock', pb2.MMIOReadBlockRequest(
+            handle=handle, offset=offset, count=count
+        ))
+        return np.frombuffer(response.data, dtype='<u4').astype(np.uint32)
+
+    def write_block(self, handle: str, offset: int, words: np.ndarray):
+        self._fence_writes()
+        Connection().call_with_auth('MMIOWriteBlock', pb2.MMIOWriteBlockRequest(
+            handle=handle, offset=offset, data=words.astype('<u4', copy=False).tobytes()
+        ))
+
+    def batch(self, handle: str, ops) -> List[int]:
+        """
+        BatchMMIO unaria, ordinata dopo i frame già inviati.
+        ops: (offset, value) per le scritture, (offset, None) per le letture.
+        """
+        self._fence_writes()
+        request = pb2.BatchMMIORequest(handles=[handle])
+        for offset, value in ops:
+            request.offsets.append(offset)
+            if value is None:
+                request.ops.append(pb2.MMIO_BATCH_READ)
+                request.values.append(0)
+            else:
+                request.ops.append(pb2.MMIO_BATCH_WRITE)
+                request.values.append(value)
+        
+        response = Connection().call_with_auth('BatchMMIO', request)
+        if len(response.ok) < len(ops) or not all(response.ok):
+            raise Exception(f"MMIO batch failed: {response.error}")
+        return list(response.values)
+    
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        self._requests.put(None)
@@ -120,7 +120,7 @@ class Overlay:
         if self._uio_device:
             logger.info(f"UIO device assigned: {self._uio_device}")
         else:
-            logger.warning("No UIO device provided by server - MMIO access will fail")
+            logger.warning("No UIO device provided by server - MMIO access via gRPC MMIOStream")
         
         # Estrai pr_zone_id se presente
         self._pr_zone_id = response.pr_zone_id if response.HasField('pr_zone_id') else None
@@ -163,9 +163,12 @@ class Overlay:
         
     def _create_ip_attributes(self):
         """Crea attributi per accesso diretto agli IP"""
+        from client.pynq_proxy.dma import DMA
+        
         for name, ip_info in self._ip_dict.items():
             # Usa IPCore invece di MMIO diretto
-            ip_core = IPCore(
+            ip_class = DMA if 'axi_dma' in ip_info['type'] else IPCore
+            ip_args = dict(
                 base_addr=ip_info['phys_addr'],
                 length=ip_info['addr_range'],
                 ip_name=name,
@@ -173,6 +176,14 @@ class Overlay:
                 registers=ip_info.get('registers'),
                 uio_device=self._uio_device  # NUOVO: Passa il device UIO
             )
+            try:
+                ip_core = ip_class(**ip_args)
+            except Exception as e:
+                if ip_class is IPCore:
+                    raise
+                # DMA non utilizzabile dal tenant: resta accessibile come registri
+                logger.warning(f"DMA {name} not available ({e}), using register access only")
+                ip_core = IPCore(**ip_args)
             
             setattr(self, name, ip_core)
             
@@ -1,29 +1,9 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
 import grpc
-import warnings
 
 import pynq_service_pb2 as pynq__service__pb2
 
-GRPC_GENERATED_VERSION = '1.70.0'
-GRPC_VERSION = grpc.__version__
-_version_not_supported = False
-
-try:
-    from grpc._utilities import first_version_is_lower
-    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
-except ImportError:
-    _version_not_supported = True
-
-if _version_not_supported:
-    raise RuntimeError(
-        f'The grpc package installed is at version {GRPC_VERSION},'
-        + f' but the generated code in pynq_service_pb2_grpc.py depends on'
-        + f' grpcio>={GRPC_GENERATED_VERSION}.'
-        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
-        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
-    )
-
 
 class PYNQServiceStub(object):
     """Missing associated documentation comment in .proto file."""
@@ -38,92 +18,127 @@ class PYNQServiceStub(object):
                 '/pynq.PYNQService/Authenticate',
                 request_serializer=pynq__service__pb2.AuthRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.AuthResponse.FromString,
-                _registered_method=True)
+                )
         self.LoadOverlay = channel.unary_unary(
                 '/pynq.PYNQService/LoadOverlay',
                 request_serializer=pynq__service__pb2.LoadOverlayRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.LoadOverlayResponse.FromString,
-                _registered_method=True)
+                )
         self.GetOverlayInfo = channel.unary_unary(
                 '/pynq.PYNQService/GetOverlayInfo',
                 request_serializer=pynq__service__pb2.GetOverlayInfoRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.OverlayInfoResponse.FromString,
-                _registered_method=True)
+                )
         self.UnloadOverlay = channel.unary_unary(
                 '/pynq.PYNQService/UnloadOverlay',
                 request_serializer=pynq__service__pb2.UnloadOverlayRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                )
         self.CreateMMIO = channel.unary_unary(
                 '/pynq.PYNQService/CreateMMIO',
                 request_serializer=pynq__service__pb2.CreateMMIORequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.CreateMMIOResponse.FromString,
-                _registered_method=True)
+                )
         self.MMIORead = channel.unary_unary(
                 '/pynq.PYNQService/MMIORead',
                 request_serializer=pynq__service__pb2.MMIOReadRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.MMIOReadResponse.FromString,
-                _registered_method=True)
+                )
         self.MMIOWrite = channel.unary_unary(
                 '/pynq.PYNQService/MMIOWrite',
                 request_serializer=pynq__service__pb2.MMIOWriteRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                )
+        self.MMIOReadBlock = channel.unary_unary(
+                '/pynq.PYNQService/MMIOReadBlock',
+                request_serializer=pynq__service__pb2.MMIOReadBlockRequest.SerializeToString,
+                response_deserializer=pynq__service__pb2.MMIOReadBlockResponse.FromString,
+                )
+        self.MMIOWriteBlock = channel.unary_unary(
+                '/pynq.PYNQService/MMIOWriteBlock',
+                request_serializer=pynq__service__pb2.MMIOWriteBlockRequest.SerializeToString,
+                response_deserializer=pynq__service__pb2.Empty.FromString,
+                )
+        self.BatchMMIO = channel.unary_unary(
+                '/pynq.PYNQService/BatchMMIO',
+                request_serializer=pynq__service__pb2.BatchMMIORequest.SerializeToString,
+                response_deserializer=pynq__service__pb2.BatchMMIOResponse.FromString,
+                )
         self.ReleaseMMIO = channel.unary_unary(
                 '/pynq.PYNQService/ReleaseMMIO',
                 request_serializer=pynq__service__pb2.ReleaseMMIORequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                )
+        self.MMIOStream = channel.stream_stream(
+                '/pynq.PYNQService/MMIOStream',
+                request_serializer=pynq__service__pb2.MMIOStreamRequest.SerializeToString,
+                response_deserializer=pynq__service__pb2.MMIOStreamResponse.FromString,
+                )
         self.AllocateBuffer = channel.unary_unary(
                 '/pynq.PYNQService/AllocateBuffer',
                 request_serializer=pynq__service__pb2.AllocateBufferRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.AllocateBufferResponse.FromString,
-                _registered_method=True)
+                )
         self.ReadBuffer = channel.unary_unary(
                 '/pynq.PYNQService/ReadBuffer',
                 request_serializer=pynq__service__pb2.ReadBufferRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.ReadBufferResponse.FromString,
-                _registered_method=True)
+                )
         self.WriteBuffer = channel.unary_unary(
                 '/pynq.PYNQService/WriteBuffer',
                 request_serializer=pynq__service__pb2.WriteBufferRequest.SerializeToString,
-                response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                response_deserializer=pynq__service__pb2.WriteBufferResponse.FromString,
+                )
+        self.ReadBufferStream = channel.unary_stream(
+                '/pynq.PYNQService/ReadBufferStream',
+                request_serializer=pynq__service__pb2.ReadBufferRequest.SerializeToString,
+                response_deserializer=pynq__service__pb2.BufferChunk.FromString,
+                )
+        self.WriteBufferStream = channel.stream_unary(
+                '/pynq.PYNQService/WriteBufferStream',
+                request_serializer=pynq__service__pb2.BufferChunk.SerializeToString,
+                response_deserializer=pynq__service__pb2.WriteBufferResponse.FromString,
+                )
         self.FreeBuffer = channel.unary_unary(
                 '/pynq.PYNQService/FreeBuffer',
                 request_serializer=pynq__service__pb2.FreeBufferRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                )
         self.CreateDMA = channel.unary_unary(
                 '/pynq.PYNQService/CreateDMA',
                 request_serializer=pynq__service__pb2.CreateDMARequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.CreateDMAResponse.FromString,
-                _registered_method=True)
+                )
         self.DMATransfer = channel.unary_unary(
                 '/pynq.PYNQService/DMATransfer',
                 request_serializer=pynq__service__pb2.DMATransferRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.DMATransferResponse.FromString,
-                _registered_method=True)
+                )
         self.GetDMAStatus = channel.unary_unary(
                 '/pynq.PYNQService/GetDMAStatus',
                 request_serializer=pynq__service__pb2.GetDMAStatusRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.GetDMAStatusResponse.FromString,
-                _registered_method=True)
+                )
+        self.WatchCompletions = channel.unary_stream(
+                '/pynq.PYNQService/WatchCompletions',
+                request_serializer=pynq__service__pb2.WatchCompletionsRequest.SerializeToString,
+                response_deserializer=pynq__service__pb2.CompletionBatch.FromString,
+                )
         self.CleanupResources = channel.unary_unary(
                 '/pynq.PYNQService/CleanupResources',
                 request_serializer=pynq__service__pb2.Empty.SerializeToString,
                 response_deserializer=pynq__service__pb2.CleanupResponse.FromString,
-                _registered_method=True)
+                )
         self.Disconnect = channel.unary_unary(
                 '/pynq.PYNQService/Disconnect',
                 request_serializer=pynq__service__pb2.Empty.SerializeToString,
                 response_deserializer=pynq__service__pb2.DisconnectResponse.FromString,
-                _registered_method=True)
+                )
         self.Heartbeat = channel.unary_unary(
                 '/pynq.PYNQService/Heartbeat',
                 request_serializer=pynq__service__pb2.Empty.SerializeToString,
                 response_deserializer=pynq__service__pb2.HeartbeatResponse.FromString,
-                _registered_method=True)
+                )
 
 
 class PYNQServiceServicer(object):
@@ -174,12 +189,38 @@ class PYNQServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def MMIOReadBlock(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MMIOWriteBlock(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchMMIO(self, request, context):
+        """Sequenza di accessi registri (es. setup di un kernel HLS) in una sola RPC
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ReleaseMMIO(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def MMIOStream(self, request_iterator, context):
+        """Canale registri a lunga durata: auth e HTTP/2 pagati una volta per sessione
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AllocateBuffer(self, request, context):
         """Buffer operations
         """
@@ -199,6 +240,19 @@ class PYNQServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReadBufferStream(self, request, context):
+        """Trasferimenti a chunk di dimensione fissa per buffer grandi
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WriteBufferStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def FreeBuffer(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -224,6 +278,12 @@ class PYNQServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def WatchCompletions(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def CleanupResources(self, request, context):
         """Cleanup resources
 
@@ -284,11 +344,31 @@ def add_PYNQServiceServicer_to_server(servicer, server):
                     request_deserializer=pynq__service__pb2.MMIOWriteRequest.FromString,
                     response_serializer=pynq__service__pb2.Empty.SerializeToString,
             ),
+            'MMIOReadBlock': grpc.unary_unary_rpc_method_handler(
+                    servicer.MMIOReadBlock,
+                    request_deserializer=pynq__service__pb2.MMIOReadBlockRequest.FromString,
+                    response_serializer=pynq__service__pb2.MMIOReadBlockResponse.SerializeToString,
+            ),
+            'MMIOWriteBlock': grpc.unary_unary_rpc_method_handler(
+                    servicer.MMIOWriteBlock,
+                    request_deserializer=pynq__service__pb2.MMIOWriteBlockRequest.FromString,
+                    response_serializer=pynq__service__pb2.Empty.SerializeToString,
+            ),
+            'BatchMMIO': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchMMIO,
+                    request_deserializer=pynq__service__pb2.BatchMMIORequest.FromString,
+                    response_serializer=pynq__service__pb2.BatchMMIOResponse.SerializeToString,
+            ),
             'ReleaseMMIO': grpc.unary_unary_rpc_method_handler(
                     servicer.ReleaseMMIO,
                     request_deserializer=pynq__service__pb2.ReleaseMMIORequest.FromString,
                     response_serializer=pynq__service__pb2.Empty.SerializeToString,
             ),
+            'MMIOStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.MMIOStream,
+                    request_deserializer=pynq__service__pb2.MMIOStreamRequest.FromString,
+                    response_serializer=pynq__service__pb2.MMIOStreamResponse.SerializeToString,
+            ),
             'AllocateBuffer': grpc.unary_unary_rpc_method_handler(
                     servicer.AllocateBuffer,
                     request_deserializer=pynq__service__pb2.AllocateBufferRequest.FromString,
@@ -302,7 +382,17 @@ def add_PYNQServiceServicer_to_server(servicer, server):
             'WriteBuffer': grpc.unary_unary_rpc_method_handler(
                     servicer.WriteBuffer,
                     request_deserializer=pynq__service__pb2.WriteBufferRequest.FromString,
-                    response_serializer=pynq__service__pb2.Empty.SerializeToString,
+                    response_serializer=pynq__service__pb2.WriteBufferResponse.SerializeToString,
+            ),
+            'ReadBufferStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.ReadBufferStream,
+                    request_deserializer=pynq__service__pb2.ReadBufferRequest.FromString,
+                    response_serializer=pynq__service__pb2.BufferChunk.SerializeToString,
+            ),
+            'WriteBufferStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.WriteBufferStream,
+                    request_deserializer=pynq__service__pb2.BufferChunk.FromString,
+                    response_serializer=pynq__service__pb2.WriteBufferResponse.SerializeToString,
             ),
             'FreeBuffer': grpc.unary_unary_rpc_method_handler(
                     servicer.FreeBuffer,
@@ -324,6 +414,11 @@ def add_PYNQServiceServicer_to_server(servicer, server):
                     request_deserializer=pynq__service__pb2.GetDMAStatusRequest.FromString,
                     response_serializer=pynq__service__pb2.GetDMAStatusResponse.SerializeToString,
             ),
+            'WatchCompletions': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchCompletions,
+                    request_deserializer=pynq__service__pb2.WatchCompletionsRequest.FromString,
+                    response_serializer=pynq__service__pb2.CompletionBatch.SerializeToString,
+            ),
             'CleanupResources': grpc.unary_unary_rpc_method_handler(
                     servicer.CleanupResources,
                     request_deserializer=pynq__service__pb2.Empty.FromString,
@@ -343,7 +438,6 @@ def add_PYNQServiceServicer_to_server(servicer, server):
     generic_handler = grpc.method_handlers_generic_handler(
             'pynq.PYNQService', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
-    server.add_registered_method_handlers('pynq.PYNQService', rpc_method_handlers)
 
 
  # This class is part of an EXPERIMENTAL API.
@@ -361,21 +455,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/Authenticate',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/Authenticate',
             pynq__service__pb2.AuthRequest.SerializeToString,
             pynq__service__pb2.AuthResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def LoadOverlay(request,
@@ -388,21 +472,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/LoadOverlay',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/LoadOverlay',
             pynq__service__pb2.LoadOverlayRequest.SerializeToString,
             pynq__service__pb2.LoadOverlayResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def GetOverlayInfo(request,
@@ -415,21 +489,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/GetOverlayInfo',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/GetOverlayInfo',
             pynq__service__pb2.GetOverlayInfoRequest.SerializeToString,
             pynq__service__pb2.OverlayInfoResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def UnloadOverlay(request,
@@ -442,21 +506,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/UnloadOverlay',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/UnloadOverlay',
             pynq__service__pb2.UnloadOverlayRequest.SerializeToString,
             pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def CreateMMIO(request,
@@ -469,21 +523,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/CreateMMIO',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/CreateMMIO',
             pynq__service__pb2.CreateMMIORequest.SerializeToString,
             pynq__service__pb2.CreateMMIOResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def MMIORead(request,
@@ -496,21 +540,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/MMIORead',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/MMIORead',
             pynq__service__pb2.MMIOReadRequest.SerializeToString,
             pynq__service__pb2.MMIOReadResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def MMIOWrite(request,
@@ -523,24 +557,48 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/MMIOWrite',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/MMIOWrite',
             pynq__service__pb2.MMIOWriteRequest.SerializeToString,
             pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
-    def ReleaseMMIO(request,
+    def MMIOReadBlock(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/MMIOReadBlock',
+            pynq__service__pb2.MMIOReadBlockRequest.SerializeToString,
+            pynq__service__pb2.MMIOReadBlockResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def MMIOWriteBlock(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/MMIOWriteBlock',
+            pynq__service__pb2.MMIOWriteBlockRequest.SerializeToString,
+            pynq__service__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchMMIO(request,
             target,
             options=(),
             channel_credentials=None,
@@ -550,24 +608,31 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/BatchMMIO',
+            pynq__service__pb2.BatchMMIORequest.SerializeToString,
+            pynq__service__pb2.BatchMMIOResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ReleaseMMIO(request,
             target,
-            '/pynq.PYNQService/ReleaseMMIO',
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/ReleaseMMIO',
             pynq__service__pb2.ReleaseMMIORequest.SerializeToString,
             pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
-    def AllocateBuffer(request,
+    def MMIOStream(request_iterator,
             target,
             options=(),
             channel_credentials=None,
@@ -577,21 +642,28 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
+        return grpc.experimental.stream_stream(request_iterator, target, '/pynq.PYNQService/MMIOStream',
+            pynq__service__pb2.MMIOStreamRequest.SerializeToString,
+            pynq__service__pb2.MMIOStreamResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def AllocateBuffer(request,
             target,
-            '/pynq.PYNQService/AllocateBuffer',
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/AllocateBuffer',
             pynq__service__pb2.AllocateBufferRequest.SerializeToString,
             pynq__service__pb2.AllocateBufferResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def ReadBuffer(request,
@@ -604,21 +676,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/ReadBuffer',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/ReadBuffer',
             pynq__service__pb2.ReadBufferRequest.SerializeToString,
             pynq__service__pb2.ReadBufferResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def WriteBuffer(request,
@@ -631,24 +693,14 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/WriteBuffer',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/WriteBuffer',
             pynq__service__pb2.WriteBufferRequest.SerializeToString,
-            pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            pynq__service__pb2.WriteBufferResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
-    def FreeBuffer(request,
+    def ReadBufferStream(request,
             target,
             options=(),
             channel_credentials=None,
@@ -658,21 +710,45 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
+        return grpc.experimental.unary_stream(request, target, '/pynq.PYNQService/ReadBufferStream',
+            pynq__service__pb2.ReadBufferRequest.SerializeToString,
+            pynq__service__pb2.BufferChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WriteBufferStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/pynq.PYNQService/WriteBufferStream',
+            pynq__service__pb2.BufferChunk.SerializeToString,
+            pynq__service__pb2.WriteBufferResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def FreeBuffer(request,
             target,
-            '/pynq.PYNQService/FreeBuffer',
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/FreeBuffer',
             pynq__service__pb2.FreeBufferRequest.SerializeToString,
             pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def CreateDMA(request,
@@ -685,21 +761,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/CreateDMA',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/CreateDMA',
             pynq__service__pb2.CreateDMARequest.SerializeToString,
             pynq__service__pb2.CreateDMAResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def DMATransfer(request,
@@ -712,21 +778,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/DMATransfer',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/DMATransfer',
             pynq__service__pb2.DMATransferRequest.SerializeToString,
             pynq__service__pb2.DMATransferResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def GetDMAStatus(request,
@@ -739,24 +795,14 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/GetDMAStatus',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/GetDMAStatus',
             pynq__service__pb2.GetDMAStatusRequest.SerializeToString,
             pynq__service__pb2.GetDMAStatusResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
-    def CleanupResources(request,
+    def WatchCompletions(request,
             target,
             options=(),
             channel_credentials=None,
@@ -766,21 +812,28 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
+        return grpc.experimental.unary_stream(request, target, '/pynq.PYNQService/WatchCompletions',
+            pynq__service__pb2.WatchCompletionsRequest.SerializeToString,
+            pynq__service__pb2.CompletionBatch.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CleanupResources(request,
             target,
-            '/pynq.PYNQService/CleanupResources',
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/CleanupResources',
             pynq__service__pb2.Empty.SerializeToString,
             pynq__service__pb2.CleanupResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def Disconnect(request,
@@ -793,21 +846,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/Disconnect',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/Disconnect',
             pynq__service__pb2.Empty.SerializeToString,
             pynq__service__pb2.DisconnectResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def Heartbeat(request,
@@ -820,21 +863,11 @@ class PYNQService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQService/Heartbeat',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQService/Heartbeat',
             pynq__service__pb2.Empty.SerializeToString,
             pynq__service__pb2.HeartbeatResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
 
 class PYNQManagementServiceStub(object):
@@ -850,47 +883,62 @@ class PYNQManagementServiceStub(object):
                 '/pynq.PYNQManagementService/CreateTenant',
                 request_serializer=pynq__service__pb2.CreateTenantRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.CreateTenantResponse.FromString,
-                _registered_method=True)
+                )
         self.UpdateTenant = channel.unary_unary(
                 '/pynq.PYNQManagementService/UpdateTenant',
                 request_serializer=pynq__service__pb2.UpdateTenantRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.UpdateTenantResponse.FromString,
-                _registered_method=True)
+                )
         self.DeleteTenant = channel.unary_unary(
                 '/pynq.PYNQManagementService/DeleteTenant',
                 request_serializer=pynq__service__pb2.DeleteTenantRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.DeleteTenantResponse.FromString,
-                _registered_method=True)
+                )
         self.ListTenants = channel.unary_unary(
                 '/pynq.PYNQManagementService/ListTenants',
                 request_serializer=pynq__service__pb2.ListTenantsRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.ListTenantsResponse.FromString,
-                _registered_method=True)
+                )
         self.AddAllowedBitstream = channel.unary_unary(
                 '/pynq.PYNQManagementService/AddAllowedBitstream',
                 request_serializer=pynq__service__pb2.AddBitstreamRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                )
         self.RemoveAllowedBitstream = channel.unary_unary(
                 '/pynq.PYNQManagementService/RemoveAllowedBitstream',
                 request_serializer=pynq__service__pb2.RemoveBitstreamRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                )
         self.UpdateTenantLimits = channel.unary_unary(
                 '/pynq.PYNQManagementService/UpdateTenantLimits',
                 request_serializer=pynq__service__pb2.UpdateLimitsRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.Empty.FromString,
-                _registered_method=True)
+                )
         self.GetTenantStatus = channel.unary_unary(
                 '/pynq.PYNQManagementService/GetTenantStatus',
                 request_serializer=pynq__service__pb2.GetTenantStatusRequest.SerializeToString,
                 response_deserializer=pynq__service__pb2.GetTenantStatusResponse.FromString,
-                _registered_method=True)
+                )
         self.GetSystemStatus = channel.unary_unary(
                 '/pynq.PYNQManagementService/GetSystemStatus',
                 request_serializer=pynq__service__pb2.Empty.SerializeToString,
                 response_deserializer=pynq__service__pb2.SystemStatusResponse.FromString,
-                _registered_method=True)
+                )
+        self.GetFastPathMetrics = channel.unary_unary(
+                '/pynq.PYNQManagementService/GetFastPathMetrics',
+                request_serializer=pynq__service__pb2.FastPathMetricsRequest.SerializeToString,
+                response_deserializer=pynq__service__pb2.FastPathMetricsResponse.FromString,
+                )
+        self.ResetFastPathMetrics = channel.unary_unary(
+                '/pynq.PYNQManagementService/ResetFastPathMetrics',
+                request_serializer=pynq__service__pb2.Empty.SerializeToString,
+                response_deserializer=pynq__service__pb2.Empty.FromString,
+                )
+        self.GetBufferPoolStats = channel.unary_unary(
+                '/pynq.PYNQManagementService/GetBufferPoolStats',
+                request_serializer=pynq__service__pb2.Empty.SerializeToString,
+                response_deserializer=pynq__service__pb2.BufferPoolStatsResponse.FromString,
+                )
 
 
 class PYNQManagementServiceServicer(object):
@@ -953,6 +1001,26 @@ class PYNQManagementServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetFastPathMetrics(self, request, context):
+        """Metriche del fast path MMIO (latenze per fase, contatori per opcode/tenant)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ResetFastPathMetrics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBufferPoolStats(self, request, context):
+        """Statistiche del pool dei buffer CMA (per classe di dimensione)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_PYNQManagementServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -1001,11 +1069,25 @@ def add_PYNQManagementServiceServicer_to_server(servicer, server):
                     request_deserializer=pynq__service__pb2.Empty.FromString,
                     response_serializer=pynq__service__pb2.SystemStatusResponse.SerializeToString,
             ),
+            'GetFastPathMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetFastPathMetrics,
+                    request_deserializer=pynq__service__pb2.FastPathMetricsRequest.FromString,
+                    response_serializer=pynq__service__pb2.FastPathMetricsResponse.SerializeToString,
+            ),
+            'ResetFastPathMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.ResetFastPathMetrics,
+                    request_deserializer=pynq__service__pb2.Empty.FromString,
+                    response_serializer=pynq__service__pb2.Empty.SerializeToString,
+            ),
+            'GetBufferPoolStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBufferPoolStats,
+                    request_deserializer=pynq__service__pb2.Empty.FromString,
+                    response_serializer=pynq__service__pb2.BufferPoolStatsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'pynq.PYNQManagementService', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
-    server.add_registered_method_handlers('pynq.PYNQManagementService', rpc_method_handlers)
 
 
  # This class is part of an EXPERIMENTAL API.
@@ -1023,21 +1105,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/CreateTenant',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/CreateTenant',
             pynq__service__pb2.CreateTenantRequest.SerializeToString,
             pynq__service__pb2.CreateTenantResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def UpdateTenant(request,
@@ -1050,21 +1122,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/UpdateTenant',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/UpdateTenant',
             pynq__service__pb2.UpdateTenantRequest.SerializeToString,
             pynq__service__pb2.UpdateTenantResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def DeleteTenant(request,
@@ -1077,21 +1139,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/DeleteTenant',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/DeleteTenant',
             pynq__service__pb2.DeleteTenantRequest.SerializeToString,
             pynq__service__pb2.DeleteTenantResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def ListTenants(request,
@@ -1104,21 +1156,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/ListTenants',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/ListTenants',
             pynq__service__pb2.ListTenantsRequest.SerializeToString,
             pynq__service__pb2.ListTenantsResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def AddAllowedBitstream(request,
@@ -1131,21 +1173,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/AddAllowedBitstream',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/AddAllowedBitstream',
             pynq__service__pb2.AddBitstreamRequest.SerializeToString,
             pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def RemoveAllowedBitstream(request,
@@ -1158,21 +1190,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/RemoveAllowedBitstream',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/RemoveAllowedBitstream',
             pynq__service__pb2.RemoveBitstreamRequest.SerializeToString,
             pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def UpdateTenantLimits(request,
@@ -1185,21 +1207,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/UpdateTenantLimits',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/UpdateTenantLimits',
             pynq__service__pb2.UpdateLimitsRequest.SerializeToString,
             pynq__service__pb2.Empty.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def GetTenantStatus(request,
@@ -1212,21 +1224,11 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/GetTenantStatus',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/GetTenantStatus',
             pynq__service__pb2.GetTenantStatusRequest.SerializeToString,
             pynq__service__pb2.GetTenantStatusResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
     @staticmethod
     def GetSystemStatus(request,
@@ -1239,18 +1241,59 @@ class PYNQManagementService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
-            request,
-            target,
-            '/pynq.PYNQManagementService/GetSystemStatus',
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/GetSystemStatus',
             pynq__service__pb2.Empty.SerializeToString,
             pynq__service__pb2.SystemStatusResponse.FromString,
-            options,
-            channel_credentials,
-            insecure,
-            call_credentials,
-            compression,
-            wait_for_ready,
-            timeout,
-            metadata,
-            _registered_method=True)
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetFastPathMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/GetFastPathMetrics',
+            pynq__service__pb2.FastPathMetricsRequest.SerializeToString,
+            pynq__service__pb2.FastPathMetricsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ResetFastPathMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/ResetFastPathMetrics',
+            pynq__service__pb2.Empty.SerializeToString,
+            pynq__service__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetBufferPoolStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/pynq.PYNQManagementService/GetBufferPoolStats',
+            pynq__service__pb2.Empty.SerializeToString,
+            pynq__service__pb2.BufferPoolStatsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
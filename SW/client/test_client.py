@@ -2,7 +2,11 @@
 # test_pynq_client.py
 
 import os
+import socket
 import sys
+import time
+
+import numpy as np
 
 # Setup environment
 os.environ['TENANT_ID'] = 'tenant1'
@@ -11,9 +15,19 @@ os.environ['PYNQ_DEBUG_MODE'] = 'false'
 
 # Aggiungi client al path
 sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
 # Importa il nostro PYNQ proxy invece del vero PYNQ
-from client.pynq_proxy import Overlay, allocate
+from client.pynq_proxy import Overlay, MMIO, allocate
+from client.pynq_proxy.fast_mmio import UltraFastMMIO, _PipelinedConnection, _WriteCombiner, gather
+from client.pynq_proxy.allocate import ProxyBuffer
+from client.connection import Connection
+from fast_mmio_ring import RING_SUPPORTED
+from fast_mmio_protocol import (
+    PROTOCOL_VERSION, OP_HELLO, OP_READ_SLOT, OP_WRITE_SLOT, OP_CREDIT, FLAG_NONE,
+    STATUS_OK, STATUS_ERROR, INITIAL_CREDITS, READ_SLOT_FRAME, READ_SLOT_PAYLOAD, WRITE_SLOT_FRAME,
+    FrameReader, FrameWriter, encode_handle
+)
 
 def test_pynq_compatibility():
     print("=== Testing PYNQ Proxy Client ===\n")
@@ -50,5 +64,644 @@ def test_pynq_compatibility():
     print("\n=== All tests passed! ===")
     print("The proxy client is API-compatible with PYNQ!")
 
+def test_ring_fence_ordering():
+    """Backend mock in-process: ordine tra scritture sul ring e operazioni sul socket"""
+    import tempfile
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Hypervisor'))
+    from config import TenantConfig
+    from tenant_manager import TenantManager
+    from mock_resource_manager import MockResourceManager
+    from fast_mmio_server import UltraFastMMIOServer
+
+    print("=== Testing ring ordering with fence (mock backend) ===\n")
+    if not RING_SUPPORTED:
+        print("⚠️  Shared ring transport not supported here, skipped")
+        return
+
+    tenant_id = os.environ['TENANT_ID']
+    tenant_manager = TenantManager({
+        tenant_id: TenantConfig(tenant_id=tenant_id, uid=os.getuid(), gid=os.getgid(), api_key='')
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    server = UltraFastMMIOServer(resource_manager, tenant_manager, socket_dir=tempfile.mkdtemp(),
+                                 mode='event_loop')
+    if not server.ring_enabled:
+        print("⚠️  Ring disabled on this platform (fast_mmio_ring), skipped")
+        return
+    server.start()
+    os.environ['PYNQ_SOCKET_DIR'] = server.socket_dir
+
+    class LocalMMIO(UltraFastMMIO):
+        """Handle creato direttamente sul resource manager, senza gRPC"""
+        def _create_mmio_handle(self):
+            self._handle_str = resource_manager.create_mmio(tenant_id, self.base_addr, self.length)
+            self._handle_bytes = encode_handle(self._handle_str)
+
+    mmio = None
+    try:
+        mmio = LocalMMIO(0xA0000000, 0x1000, use_ring=True)
+        handle = mmio._handle_str
+
+        # 1. fence(): le scritture sul ring sono arrivate all'hardware
+        print("1. Ring writes, then fence()...")
+        for i in range(100):
+            mmio.write(0x10, i)
+        mmio.fence()
+        assert resource_manager.mmio_read(tenant_id, handle, 0x10, 4) == 99
+        print("✅ Last write visible after fence()")
+
+        # 2. Le operazioni servite sul socket non sorpassano le scritture sul ring
+        print("\n2. Ring writes followed by socket operations...")
+        for n in range(50):
+            for i in range(20):
+                mmio.write(0x20, n * 100 + i)
+            assert int(mmio.read_block(0x20, 1)[0]) == n * 100 + 19
+            for i in range(20):
+                mmio.write(0x24, n * 100 + i)
+            assert mmio.execute(mmio.program().read(0x24))[0] == n * 100 + 19
+            mmio.write_block(0x28, [n])
+            assert mmio.read(0x28) == n
+        print("✅ No stale reads")
+
+        # 3. Server fermo: le scritture fire-and-forget falliscono invece di girare a vuoto
+        print("\n3. Ring writes after the server stopped...")
+        server.stop()
+        t0 = time.process_time()
+        try:
+            for i in range(1_000_000):
+                mmio.write(0x10, i)
+            raise AssertionError("Ring writes still accepted after server stop")
+        except ConnectionError as e:
+            print(f"✅ {e}")
+        assert time.process_time() - t0 < 1.0
+    finally:
+        if mmio is not None:
+            mmio._conn.close()
+        server.stop()
+
+    print("\n=== Ring ordering test passed! ===")
+
+
+# --- Backend mock in-process (nessun server esterno, nessuna board) ---
+
+def _mock_backend(mode: str = 'event_loop'):
+    """Resource manager mock, fast path e server gRPC del tenant, con le Connection() puntate sul server"""
+    import tempfile
+    import grpc
+    import pynq_service_pb2_grpc as pb2_grpc
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Hypervisor'))
+    from config import TenantConfig
+    from tenant_manager import TenantManager
+    from mock_resource_manager import MockResourceManager
+    from fast_mmio_server import UltraFastMMIOServer
+    from servicer import PYNQServicer
+    from auth_interceptor import AuthInterceptor
+    from tenant_executor import FairTenantExecutor
+
+    tenant_id = os.environ['TENANT_ID']
+    tenant_manager = TenantManager({
+        tenant_id: TenantConfig(tenant_id=tenant_id, uid=os.getuid(), gid=os.getgid(),
+                                api_key=os.environ['PYNQ_API_KEY'])
+    })
+    resource_manager = MockResourceManager(tenant_manager)
+    fast_server = UltraFastMMIOServer(resource_manager, tenant_manager, socket_dir=tempfile.mkdtemp(),
+                                      mode=mode)
+    fast_server.start()
+    os.environ['PYNQ_SOCKET_DIR'] = fast_server.socket_dir
+
+    grpc_server = grpc.server(FairTenantExecutor(max_workers=4).executor_for(tenant_id),
+                              interceptors=[AuthInterceptor(tenant_manager, tenant_id)])
+    pb2_grpc.add_PYNQServiceServicer_to_server(
+        PYNQServicer(tenant_manager, resource_manager, tenant_id=tenant_id), grpc_server)
+    address = f"unix://{fast_server.socket_dir}/{tenant_id}.sock"
+    grpc_server.add_insecure_port(address)
+    grpc_server.start()
+
+    for conn in _connections():
+        conn.channel = grpc.insecure_channel(address)
+        conn.stub = pb2_grpc.PYNQServiceStub(conn.channel)
+        conn._authenticate()
+    return resource_manager, fast_server, grpc_server
+
+
+def _connections():
+    """Singleton Connection dei moduli del proxy (client.connection e connection)"""
+    import connection
+    return Connection(), connection.Connection()
+
+
+def _stop_mock_backend(resource_manager, fast_server, grpc_server):
+    resource_manager.cleanup_tenant_resources(os.environ['TENANT_ID'])
+    for conn in _connections():
+        conn.channel.close()
+        conn.channel = conn.stub = conn.token = None
+        conn._resources_created = False
+    grpc_server.stop(None)
+    fast_server.stop()
+
+
+def _grpc_buffer(shape, dtype):
+    """ProxyBuffer in modalità gRPC (il mock darebbe shared memory oltre 1 KB)"""
+    import pynq_service_pb2 as pb2
+    conn = Connection()
+    response = conn.call_with_auth('AllocateBuffer', pb2.AllocateBufferRequest(
+        shape=list(shape), dtype=str(np.dtype(dtype))))
+    return ProxyBuffer(shape, dtype, handle=response.handle, physical_address=0, connection=conn)
+
+
+def _record_calls():
+    """
+    Sostituisce Connection().call_with_auth con una versione che registra le RPC:
+    (metodo, [(offset, len)]) per le scritture, (metodo, richiesta) per le altre
+    """
+    conn = Connection()
+    calls = []
+    original = conn.call_with_auth
+
+    def call_with_auth(method_name, request):
+        if callable(request):
+            chunks = list(request())
+            calls.append((method_name, [(c.offset, len(c.data)) for c in chunks]))
+            return original(method_name, lambda: iter(chunks))
+        if method_name == 'WriteBuffer':
+            calls.append((method_name, [(request.offset, len(request.data))]))
+        else:
+            calls.append((method_name, request))
+        return original(method_name, request)
+
+    conn.call_with_auth = call_with_auth
+    return calls
+
+
+def test_dirty_ranges():
+    """Intervalli sporchi di ProxyBuffer in modalità gRPC (backend mock)"""
+    allocate_module = sys.modules['client.pynq_proxy.allocate']
+    add_range = allocate_module._add_range
+    gap = allocate_module.DIRTY_MERGE_GAP
+    max_ranges = allocate_module.DIRTY_MAX_RANGES
+
+    print("=== Testing dirty-range tracking (mock backend) ===\n")
+
+    # 1. Unione degli intervalli
+    print("1. Merging ranges...")
+    assert add_range([(0, 4)], 4 + gap, 8 + gap) == [(0, 8 + gap)]
+    assert add_range([(0, 4)], 5 + gap, 8 + gap) == [(0, 4), (5 + gap, 8 + gap)]
+    # Un intervallo che tocca due vicini li unisce tutti
+    assert add_range([(0, 4), (9000, 9004)], 4000, 5000) == [(0, 9004)]
+    ranges = []
+    for i in range(max_ranges + 1):
+        ranges = add_range(ranges, i * 2 * gap, i * 2 * gap + 1)
+        assert len(ranges) == (i + 1 if i < max_ranges else 1)
+    assert ranges == [(0, max_ranges * 2 * gap + 1)]
+    print(f"✅ Gap {gap} merged, collapsed to one range past {max_ranges}")
+
+    # 2. Byte coperti da una vista, anche con stride negativi
+    print("\n2. Byte ranges of views...")
+    resource_manager, fast_server, grpc_server = _mock_backend()
+    try:
+        buf = _grpc_buffer((4, 4), np.int32)
+        array = buf._array
+        assert buf._byte_range(array[:, 1]) == (4, 56)
+        assert buf._byte_range(array[::-1, ::-1]) == (0, 64)
+        assert buf._byte_range(array[2:0:-1]) == (16, 48)
+        assert buf._byte_range(array[3, ::-2]) == (52, 64)
+        assert buf._byte_range(array[2:2]) is None
+        assert buf._byte_range(np.zeros(4, dtype=np.int32)) is None
+        buf[2:0:-1, 0] = 7
+        assert buf._dirty_ranges == [(16, 36)]
+        print("✅ OK")
+
+        # 3. Solo gli intervalli scritti arrivano al server
+        print("\n3. Syncing written ranges...")
+        calls = _record_calls()
+        buf = _grpc_buffer((8192,), np.int32)
+        buf[10] = 1
+        buf[6000:6004] = [2, 3, 4, 5]
+        buf.sync_to_device()
+        assert calls[-1] == ('WriteBufferStream', [(40, 4), (24000, 16)])
+        data = np.frombuffer(resource_manager.read_buffer(os.environ['TENANT_ID'], buf._handle, 0, buf._array.nbytes),
+                             dtype=np.int32)
+        assert data[10] == 1 and list(data[6000:6004]) == [2, 3, 4, 5]
+        print(f"✅ Sent {calls[-1][1]}")
+
+        # 4. Scritture attraverso una vista: solo gli elementi cambiati, allineati all'elemento
+        print("\n4. Writes through a view...")
+        view = buf[1000:2000]
+        view[500] = 0x01000000      # cambia solo il byte più alto (little endian)
+        view[502] = 9
+        buf.sync_to_device()
+        assert calls[-1] == ('WriteBuffer', [(6000, 12)])
+        buf.sync_to_device()        # nessun cambiamento: nessuna RPC
+        assert calls[-1] == ('WriteBuffer', [(6000, 12)])
+        print(f"✅ Sent {calls[-1][1]}")
+    finally:
+        Connection().__dict__.pop('call_with_auth', None)
+        _stop_mock_backend(resource_manager, fast_server, grpc_server)
+
+    print("\n=== Dirty-range test passed! ===")
+
+
+def _scripted_fast_server():
+    """Socket fast-path finto: accetta una connessione, risponde all'HELLO e ritorna (path, peer)"""
+    import tempfile
+    import threading
+    path = os.path.join(tempfile.mkdtemp(), 'scripted_mmio.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    accepted = []
+
+    def handshake():
+        peer, _ = listener.accept()
+        FrameReader(capacity=64).read_frame(peer)
+        writer = FrameWriter(capacity=64)
+        writer.u16(OP_HELLO, STATUS_OK, 0, PROTOCOL_VERSION)
+        writer.flush_blocking(peer)
+        accepted.append(peer)
+        listener.close()
+
+    thread = threading.Thread(target=handshake, daemon=True)
+    thread.start()
+    return path, thread, accepted
+
+
+def test_pipelined_client():
+    """Tag, completamento fuori ordine e crediti della connessione pipelined"""
+    import threading
+    print("=== Testing pipelined fast MMIO client ===\n")
+
+    path, thread, accepted = _scripted_fast_server()
+    conn = _PipelinedConnection(path)
+    thread.join()
+    peer = accepted[0]
+    reader = FrameReader(capacity=4096)
+    writer = FrameWriter(capacity=4096)
+    try:
+        # 1. Risposte fuori ordine: ogni future riceve la risposta con il suo tag
+        print("1. Out-of-order replies...")
+        futures = [conn.submit(READ_SLOT_FRAME, OP_READ_SLOT, FLAG_NONE, 0, offset)
+                   for offset in (0x00, 0x04, 0x08)]
+        requests = []
+        for _ in futures:
+            payload = reader.read_frame(peer)
+            requests.append((reader.tag, READ_SLOT_PAYLOAD.unpack_from(reader.buf, payload)[1]))
+        assert len({tag for tag, _ in requests}) == 3
+        for tag, offset in reversed(requests):
+            if offset == 0x04:
+                writer.status(OP_READ_SLOT, STATUS_ERROR, tag)
+            else:
+                writer.u32(OP_READ_SLOT, STATUS_OK, tag, 0x1000 + offset)
+        writer.flush_blocking(peer)
+        assert futures[0].result(timeout=5) == 0x1000
+        assert futures[2].result(timeout=5) == 0x1008
+        assert futures[1].exception(timeout=5) is not None
+        print(f"✅ Tags {[tag for tag, _ in requests]} matched in reverse order")
+
+        # 2. Senza crediti le scritture fire-and-forget si fermano
+        print("\n2. Credit flow control...")
+        sender = threading.Thread(target=lambda: [
+            conn.submit(WRITE_SLOT_FRAME, OP_WRITE_SLOT, FLAG_NONE, 0, 0x10, i, reply=False)
+            for i in range(INITIAL_CREDITS + 1)
+        ], daemon=True)
+        sender.start()
+        for _ in range(INITIAL_CREDITS):
+            reader.read_frame(peer)
+            assert reader.op == OP_WRITE_SLOT
+        sender.join(0.2)
+        assert sender.is_alive()
+        peer.settimeout(0.1)
+        try:
+            peer.recv(1, socket.MSG_PEEK)
+            raise AssertionError("Write sent without credits")
+        except socket.timeout:
+            pass
+        peer.settimeout(None)
+        writer.u16(OP_CREDIT, STATUS_OK, 0, 1)
+        writer.flush_blocking(peer)
+        sender.join(5)
+        assert not sender.is_alive()
+        reader.read_frame(peer)
+        assert reader.op == OP_WRITE_SLOT
+        print(f"✅ Blocked after {INITIAL_CREDITS} writes, resumed with one credit")
+
+        # 3. Connessione persa: falliscono le future in attesa e chi aspetta un credito
+        print("\n3. Connection lost...")
+        writer.u16(OP_CREDIT, STATUS_OK, 0, 1)
+        writer.flush_blocking(peer)
+        pending = conn.submit(READ_SLOT_FRAME, OP_READ_SLOT, FLAG_NONE, 0, 0x20)
+        errors = []
+
+        def blocked_submit():
+            try:
+                conn.submit(READ_SLOT_FRAME, OP_READ_SLOT, FLAG_NONE, 0, 0x24)
+            except ConnectionError as e:
+                errors.append(e)
+
+        waiter = threading.Thread(target=blocked_submit, daemon=True)
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive()
+        peer.close()
+        assert isinstance(pending.exception(timeout=5), ConnectionError)
+        waiter.join(5)
+        assert not waiter.is_alive() and len(errors) == 1
+        print("✅ Pending read and credit waiter fail with ConnectionError")
+    finally:
+        conn.close()
+        peer.close()
+
+    # 4. Contro il server: i crediti tornano e l'ordine resta quello di invio
+    print("\n4. Pipelined client against the mock server...")
+    resource_manager, fast_server, grpc_server = _mock_backend()
+    try:
+        mmio = UltraFastMMIO(0xA0000000, 0x1000, pipelined=True)
+        for i in range(4 * INITIAL_CREDITS):
+            mmio.write(0x10, i)
+        reads = [mmio.read_async(0x10)]
+        for i in range(8):
+            mmio.write(0x14 + 4 * i, i)
+            reads.append(mmio.read_async(0x14 + 4 * i))
+        assert gather(reads, timeout=5) == [4 * INITIAL_CREDITS - 1] + list(range(8))
+        print(f"✅ {4 * INITIAL_CREDITS} fire-and-forget writes, reads in order")
+    finally:
+        _stop_mock_backend(resource_manager, fast_server, grpc_server)
+
+    print("\n=== Pipelined client test passed! ===")
+
+
+def test_write_combiner():
+    """Write combining con fence() sul backend mock, con e senza pipeline"""
+    print("=== Testing write combining and fence (mock backend) ===\n")
+    tenant_id = os.environ['TENANT_ID']
+    resource_manager, fast_server, grpc_server = _mock_backend()
+    try:
+        for pipelined in (False, True):
+            print(f"--- pipelined={pipelined} ---")
+            mmio = UltraFastMMIO(0xA0000000, 0x1000, pipelined=pipelined, coalesce=True)
+            other = UltraFastMMIO(0xA0001000, 0x1000, pipelined=pipelined, coalesce=True)
+            assert other._conn is mmio._conn and mmio._conn.combiner is not None
+            # Soglia di tempo lontana: i flush avvengono solo dove li provoca il test
+            combiner = mmio._conn.combiner = _WriteCombiner(mmio._conn, max_delay=60.0)
+
+            def register(target, offset):
+                return resource_manager.mmio_read(tenant_id, target._handle_str, offset, 4)
+
+            # 1. Le scritture restano nel client fino al fence(), nell'ordine di invio
+            print("1. Writes held until fence()...")
+            base = 1000 if pipelined else 0     # Registri condivisi tra i due giri
+            for i in range(10):
+                mmio.write(0x10, base + i)
+                other.write(0x10, base + 100 + i)
+            assert combiner.count == 20 and register(mmio, 0x10) != base + 9
+            mmio.fence()
+            assert combiner.count == 0
+            assert (register(mmio, 0x10), register(other, 0x10)) == (base + 9, base + 109)
+            print("✅ 20 writes from two slots in one batch")
+
+            # 2. Una lettura invia prima le scritture in attesa
+            print("2. Read after coalesced writes...")
+            mmio.write(0x14, base + 5)
+            assert mmio.read(0x14) == base + 5 and combiner.count == 0
+            print("✅ OK")
+
+            # 3. Soglia di dimensione
+            print("3. Size threshold...")
+            for i in range(combiner.max_writes):
+                mmio.write(0x18, base + i)
+            assert combiner.count == 0
+            mmio.fence()
+            assert register(mmio, 0x18) == base + combiner.max_writes - 1
+            print(f"✅ Flushed at {combiner.max_writes} writes")
+
+            # 4. Soglia di tempo
+            print("4. Time threshold...")
+            combiner = mmio._conn.combiner = _WriteCombiner(mmio._conn, max_delay=0.01)
+            mmio.write(0x1C, base + 7)
+            deadline = time.monotonic() + 5
+            while register(mmio, 0x1C) != base + 7:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert combiner.count == 0
+            print("✅ Flushed by the timer")
+
+            # 5. Una scrittura fallita nel batch viene segnalata dal fence() successivo
+            print("5. Failed coalesced write...")
+            mmio.write(0x20, base + 1)
+            mmio.write(0x2000, 1)       # fuori dalla regione
+            mmio.write(0x24, base + 2)
+            try:
+                mmio.fence()
+                raise AssertionError("fence() did not report the failed write")
+            except Exception as e:
+                assert "1 of 3 coalesced MMIO writes failed" in str(e), e
+            assert (register(mmio, 0x20), register(mmio, 0x24)) == (base + 1, base + 2)
+            mmio.fence()
+            print("✅ Reported once by fence(), the other writes applied\n")
+    finally:
+        _stop_mock_backend(resource_manager, fast_server, grpc_server)
+
+    print("=== Write combining test passed! ===")
+
+
+def test_mmio_stream_client():
+    """MMIO senza device UIO: accessi su MMIOStream, ordinati con le RPC unarie"""
+    print("=== Testing MMIO over MMIOStream (mock backend) ===\n")
+    tenant_id = os.environ['TENANT_ID']
+    resource_manager, fast_server, grpc_server = _mock_backend()
+    try:
+        mmio = MMIO(0xA0000000, 0x1000)
+        assert mmio._stream is not None
+
+        # 1. Le scritture senza risposta precedono letture e burst unari
+        print("1. Writes, reads and bursts...")
+        mmio.write(0x10, 0x1234)
+        mmio.write(0x14, 0x5678)
+        assert mmio.read(0x10) == 0x1234
+        mmio.write(0x18, 9)
+        assert list(mmio.read_block(0x10, 3)) == [0x1234, 0x5678, 9]
+        mmio.write_block(0x20, [1, 2])
+        assert mmio.read(0x24) == 2
+        print("✅ Ordered")
+
+        # 2. POLL eseguito sul server
+        print("\n2. Poll...")
+        assert mmio.poll(0x14, 0xFF, 0x78, timeout=0.1) == 0x5678
+        try:
+            mmio.poll(0x14, 0xFF, 0x79, timeout=0.01)
+            raise AssertionError("Poll did not time out")
+        except TimeoutError:
+            pass
+        print("✅ Satisfied and timed out")
+
+        # 3. Una scrittura rifiutata viene segnalata da flush()
+        print("\n3. Failed write...")
+        stale = MMIO(0xA0000000, 0x1000)
+        resource_manager.release_mmio(tenant_id, stale._handle)
+        stale.write(0x10, 1)
+        try:
+            stale.flush()
+            raise AssertionError("flush() did not report the failed write")
+        except Exception as e:
+            assert "MMIO write failed" in str(e), e
+        mmio.flush()
+        assert mmio.read(0x10) == 0x1234
+        print("✅ Reported by flush(), stream still usable")
+        mmio.close()
+    finally:
+        _stop_mock_backend(resource_manager, fast_server, grpc_server)
+
+    print("\n=== MMIOStream client test passed! ===")
+
+
+def test_buffer_streams_client():
+    """ProxyBuffer in modalità gRPC oltre BUFFER_CHUNK_SIZE: sync a chunk in entrambe le direzioni"""
+    chunk = sys.modules['client.pynq_proxy.allocate'].BUFFER_CHUNK_SIZE
+    print("=== Testing chunked buffer syncs (mock backend) ===\n")
+    tenant_id = os.environ['TENANT_ID']
+    resource_manager, fast_server, grpc_server = _mock_backend()
+    try:
+        calls = _record_calls()
+        size = 2 * chunk + chunk // 2
+        data = np.random.default_rng(1).integers(0, 256, size, dtype=np.uint8)
+        buf = _grpc_buffer((size,), np.uint8)
+
+        # 1. Scrittura completa: un WriteBufferStream con chunk di BUFFER_CHUNK_SIZE
+        print("1. sync_to_device...")
+        buf[:] = data
+        buf.sync_to_device()
+        assert calls[-1] == ('WriteBufferStream', [(0, chunk), (chunk, chunk), (2 * chunk, chunk // 2)])
+        assert resource_manager.read_buffer(tenant_id, buf._handle, 0, size) == data.tobytes()
+        print(f"✅ {len(calls[-1][1])} chunks")
+
+        # 2. Lettura dopo una scrittura lato server: ReadBufferStream direttamente nell'array
+        print("\n2. sync_from_device...")
+        resource_manager.write_buffer(tenant_id, buf._handle, b'\xAA' * 16, chunk + 8)
+        data[chunk + 8:chunk + 24] = 0xAA
+        buf.sync_from_device()
+        assert calls[-1][0] == 'ReadBufferStream'
+        assert np.array_equal(buf._array, data)
+        print("✅ OK")
+    finally:
+        Connection().__dict__.pop('call_with_auth', None)
+        _stop_mock_backend(resource_manager, fast_server, grpc_server)
+
+    print("\n=== Chunked buffer sync test passed! ===")
+
+
+def test_read_cache():
+    """Cache di lettura versionata di ProxyBuffer in modalità gRPC"""
+    allocate_module = sys.modules['client.pynq_proxy.allocate']
+    print("=== Testing versioned buffer read cache (mock backend) ===\n")
+    tenant_id = os.environ['TENANT_ID']
+    resource_manager, fast_server, grpc_server = _mock_backend()
+    try:
+        calls = _record_calls()
+        buf = _grpc_buffer((64,), np.uint8)
+
+        def reads():
+            return [request for method, request in calls if method == 'ReadBuffer']
+
+        # 1. Una sola lettura dal server, poi accessi locali
+        print("1. Repeated reads...")
+        total = sum(int(buf[i]) for i in range(64) for _ in range(4))
+        assert total == 0 and len(reads()) == 1 and reads()[0].known_version == 0
+        version = buf._version
+        print(f"✅ 256 accesses, 1 ReadBuffer (version {version})")
+
+        # 2. Dopo invalidate_buffers() basta una risposta not_modified
+        print("\n2. Revalidation...")
+        allocate_module.invalidate_buffers()
+        assert buf[0] == 0 and len(reads()) == 2 and reads()[-1].known_version == version
+        assert buf._version == version
+        resource_manager.write_buffer(tenant_id, buf._handle, b'\x07', 8)
+        assert buf[8] == 0          # Nessuna invalidazione: copia locale
+        allocate_module.invalidate_buffers()
+        assert buf[8] == 7 and len(reads()) == 3 and buf._version > version
+        print("✅ not_modified, then reloaded after a server-side write")
+
+        # 3. Le proprie scritture lasciano la cache valida
+        print("\n3. Own writes...")
+        buf[1] = 5
+        buf.sync_to_device()
+        assert buf[1] == 5 and len(reads()) == 3
+        print("✅ No read after sync_to_device()")
+
+        # 4. Registro di controllo via fast path: rilettura completa, senza known_version
+        print("\n4. Control register writes...")
+        mmio = UltraFastMMIO(0xA0000000, 0x1000)
+        mmio.write(0x10, 1)
+        assert buf[1] == 5 and len(reads()) == 3
+        mmio.write(0x00, 1)
+        mmio.fence()
+        assert buf[1] == 5 and len(reads()) == 4 and reads()[-1].known_version == 0
+        print("✅ Only ap_start forces a full reload")
+    finally:
+        Connection().__dict__.pop('call_with_auth', None)
+        _stop_mock_backend(resource_manager, fast_server, grpc_server)
+
+    print("\n=== Read cache test passed! ===")
+
+
+def test_dma_completions_client():
+    """Canali DMA che attendono i completamenti su WatchCompletions (DMA mock in loopback)"""
+    from client.pynq_proxy.completions import CompletionWatcher
+    print("=== Testing DMA completions over WatchCompletions (mock backend) ===\n")
+    resource_manager, fast_server, grpc_server = _mock_backend()
+    try:
+        import pynq_service_pb2 as pb2
+        from client.pynq_proxy.dma import DMA
+        response = Connection().call_with_auth('LoadOverlay', pb2.LoadOverlayRequest(bitfile_path='base.bit'))
+        ip = response.ip_cores['axi_dma_0']
+        dma = DMA(ip.base_address, ip.address_range, ip_name='axi_dma_0', overlay_id=response.overlay_id)
+        calls = _record_calls()
+        src, dst = _grpc_buffer((4096,), np.uint8), _grpc_buffer((4096,), np.uint8)
+
+        def polls():
+            return [request for method, request in calls if method == 'GetDMAStatus']
+
+        # 1. Trasferimenti attesi sullo stream, senza GetDMAStatus
+        print("1. Loopback transfers...")
+        src[:] = np.arange(4096) % 251
+        for _ in range(3):
+            dma.recvchannel.transfer(dst)
+            dma.sendchannel.transfer(src)
+            dma.sendchannel.wait(5)
+            dma.recvchannel.wait(5)
+        assert np.array_equal(dst[:], src[:])
+        assert dma.recvchannel.transferred == 4096 and dma.recvchannel.idle
+        assert not polls()
+        print("✅ 6 transfers completed, no GetDMAStatus")
+
+        # 2. Stream chiuso con un trasferimento in volo: si torna a GetDMAStatus
+        print("\n2. Stream closed...")
+        dma.recvchannel.transfer(dst)
+        watcher = CompletionWatcher.get()
+        watcher.close()
+        watcher._reader.join(5)
+        dma.sendchannel.transfer(src)
+        dma.sendchannel.wait(5)
+        dma.recvchannel.wait(5)
+        assert dma.recvchannel.transferred == 4096 and np.array_equal(dst[:], src[:])
+        assert polls() and not CompletionWatcher.get().closed
+        print(f"✅ Completed, {len(polls())} GetDMAStatus after the stream closed")
+    finally:
+        Connection().__dict__.pop('call_with_auth', None)
+        if CompletionWatcher._instance is not None:
+            CompletionWatcher._instance.close()
+        _stop_mock_backend(resource_manager, fast_server, grpc_server)
+
+    print("\n=== DMA completions client test passed! ===")
+
+
 if __name__ == '__main__':
-    test_pynq_compatibility()
\ No newline at end of file
+    if '--mock' in sys.argv:
+        test_ring_fence_ordering()
+        test_dirty_ranges()
+        test_pipelined_client()
+        test_write_combiner()
+        test_mmio_stream_client()
+        test_buffer_streams_client()
+        test_read_cache()
+        test_dma_completions_client()
+    else:
+        test_pynq_compatibility()
\ No newline at end of file